@@ -0,0 +1 @@
+# Gateway micro-benchmarks (run with: python -m benchmarks.<name>)
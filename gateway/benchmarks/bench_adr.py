@@ -0,0 +1,139 @@
+"""
+Adaptive data rate benchmark on a link whose signal strength changes.
+
+Node A streams fixed-size messages to node B, each acknowledged, over a
+simulated E22 link. The received signal follows a profile (strong, a
+slow fade to near the slowest rate's sensitivity, a hold there, then
+recovery) with per-packet Gaussian fading; a packet gets through when its SNR clears
+the floor of the air rate in use. Both nodes run an AdrController that
+negotiates over the same link, and only hear each other at the same air
+rate.
+
+Compares fixed slowest, fixed fastest and ADR: throughput, packet error
+rate and the longest outage (time without a delivery), and for ADR the
+throughput and packet error rate at each air rate it used.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_adr [--size 64] [--minutes 30] [--fade 8] [--seed 1]
+"""
+import argparse
+import random
+
+from lyceum.link.adr import AdrController, e22_ladder, noise_floor_dbm
+from lyceum.link.arq import DATA_OVERHEAD
+
+
+CRYPTO_OVERHEAD = 28
+ACK_SIZE = DATA_OVERHEAD + CRYPTO_OVERHEAD
+A, B = 0x0001, 0x0002
+
+
+def profile(t: float, duration: float) -> float:
+    """Mean RSSI (dBm): strong, fade to near the edge, hold, recover."""
+    x = t / duration
+    if x < 0.2:
+        return -80.0
+    if x < 0.4:
+        return -80.0 - 44.0 * (x - 0.2) / 0.2
+    if x < 0.6:
+        return -124.0
+    if x < 0.8:
+        return -124.0 + 44.0 * (x - 0.6) / 0.2
+    return -80.0
+
+
+def run(mode: str, size: int, duration: float, fade_db: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    ladder = e22_ladder()
+    noise = noise_floor_dbm(ladder[0].modulation)
+    now = 0.0
+    fixed = {"slowest": 0, "fastest": len(ladder) - 1}.get(mode)
+    control = []  # (src, dst, frame)
+
+    def clock():
+        return now
+
+    def transmitter(src):
+        return lambda dst, frame: control.append((src, dst, frame))
+
+    nodes = {
+        a: AdrController(a, ladder, transmitter(a), lambda rate: None,
+                         initial=fixed or 0, clock=clock)
+        for a in (A, B)
+    }
+
+    def heard(frame_size: int, rate: int):
+        rssi = profile(now, duration) + rng.gauss(0.0, fade_db / 2)
+        ok = rssi - noise >= ladder[rate].snr_floor
+        return ok, rssi
+
+    delivered = sent = errors = 0
+    last_ok = outage = 0.0
+    while now < duration:
+        a, b = nodes[A], nodes[B]
+        rate = a.index
+        modulation = ladder[rate].modulation
+        now += modulation.time_on_air(size + DATA_OVERHEAD + CRYPTO_OVERHEAD)
+        sent += 1
+        ok, rssi = heard(size, rate)
+        if ok and b.index == rate:
+            b.observe(A, rssi=rssi, size=size)
+            now += modulation.time_on_air(ACK_SIZE)
+            ok, rssi = heard(ACK_SIZE, rate)
+            if ok:
+                a.observe(B, rssi=rssi)
+        else:
+            ok = False
+            now += 2 * modulation.time_on_air(ACK_SIZE)  # Ack timeout
+        delivered += size if ok else 0
+        errors += not ok
+        if ok:
+            outage = max(outage, now - last_ok)
+            last_ok = now
+        if fixed is not None:
+            continue
+        a.record_tx(size, ok)
+        while control:
+            src, dst, frame = control.pop(0)
+            now += ladder[nodes[src].index].modulation.time_on_air(len(frame) + CRYPTO_OVERHEAD)
+            if nodes[src].index == nodes[dst].index and heard(len(frame), nodes[src].index)[0]:
+                nodes[dst].on_frame(frame)
+        for node in nodes.values():
+            node.poll(now)
+
+    result = {
+        "mode": mode,
+        "throughput_bps": 8 * delivered / now,
+        "per": errors / sent,
+        "sent": sent,
+        "outage_s": max(outage, now - last_ok),
+    }
+    if fixed is None:
+        report = nodes[A].report()
+        result["changes"] = report["changes"]
+        result["fallbacks"] = report["fallbacks"]
+        result["rates"] = {k: v for k, v in report["rates"].items() if v["tx_packets"]}
+    return result
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--size", type=int, default=64, help="Payload bytes per message")
+    p.add_argument("--minutes", type=float, default=30.0, help="Simulated duration")
+    p.add_argument("--fade", type=float, default=8.0, help="Fading spread (dB, ~2 sigma)")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    duration = args.minutes * 60
+    print(f"{'mode':>8} {'bit/s':>9} {'PER':>7} {'sent':>7} {'outage s':>9} {'changes':>8}")
+    for mode in ("slowest", "fastest", "adr"):
+        r = run(mode, args.size, duration, args.fade, args.seed)
+        print(f"{mode:>8} {r['throughput_bps']:>9,.0f} {r['per']:>7.1%} {r['sent']:>7} "
+              f"{r['outage_s']:>9.0f} {r.get('changes', '-'):>8}")
+        for name, s in r.get("rates", {}).items():
+            print(f"{'':>8} {name:>6}: {s['seconds']:>7.0f} s  {s['throughput_bps']:>9,.0f} bit/s  "
+                  f"PER {s['per']:.1%}  ({s['tx_packets']} packets)")
+
+
+if __name__ == "__main__":
+    main()
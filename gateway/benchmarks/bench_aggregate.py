@@ -0,0 +1,116 @@
+"""
+Channel capacity benchmark for small-message aggregation.
+
+Offers a backlog of small text messages to one destination on one channel
+and drains it through the real transmit path (LyceumGateway framing,
+AES-GCM, TxScheduler airtime and duty-cycle accounting) on a simulated
+clock, once with every message in its own frame and once through the
+Aggregator. Reports the messages per second the channel carries and the
+bytes on air per message. The token bucket burst is one full frame, so
+the figures are sustained (duty-cycle limited) rates.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_aggregate [--count 500] [--sizes 8 24 64]
+                                         [--rates 2 5 7] [--duty-cycle 0.1]
+"""
+import argparse
+import os
+
+from e22_driver import LyceumGateway
+from lyceum.link import Aggregator, SchedulerConfig, TxScheduler, e22_modulation
+
+
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+DST = 0x0002
+CHANNEL = 4
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run(gw: LyceumGateway, count: int, size: int, air_rate: int, duty_cycle: float, aggregate: bool) -> dict:
+    clock = FakeClock()
+    modulation = e22_modulation(air_rate)
+    scheduler = TxScheduler(
+        SchedulerConfig(
+            modulation=modulation,
+            duty_cycle=duty_cycle,
+            # One full sub-packet of burst: measure the sustained rate, not
+            # how much of a short run fits in the initial allowance
+            burst_s=modulation.time_on_air(240),
+            max_queue=count,
+        ),
+        clock=clock,
+    )
+
+    def enqueue(key, frame, n):
+        scheduler.enqueue(gw.build_lyceum_frame(DST, CHANNEL, frame), CHANNEL)
+
+    aggregator = Aggregator(enqueue, clock=clock) if aggregate else None
+    text = "m" * size
+    for _ in range(count):
+        frame = gw.text_frame(DST, text)
+        if aggregator:
+            aggregator.add((DST, CHANNEL), frame)
+        else:
+            enqueue(None, frame, 1)
+    if aggregator:
+        aggregator.flush()
+
+    frames = 0
+    on_air_bytes = 0
+    end = 0.0
+    while scheduler.depth:
+        item = scheduler.pop_ready(clock.now)
+        if item is None:
+            clock.now = scheduler.next_wakeup(clock.now)
+            continue
+        frames += 1
+        on_air_bytes += len(item.frame) - scheduler.config.prefix_bytes
+        end = clock.now + item.airtime
+    return {
+        "frames": frames,
+        "msgs_per_s": count / end,
+        "bytes_per_msg": on_air_bytes / count,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=500)
+    p.add_argument("--sizes", type=int, nargs="+", default=[8, 24, 64])
+    p.add_argument("--rates", type=int, nargs="+", default=[2, 5, 7], help="E22 air rate codes")
+    p.add_argument("--duty-cycle", type=float, default=0.1)
+    args = p.parse_args()
+
+    # Frames are only built, never written; a pty stands in for the module
+    master, slave = os.openpty()
+    gw = LyceumGateway(os.ttyname(slave), aes_key=KEY)
+
+    print(f"duty cycle {args.duty_cycle:.0%}, {args.count} messages per run")
+    print(
+        f"{'rate':>4} {'size':>5}  {'msgs/s off':>10} {'msgs/s on':>10} {'gain':>6}"
+        f"  {'B/msg off':>9} {'B/msg on':>9} {'msgs/frame':>10}"
+    )
+    for rate in args.rates:
+        for size in args.sizes:
+            off = run(gw, args.count, size, rate, args.duty_cycle, aggregate=False)
+            on = run(gw, args.count, size, rate, args.duty_cycle, aggregate=True)
+            print(
+                f"{rate:>4} {size:>5}  {off['msgs_per_s']:>10.2f} {on['msgs_per_s']:>10.2f} "
+                f"{on['msgs_per_s'] / off['msgs_per_s']:>5.1f}x"
+                f"  {off['bytes_per_msg']:>9.1f} {on['bytes_per_msg']:>9.1f} "
+                f"{args.count / on['frames']:>10.1f}"
+            )
+    gw.close()
+    os.close(slave)
+    os.close(master)
+
+
+if __name__ == "__main__":
+    main()
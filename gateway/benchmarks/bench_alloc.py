@@ -0,0 +1,115 @@
+"""
+Allocation benchmark for the gateway receive path.
+
+Replays a stream of encrypted frames through two receive paths and uses
+tracemalloc to measure what each packet allocates:
+
+- copy: read() bytes, decrypt() to a new plaintext, decode to str
+  (the original LyceumGatewayDevice._handle_received_data)
+- into: readinto() a pooled buffer, decrypt_into() another pooled buffer,
+  decode to str (the only allocation left is the message itself)
+
+"bytes/packet" is the mean tracemalloc peak above baseline per packet and
+"retained" is memory still held after the run (should be ~0 for both).
+Small memoryview objects cost a fixed ~184 bytes each, so compare the
+growth across --sizes: on the copy path it grows by several times the
+payload, on the into path only by the decoded str.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_alloc [--count 20000] [--sizes 32 200] [--session]
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from lyceum.crypto import AESGCMCipher, BufferPool, SessionCipher
+
+
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+
+
+def make_frames(count: int, size: int, session: bool) -> Tuple[List[bytes], object]:
+    text = ("x" * size).encode("utf-8")
+    if session:
+        salt = SessionCipher.new_salt()
+        sender = SessionCipher(KEY, salt, sender=1)
+        return [sender.encrypt(text) for _ in range(count)], SessionCipher(KEY, salt, sender=2)
+    cipher = AESGCMCipher(KEY)
+    return cipher.encrypt_many([text] * count), AESGCMCipher(KEY)
+
+
+def copy_path(stream: io.BytesIO, cipher, frame_len: int) -> Callable[[], None]:
+    def step():
+        data = stream.read(frame_len)
+        plaintext = cipher.decrypt(data)
+        plaintext.decode("utf-8")
+    return step
+
+
+def into_path(stream: io.BytesIO, cipher, frame_len: int) -> Callable[[], None]:
+    pool = BufferPool(size=256, count=4)
+
+    def step():
+        rx = pool.acquire()
+        plain = pool.acquire()
+        n = stream.readinto(rx[:frame_len])
+        view = cipher.decrypt_into(rx[:n], plain)
+        str(view, "utf-8")
+        pool.release(plain)
+        pool.release(rx)
+    return step
+
+
+def measure(name: str, factory, frames: List[bytes], receiver) -> dict:
+    stream = io.BytesIO(b"".join(frames))
+    step = factory(stream, receiver, len(frames[0]))
+    step()  # Warm caches (backend selection, first-use allocations)
+    half = (len(frames) - 1) // 2
+
+    # First half untraced for throughput, second half under tracemalloc
+    start = time.perf_counter()
+    for _ in range(half):
+        step()
+    pps = half / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    transient = 0
+    for _ in range(half):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        step()
+        transient += tracemalloc.get_traced_memory()[1] - before
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return {
+        "path": name,
+        "transient_bytes_per_packet": transient / half,
+        "retained_bytes": retained,
+        "pps": pps,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=20000)
+    p.add_argument("--sizes", type=int, nargs="+", default=[32, 200])
+    p.add_argument("--session", action="store_true", help="Use SessionCipher frames")
+    args = p.parse_args()
+
+    print(f"{'size':>5}  {'path':<6} {'bytes/packet':>13} {'retained':>10} {'packets/s':>12}")
+    for size in args.sizes:
+        for name, factory in (("copy", copy_path), ("into", into_path)):
+            # Fresh receiver per path so the replay window starts empty
+            frames, receiver = make_frames(args.count, size, args.session)
+            row = measure(name, factory, frames, receiver)
+            print(
+                f"{size:>5}  {row['path']:<6} {row['transient_bytes_per_packet']:>13,.0f} "
+                f"{row['retained_bytes']:>10,} {row['pps']:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+LyceumFrame codec benchmark.
+
+Encodes and decodes frames through three paths and reports frames per
+second for each:
+
+- concat: the original int.to_bytes concatenation and repeated slicing
+- struct: the precompiled HEADER struct (to_bytes / from_bytes)
+- pack_into: struct encode into one preallocated buffer, decode via a
+  zero-copy LyceumFrameView header() unpack
+
+Then reports bytes on air per frame with the full and compact header,
+counting the fixed-point prefix, length byte and AES-GCM overhead.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_codec [--count 200000] [--sizes 8 32 128]
+"""
+import argparse
+import time
+
+from lyceum_proto import COMPACT_SAVING, HEADER_SIZE, LyceumFrame, LyceumFrameView
+
+
+LENGTH = 1  # "length" framing byte
+CRYPTO_OVERHEAD = 28  # AES-GCM nonce + tag
+
+
+def concat_encode(frame: LyceumFrame) -> bytes:
+    return (
+        frame.src.to_bytes(2, "big")
+        + frame.dst.to_bytes(2, "big")
+        + (frame.seq & 0xFF).to_bytes(1, "big")
+        + (frame.flags & 0xFF).to_bytes(1, "big")
+        + frame.payload
+    )
+
+
+def concat_decode(b: bytes) -> LyceumFrame:
+    return LyceumFrame(
+        src=int.from_bytes(b[0:2], "big"),
+        dst=int.from_bytes(b[2:4], "big"),
+        seq=b[4],
+        flags=b[5],
+        payload=b[6:],
+    )
+
+
+def rate(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=200000)
+    p.add_argument("--sizes", type=int, nargs="+", default=[8, 32, 128])
+    args = p.parse_args()
+
+    print(f"{args.count} frames per run (frames/s, encode | decode)")
+    print(f"{'size':>5} {'concat':>17} {'struct':>17} {'pack_into':>17}")
+    for size in args.sizes:
+        frame = LyceumFrame(src=0x0001, dst=0x0002, seq=7, flags=0, payload=bytes(size))
+        wire = frame.to_bytes()
+        buf = bytearray(HEADER_SIZE + size)
+        view = memoryview(buf)
+        frame.pack_into(buf)
+        results = [
+            (rate(lambda: concat_encode(frame), args.count),
+             rate(lambda: concat_decode(wire), args.count)),
+            (rate(frame.to_bytes, args.count),
+             rate(lambda: LyceumFrame.from_bytes(wire), args.count)),
+            (rate(lambda: frame.pack_into(buf), args.count),
+             rate(lambda: LyceumFrameView(view).header(), args.count)),
+        ]
+        print(f"{size:>5} " + " ".join(f"{enc:>8,.0f}|{dec:<8,.0f}" for enc, dec in results))
+
+    print()
+    print("bytes on air per frame (prefix excluded; length byte and AES-GCM included)")
+    print(f"{'size':>5} {'full':>6} {'compact':>8} {'saved':>6}")
+    for size in args.sizes:
+        full = LENGTH + CRYPTO_OVERHEAD + HEADER_SIZE + size
+        compact = full - COMPACT_SAVING
+        print(f"{size:>5} {full:>6} {compact:>8} {1 - compact / full:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Packets-per-second benchmark for the AES-GCM payload cipher.
+
+Compares the old per-packet code paths (fresh AES object and RNG call in
+LyceumGateway, fresh AESGCMCipher plus import in AIWTDaemon._decrypt)
+against a reused AESGCMCipher and its batch API, plus the batch API on
+each installed AEAD backend.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_crypto [--count 20000] [--sizes 32 230]
+"""
+import argparse
+import time
+from typing import Callable, List, Optional
+
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+from lyceum.crypto import AESGCMCipher, available_backends
+
+
+KEY = bytes.fromhex("deadbeefcafebabe0011223344556677")
+
+
+def legacy_encrypt(key: bytes, plaintext: bytes) -> bytes:
+    """LyceumGateway.encrypt_payload before cipher reuse."""
+    nonce = get_random_bytes(12)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+    ct, tag = cipher.encrypt_and_digest(plaintext)
+    return nonce + tag + ct
+
+
+def legacy_daemon_decrypt(key: bytes, blob: bytes) -> Optional[bytes]:
+    """AIWTDaemon._decrypt before cipher reuse."""
+    from lyceum.crypto import AESGCMCipher, available_backends
+    cipher = AESGCMCipher(key)
+    return cipher.decrypt(blob)
+
+
+def rate(fn: Callable[[], object], packets: int, repeat: int = 3) -> float:
+    """Run fn `repeat` times and return the best packets per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return packets / best
+
+
+def run(count: int, sizes: List[int]) -> List[dict]:
+    cipher = AESGCMCipher(KEY)
+    results = []
+    for size in sizes:
+        plaintexts = [get_random_bytes(size) for _ in range(count)]
+        blobs = cipher.encrypt_many(plaintexts)
+
+        rows = {
+            "encrypt/legacy": lambda: [legacy_encrypt(KEY, p) for p in plaintexts],
+            "encrypt/reused": lambda: [cipher.encrypt(p) for p in plaintexts],
+            "encrypt/many": lambda: cipher.encrypt_many(plaintexts),
+            "decrypt/legacy": lambda: [legacy_daemon_decrypt(KEY, b) for b in blobs],
+            "decrypt/reused": lambda: [cipher.decrypt(b) for b in blobs],
+            "decrypt/many": lambda: cipher.decrypt_many(blobs),
+        }
+        for backend in available_backends():
+            forced = AESGCMCipher(KEY, backend=backend)
+            rows[f"encrypt/{backend}"] = lambda c=forced: c.encrypt_many(plaintexts)
+            rows[f"decrypt/{backend}"] = lambda c=forced: c.decrypt_many(blobs)
+        for name, fn in rows.items():
+            results.append({"size": size, "path": name, "pps": rate(fn, count)})
+    return results
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=20000)
+    p.add_argument("--sizes", type=int, nargs="+", default=[32, 230])
+    args = p.parse_args()
+
+    print(f"{'size':>5}  {'path':<22} {'packets/s':>12}")
+    for row in run(args.count, args.sizes):
+        print(f"{row['size']:>5}  {row['path']:<22} {row['pps']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
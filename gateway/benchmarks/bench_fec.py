@@ -0,0 +1,90 @@
+"""
+Completion-time benchmark: FEC vs plain retransmission.
+
+Sends one multi-frame payload at a time over the lossy half-duplex
+channel of bench_arq (airtime per frame, independent loss of every data
+and ack frame) and records how long the receiver takes to hold the whole
+payload:
+
+- arq: the payload cut into frames and sent with selective-repeat ARQ
+- fec: one Reed-Solomon block, redundancy sized by AdaptiveRedundancy
+  and topped up with repair shards until the block is acked
+
+Both start from the same 3 s retransmission/repair timeout. The FEC
+redundancy estimator carries over between trials, as it would between
+blocks on a real link.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_fec [--size 2000] [--trials 30] [--rate 5]
+                                   [--loss 0.01 0.1 0.3]
+"""
+import argparse
+import statistics
+
+from benchmarks.bench_arq import LossyLoopback
+from lyceum.link import e22_modulation
+from lyceum.link.arq import ArqEndpoint, DATA_OVERHEAD
+from lyceum.link.fec import AdaptiveRedundancy, FecEndpoint, MAX_SHARD, SHARD_OVERHEAD
+
+
+A, B = 0x0001, 0x0002
+
+
+def arq_trial(payload: bytes, modulation, loss: float, seed: int) -> float:
+    link = LossyLoopback(modulation, loss, seed)
+    chunks = []
+    sender = ArqEndpoint(A, link.transmitter(A), lambda s, p: None, clock=link.clock)
+    receiver = ArqEndpoint(B, link.transmitter(B), lambda s, p: chunks.append(p), clock=link.clock)
+    link.endpoints = {A: sender, B: receiver}
+    size = MAX_SHARD + SHARD_OVERHEAD - DATA_OVERHEAD  # Same frame size as an FEC shard
+    parts = [payload[i:i + size] for i in range(0, len(payload), size)]
+    for part in parts:
+        sender.send(B, part)
+    link.run(lambda: len(chunks) == len(parts))
+    assert b"".join(chunks) == payload
+    return link.now
+
+
+def fec_trial(payload: bytes, modulation, loss: float, seed: int, redundancy) -> tuple:
+    link = LossyLoopback(modulation, loss, seed)
+    got = []
+    sender = FecEndpoint(A, link.transmitter(A), lambda s, p: None,
+                         redundancy=redundancy, clock=link.clock)
+    receiver = FecEndpoint(B, link.transmitter(B), lambda s, p: got.append(p), clock=link.clock)
+    link.endpoints = {A: sender, B: receiver}
+    sender.send(B, payload)
+    link.run(lambda: bool(got))
+    assert got == [payload]
+    return link.now, sender.stats.shards_sent
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--size", type=int, default=2000)
+    p.add_argument("--trials", type=int, default=30)
+    p.add_argument("--rate", type=int, default=5, help="E22 air rate code")
+    p.add_argument("--loss", type=float, nargs="+", default=[0.01, 0.1, 0.3])
+    args = p.parse_args()
+
+    modulation = e22_modulation(args.rate)
+    payload = bytes(range(256)) * (args.size // 256) + bytes(args.size % 256)
+    k = -(-args.size // MAX_SHARD)
+    print(f"{args.size} B payload ({k} frames), air rate code {args.rate}, {args.trials} trials")
+    print(f"{'loss':>5} {'arq mean s':>10} {'arq p95':>8} {'fec mean s':>10} {'fec p95':>8} {'shards':>7}")
+    for loss in args.loss:
+        redundancy = AdaptiveRedundancy(initial_loss=loss)
+        arq, fec, shards = [], [], []
+        for trial in range(args.trials):
+            arq.append(arq_trial(payload, modulation, loss, trial))
+            seconds, sent = fec_trial(payload, modulation, loss, trial, redundancy)
+            fec.append(seconds)
+            shards.append(sent)
+        p95 = lambda xs: sorted(xs)[int(0.95 * (len(xs) - 1))]
+        print(
+            f"{loss:>5.0%} {statistics.mean(arq):>10.2f} {p95(arq):>8.2f} "
+            f"{statistics.mean(fec):>10.2f} {p95(fec):>8.2f} {statistics.mean(shards):>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Session establishment cost: full X25519 handshake vs. cached key reuse.
+
+Measures, per session:
+- handshake: ephemeral key generation + X25519 + HKDF (uncached peer)
+- cached:    HKDF from the cached shared secret (known peer, new session)
+- hit:       lookup of an existing session's keys
+
+Run it on the target board (e.g. Radxa Zero 3W / Raspberry Pi) to get
+ARM numbers; the machine type is printed with the results.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_handshake [--count 500]
+"""
+import argparse
+import platform
+import time
+
+from lyceum.crypto.ecdh import SessionKeyCache, X25519KeyPair
+
+
+def per_op_ms(fn, count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=500)
+    args = p.parse_args()
+
+    guardian = X25519KeyPair.generate()
+
+    # Every session with a new cache instance pays for the handshake
+    handshake = per_op_ms(
+        lambda i: SessionKeyCache(max_sessions=1).session_keys(
+            "!g", guardian.public_bytes, f"s{i}"
+        ),
+        args.count,
+    )
+
+    cache = SessionKeyCache(max_sessions=args.count + 1)
+    cache.session_keys("!g", guardian.public_bytes, "warmup")
+    cached = per_op_ms(
+        lambda i: cache.session_keys("!g", guardian.public_bytes, f"s{i}"),
+        args.count,
+    )
+    hit = per_op_ms(
+        lambda i: cache.session_keys("!g", guardian.public_bytes, "warmup"),
+        args.count,
+    )
+
+    print(f"machine: {platform.machine()} ({platform.processor() or 'unknown cpu'})")
+    print(f"{'path':<10} {'ms/session':>12} {'sessions/s':>12}")
+    for name, ms in (("handshake", handshake), ("cached", cached), ("hit", hit)):
+        print(f"{name:<10} {ms:>12.4f} {1000 / ms:>12,.0f}")
+    print(f"speedup (handshake/cached): {handshake / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
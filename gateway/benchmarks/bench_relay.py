@@ -0,0 +1,134 @@
+"""
+Internet relay throughput benchmark.
+
+Starts a local stand-in relay (HTTP/1.1 keep-alive, with an optional
+per-request delay standing in for the WAN round trip) and pushes a
+burst of relay messages through it twice: once the old way, one POST
+on a new connection per message, and once through RelayClient (one
+kept-alive connection, batched gzip bodies). A third run takes the
+relay down for the first half of the burst and reports the peak spool
+depth and how long the replay takes once it returns.
+
+Usage (from gateway/):
+    python -m benchmarks.bench_relay [--count 2000] [--rtt 20] [--size 120]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lyceum.relay import HttpPoster, RelayClient, Spool
+
+
+class Relay:
+    def __init__(self, rtt_s: float):
+        self.received = 0
+        self.up = True
+        relay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(rtt_s)
+                if relay.up:
+                    if self.headers.get("Content-Encoding") == "gzip":
+                        body = gzip.decompress(body)
+                    data = json.loads(body)
+                    relay.received += len(data) if isinstance(data, list) else 1
+                self.send_response(200 if relay.up else 503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_port
+        self.url = f"http://127.0.0.1:{self.port}/relay/batch"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def message(n: int, size: int) -> dict:
+    return {"message": "m" * size, "node_id": "!bench", "channel": 4, "n": n}
+
+
+def per_message(relay: Relay, count: int, size: int) -> float:
+    start = time.perf_counter()
+    for n in range(count):
+        conn = HTTPConnection("127.0.0.1", relay.port)
+        conn.request("POST", "/relay", json.dumps(message(n, size)), {"Content-Type": "application/json"})
+        conn.getresponse().read()
+        conn.close()
+    return count / (time.perf_counter() - start)
+
+
+async def batched(relay: Relay, count: int, size: int, outage: bool = False) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        poster = HttpPoster(relay.url)
+        client = RelayClient(poster, spool=Spool(f"{tmp}/relay.spool", fsync=False),
+                             retry_min_s=0.05, retry_max_s=0.2)
+        client.start()
+        relay.up = not outage
+        start = time.perf_counter()
+        peak = 0
+        for n in range(count):
+            await client.submit(message(n, size))
+            peak = max(peak, client.spool_depth)
+            if outage and n == count // 2:
+                restored = time.perf_counter()
+                relay.up = True
+        while client.stats.sent < count:
+            peak = max(peak, client.spool_depth)
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        await client.close()
+        poster.close()
+        return {
+            "msgs_per_s": count / elapsed,
+            "batches": client.stats.batches,
+            "compression": client.stats.to_dict()["compression"],
+            "peak_spool": peak,
+            "replay_s": time.perf_counter() - restored if outage else 0.0,
+        }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--count", type=int, default=2000)
+    p.add_argument("--rtt", type=float, default=20.0, help="Simulated round trip per request (ms)")
+    p.add_argument("--size", type=int, default=120, help="Message text length")
+    args = p.parse_args()
+
+    relay = Relay(args.rtt / 1000)
+    try:
+        print(f"{args.count} messages of {args.size} chars, {args.rtt:.0f} ms per request")
+        count = min(args.count, 200)  # The per-message path is slow; sample it
+        rate = per_message(relay, count, args.size)
+        print(f"  per-message POST, new connection: {rate:>9.1f} msgs/s")
+        result = asyncio.run(batched(relay, args.count, args.size))
+        print(
+            f"  batched, kept-alive:              {result['msgs_per_s']:>9.1f} msgs/s"
+            f"  ({result['batches']} POSTs, {result['compression']}x gzip, {result['msgs_per_s'] / rate:.0f}x)"
+        )
+        result = asyncio.run(batched(relay, args.count, args.size, outage=True))
+        print(
+            f"  relay down for first half:        {result['msgs_per_s']:>9.1f} msgs/s"
+            f"  (peak spool {result['peak_spool']}, drained {result['replay_s']:.2f} s after recovery)"
+        )
+    finally:
+        relay.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Typed model of the E22-900T22U parameter block (registers 0x00-0x08).
+
+    00 ADDH   01 ADDL   02 NETID
+    03 REG0   UART baud (7-5), parity (4-3), air data rate (2-0)
+    04 REG1   sub-packet size (7-6), RSSI noise enable (5),
+              software mode switch (2), transmit power (1-0)
+    05 REG2   channel
+    06 REG3   RSSI byte (7), fixed-point (6), relay (5), LBT (4)
+    07 CRYPT_H  08 CRYPT_L   (write-only; read back as zero)
+
+With the software mode switch enabled, mode_switch_command() moves the
+module between transmission and configuration mode over the UART, so
+registers can be changed without the M0/M1 pins.
+
+E22Config.from_bytes() parses a C1 read of the whole block and
+to_bytes() encodes one. write_for() compares against the module's
+current block and returns the single contiguous range that needs
+writing, so applying any set of changes costs one C0 command. Bits the
+model does not name are carried through unchanged.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from lyceum.link.airtime import E22_AIR_RATES, E22_NOMINAL_RATES
+
+
+REG_ADDH, REG_ADDL, REG_NETID, REG_REG0, REG_REG1, REG_CHAN, REG_REG3 = range(7)
+REG_CRYPT_H, REG_CRYPT_L = 0x07, 0x08
+REGISTER_COUNT = 9
+PID_ADDRESS, PID_LENGTH = 0x80, 7
+FACTORY_REGISTERS = bytes([0x00, 0x00, 0x00, 0x62, 0x00, 0x12, 0x03, 0x00, 0x00])
+MODE_SWITCH = bytes([0xC0, 0xC1, 0xC2, 0xC3, 0x02])  # + 0x00 transmission / 0x01 configuration
+
+UART_BAUDS = {0: 1200, 1: 2400, 2: 4800, 3: 9600, 4: 19200, 5: 38400, 6: 57600, 7: 115200}
+PARITIES = {0: "8N1", 1: "8O1", 2: "8E1"}  # 3 is also 8N1
+SUB_PACKET_SIZES = {0: 240, 1: 128, 2: 64, 3: 32}
+POWER_DBM = {0: 22, 1: 17, 2: 13, 3: 10}
+
+_REG1_KNOWN = 0xE7  # Bits 4-3 reserved
+_REG3_KNOWN = 0xF0  # Bits 3-0 reserved (WOR on other variants)
+
+
+def _code(table: dict, value, what: str) -> int:
+    for code, v in table.items():
+        if v == value:
+            return code
+    raise ValueError(f"Unsupported {what}: {value}")
+
+
+def mode_switch_command(configuration: bool) -> bytes:
+    """Software mode switch (REG1 bit 2); the reply is the command minus its C0."""
+    return MODE_SWITCH + bytes([0x01 if configuration else 0x00])
+
+
+@dataclass(frozen=True)
+class E22Config:
+    address: int = 0x0000
+    netid: int = 0
+    uart_baud: int = 9600
+    parity: str = "8N1"
+    air_rate: int = 2  # REG0 code; see lyceum.link.airtime.E22_AIR_RATES
+    sub_packet: int = 240
+    rssi_noise: bool = False  # C0 C1 C2 C3 RSSI reads in transmission mode
+    software_mode_switch: bool = False
+    power_dbm: int = 22
+    channel: int = 0x12
+    rssi_byte: bool = False
+    fixed_point: bool = False
+    relay: bool = False
+    lbt: bool = False
+    crypt_key: Optional[int] = None  # None: unknown (write-only) or untouched
+    reg1_reserved: int = 0x00
+    reg3_reserved: int = 0x03
+
+    @property
+    def air_rate_bps(self) -> int:
+        return E22_NOMINAL_RATES[self.air_rate]
+
+    @classmethod
+    def from_bytes(cls, regs: bytes) -> "E22Config":
+        """Parse registers 0x00-0x08 (as read: crypt_key comes back None)."""
+        if len(regs) < REGISTER_COUNT - 2:
+            raise ValueError(f"Expected at least {REGISTER_COUNT - 2} registers, got {len(regs)}")
+        reg0, reg1, reg3 = regs[REG_REG0], regs[REG_REG1], regs[REG_REG3]
+        return cls(
+            address=(regs[REG_ADDH] << 8) | regs[REG_ADDL],
+            netid=regs[REG_NETID],
+            uart_baud=UART_BAUDS[reg0 >> 5],
+            parity=PARITIES.get((reg0 >> 3) & 0x03, "8N1"),
+            air_rate=reg0 & 0x07,
+            sub_packet=SUB_PACKET_SIZES[reg1 >> 6],
+            rssi_noise=bool(reg1 & 0x20),
+            software_mode_switch=bool(reg1 & 0x04),
+            power_dbm=POWER_DBM[reg1 & 0x03],
+            channel=regs[REG_CHAN],
+            rssi_byte=bool(reg3 & 0x80),
+            fixed_point=bool(reg3 & 0x40),
+            relay=bool(reg3 & 0x20),
+            lbt=bool(reg3 & 0x10),
+            reg1_reserved=reg1 & ~_REG1_KNOWN & 0xFF,
+            reg3_reserved=reg3 & ~_REG3_KNOWN & 0xFF,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Encode registers 0x00-0x08 (crypt bytes are zero if crypt_key is None)."""
+        if self.air_rate not in E22_AIR_RATES:
+            raise ValueError(f"Unknown air rate code: {self.air_rate}")
+        if not 0 <= self.channel <= 80:
+            raise ValueError(f"Channel out of range (0-80): {self.channel}")
+        reg0 = (
+            (_code(UART_BAUDS, self.uart_baud, "UART baud") << 5)
+            | (_code(PARITIES, self.parity, "parity") << 3)
+            | self.air_rate
+        )
+        reg1 = (
+            (_code(SUB_PACKET_SIZES, self.sub_packet, "sub-packet size") << 6)
+            | (0x20 if self.rssi_noise else 0)
+            | (0x04 if self.software_mode_switch else 0)
+            | _code(POWER_DBM, self.power_dbm, "power")
+            | (self.reg1_reserved & ~_REG1_KNOWN & 0xFF)
+        )
+        reg3 = (
+            (0x80 if self.rssi_byte else 0)
+            | (0x40 if self.fixed_point else 0)
+            | (0x20 if self.relay else 0)
+            | (0x10 if self.lbt else 0)
+            | (self.reg3_reserved & ~_REG3_KNOWN & 0xFF)
+        )
+        key = self.crypt_key or 0
+        return bytes([
+            (self.address >> 8) & 0xFF, self.address & 0xFF, self.netid & 0xFF,
+            reg0, reg1, self.channel, reg3, (key >> 8) & 0xFF, key & 0xFF,
+        ])
+
+    def write_for(self, current: "E22Config") -> Optional[Tuple[int, bytes]]:
+        """
+        The one register range that turns `current` into this config.
+
+        Returns (start address, bytes) covering the first to the last
+        differing register, or None if nothing changes. The crypt key is
+        write-only, so it is included whenever this config sets one that
+        is not known to be in place already.
+        """
+        want = self.to_bytes()
+        have = current.to_bytes()
+        changed = [i for i in range(REG_CRYPT_H) if want[i] != have[i]]
+        if self.crypt_key is not None and self.crypt_key != current.crypt_key:
+            changed += [REG_CRYPT_H, REG_CRYPT_L]
+        if not changed:
+            return None
+        start, end = min(changed), max(changed) + 1
+        return start, want[start:end]
+
+
+@dataclass(frozen=True)
+class RateSelection:
+    """Rates chosen by LyceumGateway.select_rates(), for the record."""
+    air_rate: int  # REG0 code
+    air_rate_bps: int
+    uart_baud: int
+    margin_db: Optional[float]  # Link margin at the chosen air rate (None: RSSI unknown)
+
+
+def fastest_air_rate(rssi_dbm: float, margin_db: float = 10.0) -> Tuple[int, float]:
+    """
+    Highest E22 air rate code the link budget allows.
+
+    A rate qualifies when the received signal (RSSI is the same at any
+    air rate for a given transmit power) stays `margin_db` above that
+    rate's sensitivity. Falls back to the slowest rate. Returns the code
+    and its margin.
+    """
+    best = 2  # Codes 0-2 are all 2.4k
+    for code in sorted(E22_AIR_RATES, key=E22_NOMINAL_RATES.get):
+        if rssi_dbm - E22_AIR_RATES[code].sensitivity_dbm >= margin_db:
+            best = code
+    return best, rssi_dbm - E22_AIR_RATES[best].sensitivity_dbm
@@ -1,8 +1,21 @@
 import serial
 import time
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
-from typing import Optional
+from dataclasses import replace
+from typing import Optional, Tuple
+
+from e22_config import (
+    E22Config,
+    PID_ADDRESS,
+    PID_LENGTH,
+    REG_CRYPT_H,
+    REGISTER_COUNT,
+    RateSelection,
+    UART_BAUDS,
+    fastest_air_rate,
+    mode_switch_command,
+)
+from lyceum.crypto import AESGCMCipher, SessionCipher
+from lyceum_proto import COMPACT_SAVING, HEADER, compact_header, expand_header_into
 
 
 class E22Serial:
@@ -20,11 +33,19 @@ class E22Serial:
     def read(self, n: int = 1) -> bytes:
         return self.s.read(n)
 
+    def read_into(self, buf) -> int:
+        # Fill a caller-owned buffer (e.g. from a BufferPool); returns bytes read
+        return self.s.readinto(buf)
+
+    def set_baud(self, baud: int):
+        # Follow a UART rate change (the module applies REG0 on leaving config mode)
+        self.s.baudrate = baud
+
     # Configuration commands use the C0/C1 protocol described in the datasheet.
     # Module must be in configuration mode (9600,8N1) when calling these.
-    def config_write(self, start_addr: int, data: bytes) -> Optional[bytes]:
-        # C0 + start + len + params
-        cmd = bytes([0xC0, start_addr & 0xFF, len(data)]) + data
+    def config_write(self, start_addr: int, data: bytes, temporary: bool = False) -> Optional[bytes]:
+        # C0 + start + len + params (C2: lost at power-off)
+        cmd = bytes([0xC2 if temporary else 0xC0, start_addr & 0xFF, len(data)]) + data
         self.s.write(cmd)
         # Expect C1 + start + len + params
         resp = self.s.read(3)
@@ -37,67 +58,251 @@ class E22Serial:
         body = self.s.read(length) if length > 0 else b""
         return resp + body
 
+    def config_read(self, start_addr: int, length: int) -> Optional[bytes]:
+        # C1 + start + len; returns the params of C1 + start + len + params
+        self.s.write(bytes([0xC1, start_addr & 0xFF, length]))
+        resp = self.s.read(3 + length)
+        if len(resp) < 3 + length or resp[:3] != bytes([0xC1, start_addr & 0xFF, length]):
+            return None
+        return resp[3:]
+
+    def read_config(self) -> Optional[E22Config]:
+        # Whole parameter block in one round trip
+        regs = self.config_read(0x00, REGISTER_COUNT)
+        return E22Config.from_bytes(regs) if regs is not None else None
+
+    def read_pid(self) -> Optional[bytes]:
+        return self.config_read(PID_ADDRESS, PID_LENGTH)
+
+    def apply_config(
+        self,
+        config: E22Config,
+        current: Optional[E22Config] = None,
+        temporary: bool = False,
+    ) -> Optional[E22Config]:
+        """
+        Make the module's registers match `config` in one write command.
+
+        Reads the block first unless `current` is given, writes only the
+        changed range, and returns the config now in effect (None if the
+        module did not confirm).
+        """
+        if current is None:
+            current = self.read_config()
+            if current is None:
+                return None
+        write = config.write_for(current)
+        if write is None:
+            return replace(config, crypt_key=config.crypt_key or current.crypt_key)
+        start, data = write
+        resp = self.config_write(start, data, temporary=temporary)
+        if resp is None or resp[1:3] != bytes([start, len(data)]) or len(resp) != 3 + len(data):
+            return None
+        # Everything but the write-only crypt bytes must echo back as written
+        checked = REG_CRYPT_H - start
+        if resp[3:3 + checked] != data[:checked]:
+            return None
+        return replace(config, crypt_key=config.crypt_key or current.crypt_key)
+
+    def switch_mode(self, configuration: bool) -> bool:
+        """
+        Enter configuration (or return to transmission) mode over the UART.
+
+        Needs REG1 bit 2 (E22Config.software_mode_switch) enabled.
+        """
+        cmd = mode_switch_command(configuration)
+        self.s.write(cmd)
+        return self.s.read(len(cmd) - 1) == cmd[1:]
+
+    def read_rssi(self) -> Optional[Tuple[float, float]]:
+        """
+        (ambient noise, last packet) in dBm, from transmission mode.
+
+        Needs REG1 bit 5 (E22Config.rssi_noise) enabled.
+        """
+        self.s.write(bytes([0xC0, 0xC1, 0xC2, 0xC3, 0x00, 0x02]))
+        resp = self.s.read(5)
+        if len(resp) < 5 or resp[:3] != bytes([0xC1, 0x00, 0x02]):
+            return None
+        # Register value is -2 * dBm
+        return -resp[3] / 2, -resp[4] / 2
+
 
 class LyceumGateway:
-    def __init__(self, port: str, baud: int = 115200, aes_key: bytes = None):
+    def __init__(
+        self,
+        port: str,
+        baud: int = 115200,
+        aes_key: bytes = None,
+        session_salt: Optional[bytes] = None,
+        address: int = 0x0001,
+        aead_backend: Optional[str] = None,
+        framing: Optional[str] = "length",
+        compact_header: bool = False,
+    ):
         self.e22 = E22Serial(port, baud=baud)
         self.aes_key = aes_key
+        self.address = address
+        # "length" prefixes each packet with its size so the receiver's
+        # FrameReassembler can split the UART stream; None/"gap" sends bare
+        self.framing = framing
+        # Leave dst out of the LyceumFrame header on air: the fixed-point
+        # prefix already carries it (see lyceum_proto). Both ends must match.
+        self.compact_header = compact_header
+        # One cipher for the life of the gateway, shared by TX and RX.
+        # With a session salt, frames use short counter nonces and replay
+        # protection (see lyceum.crypto.session) instead of random nonces.
+        # The counter restarts at 0 here, so pass a fresh salt every time
+        # (SessionCipher.new_salt() or derive_session_keys), never a fixed one.
+        if aes_key and session_salt:
+            self._cipher = SessionCipher(
+                aes_key, session_salt, sender=address, backend=aead_backend
+            )
+        elif aes_key:
+            self._cipher = AESGCMCipher(aes_key, backend=aead_backend)
+        else:
+            self._cipher = None
         self.seq = 0
+        # Last register block read from or written to the module
+        self.config: Optional[E22Config] = None
+        self.rates: Optional[RateSelection] = None
 
     def close(self):
         self.e22.close()
 
+    # Module must be in configuration mode (9600,8N1) for these
+    def read_config(self) -> Optional[E22Config]:
+        self.config = self.e22.read_config()
+        return self.config
+
+    def configure(self, refresh: bool = False, temporary: bool = False, **changes) -> Optional[E22Config]:
+        """
+        Change E22Config fields (e.g. fixed_point=True, channel=4) at once.
+
+        Costs one read (skipped once the block is known, unless refresh)
+        and at most one write of the changed register range.
+        """
+        current = self.config if self.config and not refresh else self.read_config()
+        if current is None:
+            return None
+        applied = self.e22.apply_config(replace(current, **changes), current, temporary=temporary)
+        if applied is not None:
+            self.config = applied
+        return applied
+
     def set_fixed_point_mode(self) -> bool:
-        # write to register 0x07 value 0x01
-        # Module must be in configuration mode (9600,8N1)
-        resp = self.e22.config_write(0x07, bytes([0x01]))
-        return resp is not None
+        # REG3 (0x06) bit 6; the rest of REG3 is preserved
+        return self.configure(fixed_point=True) is not None
 
     def set_crypt_key(self, key16: int) -> bool:
-        # write two byte key at 0x08 (CRYPT_H, CRYPT_L)
-        hi = (key16 >> 8) & 0xFF
-        lo = key16 & 0xFF
-        resp = self.e22.config_write(0x08, bytes([hi, lo]))
-        return resp is not None
+        # CRYPT_H, CRYPT_L at 0x07-0x08 (write-only)
+        return self.configure(crypt_key=key16 & 0xFFFF) is not None
+
+    def select_rates(
+        self,
+        rssi_dbm: Optional[float] = None,
+        margin_db: float = 10.0,
+        max_baud: int = 115200,
+    ) -> Optional[RateSelection]:
+        """
+        Switch to the fastest UART and air rates the link allows.
+
+        The air rate is the fastest whose sensitivity leaves `margin_db`
+        below `rssi_dbm` (kept as is without an RSSI). Both ends of a
+        link must use the same air rate. The UART takes effect when the
+        module leaves configuration mode; follow it with
+        e22.set_baud(selection.uart_baud). The choice is kept in .rates.
+        """
+        current = self.config or self.read_config()
+        if current is None:
+            return None
+        air_rate, margin = current.air_rate, None
+        if rssi_dbm is not None:
+            air_rate, margin = fastest_air_rate(rssi_dbm, margin_db)
+        uart_baud = max(b for b in UART_BAUDS.values() if b <= max_baud)
+        if self.configure(air_rate=air_rate, uart_baud=uart_baud) is None:
+            return None
+        self.rates = RateSelection(air_rate, self.config.air_rate_bps, uart_baud, margin)
+        return self.rates
 
     def encrypt_payload(self, plaintext: bytes) -> bytes:
-        if not self.aes_key:
+        if self.compact_header:
+            plaintext = compact_header(plaintext)
+        if not self._cipher:
             return plaintext
-        nonce = get_random_bytes(12)
-        cipher = AES.new(self.aes_key, AES.MODE_GCM, nonce=nonce)
-        ct, tag = cipher.encrypt_and_digest(plaintext)
-        return nonce + tag + ct
+        return self._cipher.encrypt(plaintext)
 
     def decrypt_payload(self, blob: bytes) -> Optional[bytes]:
-        if not self.aes_key:
-            return blob
-        if len(blob) < 12 + 16:
+        plain = self._cipher.decrypt(blob) if self._cipher else blob
+        if plain is None or not self.compact_header:
+            return plain
+        buf = bytearray(COMPACT_SAVING) + plain
+        try:
+            return bytes(expand_header_into(buf, len(plain), self.address))
+        except ValueError:
             return None
-        nonce = blob[:12]
-        tag = blob[12:28]
-        ct = blob[28:]
-        cipher = AES.new(self.aes_key, AES.MODE_GCM, nonce=nonce)
+
+    def decrypt_payload_into(self, blob, out) -> Optional[memoryview]:
+        # Receive-path variant of decrypt_payload: no per-packet allocation
+        if not self.compact_header:
+            if not self._cipher:
+                return memoryview(blob)
+            return self._cipher.decrypt_into(blob, out)
+        # Compact frames land COMPACT_SAVING bytes in, leaving room to
+        # restore dst in place
+        out = out if isinstance(out, memoryview) else memoryview(out)
+        if self._cipher:
+            plain = self._cipher.decrypt_into(blob, out[COMPACT_SAVING:])
+            if plain is None:
+                return None
+            size = len(plain)
+        else:
+            size = len(blob)
+            out[COMPACT_SAVING:COMPACT_SAVING + size] = blob
         try:
-            pt = cipher.decrypt_and_verify(ct, tag)
-            return pt
-        except Exception:
+            return expand_header_into(out, size, self.address)
+        except ValueError:
             return None
 
-    def send_lyceum_frame(self, dst_addr: int, channel: int, lyceum_bytes: bytes):
+    def peek_sender(self, blob) -> Optional[int]:
+        # Sender address readable before decryption: the session header, or
+        # the LyceumFrame src when frames go unencrypted. Random-nonce
+        # AES-GCM frames hide it, so they return None.
+        if isinstance(self._cipher, SessionCipher):
+            return SessionCipher.peek_sender(blob)
+        if self._cipher is None and len(blob) >= 2:
+            return int.from_bytes(blob[:2], "big")
+        return None
+
+    def build_lyceum_frame(self, dst_addr: int, channel: int, lyceum_bytes: bytes) -> bytes:
         # For fixed-point mode, the first 3 bytes are destination: ADDH, ADDL, CH
         # prefix dest address and channel
         packet = self.encrypt_payload(lyceum_bytes)
         dest = dst_addr & 0xFFFF
         prefix = dest.to_bytes(2, "big") + bytes([channel & 0xFF])
-        self.e22.send_plain(prefix + packet)
+        if self.framing == "length":
+            # Length byte + packet must fit one 240-byte E22 sub-packet
+            if not 0 < len(packet) < 240:
+                raise ValueError(f"Packet of {len(packet)} bytes does not fit a sub-packet")
+            prefix += bytes([len(packet)])
+        return prefix + packet
 
-    def send_text(self, dst_addr: int, channel: int, text: str, src: int = 0x0001):
+    def text_frame(self, dst_addr: int, text: str, src: int = 0x0001) -> bytes:
         # simple Lyceum framing: src(2)+dst(2)+seq(1)+flags(1)+payload
-        hdr = src.to_bytes(2, "big") + dst_addr.to_bytes(2, "big") + bytes([self.seq & 0xFF, 0])
+        hdr = HEADER.pack(src & 0xFFFF, dst_addr & 0xFFFF, self.seq & 0xFF, 0)
         self.seq = (self.seq + 1) & 0xFF
         payload = text.encode("utf-8")
-        frame = hdr + payload
-        self.send_lyceum_frame(dst_addr, channel, frame)
+        return hdr + payload
+
+    def build_text_frame(self, dst_addr: int, channel: int, text: str, src: int = 0x0001) -> bytes:
+        return self.build_lyceum_frame(dst_addr, channel, self.text_frame(dst_addr, text, src))
+
+    # Blocking senders; async code should write build_* output to an E22Transport
+    def send_lyceum_frame(self, dst_addr: int, channel: int, lyceum_bytes: bytes):
+        self.e22.send_plain(self.build_lyceum_frame(dst_addr, channel, lyceum_bytes))
+
+    def send_text(self, dst_addr: int, channel: int, text: str, src: int = 0x0001):
+        self.e22.send_plain(self.build_text_frame(dst_addr, channel, text, src))
 
 
 if __name__ == "__main__":
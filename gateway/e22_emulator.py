@@ -0,0 +1,597 @@
+"""
+Virtual E22-900T22U modules on pseudo-terminals.
+
+Each VirtualE22 owns a pty; open its `port` (e.g. with LyceumGateway or
+E22Serial) exactly as you would /dev/ttyUSB0. Modules share an Ether, the
+simulated radio medium, which runs on a background thread:
+
+- Configuration mode speaks the C0 (write), C1 (read) and C2 (temporary
+  write) register commands and answers C1 + start + length + params, or
+  FF FF FF for a malformed command. CRYPT_H/CRYPT_L read back as zero.
+- Transmission mode cuts the UART stream into packets at an idle gap or
+  at the sub-packet size (REG1), and in fixed-point mode (REG3 bit 6)
+  takes the first three bytes as ADDH, ADDL, CH of the target.
+- Each packet occupies the channel for its LoRa time on air at the
+  sender's air data rate (lyceum.link.airtime). Receivers hear it only on
+  the same channel, air rate and NETID, when the address matches (or
+  either side is 0xFFFF) and they are not transmitting themselves; two
+  packets overlapping in time on one channel are both lost (no capture).
+- Surviving packets are dropped with the configured loss probability and
+  delivered with a simulated RSSI, appended as a byte when REG3 bit 7 is
+  set. LBT (REG3 bit 4) defers a transmission while the channel is busy.
+
+Randomness comes from a seeded generator and time_scale shrinks every
+airtime, so runs are reproducible and CI can go faster than real air.
+
+Usage (prints the port paths, runs until Ctrl-C):
+    python e22_emulator.py [--modules 2] [--fixed] [--air-rate 2]
+                           [--loss 0.0] [--rssi -60] [--time-scale 1.0]
+"""
+import heapq
+import itertools
+import os
+import random
+import selectors
+import threading
+import time
+import tty
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from e22_config import (
+    FACTORY_REGISTERS,
+    PID_ADDRESS,
+    PID_LENGTH,
+    REG_ADDH,
+    REG_ADDL,
+    REG_CHAN,
+    REG_CRYPT_H,
+    REG_CRYPT_L,
+    REG_NETID,
+    REG_REG0,
+    REG_REG1,
+    REG_REG3,
+    REGISTER_COUNT,
+    SUB_PACKET_SIZES,
+)
+from lyceum.link.airtime import e22_modulation
+
+
+MODE_TRANSMISSION = "transmission"
+MODE_CONFIGURATION = "configuration"
+
+PID = bytes(PID_LENGTH)  # Read-only product information
+BROADCAST = 0xFFFF
+UART_BUFFER = 1000  # Bytes the module accepts before dropping input
+LBT_MAX_WAIT = 2.0  # Seconds; the module sends anyway after this
+FORMAT_ERROR = b"\xff\xff\xff"
+
+
+def _rssi_byte(dbm: float) -> int:
+    # Trailer byte after a packet: dBm = -(256 - byte)
+    return max(0, min(255, round(dbm) + 256))
+
+
+def _rssi_register(dbm: float) -> int:
+    # RSSI registers (C0 C1 C2 C3 read): dBm = -value / 2
+    return max(0, min(255, round(-2 * dbm)))
+
+
+@dataclass
+class EtherStats:
+    packets: int = 0  # Packets put on air
+    delivered: int = 0  # Packet copies written to a receiver's UART
+    lost: int = 0  # Copies dropped by the loss model
+    collisions: int = 0  # Copies destroyed by an overlapping packet
+    airtime: float = 0.0  # Simulated seconds on air (before time_scale)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _Transmission:
+    sender: "VirtualE22"
+    target: int
+    channel: int
+    air_rate: int
+    netid: int
+    payload: bytes
+    start: float
+    end: float
+
+
+@dataclass
+class _Link:
+    loss: Optional[float] = None
+    rssi: Optional[float] = None
+
+
+class VirtualE22:
+    """One emulated module: a pty, a register block and a half-duplex radio."""
+
+    def __init__(
+        self,
+        ether: "Ether",
+        address: int = 0x0000,
+        channel: int = 0x12,
+        air_rate: int = 2,
+        fixed_point: bool = False,
+        rssi_byte: bool = False,
+        mode: str = MODE_TRANSMISSION,
+    ):
+        self.ether = ether
+        self.registers = bytearray(FACTORY_REGISTERS)
+        self.address = address
+        self.registers[REG_CHAN] = channel
+        self.registers[REG_REG0] = (self.registers[REG_REG0] & ~0x07) | (air_rate & 0x07)
+        self.registers[REG_REG3] |= (0x40 if fixed_point else 0) | (0x80 if rssi_byte else 0)
+        self.mode = mode
+
+        self._master, self._slave = os.openpty()
+        # Raw mode so bytes pass through the line discipline unmodified
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+
+        self._uart = bytearray()  # Transmission mode input awaiting a gap
+        self._config = bytearray()  # Configuration mode input
+        self._gap_timer = None
+        self._tx_queue: List[Tuple[int, int, bytes]] = []  # (target, channel, payload)
+        self._transmitting: Optional[_Transmission] = None
+        self.last_rssi: Optional[float] = None
+        self.tx_packets = 0
+        self.rx_packets = 0
+        self.uart_overflows = 0
+        ether._attach(self)
+
+    # --- Register views ---------------------------------------------------
+
+    @property
+    def address(self) -> int:
+        return (self.registers[REG_ADDH] << 8) | self.registers[REG_ADDL]
+
+    @address.setter
+    def address(self, value: int):
+        self.registers[REG_ADDH] = (value >> 8) & 0xFF
+        self.registers[REG_ADDL] = value & 0xFF
+
+    @property
+    def channel(self) -> int:
+        return self.registers[REG_CHAN]
+
+    @property
+    def netid(self) -> int:
+        return self.registers[REG_NETID]
+
+    @property
+    def air_rate(self) -> int:
+        return self.registers[REG_REG0] & 0x07
+
+    @property
+    def sub_packet_size(self) -> int:
+        return SUB_PACKET_SIZES[self.registers[REG_REG1] >> 6]
+
+    @property
+    def fixed_point(self) -> bool:
+        return bool(self.registers[REG_REG3] & 0x40)
+
+    @property
+    def rssi_byte(self) -> bool:
+        return bool(self.registers[REG_REG3] & 0x80)
+
+    @property
+    def lbt(self) -> bool:
+        return bool(self.registers[REG_REG3] & 0x10)
+
+    @property
+    def software_mode_switch(self) -> bool:
+        return bool(self.registers[REG_REG1] & 0x04)
+
+    @property
+    def rssi_commands(self) -> bool:
+        return bool(self.registers[REG_REG1] & 0x20)
+
+    def set_mode(self, mode: str):
+        """Drive M0/M1: MODE_TRANSMISSION or MODE_CONFIGURATION."""
+        if mode not in (MODE_TRANSMISSION, MODE_CONFIGURATION):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.ether.call(self._set_mode, mode, wait=True)
+
+    def close(self):
+        self.ether.call(self._close, wait=True)
+
+    def _close(self):
+        self.ether._detach(self)
+        if self._gap_timer is not None:
+            self._gap_timer.cancel()
+        os.close(self._slave)
+        os.close(self._master)
+
+    # --- UART (ether thread) ----------------------------------------------
+
+    def _set_mode(self, mode: str):
+        self.mode = mode
+        self._uart.clear()
+        self._config.clear()
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._master, 4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            return  # Slave side closed
+        if self.mode == MODE_CONFIGURATION:
+            self._config += data
+            self._parse_config()
+            return
+        room = UART_BUFFER - len(self._uart)
+        if len(data) > room:
+            self.uart_overflows += len(data) - room
+            data = data[:room]
+        self._uart += data
+        if self._uart[:4] == b"\xc0\xc1\xc2\xc3" and self._transmission_command():
+            return
+        if self._gap_timer is not None:
+            self._gap_timer.cancel()
+        header = 3 if self.fixed_point else 0
+        if len(self._uart) >= header + self.sub_packet_size:
+            self._packetize()
+        else:
+            self._gap_timer = self.ether.call_later(self.ether.gap_s, self._packetize, scaled=False)
+
+    def _reply(self, data: bytes):
+        try:
+            os.write(self._master, data)
+        except OSError:
+            pass
+
+    def _parse_config(self):
+        buf = self._config
+        while len(buf) >= 3:
+            if buf[:4] == b"\xc0\xc1\xc2\xc3"[:len(buf)] and self.software_mode_switch:
+                # Software switch back to transmission mode
+                if len(buf) < 6:
+                    return
+                arg = buf[5]
+                del buf[:6]
+                self._reply(bytes([0xC1, 0xC2, 0xC3, 0x02, arg]))
+                self._set_mode(MODE_CONFIGURATION if arg == 0x01 else MODE_TRANSMISSION)
+                return
+            cmd, start, length = buf[0], buf[1], buf[2]
+            if cmd in (0xC0, 0xC2):
+                if len(buf) < 3 + length:
+                    return
+                params = bytes(buf[3:3 + length])
+                del buf[:3 + length]
+                if start + length > REGISTER_COUNT or length == 0:
+                    self._reply(FORMAT_ERROR)
+                    continue
+                self.registers[start:start + length] = params
+                self._reply(bytes([0xC1, start, length]) + params)
+            elif cmd == 0xC1:
+                del buf[:3]
+                if start >= PID_ADDRESS and start + length <= PID_ADDRESS + PID_LENGTH and length:
+                    params = PID[start - PID_ADDRESS:start - PID_ADDRESS + length]
+                elif start + length <= REGISTER_COUNT and length:
+                    params = bytearray(self.registers[start:start + length])
+                    # CRYPT_H/CRYPT_L are write-only
+                    for reg in (REG_CRYPT_H, REG_CRYPT_L):
+                        if start <= reg < start + length:
+                            params[reg - start] = 0
+                    params = bytes(params)
+                else:
+                    self._reply(FORMAT_ERROR)
+                    continue
+                self._reply(bytes([0xC1, start, length]) + params)
+            else:
+                del buf[:1]
+                self._reply(FORMAT_ERROR)
+
+    def _transmission_command(self) -> bool:
+        # C0 C1 C2 C3 commands accepted in transmission mode (REG1 bits 5, 2)
+        buf = self._uart
+        if len(buf) < 6:
+            return True  # Wait for the rest
+        op, arg = buf[4], buf[5]
+        if op == 0x02 and self.software_mode_switch:
+            del buf[:6]
+            mode = MODE_CONFIGURATION if arg == 0x01 else MODE_TRANSMISSION
+            self._reply(bytes([0xC1, 0xC2, 0xC3, 0x02, arg]))
+            self._set_mode(mode)
+            return True
+        if op == 0x00 and self.rssi_commands and arg <= 2:
+            del buf[:6]
+            noise = self.ether.noise_dbm
+            last = self.last_rssi if self.last_rssi is not None else noise
+            values = bytes([_rssi_register(noise), _rssi_register(last)])[:arg]
+            self._reply(bytes([0xC1, 0x00, arg]) + values)
+            return True
+        return False  # Ordinary data that happens to start with C0
+
+    def _packetize(self):
+        self._gap_timer = None
+        data = bytes(self._uart)
+        self._uart.clear()
+        if self.fixed_point:
+            if len(data) <= 3:
+                return
+            target = (data[0] << 8) | data[1]
+            channel = data[2]
+            data = data[3:]
+        else:
+            target, channel = self.address, self.channel
+        size = self.sub_packet_size
+        for i in range(0, len(data), size):
+            self._tx_queue.append((target, channel, data[i:i + size]))
+        self._start_tx()
+
+    # --- Radio (ether thread) ---------------------------------------------
+
+    def _start_tx(self, waited: float = 0.0):
+        if self._transmitting is not None or not self._tx_queue:
+            return
+        target, channel, payload = self._tx_queue[0]
+        if self.lbt and waited < LBT_MAX_WAIT:
+            busy_until = self.ether._busy_until(channel)
+            if busy_until is not None:
+                wait = busy_until - self.ether.now()
+                self.ether.call_later(
+                    wait, lambda: self._start_tx(waited + wait), scaled=False
+                )
+                return
+        self._tx_queue.pop(0)
+        self._transmitting = self.ether._transmit(self, target, channel, payload)
+        self.tx_packets += 1
+
+    def _tx_done(self):
+        self._transmitting = None
+        self._start_tx()
+
+    def _hears(self, tx: _Transmission) -> bool:
+        if tx.sender is self or self.mode != MODE_TRANSMISSION:
+            return False
+        if (self.channel, self.air_rate, self.netid) != (tx.channel, tx.air_rate, tx.netid):
+            return False
+        return tx.target == BROADCAST or self.address in (tx.target, BROADCAST)
+
+    def _receive(self, payload: bytes, rssi: float):
+        self.last_rssi = rssi
+        self.rx_packets += 1
+        self._reply(payload + (bytes([_rssi_byte(rssi)]) if self.rssi_byte else b""))
+
+
+class Ether:
+    """
+    The shared radio medium for a set of VirtualE22 modules.
+
+    loss and rssi are defaults for every pair of modules; set_link()
+    overrides them for one direction. Use as a context manager, or call
+    start() and stop().
+    """
+
+    def __init__(
+        self,
+        loss: float = 0.0,
+        rssi: float = -60.0,
+        rssi_jitter: float = 0.0,
+        noise_dbm: float = -110.0,
+        time_scale: float = 1.0,
+        gap_s: float = 0.005,
+        seed: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loss = loss
+        self.rssi = rssi
+        self.rssi_jitter = rssi_jitter
+        self.noise_dbm = noise_dbm
+        self.time_scale = time_scale
+        # UART idle time that ends a packet (real seconds, not scaled)
+        self.gap_s = gap_s
+        self.rng = random.Random(seed)
+        self.now = clock
+        self.stats = EtherStats()
+        self.modules: List[VirtualE22] = []
+        self._links: Dict[Tuple[int, int], _Link] = {}
+        self._on_air: List[_Transmission] = []
+        self._timers: list = []  # Heap of (when, order, _Timer)
+        self._order = itertools.count()
+        self._calls: list = []
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def module(self, **settings) -> VirtualE22:
+        """Create a module on this medium (see VirtualE22 for settings)."""
+        return VirtualE22(self, **settings)
+
+    def set_link(self, sender: VirtualE22, receiver: VirtualE22, loss: float = None, rssi: float = None):
+        """Override loss and/or RSSI from one module to another."""
+        self._links[(id(sender), id(receiver))] = _Link(loss, rssi)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="e22-ether", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join()
+        for module in list(self.modules):
+            module.close()
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def __enter__(self) -> "Ether":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def call(self, fn, *args, wait: bool = False):
+        """Run fn(*args) on the ether thread (module state lives there)."""
+        if not self._running or threading.current_thread() is self._thread:
+            fn(*args)
+            return
+        done = threading.Event() if wait else None
+        with self._lock:
+            self._calls.append((fn, args, done))
+        self._wake()
+        if done is not None:
+            done.wait()
+
+    def call_later(self, delay: float, fn, scaled: bool = True) -> "_Timer":
+        # Ether thread only; scaled delays are simulated (air) seconds
+        timer = _Timer(fn)
+        when = self.now() + max(0.0, delay) * (self.time_scale if scaled else 1.0)
+        heapq.heappush(self._timers, (when, next(self._order), timer))
+        return timer
+
+    def _wake(self):
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def _attach(self, module: VirtualE22):
+        def register():
+            self.modules.append(module)
+            self._selector.register(module._master, selectors.EVENT_READ, module)
+        self.call(register)
+
+    def _detach(self, module: VirtualE22):
+        if module in self.modules:
+            self.modules.remove(module)
+            try:
+                self._selector.unregister(module._master)
+            except (KeyError, ValueError):
+                pass
+
+    def _run(self):
+        while self._running:
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, self._timers[0][0] - self.now())
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                else:
+                    key.data._on_readable()
+            with self._lock:
+                calls, self._calls = self._calls, []
+            for fn, args, done in calls:
+                fn(*args)
+                if done is not None:
+                    done.set()
+            now = self.now()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, timer = heapq.heappop(self._timers)
+                if not timer.cancelled:
+                    timer.fn()
+
+    # --- Medium -----------------------------------------------------------
+
+    def _busy_until(self, channel: int) -> Optional[float]:
+        now = self.now()
+        ends = [tx.end for tx in self._on_air if tx.channel == channel and tx.start <= now < tx.end]
+        return max(ends) if ends else None
+
+    def _transmit(self, sender: VirtualE22, target: int, channel: int, payload: bytes) -> _Transmission:
+        airtime = e22_modulation(sender.air_rate).time_on_air(len(payload))
+        start = self.now()
+        tx = _Transmission(
+            sender, target, channel, sender.air_rate, sender.netid, payload,
+            start, start + airtime * self.time_scale,
+        )
+        self._on_air.append(tx)
+        self.stats.packets += 1
+        self.stats.airtime += airtime
+        self.call_later(airtime, lambda: self._tx_end(tx))
+        return tx
+
+    def _tx_end(self, tx: _Transmission):
+        overlapping = [
+            other for other in self._on_air
+            if other is not tx and other.channel == tx.channel
+            and other.start < tx.end and other.end > tx.start
+        ]
+        for module in self.modules:
+            if not module._hears(tx):
+                continue
+            busy = module._transmitting
+            if busy is not None and busy.start < tx.end and busy.end > tx.start:
+                continue  # Half duplex: deaf while transmitting
+            if overlapping:
+                self.stats.collisions += 1
+                continue
+            link = self._links.get((id(tx.sender), id(module)), _Link())
+            loss = self.loss if link.loss is None else link.loss
+            if self.rng.random() < loss:
+                self.stats.lost += 1
+                continue
+            rssi = self.rssi if link.rssi is None else link.rssi
+            if self.rssi_jitter:
+                rssi += self.rng.gauss(0.0, self.rssi_jitter)
+            self.stats.delivered += 1
+            module._receive(tx.payload, rssi)
+        # Forget transmissions that ended before anything still on air began
+        horizon = min((t.start for t in self._on_air if t.end > tx.end), default=tx.end)
+        self._on_air = [t for t in self._on_air if t.end > horizon]
+        tx.sender._tx_done()
+
+
+class _Timer:
+    __slots__ = ("fn", "cancelled")
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--modules", type=int, default=2)
+    p.add_argument("--fixed", action="store_true", help="Fixed-point transmission (REG3 bit 6)")
+    p.add_argument("--rssi-byte", action="store_true", help="Append an RSSI byte (REG3 bit 7)")
+    p.add_argument("--channel", type=int, default=4)
+    p.add_argument("--air-rate", type=int, default=2)
+    p.add_argument("--loss", type=float, default=0.0)
+    p.add_argument("--rssi", type=float, default=-60.0)
+    p.add_argument("--time-scale", type=float, default=1.0)
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+
+    with Ether(loss=args.loss, rssi=args.rssi, time_scale=args.time_scale, seed=args.seed) as ether:
+        for i in range(args.modules):
+            m = ether.module(
+                address=i + 1,
+                channel=args.channel,
+                air_rate=args.air_rate,
+                fixed_point=args.fixed,
+                rssi_byte=args.rssi_byte,
+            )
+            print(f"module 0x{m.address:04X}: {m.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(ether.stats.to_dict())
@@ -0,0 +1,191 @@
+"""
+Event-driven asyncio transport for the E22 serial port.
+
+The serial file descriptor is watched by the event loop (add_reader) instead
+of a thread blocking in pyserial's read timeout, so received bytes are handed
+on as soon as the UART delivers them. The transport is the single owner of
+the port: writes are queued and flushed from the loop (add_writer on a full
+kernel buffer), and configuration request/response exchanges (C0/C1) hold
+the receive side until their reply arrives, so TX and RX never race.
+
+If the port goes away (EOF, or EIO when a USB adapter is unplugged) the
+transport unregisters itself, fails anything waiting on it and reports
+the error to on_close; it does not reopen the port.
+
+POSIX only (pyserial opens the port with O_NONBLOCK, which this relies on).
+"""
+import asyncio
+import logging
+import os
+from typing import Callable, Optional
+
+from lyceum.crypto import BufferPool
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class E22Transport:
+    def __init__(
+        self,
+        fd: int,
+        on_data: Callable[[memoryview], None],
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        read_size: int = 512,
+        on_close: Optional[Callable[[Optional[Exception]], None]] = None,
+    ):
+        # on_data gets a view into a reused buffer, valid only during the call;
+        # on_close(exc) runs once if the port fails (exc is None on EOF)
+        self.fd = fd
+        self.on_data = on_data
+        self.on_close = on_close
+        self.loop = loop or asyncio.get_event_loop()
+        self._rx = BufferPool(size=read_size, count=1)
+        self._tx = bytearray()
+        self._writing = False
+        self._drained: Optional[asyncio.Event] = None
+        self._request: Optional[asyncio.Future] = None
+        self._reply = bytearray()
+        self._reply_len = 0
+        self._lock = asyncio.Lock()
+        self.running = False
+        self.error: Optional[Exception] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @classmethod
+    def from_serial(cls, e22, on_data, loop=None, on_close=None) -> "E22Transport":
+        # e22 is an E22Serial (or anything exposing .s.fileno())
+        return cls(e22.s.fileno(), on_data, loop=loop, on_close=on_close)
+
+    def start(self):
+        os.set_blocking(self.fd, False)
+        self.loop.add_reader(self.fd, self._on_readable)
+        self.running = True
+
+    def stop(self):
+        if not self.running:
+            return
+        self.loop.remove_reader(self.fd)
+        if self._writing:
+            self.loop.remove_writer(self.fd)
+            self._writing = False
+        self.running = False
+        # Wake waiters: request() returns None, drain() raises if bytes remain
+        if self._request is not None and not self._request.done():
+            self._request.set_result(None)
+        if self._drained is not None:
+            self._drained.set()
+
+    def _lost(self, exc: Optional[Exception]):
+        # The port failed under us: stop before the loop calls back again
+        if not self.running:
+            return
+        _LOGGER.error("Serial port fd %d lost: %s", self.fd, exc or "end of file")
+        self.error = exc
+        self.stop()
+        if self.on_close is not None:
+            self.on_close(exc)
+
+    # --- RX -------------------------------------------------------------
+
+    def _on_readable(self):
+        buf = self._rx.acquire()
+        try:
+            try:
+                n = os.readv(self.fd, [buf])
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                self._lost(exc)
+                return
+            if n == 0:
+                self._lost(None)
+                return
+            self.bytes_in += n
+            data = buf[:n]
+            if self._request is not None:
+                data = self._feed_reply(data)
+            if data:
+                self.on_data(data)
+        finally:
+            self._rx.release(buf)
+
+    def _feed_reply(self, data: memoryview) -> memoryview:
+        # Consume bytes belonging to a pending config reply; return the rest
+        take = min(len(data), self._reply_len - len(self._reply))
+        self._reply += data[:take]
+        if len(self._reply) >= self._reply_len and not self._request.done():
+            self._request.set_result(bytes(self._reply))
+            self._request = None
+        return data[take:]
+
+    # --- TX -------------------------------------------------------------
+
+    def write(self, data: bytes):
+        # Queue bytes for transmission; never blocks the loop
+        if not self.running:
+            raise ConnectionError("Serial transport is stopped")
+        self._tx += data
+        if self._drained is not None:
+            self._drained.clear()
+        if not self._writing:
+            self._flush()
+
+    def _flush(self):
+        while self._tx:
+            try:
+                n = os.write(self.fd, self._tx)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self._lost(exc)
+                return
+            self.bytes_out += n
+            del self._tx[:n]
+        if self._tx and not self._writing:
+            self.loop.add_writer(self.fd, self._flush)
+            self._writing = True
+        elif not self._tx:
+            if self._writing:
+                self.loop.remove_writer(self.fd)
+                self._writing = False
+            if self._drained is not None:
+                self._drained.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._tx)
+
+    async def drain(self):
+        # Wait until every queued byte has been handed to the kernel.
+        # Raises ConnectionError if the transport stops first.
+        if not self._tx:
+            return
+        if self.running:
+            if self._drained is None:
+                self._drained = asyncio.Event()
+            self._drained.clear()
+            await self._drained.wait()
+        if self._tx:
+            raise ConnectionError(f"Serial transport stopped with {len(self._tx)} bytes unsent")
+
+    # --- Request/response (configuration mode) ---------------------------
+
+    async def request(self, cmd: bytes, reply_len: int, timeout: float = 1.0) -> Optional[bytes]:
+        # Send a command and collect exactly reply_len bytes of response.
+        # Requests are serialised; frames arriving meanwhile go to the reply.
+        # Returns None on timeout or once the transport has stopped.
+        async with self._lock:
+            if not self.running:
+                return None
+            self._request = self.loop.create_future()
+            self._reply = bytearray()
+            self._reply_len = reply_len
+            future = self._request
+            self.write(cmd)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._request = None
@@ -19,7 +19,7 @@ from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 
 from .const import (
     DOMAIN,
@@ -29,11 +29,41 @@ from .const import (
     CONF_GUARDIAN_MEMORY_LIMIT,
     CONF_GUARDIAN_SYMBOLONS,
     CONF_GUARDIAN_EARN_TOKENS,
+    CONF_BACKBONE_MODE,
+    CONF_RELAY_URL,
+    CONF_RX_WORKERS,
+    CONF_FRAMING,
+    CONF_AIR_RATE,
+    CONF_DUTY_CYCLE,
+    CONF_AGGREGATE_LINGER,
+    CONF_COMPACT_HEADER,
+    CONF_ADAPTIVE_RATE,
+    CONF_EXTRA_RADIOS,
+    CONF_STATE_INTERVAL,
+    CONF_EVENT_SUMMARY,
+    CONF_HISTORY_SIZE,
+    CONF_CUSTODY_TTL,
+    CONF_CUSTODY_CAPACITY,
     DEFAULT_GUARDIAN_CPU,
     DEFAULT_GUARDIAN_MEMORY,
+    DEFAULT_RELAY_URL,
+    DEFAULT_RX_WORKERS,
+    DEFAULT_FRAMING,
+    DEFAULT_AIR_RATE,
+    DEFAULT_DUTY_CYCLE,
+    DEFAULT_AGGREGATE_LINGER,
+    DEFAULT_COMPACT_HEADER,
+    DEFAULT_ADAPTIVE_RATE,
+    DEFAULT_EXTRA_RADIOS,
+    DEFAULT_STATE_INTERVAL,
+    DEFAULT_EVENT_SUMMARY,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_CUSTODY_TTL,
+    DEFAULT_CUSTODY_CAPACITY,
     EVENT_JOB_COMPLETED,
 )
 from .gateway import LyceumGatewayDevice
+from .radio import parse_radios
 from .guardian import GuardianDaemon, GuardianConfig, ResourceLimits
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,6 +82,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         channel=entry.data.get("channel", 4),
         aes_key=bytes.fromhex(entry.data["aes_key"]) if entry.data.get("aes_key") else None,
         node_id=entry.data.get("node_id", "!ha_gateway"),
+        rx_workers=entry.data.get(CONF_RX_WORKERS, DEFAULT_RX_WORKERS),
+        framing=entry.data.get(CONF_FRAMING, DEFAULT_FRAMING),
+        air_rate=entry.data.get(CONF_AIR_RATE, DEFAULT_AIR_RATE),
+        duty_cycle=entry.data.get(CONF_DUTY_CYCLE, DEFAULT_DUTY_CYCLE) / 100.0,
+        aggregate_linger=entry.data.get(CONF_AGGREGATE_LINGER, DEFAULT_AGGREGATE_LINGER) / 1000.0,
+        compact_header=entry.data.get(CONF_COMPACT_HEADER, DEFAULT_COMPACT_HEADER),
+        adaptive_rate=entry.data.get(CONF_ADAPTIVE_RATE, DEFAULT_ADAPTIVE_RATE),
+        extra_radios=parse_radios(entry.data.get(CONF_EXTRA_RADIOS, DEFAULT_EXTRA_RADIOS)),
+        state_interval=entry.data.get(CONF_STATE_INTERVAL, DEFAULT_STATE_INTERVAL) / 1000.0,
+        event_summary=entry.data.get(CONF_EVENT_SUMMARY, DEFAULT_EVENT_SUMMARY),
+        history_size=entry.data.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+        custody_ttl=entry.data.get(CONF_CUSTODY_TTL, DEFAULT_CUSTODY_TTL) * 3600.0,
+        custody_capacity=entry.data.get(CONF_CUSTODY_CAPACITY, DEFAULT_CUSTODY_CAPACITY),
+        backbone_mode=entry.data.get(CONF_BACKBONE_MODE, False),
+        relay_url=entry.data.get(CONF_RELAY_URL, DEFAULT_RELAY_URL),
     )
     
     # Start the gateway
@@ -110,16 +155,34 @@ async def async_setup_services(
         """Handle the send_message service call."""
         destination = call.data.get("destination", 0xFFFF)
         message = call.data["message"]
-        channel = call.data.get("channel", gateway.channel)
+        # No channel: the destination's, or the least busy radio's
+        channel = call.data.get("channel")
+        priority = call.data.get("priority", "relay")
+        reliable = call.data.get("reliable", False)
+        # Held and retried until delivered when the destination is out of range
+        store_and_forward = call.data.get("store_and_forward", False)
         
-        await gateway.async_send_message(destination, channel, message)
+        await gateway.async_send_message(
+            destination, channel, message, priority, reliable, store_and_forward
+        )
         _LOGGER.info("Sent Lyceum message to %s: %s", hex(destination), message[:50])
     
+    async def handle_message_history(call: ServiceCall) -> ServiceResponse:
+        """Return the last N messages, optionally for one sender or channel."""
+        sender = call.data.get("sender")
+        return {
+            "messages": gateway.message_history(
+                count=call.data.get("count", 20),
+                sender=int(sender, 16) if sender else None,
+                channel=call.data.get("channel"),
+            )
+        }
+    
     async def handle_relay_to_internet(call) -> None:
         """Handle relay_to_internet service for backbone mode."""
         message = call.data["message"]
-        relay_url = call.data.get("relay_url", "https://relay.lyceum.example.org")
-        await gateway.async_relay_to_internet(message, relay_url)
+        # No relay_url: the one configured for backbone mode
+        await gateway.async_relay_to_internet(message, call.data.get("relay_url"))
     
     async def handle_guardian_stats(call) -> dict:
         """Get Guardian statistics."""
@@ -143,6 +206,12 @@ async def async_setup_services(
         await guardian._symbolon_runtime.stop_symbolon(name)
     
     hass.services.async_register(DOMAIN, "send_message", handle_send_message)
+    hass.services.async_register(
+        DOMAIN,
+        "message_history",
+        handle_message_history,
+        supports_response=SupportsResponse.ONLY,
+    )
     hass.services.async_register(DOMAIN, "relay_to_internet", handle_relay_to_internet)
     hass.services.async_register(DOMAIN, "guardian_stats", handle_guardian_stats)
     hass.services.async_register(DOMAIN, "start_symbolon", handle_start_symbolon)
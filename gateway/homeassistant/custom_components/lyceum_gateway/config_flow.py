@@ -19,10 +19,38 @@ from .const import (
     CONF_NODE_ID,
     CONF_BACKBONE_MODE,
     CONF_RELAY_URL,
+    CONF_RX_WORKERS,
+    CONF_FRAMING,
+    CONF_AIR_RATE,
+    CONF_DUTY_CYCLE,
+    CONF_AGGREGATE_LINGER,
+    CONF_COMPACT_HEADER,
+    CONF_ADAPTIVE_RATE,
+    CONF_EXTRA_RADIOS,
+    CONF_STATE_INTERVAL,
+    CONF_EVENT_SUMMARY,
+    CONF_HISTORY_SIZE,
+    CONF_CUSTODY_TTL,
+    CONF_CUSTODY_CAPACITY,
     DEFAULT_CHANNEL,
     DEFAULT_NODE_ID,
     DEFAULT_RELAY_URL,
+    DEFAULT_RX_WORKERS,
+    DEFAULT_FRAMING,
+    DEFAULT_AIR_RATE,
+    DEFAULT_DUTY_CYCLE,
+    DEFAULT_AGGREGATE_LINGER,
+    DEFAULT_COMPACT_HEADER,
+    DEFAULT_ADAPTIVE_RATE,
+    DEFAULT_EXTRA_RADIOS,
+    DEFAULT_STATE_INTERVAL,
+    DEFAULT_EVENT_SUMMARY,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_CUSTODY_TTL,
+    DEFAULT_CUSTODY_CAPACITY,
+    FRAMING_MODES,
 )
+from .radio import parse_radios
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +92,19 @@ class LyceumGatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 except ValueError:
                     errors[CONF_AES_KEY] = "invalid_hex"
             
+            # Encrypted frames hide the sender the worker shards key on
+            if user_input.get(CONF_AES_KEY) and user_input.get(CONF_RX_WORKERS, 0) > 1:
+                errors[CONF_RX_WORKERS] = "workers_need_sender"
+            
+            # Validate additional radios: known ports, each used once
+            try:
+                extra = parse_radios(user_input.get(CONF_EXTRA_RADIOS, ""))
+                used = [user_input[CONF_PORT]] + [port for port, _ in extra]
+                if any(port not in ports for port in used) or len(set(used)) != len(used):
+                    errors[CONF_EXTRA_RADIOS] = "invalid_radios"
+            except ValueError:
+                errors[CONF_EXTRA_RADIOS] = "invalid_radios"
+            
             if not errors:
                 # Create unique ID from port
                 await self.async_set_unique_id(user_input[CONF_PORT])
@@ -84,6 +125,37 @@ class LyceumGatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_AES_KEY): str,
             vol.Optional(CONF_BACKBONE_MODE, default=False): bool,
             vol.Optional(CONF_RELAY_URL, default=DEFAULT_RELAY_URL): str,
+            vol.Optional(CONF_RX_WORKERS, default=DEFAULT_RX_WORKERS): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=8)
+            ),
+            vol.Optional(CONF_FRAMING, default=DEFAULT_FRAMING): vol.In(FRAMING_MODES),
+            vol.Optional(CONF_AIR_RATE, default=DEFAULT_AIR_RATE): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=7)
+            ),
+            vol.Optional(CONF_DUTY_CYCLE, default=DEFAULT_DUTY_CYCLE): vol.All(
+                vol.Coerce(float), vol.Range(min=0.1, max=100)
+            ),
+            vol.Optional(CONF_AGGREGATE_LINGER, default=DEFAULT_AGGREGATE_LINGER): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=2000)
+            ),
+            vol.Optional(CONF_COMPACT_HEADER, default=DEFAULT_COMPACT_HEADER): bool,
+            vol.Optional(CONF_ADAPTIVE_RATE, default=DEFAULT_ADAPTIVE_RATE): bool,
+            vol.Optional(CONF_EXTRA_RADIOS, default=DEFAULT_EXTRA_RADIOS): str,
+            vol.Optional(CONF_STATE_INTERVAL, default=DEFAULT_STATE_INTERVAL): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=60000)
+            ),
+            vol.Optional(CONF_EVENT_SUMMARY, default=DEFAULT_EVENT_SUMMARY): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=3600)
+            ),
+            vol.Optional(CONF_HISTORY_SIZE, default=DEFAULT_HISTORY_SIZE): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100000)
+            ),
+            vol.Optional(CONF_CUSTODY_TTL, default=DEFAULT_CUSTODY_TTL): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=720)
+            ),
+            vol.Optional(CONF_CUSTODY_CAPACITY, default=DEFAULT_CUSTODY_CAPACITY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=1000)
+            ),
         })
 
         return self.async_show_form(
@@ -9,6 +9,19 @@ CONF_AES_KEY = "aes_key"
 CONF_NODE_ID = "node_id"
 CONF_BACKBONE_MODE = "backbone_mode"
 CONF_RELAY_URL = "relay_url"
+CONF_RX_WORKERS = "rx_workers"
+CONF_FRAMING = "framing"
+CONF_AIR_RATE = "air_rate"
+CONF_DUTY_CYCLE = "duty_cycle"
+CONF_AGGREGATE_LINGER = "aggregate_linger"
+CONF_COMPACT_HEADER = "compact_header"
+CONF_ADAPTIVE_RATE = "adaptive_rate"
+CONF_EXTRA_RADIOS = "extra_radios"
+CONF_STATE_INTERVAL = "state_interval"
+CONF_EVENT_SUMMARY = "event_summary"
+CONF_HISTORY_SIZE = "history_size"
+CONF_CUSTODY_TTL = "custody_ttl"
+CONF_CUSTODY_CAPACITY = "custody_capacity"
 
 # Guardian config keys
 CONF_GUARDIAN_ENABLED = "guardian_enabled"
@@ -22,9 +35,30 @@ CONF_GUARDIAN_EARN_TOKENS = "guardian_earn_tokens"
 DEFAULT_CHANNEL = 4
 DEFAULT_NODE_ID = "!ha_gateway"
 DEFAULT_RELAY_URL = "https://relay.lyceum.example.org"
+DEFAULT_RX_WORKERS = 0  # 0 = decrypt and parse inline on the event loop
+DEFAULT_FRAMING = "length"
+DEFAULT_AIR_RATE = 2  # E22 REG0 code: 2.4k (factory default)
+DEFAULT_DUTY_CYCLE = 10  # Percent of airtime per channel
+DEFAULT_AGGREGATE_LINGER = 50  # ms; 0 = one frame per message
+DEFAULT_COMPACT_HEADER = False  # Every node on the channel must match
+DEFAULT_ADAPTIVE_RATE = False  # Needs REG1 software mode switch on the module
+DEFAULT_EXTRA_RADIOS = ""  # "port:channel, ..." for more E22 modules
+DEFAULT_STATE_INTERVAL = 1000  # ms between sensor state writes; 0 = every message
+DEFAULT_EVENT_SUMMARY = 0  # s per summary event; 0 = one event per message
+DEFAULT_HISTORY_SIZE = 500  # Messages kept in memory for message_history; 0 = off
+DEFAULT_CUSTODY_TTL = 24  # Hours a store-and-forward message is kept; 0 = off
+DEFAULT_CUSTODY_CAPACITY = 20  # Store-and-forward messages held per destination
+
+# Packet delimiting on the E22 UART stream (see lyceum.link.framing)
+FRAMING_MODES = ["length", "gap"]
 DEFAULT_GUARDIAN_CPU = 25
 DEFAULT_GUARDIAN_MEMORY = 512
 
+# Transmit priority classes (see lyceum.link.scheduler.Priority)
+TX_PRIORITIES = ["discovery", "debate", "relay", "telemetry"]
+# Classes whose small messages may wait to share a frame (lyceum.link.aggregate)
+AGGREGATE_PRIORITIES = ["relay", "telemetry"]
+
 # Guardian skills
 SKILL_RELAY = "relay"
 SKILL_REFLEX_STT = "reflex_stt"
@@ -37,6 +71,8 @@ ALL_SKILLS = [SKILL_RELAY, SKILL_REFLEX_STT, SKILL_REFLEX_TTS, SKILL_CORTEX, SKI
 # Event types
 EVENT_MESSAGE_RECEIVED = f"{DOMAIN}_message_received"
 EVENT_MESSAGE_SENT = f"{DOMAIN}_message_sent"
+EVENT_MESSAGE_SUMMARY = f"{DOMAIN}_message_summary"
+EVENT_MESSAGE_DELIVERED = f"{DOMAIN}_message_delivered"
 EVENT_JOB_COMPLETED = f"{DOMAIN}_job_completed"
 
 # Sensor attributes
@@ -45,5 +81,8 @@ ATTR_SNR = "snr"
 ATTR_SENDER = "sender"
 ATTR_CHANNEL = "channel"
 ATTR_TIMESTAMP = "timestamp"
+ATTR_PRIORITY = "priority"
+ATTR_RELIABLE = "reliable"
+ATTR_STORE_AND_FORWARD = "store_and_forward"
 ATTR_TOKENS_EARNED = "tokens_earned"
 ATTR_JOBS_COMPLETED = "jobs_completed"
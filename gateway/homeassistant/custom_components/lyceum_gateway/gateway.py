@@ -2,33 +2,60 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+import hashlib
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Sequence
 
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import aiohttp
 
 from .const import (
     DOMAIN,
     EVENT_MESSAGE_RECEIVED,
     EVENT_MESSAGE_SENT,
+    EVENT_MESSAGE_SUMMARY,
+    EVENT_MESSAGE_DELIVERED,
+    DEFAULT_RELAY_URL,
     ATTR_RSSI,
     ATTR_SNR,
     ATTR_SENDER,
     ATTR_CHANNEL,
     ATTR_TIMESTAMP,
+    ATTR_PRIORITY,
+    ATTR_RELIABLE,
+    ATTR_STORE_AND_FORWARD,
+    TX_PRIORITIES,
+    AGGREGATE_PRIORITIES,
 )
+from .radio import LyceumRadio
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _node_address(node_id: str) -> int:
+    """16-bit LoRa address from a hex node ID ("!a1b2"); 0x0001 otherwise."""
+    try:
+        return int(node_id.lstrip("!"), 16) & 0xFFFF
+    except ValueError:
+        return 0x0001
+
+
 class LyceumGatewayDevice:
     """
     Wrapper for the E22 LoRa gateway device.
     
-    Runs in a background thread/task and pushes events to HA
-    when messages are received.
+    Each E22 (the one on `port`, plus any `extra_radios`, each on its own
+    channel) is a LyceumRadio whose serial port is owned by an E22Transport
+    on the HA event loop, which pushes events to HA as soon as messages
+    are received. With several radios, outbound frames are spread by
+    channel occupancy (RadioBalancer) and received packets are merged
+    into one ordered stream (RxMerger). Encryption, ARQ, FEC and ADR are
+    shared; ADR retunes the first radio only.
     """
 
     def __init__(
@@ -38,16 +65,71 @@ class LyceumGatewayDevice:
         channel: int = 4,
         aes_key: Optional[bytes] = None,
         node_id: str = "!ha_gateway",
+        rx_workers: int = 0,
+        framing: str = "length",
+        air_rate: int = 2,
+        duty_cycle: float = 0.1,
+        aggregate_linger: float = 0.05,
+        compact_header: bool = False,
+        adaptive_rate: bool = False,
+        extra_radios: Sequence[tuple[str, int]] = (),
+        state_interval: float = 1.0,
+        event_summary: float = 0.0,
+        history_size: int = 500,
+        custody_ttl: float = 86400.0,
+        custody_capacity: int = 20,
+        backbone_mode: bool = False,
+        relay_url: str = DEFAULT_RELAY_URL,
     ):
         self.hass = hass
         self.port = port
         self.channel = channel
         self.aes_key = aes_key
         self.node_id = node_id
+        self.rx_workers = rx_workers
+        self.framing = framing
+        self.air_rate = air_rate
+        self.duty_cycle = duty_cycle
+        self.aggregate_linger = aggregate_linger
+        self.compact_header = compact_header
+        self.adaptive_rate = adaptive_rate
+        self.extra_radios = list(extra_radios)  # (port, channel) pairs
+        self.state_interval = state_interval
+        self.event_summary = event_summary
+        self.history_size = history_size
+        self.custody_ttl = custody_ttl
+        self.custody_capacity = custody_capacity
+        self.backbone_mode = backbone_mode
+        self.relay_url = relay_url
+        # Our LoRa address, used as the frame source
+        self.address = _node_address(node_id)
         
         self._gateway = None
+        self._frame_view = None  # lyceum_proto.LyceumFrameView, once importable
+        # One LyceumRadio per module; the first is the one on `port`
+        self.radios: list[LyceumRadio] = []
+        self.balancer = None
+        self.merger = None
+        self._merge_handle: Optional[asyncio.TimerHandle] = None
+        # Small-message coalescing ahead of the scheduler (linger > 0)
+        self.aggregator = None
+        self._linger_handle: Optional[asyncio.TimerHandle] = None
+        self._aggregate = None  # lyceum.link.aggregate, once importable
+        self._arq = None  # lyceum.link.arq, once importable
+        # Selective-repeat ARQ for reliable sends (and ACKs to peers'),
+        # FEC for messages too long for one frame
+        self.arq = None
+        self.fec = None
+        self._fec = None  # lyceum.link.fec, once importable
+        self._routes: dict[int, tuple] = {}  # Peer -> (channel, priority)
+        # Adaptive data rate (adaptive_rate), fed with per-packet RSSI and
+        # ARQ delivery outcomes
+        self.adr = None
+        self._adr = None  # lyceum.link.adr, once importable
+        self._arq_seen = (0, 0, 0)  # acked, acked bytes, retransmits already fed to ADR
+        self._config_lock = asyncio.Lock()
+        self._retransmit_handle: Optional[asyncio.TimerHandle] = None
         self._running = False
-        self._task: Optional[asyncio.Task] = None
         
         # State
         self.last_message: Optional[str] = None
@@ -55,6 +137,30 @@ class LyceumGatewayDevice:
         self.last_snr: float = 0.0
         self.message_count: int = 0
         self._callbacks: list[Callable] = []
+        # Sensor writes at most every state_interval; message events folded
+        # into one summary per event_summary seconds (when > 0)
+        self.state_throttle = None
+        self._state_handle: Optional[asyncio.TimerHandle] = None
+        self.summarizer = None
+        self._summary_handle: Optional[asyncio.TimerHandle] = None
+        # Recent received/sent messages, fixed memory (history_size > 0)
+        self.history = None
+        self._history = None  # lyceum.history, once importable
+        # Batched, spooled internet relay clients, one per relay URL; the
+        # configured one is `relay` (started with backbone_mode)
+        self._relays: dict[str, Any] = {}
+        # Store-and-forward custody (custody_ttl > 0): messages held in
+        # SQLite and retried over ARQ when their destination is heard
+        self.custody = None
+        self._custody_inflight: dict[tuple[int, bytes], deque] = {}  # (dst, payload) -> entry ids
+        self._custody_handle: Optional[asyncio.TimerHandle] = None
+        self._custody_saving: Optional[asyncio.Task] = None
+        self._relay_lock = asyncio.Lock()
+
+        # Reusable receive buffers (created once the gateway lib is importable)
+        self._rx_pool = None
+        # Optional off-loop decrypt/parse stage (rx_workers > 0)
+        self.worker_pool = None
 
     async def async_start(self) -> None:
         """Start the gateway listener."""
@@ -70,29 +176,188 @@ class LyceumGatewayDevice:
             sys.path.insert(0, gateway_path)
         
         try:
-            from e22_driver import LyceumGateway
+            from e22_driver import E22Serial, LyceumGateway
+            from lyceum_proto import LyceumFrameView
+            self._frame_view = LyceumFrameView
+            from lyceum.crypto import BufferPool
+            from lyceum.link import Aggregator, RadioBalancer, RxMerger
+            from lyceum.link import adr, aggregate, arq, fec
+            self._adr = adr
+            self._aggregate = aggregate
+            self._arq = arq
+            self._fec = fec
+            from lyceum import history
+            self._history = history
+            from lyceum.throttle import EventSummarizer, UpdateThrottle
+            from lyceum.workers import ShardedWorkerPool
+            self._rx_pool = BufferPool(size=256, count=4)
+            if self.rx_workers > 1 and self.aes_key:
+                # Random-nonce frames hide the sender until decrypted, so
+                # every frame would land on one shard anyway
+                _LOGGER.warning(
+                    "rx_workers=%d needs the sender readable before decryption; "
+                    "using 1 worker with AES encryption", self.rx_workers
+                )
+                self.rx_workers = 1
+            if self.rx_workers > 0:
+                self.worker_pool = ShardedWorkerPool(
+                    self._process_frame,
+                    self._deliver_threadsafe,
+                    workers=self.rx_workers,
+                )
             self._gateway = LyceumGateway(
                 self.port,
                 baud=115200,
                 aes_key=self.aes_key,
+                address=self.address,
+                framing=self.framing,
+                compact_header=self.compact_header,
+            )
+            modules = [(self._gateway.e22, self.channel)] + [
+                (E22Serial(port, baud=115200), channel) for port, channel in self.extra_radios
+            ]
+            for index, (e22, channel) in enumerate(modules):
+                radio = LyceumRadio(
+                    self.hass,
+                    index,
+                    e22,
+                    channel,
+                    self._on_packet,
+                    self._on_transmit,
+                    framing=self.framing,
+                    air_rate=self.air_rate,
+                    duty_cycle=self.duty_cycle,
+                    # ADR needs the RSSI byte the module appends to each packet
+                    trailer=1 if self.adaptive_rate and index == 0 else 0,
+                )
+                radio.start()
+                self.radios.append(radio)
+            if len(self.radios) > 1:
+                self.balancer = RadioBalancer(
+                    [radio.channel for radio in self.radios],
+                    clock=self.hass.loop.time,
+                )
+                self.merger = RxMerger(self._deliver_merged, clock=self.hass.loop.time)
+            self.arq = arq.ArqEndpoint(
+                self.address,
+                self._link_transmit,
+                self._deliver_payload,
+                on_acked=self._arq_acked,
+                on_fail=self._arq_failed,
+                clock=self.hass.loop.time,
             )
-            _LOGGER.info("Lyceum Gateway connected on %s", self.port)
+            self.fec = fec.FecEndpoint(
+                self.address,
+                self._link_transmit,
+                self._deliver_payload,
+                clock=self.hass.loop.time,
+            )
+            if self.adaptive_rate:
+                ladder = adr.e22_ladder()
+                codes = [rate.code for rate in ladder]
+                self.adr = adr.AdrController(
+                    self.address,
+                    ladder,
+                    self._control_transmit,
+                    self._apply_data_rate,
+                    initial=codes.index(max(self.air_rate, codes[0])),
+                    clock=self.hass.loop.time,
+                )
+                self.hass.async_create_task(self._async_configure_module(rssi_byte=True))
+            self.state_throttle = UpdateThrottle(
+                self._notify_callbacks,
+                min_interval=self.state_interval,
+                clock=self.hass.loop.time,
+            )
+            if self.history_size > 0:
+                self.history = history.MessageHistory(self.history_size)
+            if self.event_summary > 0:
+                self.summarizer = EventSummarizer(
+                    self._fire_summary,
+                    window_s=self.event_summary,
+                    clock=self.hass.loop.time,
+                )
+            if self.aggregate_linger > 0:
+                self.aggregator = Aggregator(
+                    self._enqueue_aggregate,
+                    linger_s=self.aggregate_linger,
+                    clock=self.hass.loop.time,
+                )
+            _LOGGER.info(
+                "Lyceum Gateway connected on %s",
+                ", ".join(f"{radio.port} (channel {radio.channel})" for radio in self.radios),
+            )
+            if self.custody_ttl > 0:
+                from lyceum.custody import CustodyQueue
+                path = self.hass.config.path(DOMAIN, "custody.db")
+                await self.hass.async_add_executor_job(
+                    lambda: os.makedirs(os.path.dirname(path), exist_ok=True)
+                )
+                self.custody = await self.hass.async_add_executor_job(
+                    lambda: CustodyQueue(
+                        path,
+                        ttl_s=self.custody_ttl,
+                        max_per_destination=self.custody_capacity,
+                    )
+                )
+                if self.custody.depth:
+                    _LOGGER.info("Holding %d store-and-forward message(s)", self.custody.depth)
+                self._schedule_custody()
+            if self.backbone_mode:
+                await self._async_relay_client(self.relay_url)
         except Exception as e:
             _LOGGER.error("Failed to connect to gateway: %s", e)
             raise
         
         self._running = True
-        self._task = asyncio.create_task(self._listen_loop())
 
     async def async_stop(self) -> None:
         """Stop the gateway listener."""
         self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        if self._linger_handle:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        if self._retransmit_handle:
+            self._retransmit_handle.cancel()
+            self._retransmit_handle = None
+        if self._merge_handle:
+            self._merge_handle.cancel()
+            self._merge_handle = None
+        # Don't lose the tail of a burst: last summary, last state write
+        if self._summary_handle:
+            self._summary_handle.cancel()
+            self._summary_handle = None
+        if self.summarizer:
+            self.summarizer.flush()
+        if self._state_handle:
+            self._state_handle.cancel()
+            self._state_handle = None
+        if self.state_throttle:
+            self.state_throttle.flush()
+        if self._custody_handle:
+            self._custody_handle.cancel()
+            self._custody_handle = None
+        if self.custody:
+            custody, self.custody = self.custody, None
+            if self._custody_saving:
+                await self._custody_saving
+            # Writes what is still queued, then closes the database
+            await self.hass.async_add_executor_job(custody.close)
+        self._custody_saving = None
+        self._custody_inflight = {}
+        # Undelivered relay messages go to the spool for next time
+        for client in self._relays.values():
+            await client.close()
+        self._relays = {}
+        for radio in self.radios:
+            radio.stop()
+            if radio.index > 0:
+                radio.e22.close()
+        self.radios = []
+        
+        if self.worker_pool:
+            await self.hass.async_add_executor_job(self.worker_pool.close)
+            self.worker_pool = None
         
         if self._gateway:
             self._gateway.close()
@@ -100,110 +365,720 @@ class LyceumGatewayDevice:
         
         _LOGGER.info("Lyceum Gateway stopped")
 
-    async def _listen_loop(self) -> None:
-        """Background loop to listen for incoming messages."""
-        while self._running:
-            try:
-                # Poll for data (non-blocking check would be better)
-                data = await self.hass.async_add_executor_job(
-                    self._gateway.e22.read, 256
-                )
-                
-                if data:
-                    await self._handle_received_data(data)
-                    
-            except Exception as e:
-                _LOGGER.error("Error in gateway listen loop: %s", e)
+    @property
+    def scheduler(self):
+        """Transmit scheduler of the first radio (the one ADR retunes)."""
+        return self.radios[0].scheduler if self.radios else None
+
+    @callback
+    def _on_packet(self, radio: LyceumRadio, data: memoryview, rssi: Optional[int]) -> None:
+        """A packet from one radio: straight through, or merged with the others."""
+        if self.merger is None:
+            self._handle_received_data(data, rssi)
+            return
+        # Held for ordering, so copy it out of the framer's ring
+        self.merger.push(radio.index, bytes(data), rssi, radio.airtime(data))
+        self._schedule_merge()
+
+    @callback
+    def _schedule_merge(self) -> None:
+        if self._merge_handle:
+            self._merge_handle.cancel()
+            self._merge_handle = None
+        deadline = self.merger.deadline
+        if deadline is not None:
+            self._merge_handle = self.hass.loop.call_at(deadline, self._poll_merge)
+
+    @callback
+    def _poll_merge(self) -> None:
+        self._merge_handle = None
+        self.merger.poll()
+        self._schedule_merge()
+
+    @callback
+    def _deliver_merged(self, index: int, packet: bytes, rssi: Optional[int]) -> None:
+        """Handle the next packet of the merged stream."""
+        self.balancer.record_rx(index, self.radios[index].airtime(packet))
+        self._handle_received_data(memoryview(packet), rssi, index)
+
+    @callback
+    def _on_transmit(self, radio: LyceumRadio, airtime: float) -> None:
+        if self.balancer:
+            self.balancer.record_tx(radio.index, airtime)
+
+    def _radio_for(self, channel: Optional[int], destination: Optional[int] = None) -> LyceumRadio:
+        """The radio to send on: the channel's own, else the least occupied."""
+        if self.balancer is None:
+            return self.radios[0]
+        for radio in self.radios:
+            self.balancer.set_queued(radio.index, radio.scheduler.queued_airtime)
+        return self.radios[self.balancer.pick(channel, destination)]
+
+    @callback
+    def _enqueue(self, destination: int, channel: Optional[int], frame: bytes, priority) -> bool:
+        """Encrypt a LyceumFrame and queue it on the chosen radio."""
+        radio = self._radio_for(channel, destination)
+        if channel is None:
+            channel = radio.channel
+        packet = self._gateway.build_lyceum_frame(destination, channel, frame)
+        return radio.scheduler.enqueue(packet, channel, priority)
+
+    @callback
+    def _handle_received_data(
+        self,
+        data: memoryview,
+        rssi: Optional[int] = None,
+        radio: Optional[int] = None,
+    ) -> None:
+        """
+        Process one received LoRa packet (a view into the framer's ring).
+
+        `radio` is the index of the radio that heard it, when merging
+        several; it travels with the frame through the worker pool.
+        """
+        if rssi is not None:
+            self.last_rssi = -(256 - rssi)
+        if self.worker_pool:
+            # Copy out of the pooled buffer; workers hand results back later
+            frame = bytes(data)
+            self.worker_pool.submit(self._gateway.peek_sender(frame), frame, radio)
+            return
+        
+        plain = self._rx_pool.acquire() if self.aes_key or self.compact_header else None
+        try:
+            # Decrypt if we have a key (and restore a compact header), straight
+            # into a pooled buffer
+            if plain is not None:
+                decrypted = self._gateway.decrypt_payload_into(data, plain)
+                if decrypted is None:
+                    _LOGGER.warning("Failed to decrypt incoming packet")
+                    return
+                data = decrypted
             
-            await asyncio.sleep(0.1)
-
-    async def _handle_received_data(self, data: bytes) -> None:
-        """Process received LoRa data."""
-        # Decrypt if we have a key
-        if self.aes_key:
-            plaintext = self._gateway.decrypt_payload(data)
-            if plaintext is None:
-                _LOGGER.warning("Failed to decrypt incoming packet")
+            decoded = self._decode_frame(data)
+            if decoded is None:
+                _LOGGER.warning("Received malformed or non-UTF8 frame")
                 return
-            data = plaintext
+        finally:
+            if plain is not None:
+                self._rx_pool.release(plain)
         
+        self._dispatch(decoded, radio)
+
+    def _decode_frame(self, data) -> Optional[list]:
+        """
+        Parse a LyceumFrame in place and decode its text payload(s).
+
+        Returns (message, sender) pairs, or the frame's bytes for ARQ, FEC
+        and link control frames, which must be handled on the event loop.
+        """
         try:
-            message = data.decode("utf-8")
-        except UnicodeDecodeError:
-            _LOGGER.warning("Received non-UTF8 data")
-            return
-        
+            if self._arq.is_arq(data) or self._fec.is_fec(data) or self._adr.is_control(data):
+                return [bytes(data)]
+            frame = self._frame_view(data)
+            # The message strings are the only per-packet allocations
+            if frame.flags & self._aggregate.FLAG_AGGREGATE:
+                return [
+                    (str(payload, "utf-8"), frame.src)
+                    for _seq, _flags, payload in self._aggregate.unpack(data)
+                ]
+            return [(str(frame.payload, "utf-8"), frame.src)]
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    def _process_frame(self, data: bytes) -> Optional[list]:
+        """Decrypt and decode one frame (runs on a worker thread)."""
+        # As on the inline path: a compact header needs expanding even
+        # without a key
+        if self.aes_key or self.compact_header:
+            data = self._gateway.decrypt_payload(data)
+            if data is None:
+                return None
+        return self._decode_frame(memoryview(data))
+
+    def _deliver_threadsafe(self, item) -> None:
+        """Hand a finished WorkItem from a worker thread to the event loop."""
+        self.hass.loop.call_soon_threadsafe(self._deliver_processed, item)
+
+    @callback
+    def _deliver_processed(self, item) -> None:
+        """Publish a frame processed by the worker pool."""
+        if self.worker_pool:
+            self.worker_pool.record_delivery(item)
+        if not item.ok:
+            _LOGGER.error("Error processing incoming packet: %s", item.error)
+        elif item.result is None:
+            _LOGGER.warning("Failed to decrypt or decode incoming packet")
+        else:
+            self._dispatch(item.result, item.tag)
+
+    @callback
+    def _dispatch(self, decoded: list, radio: Optional[int] = None) -> None:
+        """Publish decoded messages; hand ARQ/FEC/ADR frames to their endpoints."""
+        if decoded and (self.adr or self.custody or radio is not None):
+            # One link quality sample per received packet
+            first = decoded[0]
+            if isinstance(first, bytes):
+                sender, size = int.from_bytes(first[0:2], "big"), len(first)
+            else:
+                sender, size = first[1], sum(len(message) for message, _ in decoded)
+            if radio is not None:
+                # Replies to this peer go out on the channel it was heard on
+                self.balancer.learn(sender, radio)
+            if self.adr and radio in (None, 0):
+                self.adr.observe(sender, rssi=self.last_rssi or None, size=size)
+            if self.custody and sender is not None:
+                # It's in range now: try what we hold for it
+                self._custody_attempt(self.custody.heard(sender))
+        channel = self.radios[radio].channel if radio is not None else None
+        for entry in decoded:
+            if isinstance(entry, bytes):
+                try:
+                    if not self.arq.on_frame(entry) and not self.fec.on_frame(entry) and self.adr:
+                        self.adr.on_frame(entry)
+                except ValueError as e:
+                    _LOGGER.warning("Dropped invalid link frame: %s", e)
+                if self.adr:
+                    self._feed_adr()
+                self._schedule_retransmit()
+            else:
+                self._publish_message(*entry, channel=channel)
+
+    @callback
+    def _publish_message(
+        self,
+        message: str,
+        sender: Optional[int] = None,
+        channel: Optional[int] = None,
+    ) -> None:
+        """
+        Update state and notify HA about a received message.
+
+        Without a channel (ARQ/FEC deliveries), the one the sender was last
+        heard on is reported.
+        """
+        if channel is None and self.balancer and sender is not None:
+            channel = self.balancer.channel_for(sender)
+        if channel is None:
+            channel = self.channel
         # Update state
         self.last_message = message
         self.message_count += 1
         
-        # Fire HA event for automations
-        self.hass.bus.async_fire(EVENT_MESSAGE_RECEIVED, {
+        event = {
             "message": message,
+            ATTR_SENDER: hex(sender) if sender is not None else None,
             ATTR_RSSI: self.last_rssi,
             ATTR_SNR: self.last_snr,
-            ATTR_CHANNEL: self.channel,
+            ATTR_CHANNEL: channel,
             ATTR_TIMESTAMP: datetime.now().isoformat(),
-        })
+        }
+        if self.history:
+            self.history.record(
+                self._history.RECEIVED,
+                message,
+                peer=sender,
+                channel=event[ATTR_CHANNEL],
+                rssi=self.last_rssi,
+                snr=self.last_snr,
+            )
+        if self.summarizer:
+            # Relay bursts: one summary event per interval instead
+            self.summarizer.add(event)
+            self._schedule_summary()
+        else:
+            # Fire HA event for automations
+            self.hass.bus.async_fire(EVENT_MESSAGE_RECEIVED, event)
         
-        # Notify sensor updates
+        # Notify sensor updates (coalesced during bursts)
+        self._request_state_update()
+        
+        _LOGGER.debug("Received Lyceum message: %s", message[:50])
+
+    @callback
+    def _request_state_update(self) -> None:
+        if not self.state_throttle:
+            self._notify_callbacks()
+            return
+        if not self.state_throttle.request():
+            self._schedule_state_update()
+
+    @callback
+    def _notify_callbacks(self) -> None:
         for callback_fn in self._callbacks:
             callback_fn()
-        
-        _LOGGER.info("Received Lyceum message: %s", message[:50])
+
+    @callback
+    def _schedule_state_update(self) -> None:
+        """Arm a timer for the coalesced (trailing) sensor update."""
+        deadline = self.state_throttle.deadline
+        if deadline is not None and not self._state_handle:
+            self._state_handle = self.hass.loop.call_at(deadline, self._poll_state_update)
+
+    @callback
+    def _poll_state_update(self) -> None:
+        self._state_handle = None
+        self.state_throttle.poll()
+
+    @callback
+    def _schedule_summary(self) -> None:
+        deadline = self.summarizer.deadline
+        if deadline is not None and not self._summary_handle:
+            self._summary_handle = self.hass.loop.call_at(deadline, self._poll_summary)
+
+    @callback
+    def _poll_summary(self) -> None:
+        self._summary_handle = None
+        self.summarizer.poll()
+
+    @callback
+    def _fire_summary(self, summary: dict[str, Any]) -> None:
+        # Event data must be JSON: sender/channel keys as strings
+        for key in ("senders", "channels"):
+            summary[key] = {str(k): n for k, n in summary[key].items()}
+        summary[ATTR_TIMESTAMP] = datetime.now().isoformat()
+        self.hass.bus.async_fire(EVENT_MESSAGE_SUMMARY, summary)
+
+    def message_history(
+        self,
+        count: int = 20,
+        sender: Optional[int] = None,
+        channel: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """The newest `count` messages, oldest first (see lyceum.history)."""
+        if not self.history:
+            return []
+        return self.history.query(count, sender=sender, channel=channel)
+
+    @property
+    def update_stats(self) -> dict[str, Any]:
+        """How many sensor updates and message events were coalesced."""
+        stats = self.state_throttle.stats.to_dict() if self.state_throttle else {}
+        if self.summarizer:
+            stats["summaries"] = self.summarizer.summaries
+        return stats
+
+    @property
+    def rx_stats(self) -> Optional[dict[str, Any]]:
+        """Worker pool queue depth and per-stage latency (None when inline)."""
+        return self.worker_pool.stats() if self.worker_pool else None
+
+    @property
+    def tx_stats(self) -> Optional[dict[str, Any]]:
+        """Transmit queue depth and per-class queue wait."""
+        if not self.scheduler:
+            return None
+        stats = {
+            "depth": sum(radio.scheduler.depth for radio in self.radios),
+            "classes": self.scheduler.to_dict(),
+        }
+        if self.balancer:
+            stats["radios"] = [
+                dict(
+                    radio.stats,
+                    **self.balancer.stats[radio.index].to_dict(),
+                    occupancy=round(self.balancer.loads[radio.index].occupancy(), 4),
+                    classes=radio.scheduler.to_dict(),
+                )
+                for radio in self.radios
+            ]
+            stats["merger"] = self.merger.stats.to_dict()
+        if self.aggregator:
+            agg = self.aggregator.stats
+            stats["aggregation"] = {
+                "messages": agg.messages,
+                "frames": agg.frames_out,
+                "messages_per_frame": round(agg.ratio, 2),
+                "pending": self.aggregator.pending,
+            }
+        if self.arq:
+            stats["arq"] = dict(self.arq.stats.to_dict(), pending=self.arq.pending)
+        if self.fec:
+            stats["fec"] = dict(
+                self.fec.stats.to_dict(),
+                pending=self.fec.pending,
+                loss_estimate=round(self.fec.redundancy.loss, 3),
+            )
+        if self.adr:
+            stats["adr"] = self.adr.report()
+        return stats
+
+    @callback
+    def _enqueue_aggregate(self, key, frame: bytes, count: int) -> None:
+        """Encrypt one (possibly aggregated) frame and hand it to the scheduler."""
+        destination, channel, priority = key
+        if not self._enqueue(destination, channel, frame, priority):
+            _LOGGER.warning("Transmit queue full: dropped %d %s message(s)", count, priority.name.lower())
+
+    @callback
+    def _link_transmit(self, destination: int, frame: bytes) -> None:
+        """Send an ARQ or FEC frame through the scheduler."""
+        from lyceum.link import Priority
+        channel, priority = self._routes.get(destination, (None, Priority.RELAY))
+        if not self._enqueue(destination, channel, frame, priority):
+            _LOGGER.debug("Transmit queue full: frame to %s left to retransmission", hex(destination))
+
+    @callback
+    def _control_transmit(self, destination: int, frame: bytes) -> None:
+        """Send a link control frame ahead of queued traffic (first radio, like ADR)."""
+        from lyceum.link import Priority
+        packet = self._gateway.build_lyceum_frame(destination, self.channel, frame)
+        if not self.scheduler.enqueue(packet, self.channel, Priority.DISCOVERY):
+            _LOGGER.debug("Transmit queue full: dropped control frame to %s", hex(destination))
+
+    @callback
+    def _apply_data_rate(self, rate) -> None:
+        """Retune airtime accounting and the module to an agreed data rate."""
+        _LOGGER.info("Switching air data rate to %s", rate.name)
+        self.air_rate = rate.code
+        self.scheduler.config.modulation = rate.modulation
+        self.hass.async_create_task(self._async_configure_module(air_rate=rate.code))
+
+    async def _async_configure_module(self, **changes) -> bool:
+        """
+        Change module registers without the M0/M1 pins.
+
+        Uses the software mode switch (REG1 bit 2, which must already be
+        enabled) and one register read and write, through the transport so
+        received frames keep flowing to the framer. Transmission is held
+        from before the switch into configuration mode until the module is
+        back in transmission mode: a frame written in between would be read
+        as a command (one starting C0 is a register write).
+        """
+        from dataclasses import replace
+        from e22_config import REG_CRYPT_H, E22Config, mode_switch_command
+
+        radio = self.radios[0]
+        transport, scheduler = radio.transport, radio.scheduler
+        if transport is None:
+            return False
+        async with self._config_lock:
+            scheduler.pause()
+            try:
+                # Let the module take and send what it already has
+                await transport.drain()
+                await asyncio.sleep(max(scheduler.busy_until - self.hass.loop.time(), 0.0))
+                enter = mode_switch_command(True)
+                if await transport.request(enter, len(enter) - 1) != enter[1:]:
+                    _LOGGER.warning("Module did not enter configuration mode (software mode switch off?)")
+                    return False
+                try:
+                    read = bytes([0xC1, 0x00, REG_CRYPT_H])
+                    regs = await transport.request(read, 3 + REG_CRYPT_H)
+                    if regs is None or regs[:3] != read:
+                        _LOGGER.warning("Failed to read module registers")
+                        return False
+                    current = E22Config.from_bytes(regs[3:])
+                    write = replace(current, **changes).write_for(current)
+                    if write is None:
+                        return True
+                    start, data = write
+                    cmd = bytes([0xC0, start, len(data)]) + data
+                    # The module echoes the whole write with C1 in front
+                    resp = await transport.request(cmd, len(cmd))
+                    if resp != b"\xC1" + cmd[1:]:
+                        _LOGGER.warning("Module rejected register write %s", cmd.hex())
+                        return False
+                    return True
+                finally:
+                    leave = mode_switch_command(False)
+                    await transport.request(leave, len(leave) - 1)
+            except ConnectionError as e:
+                _LOGGER.warning("Could not configure module: %s", e)
+                return False
+            finally:
+                scheduler.resume()
+
+    @callback
+    def _deliver_payload(self, sender: int, payload: bytes) -> None:
+        """Publish a message received over ARQ or rebuilt from FEC shards."""
+        try:
+            message = str(payload, "utf-8")
+        except UnicodeDecodeError:
+            _LOGGER.warning("Received non-UTF8 reliable message")
+            return
+        self._publish_message(message, sender)
+
+    @callback
+    def _schedule_retransmit(self) -> None:
+        """Arm a timer for the next ARQ retransmission or FEC repair, if any."""
+        if self._retransmit_handle:
+            self._retransmit_handle.cancel()
+            self._retransmit_handle = None
+        deadlines = [d for d in (self.arq.deadline, self.fec.deadline) if d is not None]
+        if self.adr and self.adr.deadline is not None:
+            deadlines.append(self.adr.deadline)
+        if deadlines:
+            deadline = min(deadlines)
+            self._retransmit_handle = self.hass.loop.call_at(deadline, self._poll_retransmit)
+
+    @callback
+    def _poll_retransmit(self) -> None:
+        self._retransmit_handle = None
+        self.arq.poll()
+        self.fec.poll()
+        if self.adr:
+            self._feed_adr()
+            self.adr.poll()
+        self._schedule_retransmit()
+
+    @callback
+    def _feed_adr(self) -> None:
+        """Report ARQ acks and retransmissions since the last call as TX outcomes."""
+        stats = self.arq.stats
+        acked, acked_bytes, lost = self._arq_seen
+        retransmits = stats.retransmits + stats.fast_retransmits
+        if stats.acked > acked:
+            size = (stats.acked_bytes - acked_bytes) // (stats.acked - acked)
+            for _ in range(stats.acked - acked):
+                self.adr.record_tx(size, True)
+        for _ in range(retransmits - lost):
+            self.adr.record_tx(0, False)
+        self._arq_seen = (stats.acked, stats.acked_bytes, retransmits)
+
+    @callback
+    def _schedule_linger(self) -> None:
+        """Arm a timer for the aggregator's oldest buffered message."""
+        if self._linger_handle:
+            self._linger_handle.cancel()
+            self._linger_handle = None
+        deadline = self.aggregator.deadline
+        if deadline is not None:
+            self._linger_handle = self.hass.loop.call_at(deadline, self._flush_aggregator)
+
+    @callback
+    def _flush_aggregator(self) -> None:
+        self._linger_handle = None
+        self.aggregator.poll()
+        self._schedule_linger()
 
     async def async_send_message(
         self,
         destination: int,
-        channel: int,
+        channel: Optional[int],
         message: str,
+        priority: str = "relay",
+        reliable: bool = False,
+        store_and_forward: bool = False,
     ) -> None:
-        """Send a message over LoRa."""
+        """
+        Queue a message for transmission over LoRa.
+
+        With reliable=True the message is acknowledged by the destination
+        and retransmitted until it is (selective-repeat ARQ). Messages too
+        long for one frame are sent as an FEC block, which is reliable too.
+        With store_and_forward=True the gateway takes custody: the message
+        is sent reliably and, if that fails, kept (across restarts) and
+        sent again when the destination is heard, until it expires.
+        With channel=None the message goes out on the channel the
+        destination was last heard on, or the least occupied radio's.
+        """
         if not self._gateway:
             raise RuntimeError("Gateway not connected")
+        if priority not in TX_PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        from lyceum.link import Priority
+        
+        src = self.address
+        tx_class = Priority[priority.upper()]
+        payload = message.encode("utf-8")
+        fits = len(payload) <= self._aggregate.DEFAULT_MTU - self._arq.DATA_OVERHEAD
+        if store_and_forward:
+            if not self.custody:
+                raise RuntimeError("Store-and-forward is disabled (custody TTL is 0)")
+            if not fits:
+                raise ValueError("Message too long for store-and-forward (one frame)")
+            if self.custody.add(destination, message, channel, priority) is None:
+                raise RuntimeError(f"Store-and-forward queue full for {hex(destination)}")
+            self._poll_custody()  # First attempt now
+        elif not fits:
+            # Multi-frame: erasure-coded shards, topped up until acked
+            self._routes[destination] = (channel, tx_class)
+            self.fec.send(destination, payload)
+            self._schedule_retransmit()
+        elif reliable:
+            self._routes[destination] = (channel, tx_class)
+            if not self.arq.send(destination, payload):
+                raise RuntimeError(f"Reliable send backlog full for {hex(destination)}")
+            self._schedule_retransmit()
+        elif self.aggregator and priority in AGGREGATE_PRIORITIES:
+            # May share a frame with other small messages to the same node
+            self.aggregator.add(
+                (destination, channel, tx_class),
+                self._gateway.text_frame(destination, message, src),
+            )
+            self._schedule_linger()
+        else:
+            frame = self._gateway.text_frame(destination, message, src)
+            if not self._enqueue(destination, channel, frame, tx_class):
+                raise RuntimeError(f"Transmit queue full for {priority} traffic")
         
-        await self.hass.async_add_executor_job(
-            self._gateway.send_text,
-            destination,
-            channel,
-            message,
-            int(self.node_id.replace("!", ""), 16) if self.node_id.startswith("!") else 0x0001,
-        )
+        if self.history:
+            self.history.record(self._history.SENT, message, peer=destination, channel=channel)
         
         # Fire event
         self.hass.bus.async_fire(EVENT_MESSAGE_SENT, {
             "message": message,
             "destination": hex(destination),
             ATTR_CHANNEL: channel,
+            ATTR_PRIORITY: priority,
+            ATTR_RELIABLE: reliable,
+            ATTR_STORE_AND_FORWARD: store_and_forward,
             ATTR_TIMESTAMP: datetime.now().isoformat(),
         })
 
-    async def async_relay_to_internet(self, message: str, relay_url: str) -> None:
+    @callback
+    def _custody_attempt(self, entries: list) -> None:
+        """Send claimed custody entries reliably; ARQ reports the outcome."""
+        from lyceum.link import Priority
+
+        for entry in entries:
+            self._routes[entry.destination] = (entry.channel, Priority[entry.priority.upper()])
+            payload = entry.message.encode("utf-8")
+            if self.arq.send(entry.destination, payload):
+                self._custody_inflight.setdefault((entry.destination, payload), deque()).append(entry.id)
+            else:
+                self.custody.failed(entry.id)
+        if entries:
+            self._schedule_retransmit()
+            self._schedule_custody()
+
+    def _custody_entry(self, destination: int, payload: bytes) -> Optional[int]:
+        ids = self._custody_inflight.get((destination, bytes(payload)))
+        if not ids:
+            return None
+        entry_id = ids.popleft()
+        if not ids:
+            del self._custody_inflight[(destination, bytes(payload))]
+        return entry_id
+
+    @callback
+    def _arq_acked(self, destination: int, payload: bytes) -> None:
+        entry_id = self._custody_entry(destination, payload) if self.custody else None
+        if entry_id is None:
+            return
+        latency = self.custody.delivered(entry_id)
+        if latency is not None:
+            self.hass.bus.async_fire(EVENT_MESSAGE_DELIVERED, {
+                "message": payload.decode("utf-8", "replace"),
+                "destination": hex(destination),
+                "latency": round(latency, 1),
+                ATTR_TIMESTAMP: datetime.now().isoformat(),
+            })
+        self._schedule_custody()
+        self._request_state_update()
+
+    @callback
+    def _arq_failed(self, destination: int, payload: bytes) -> None:
+        entry_id = self._custody_entry(destination, payload) if self.custody else None
+        if entry_id is not None:
+            # Out of range: held until it is heard or the timed retry
+            self.custody.failed(entry_id)
+            self._schedule_custody()
+
+    @callback
+    def _schedule_custody(self) -> None:
+        """Save custody changes and arm a timer for the next retry or expiry."""
+        if self._custody_handle:
+            self._custody_handle.cancel()
+            self._custody_handle = None
+        if self.custody and self.custody.unsaved and (
+            self._custody_saving is None or self._custody_saving.done()
+        ):
+            self._custody_saving = self.hass.async_create_task(self._async_save_custody())
+        deadline = self.custody.deadline if self.custody else None
+        if deadline is not None:
+            # Custody times are wall-clock (they survive restarts)
+            self._custody_handle = self.hass.loop.call_later(
+                max(deadline - time.time(), 0.0), self._poll_custody
+            )
+
+    async def _async_save_custody(self) -> None:
+        """Write queued custody changes in the executor, one batch at a time."""
+        custody = self.custody
+        while writes := custody.take_writes():
+            try:
+                await self.hass.async_add_executor_job(custody.write, writes)
+            except Exception as e:
+                _LOGGER.error("Failed to save store-and-forward queue: %s", e)
+
+    @callback
+    def _poll_custody(self) -> None:
+        self._custody_handle = None
+        self._custody_attempt(self.custody.due())
+        self._schedule_custody()
+
+    @property
+    def custody_stats(self) -> Optional[dict[str, Any]]:
+        """Custody queue depth, outcomes and delivery latency."""
+        if not self.custody:
+            return None
+        stats = self.custody.to_dict()
+        stats["destinations"] = {
+            hex(destination): count
+            for destination, count in self.custody.depth_by_destination().items()
+        }
+        return stats
+
+    @property
+    def relay(self):
+        """RelayClient for the configured relay URL (None until used)."""
+        return self._relays.get(self.relay_url.rstrip("/"))
+
+    async def _async_relay_client(self, relay_url: str):
+        """The relay client for `relay_url`, started on first use."""
+        from lyceum.relay import RelayClient, Spool
+
+        relay_url = relay_url.rstrip("/")
+        async with self._relay_lock:
+            if relay_url not in self._relays:
+                session = async_get_clientsession(self.hass)
+                url = f"{relay_url}/relay/batch"
+
+                async def post(body: bytes, headers: dict[str, str]) -> int:
+                    async with session.post(
+                        url, data=body, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+                    ) as resp:
+                        await resp.read()
+                        return resp.status
+
+                # One spool per relay, kept across restarts
+                name = hashlib.blake2b(relay_url.encode(), digest_size=6).hexdigest()
+                path = self.hass.config.path(DOMAIN, f"relay_{name}.spool")
+                await self.hass.async_add_executor_job(
+                    lambda: os.makedirs(os.path.dirname(path), exist_ok=True)
+                )
+                spool = await self.hass.async_add_executor_job(Spool, path)
+                if spool.depth:
+                    _LOGGER.info("Replaying %d spooled relay message(s) to %s", spool.depth, relay_url)
+                client = RelayClient(post, spool=spool)
+                client.start()
+                self._relays[relay_url] = client
+            return self._relays[relay_url]
+
+    async def async_relay_to_internet(self, message: str, relay_url: Optional[str] = None) -> None:
         """
         Relay a message to the internet backbone.
         
         This is used during bootstrapping when mesh coverage is limited.
         The message is sent to a central relay server that can forward
-        it to distant Lyceum nodes over the internet.
+        it to distant Lyceum nodes over the internet. Messages are queued
+        and POSTed in compressed batches over the shared HTTP session;
+        while the relay is unreachable they are spooled to disk and
+        replayed in order. Waits while the relay is falling behind.
         """
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{relay_url}/relay",
-                    json={
-                        "message": message,
-                        "node_id": self.node_id,
-                        "channel": self.channel,
-                        "timestamp": datetime.now().isoformat(),
-                    },
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    if resp.status == 200:
-                        _LOGGER.info("Message relayed to internet backbone")
-                    else:
-                        _LOGGER.warning("Relay failed: %s", resp.status)
-            except Exception as e:
-                _LOGGER.error("Relay error: %s", e)
+        client = await self._async_relay_client(relay_url or self.relay_url)
+        await client.submit({
+            "message": message,
+            "node_id": self.node_id,
+            "channel": self.channel,
+            "timestamp": datetime.now().isoformat(),
+        })
+
+    @property
+    def relay_stats(self) -> Optional[dict[str, Any]]:
+        """Relay throughput and spool depth (None until the relay is used)."""
+        return self.relay.to_dict() if self.relay else None
 
     def register_callback(self, callback_fn: Callable) -> None:
         """Register callback for state updates."""
@@ -0,0 +1,172 @@
+"""One E22 module of a (possibly multi-radio) Lyceum gateway."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_radios(text: str) -> list[tuple[str, int]]:
+    """Parse "port:channel, port:channel" (e.g. "/dev/ttyUSB1:5")."""
+    radios = []
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        port, sep, channel = item.rpartition(":")
+        if not sep or not port:
+            raise ValueError(f"Expected port:channel, got {item!r}")
+        channel = int(channel)
+        if not 0 <= channel <= 83:
+            raise ValueError(f"Channel out of range (0-83): {channel}")
+        radios.append((port, channel))
+    return radios
+
+
+class LyceumRadio:
+    """
+    An E22 on its own serial port and channel.
+
+    Owns the module's transport (event-driven RX, queued TX), the framer
+    that splits its UART stream into packets and the transmit scheduler
+    for its airtime. Packets go to on_packet(radio, packet, rssi); every
+    frame written is reported to on_transmit(radio, airtime).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        index: int,
+        e22,
+        channel: int,
+        on_packet: Callable[["LyceumRadio", memoryview, Optional[int]], None],
+        on_transmit: Callable[["LyceumRadio", float], None],
+        framing: str = "length",
+        air_rate: int = 2,
+        duty_cycle: float = 0.1,
+        trailer: int = 0,
+    ):
+        self.hass = hass
+        self.index = index
+        self.e22 = e22
+        self.port = e22.port
+        self.channel = channel
+        self.on_packet = on_packet
+        self.on_transmit = on_transmit
+        self.framing = framing
+        self.air_rate = air_rate
+        self.duty_cycle = duty_cycle
+        self.trailer = trailer
+
+        self.transport = None
+        self.framer = None
+        self.scheduler = None
+        self._tx_task: Optional[asyncio.Task] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.last_rssi: int = 0
+        self.rx_packets: int = 0
+
+    def start(self) -> None:
+        from e22_transport import E22Transport
+        from lyceum.link import FrameReassembler, SchedulerConfig, TxScheduler, e22_modulation
+
+        # Split the UART byte stream back into LoRa packets
+        self.framer = FrameReassembler(
+            self._on_frame,
+            mode=self.framing,
+            trailer=self.trailer,
+            clock=self.hass.loop.time,
+        )
+        # Event-driven RX and queued TX, both on the event loop
+        self.transport = E22Transport.from_serial(
+            self.e22, self._on_serial_data, loop=self.hass.loop, on_close=self._on_transport_lost
+        )
+        self.transport.start()
+        # Everything this radio sends goes through its airtime/priority scheduler
+        self.scheduler = TxScheduler(
+            SchedulerConfig(
+                modulation=e22_modulation(self.air_rate),
+                duty_cycle=self.duty_cycle,
+            ),
+            clock=self.hass.loop.time,
+        )
+        self._tx_task = self.hass.loop.create_task(self.scheduler.run(self._write))
+        self._tx_task.add_done_callback(self._tx_done)
+
+    def stop(self) -> None:
+        if self._tx_task:
+            self._tx_task.cancel()
+            self._tx_task = None
+        if self.transport:
+            self.transport.stop()
+            self.transport = None
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    @callback
+    def _tx_done(self, task: asyncio.Task) -> None:
+        """Failed writes are logged by the scheduler; report anything else."""
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.error(
+                "Transmit loop on %s stopped", self.port, exc_info=task.exception()
+            )
+
+    @callback
+    def _on_transport_lost(self, exc: Optional[Exception]) -> None:
+        """The serial port failed (unplugged?): stop sending until reloaded."""
+        _LOGGER.error(
+            "E22 on %s stopped; reload the integration once it is reconnected", self.port
+        )
+        if self._tx_task:
+            self._tx_task.cancel()
+            self._tx_task = None
+
+    @callback
+    def _write(self, frame: bytes) -> None:
+        self.transport.write(frame)
+        self.on_transmit(self, self.scheduler.airtime(frame))
+
+    def airtime(self, packet) -> float:
+        """Time on air of a received packet (without the RSSI trailer)."""
+        return self.scheduler.config.modulation.time_on_air(len(packet))
+
+    @callback
+    def _on_serial_data(self, data: memoryview) -> None:
+        """Feed raw UART bytes to the framer; packets come back one by one."""
+        self.framer.feed(data)
+        self._schedule_flush()
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Arm a timer for the framer's idle-gap deadline, if it has one."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        deadline = self.framer.deadline
+        if deadline is not None:
+            self._flush_handle = self.hass.loop.call_at(deadline, self._flush_framer)
+
+    @callback
+    def _flush_framer(self) -> None:
+        self._flush_handle = None
+        self.framer.flush()
+
+    @callback
+    def _on_frame(self, data: memoryview, rssi: Optional[int]) -> None:
+        self.rx_packets += 1
+        if rssi is not None:
+            self.last_rssi = -(256 - rssi)
+        self.on_packet(self, data, rssi)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "port": self.port,
+            "channel": self.channel,
+            "connected": bool(self.transport and self.transport.running),
+            "rx_packets": self.rx_packets,
+            "last_rssi": self.last_rssi,
+            "depth": self.scheduler.depth if self.scheduler else 0,
+        }
@@ -35,6 +35,41 @@ async def async_setup_entry(
         LyceumRSSISensor(gateway, entry),
     ]
     
+    entities.append(LyceumTxQueueSensor(gateway, entry))
+    
+    # Per-radio channel load and signal when several E22 modules are used
+    if len(gateway.radios) > 1:
+        for radio in gateway.radios:
+            entities.extend([
+                LyceumRadioLoadSensor(gateway, entry, radio.index),
+                LyceumRadioRSSISensor(gateway, entry, radio.index),
+            ])
+    
+    # Air data rate chosen by ADR, with per-rate throughput and PER
+    if gateway.adaptive_rate:
+        entities.append(LyceumDataRateSensor(gateway, entry))
+    
+    # Store-and-forward custody queue
+    if gateway.custody_ttl > 0:
+        entities.extend([
+            LyceumCustodyDepthSensor(gateway, entry),
+            LyceumCustodyLatencySensor(gateway, entry),
+        ])
+    
+    # Internet relay throughput and offline spool (backbone mode)
+    if gateway.backbone_mode:
+        entities.extend([
+            LyceumRelayRateSensor(gateway, entry),
+            LyceumRelaySpoolSensor(gateway, entry),
+        ])
+    
+    # Receive worker pool health (only when processing off the event loop)
+    if gateway.rx_workers > 0:
+        entities.extend([
+            LyceumRxQueueDepthSensor(gateway, entry),
+            LyceumRxLatencySensor(gateway, entry),
+        ])
+    
     # Add Guardian sensors if enabled
     if guardian:
         entities.extend([
@@ -119,6 +154,11 @@ class LyceumMessageCountSensor(LyceumBaseSensor):
     def native_value(self) -> int:
         return self._gateway.message_count
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # State writes and events coalesced during bursts; the count is exact
+        return self._gateway.update_stats
+
 
 class LyceumRSSISensor(LyceumBaseSensor):
     """Sensor showing RSSI of last received message."""
@@ -137,6 +177,257 @@ class LyceumRSSISensor(LyceumBaseSensor):
         return self._gateway.last_rssi
 
 
+class LyceumTxQueueSensor(LyceumBaseSensor):
+    """Sensor showing frames waiting for airtime, with per-class queue wait."""
+
+    _attr_name = "Transmit Queue Depth"
+    _attr_icon = "mdi:tray-arrow-up"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_tx_queue_depth"
+
+    @property
+    def native_value(self) -> int | None:
+        stats = self._gateway.tx_stats
+        return stats["depth"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._gateway.tx_stats or {}
+        return dict(stats.get("classes", {}))
+
+
+class LyceumDataRateSensor(LyceumBaseSensor):
+    """Sensor showing the adaptive air data rate, with per-rate throughput and PER."""
+
+    _attr_name = "Air Data Rate"
+    _attr_icon = "mdi:speedometer"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_data_rate"
+
+    @property
+    def native_value(self) -> str | None:
+        stats = self._gateway.tx_stats or {}
+        return stats.get("adr", {}).get("rate")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        adr = (self._gateway.tx_stats or {}).get("adr", {})
+        return {key: adr.get(key) for key in ("changes", "fallbacks", "neighbors", "rates")}
+
+
+class LyceumRadioSensor(LyceumBaseSensor):
+    """Base class for sensors of one radio in a multi-radio gateway."""
+
+    def __init__(self, gateway: LyceumGatewayDevice, entry: ConfigEntry, index: int) -> None:
+        super().__init__(gateway, entry)
+        self._index = index
+        radio = gateway.radios[index]
+        self._attr_name = f"{self._label} (channel {radio.channel})"
+
+    @property
+    def _radio_stats(self) -> dict[str, Any]:
+        radios = (self._gateway.tx_stats or {}).get("radios", [])
+        return radios[self._index] if self._index < len(radios) else {}
+
+
+class LyceumRadioLoadSensor(LyceumRadioSensor):
+    """Sensor showing one radio's channel occupancy (airtime sent and heard)."""
+
+    _label = "Channel Load"
+    _attr_icon = "mdi:radio-tower"
+    _attr_native_unit_of_measurement = "%"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_radio{self._index}_load"
+
+    @property
+    def native_value(self) -> float | None:
+        occupancy = self._radio_stats.get("occupancy")
+        return round(100 * occupancy, 2) if occupancy is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            key: value for key, value in self._radio_stats.items()
+            if key not in ("occupancy", "classes")
+        }
+
+
+class LyceumRadioRSSISensor(LyceumRadioSensor):
+    """Sensor showing the RSSI of the last packet one radio received."""
+
+    _label = "Signal Strength"
+    _attr_device_class = SensorDeviceClass.SIGNAL_STRENGTH
+    _attr_native_unit_of_measurement = "dBm"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_radio{self._index}_rssi"
+
+    @property
+    def native_value(self) -> int | None:
+        # Only modules that append an RSSI byte report one
+        return self._gateway.radios[self._index].last_rssi or None
+
+
+class LyceumCustodyDepthSensor(LyceumBaseSensor):
+    """Sensor showing messages held for destinations that are out of range."""
+
+    _attr_name = "Store-and-Forward Queue"
+    _attr_icon = "mdi:email-fast-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_custody_depth"
+
+    @property
+    def native_value(self) -> int | None:
+        stats = self._gateway.custody_stats
+        return stats["depth"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._gateway.custody_stats or {}
+        return {
+            key: stats.get(key)
+            for key in ("inflight", "queued", "delivered", "expired", "refused", "attempts", "destinations")
+        }
+
+
+class LyceumCustodyLatencySensor(LyceumBaseSensor):
+    """Sensor showing median time from taking custody to delivery."""
+
+    _attr_name = "Store-and-Forward Latency"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = "s"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_custody_latency"
+
+    @property
+    def native_value(self) -> float | None:
+        stats = self._gateway.custody_stats
+        if not stats or not stats["latency_s"]["count"]:
+            return None
+        return stats["latency_s"]["p50"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return dict((self._gateway.custody_stats or {}).get("latency_s", {}))
+
+
+class LyceumRelayRateSensor(LyceumBaseSensor):
+    """Sensor showing messages per second delivered to the internet relay."""
+
+    _attr_name = "Relay Throughput"
+    _attr_icon = "mdi:cloud-upload"
+    _attr_native_unit_of_measurement = "msg/s"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_relay_rate"
+
+    @property
+    def native_value(self) -> float | None:
+        stats = self._gateway.relay_stats
+        return stats["messages_per_s"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._gateway.relay_stats or {}
+        return {
+            key: stats.get(key)
+            for key in ("online", "sent", "batches", "failures", "rejected", "dropped", "compression", "depth")
+        }
+
+
+class LyceumRelaySpoolSensor(LyceumBaseSensor):
+    """Sensor showing relay messages spooled on disk while the uplink is down."""
+
+    _attr_name = "Relay Spool Depth"
+    _attr_icon = "mdi:tray-full"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_relay_spool"
+
+    @property
+    def native_value(self) -> int | None:
+        stats = self._gateway.relay_stats
+        return stats["spool_depth"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._gateway.relay_stats or {}
+        return {key: stats.get(key) for key in ("spool_bytes", "spooled", "replayed")}
+
+
+class LyceumRxQueueDepthSensor(LyceumBaseSensor):
+    """Sensor showing frames waiting in the receive worker pool."""
+
+    _attr_name = "Receive Queue Depth"
+    _attr_icon = "mdi:tray-full"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_rx_queue_depth"
+
+    @property
+    def native_value(self) -> int | None:
+        stats = self._gateway.rx_stats
+        return stats["depth"] if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._gateway.rx_stats or {}
+        return {
+            key: stats.get(key)
+            for key in ("workers", "submitted", "completed", "failed", "peak_depth")
+        }
+
+
+class LyceumRxLatencySensor(LyceumBaseSensor):
+    """Sensor showing p95 receive latency from serial read to HA event."""
+
+    _attr_name = "Receive Latency"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = "ms"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._gateway.port}_rx_latency"
+
+    @property
+    def native_value(self) -> float | None:
+        stats = self._gateway.rx_stats
+        if not stats:
+            return None
+        return round(sum(s["p95_ms"] for s in stats["latency"].values()), 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # Per-stage breakdown: queue wait, processing, event-loop delivery
+        stats = self._gateway.rx_stats or {}
+        return dict(stats.get("latency", {}))
+
+
 # Guardian sensors
 
 class GuardianBaseSensor(SensorEntity):
@@ -1,4 +1,18 @@
 # Lyceum Crypto Module
-from .aes_gcm import AESGCMCipher
+from .aes_gcm import AESGCMCipher, derive_session_key
+from .session import SessionCipher, ReplayWindow
+from .ecdh import X25519KeyPair, SessionKeyCache
+from .backends import select_backend, available_backends
+from .buffers import BufferPool
 
-__all__ = ["AESGCMCipher"]
+__all__ = [
+    "AESGCMCipher",
+    "derive_session_key",
+    "SessionCipher",
+    "ReplayWindow",
+    "X25519KeyPair",
+    "SessionKeyCache",
+    "select_backend",
+    "available_backends",
+    "BufferPool",
+]
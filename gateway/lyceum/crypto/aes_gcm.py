@@ -7,11 +7,20 @@ payload content is additionally encrypted using ephemeral
 session keys derived from ECDH.
 
 Format: nonce (12 bytes) + tag (16 bytes) + ciphertext
+
+Create one AESGCMCipher per key and reuse it: the gateway driver and the
+Sovereign daemon share a single instance for every packet, and relays
+should use encrypt_many/decrypt_many for bulk traffic, and receive paths
+can use decrypt_into with a BufferPool to avoid per-packet allocations. The AES-GCM
+implementation itself comes from lyceum.crypto.backends.
 """
-from typing import Optional, Tuple
-from Crypto.Cipher import AES
+from typing import Iterable, List, Optional
+from Crypto.Hash import SHA256
+from Crypto.Protocol.KDF import HKDF
 from Crypto.Random import get_random_bytes
 
+from .backends import select_backend
+
 
 class AESGCMCipher:
     """
@@ -26,16 +35,24 @@ class AESGCMCipher:
     NONCE_SIZE = 12
     TAG_SIZE = 16
 
-    def __init__(self, key: bytes):
+    def __init__(self, key: bytes, backend: Optional[str] = None):
         """
         Initialize cipher with a key.
         
         Args:
             key: AES key (16, 24, or 32 bytes)
+            backend: Force an AEAD backend ("pycryptodome" or
+                     "cryptography"); default picks the fastest
         """
         if len(key) not in (16, 24, 32):
             raise ValueError("Key must be 16, 24, or 32 bytes")
         self.key = key
+        self._aead = select_backend(backend)(key)
+
+    @property
+    def backend(self) -> str:
+        """Name of the AEAD backend in use."""
+        return self._aead.name
 
     def encrypt(self, plaintext: bytes, associated_data: bytes = b"") -> bytes:
         """
@@ -49,12 +66,7 @@ class AESGCMCipher:
             nonce + tag + ciphertext
         """
         nonce = get_random_bytes(self.NONCE_SIZE)
-        cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
-        
-        if associated_data:
-            cipher.update(associated_data)
-            
-        ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+        ciphertext, tag = self._aead.encrypt(nonce, plaintext, associated_data)
         return nonce + tag + ciphertext
 
     def decrypt(
@@ -80,16 +92,100 @@ class AESGCMCipher:
         tag = blob[self.NONCE_SIZE:self.NONCE_SIZE + self.TAG_SIZE]
         ciphertext = blob[self.NONCE_SIZE + self.TAG_SIZE:]
         
-        cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
-        
-        if associated_data:
-            cipher.update(associated_data)
-            
-        try:
-            plaintext = cipher.decrypt_and_verify(ciphertext, tag)
-            return plaintext
-        except (ValueError, KeyError):
+        return self._aead.decrypt(nonce, ciphertext, tag, associated_data)
+
+    def encrypt_many(
+        self,
+        plaintexts: Iterable[bytes],
+        associated_data: bytes = b"",
+    ) -> List[bytes]:
+        """
+        Encrypt a batch of packets under the same key.
+
+        Draws all nonces with a single RNG call instead of one per packet.
+
+        Returns:
+            List of nonce + tag + ciphertext blobs, in input order
+        """
+        plaintexts = list(plaintexts)
+        size = self.NONCE_SIZE
+        nonces = get_random_bytes(size * len(plaintexts))
+        encrypt = self._aead.encrypt
+        blobs = []
+        for i, plaintext in enumerate(plaintexts):
+            nonce = nonces[i * size:(i + 1) * size]
+            ciphertext, tag = encrypt(nonce, plaintext, associated_data)
+            blobs.append(nonce + tag + ciphertext)
+        return blobs
+
+    def decrypt_many(
+        self,
+        blobs: Iterable[bytes],
+        associated_data: bytes = b"",
+    ) -> List[Optional[bytes]]:
+        """
+        Decrypt a batch of packets under the same key.
+
+        Returns:
+            Plaintexts in input order, with None for packets that fail
+            verification (one bad packet does not affect the others)
+        """
+        nonce_size = self.NONCE_SIZE
+        header = nonce_size + self.TAG_SIZE
+        decrypt = self._aead.decrypt
+        results: List[Optional[bytes]] = []
+        for blob in blobs:
+            if len(blob) < header:
+                results.append(None)
+                continue
+            view = memoryview(blob)
+            results.append(decrypt(
+                view[:nonce_size],
+                view[header:],
+                view[nonce_size:header],
+                associated_data,
+            ))
+        return results
+
+    def decrypt_into(
+        self,
+        blob,
+        out,
+        associated_data: bytes = b"",
+    ) -> Optional[memoryview]:
+        """
+        Verify and decrypt without allocating a plaintext object.
+
+        Args:
+            blob: nonce + tag + ciphertext (bytes, bytearray or memoryview)
+            out: Writable buffer (bytearray or memoryview) at least as long
+                 as the ciphertext, e.g. from a BufferPool
+            associated_data: Additional authenticated data
+
+        Returns:
+            A view of `out` holding the plaintext, or None if the packet is
+            malformed or fails verification
+
+        Raises:
+            ValueError: If `out` is too small for the ciphertext
+        """
+        header = self.NONCE_SIZE + self.TAG_SIZE
+        if len(blob) < header:
+            return None
+        view = blob if isinstance(blob, memoryview) else memoryview(blob)
+        size = len(view) - header
+        if size > len(out):
+            raise ValueError(f"Output buffer too small: {len(out)} < {size}")
+        target = (out if isinstance(out, memoryview) else memoryview(out))[:size]
+        if not self._aead.decrypt_into(
+            view[:self.NONCE_SIZE],
+            view[header:],
+            view[self.NONCE_SIZE:header],
+            target,
+            associated_data,
+        ):
             return None
+        return target
 
     def encrypt_json(self, data: str, associated_data: bytes = b"") -> bytes:
         """Convenience method for encrypting JSON strings."""
@@ -110,13 +206,16 @@ class AESGCMCipher:
             return None
 
 
-def derive_session_key(shared_secret: bytes) -> bytes:
+def derive_session_key(
+    shared_secret: bytes,
+    salt: bytes = b"",
+    info: bytes = b"lyceum-session-v1",
+    length: int = 32,
+) -> bytes:
     """
     Derive an AES-256 key from an ECDH shared secret.
     
-    Uses HKDF with SHA-256 for key derivation.
-    This is a placeholder - production would use cryptography.hazmat.
+    Uses HKDF with SHA-256 (RFC 5869). Distinct `info` values give
+    independent keys from the same secret.
     """
-    import hashlib
-    # Simple KDF for now - production should use HKDF
-    return hashlib.sha256(b"lyceum-session-v1" + shared_secret).digest()
+    return HKDF(shared_secret, length, salt, SHA256, context=info)
@@ -0,0 +1,210 @@
+"""
+AES-GCM Backends for Lyceum Protocol
+
+The payload ciphers only need raw AES-GCM: encrypt with a given nonce,
+returning ciphertext and tag, and verify/decrypt. Two implementations:
+
+- pycryptodome: always available (a hard dependency of the gateway)
+- cryptography: optional; keeps the expanded key inside one AESGCM object,
+  which makes it several times faster for small packets on most boxes
+
+select_backend() honours an explicit choice (argument or the
+LYCEUM_AEAD_BACKEND environment variable) and otherwise runs a short
+self-benchmark once per process and picks the fastest available backend.
+All backends produce byte-identical output for the same key and nonce.
+"""
+import os
+import time
+from typing import Dict, List, Optional, Tuple, Type
+
+from Crypto.Cipher import AES
+
+
+ENV_BACKEND = "LYCEUM_AEAD_BACKEND"
+
+
+class AEADBackend:
+    """Interface for an AES-GCM implementation bound to one key."""
+
+    name = ""
+
+    def __init__(self, key: bytes):
+        self.key = key
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def encrypt(self, nonce: bytes, plaintext: bytes, associated_data: bytes = b"") -> Tuple[bytes, bytes]:
+        """Return (ciphertext, 16-byte tag)."""
+        raise NotImplementedError
+
+    def decrypt(
+        self,
+        nonce: bytes,
+        ciphertext: bytes,
+        tag: bytes,
+        associated_data: bytes = b"",
+    ) -> Optional[bytes]:
+        """Return the plaintext, or None if verification fails."""
+        raise NotImplementedError
+
+    def decrypt_into(
+        self,
+        nonce: bytes,
+        ciphertext: bytes,
+        tag: bytes,
+        out: memoryview,
+        associated_data: bytes = b"",
+    ) -> bool:
+        """
+        Verify and decrypt into `out` (exactly len(ciphertext) bytes).
+
+        Returns False if verification fails; `out` is then zeroed.
+        """
+        plaintext = self.decrypt(nonce, ciphertext, tag, associated_data)
+        if plaintext is None:
+            return False
+        out[:] = plaintext
+        return True
+
+
+class PycryptodomeBackend(AEADBackend):
+    """AES-GCM via pycryptodome (builds a cipher object per nonce)."""
+
+    name = "pycryptodome"
+
+    def encrypt(self, nonce, plaintext, associated_data=b""):
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
+        if associated_data:
+            cipher.update(associated_data)
+        return cipher.encrypt_and_digest(plaintext)
+
+    def decrypt(self, nonce, ciphertext, tag, associated_data=b""):
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
+        if associated_data:
+            cipher.update(associated_data)
+        try:
+            return cipher.decrypt_and_verify(ciphertext, tag)
+        except (ValueError, KeyError):
+            return None
+
+    def decrypt_into(self, nonce, ciphertext, tag, out, associated_data=b""):
+        cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce)
+        if associated_data:
+            cipher.update(associated_data)
+        cipher.decrypt(ciphertext, output=out)
+        try:
+            cipher.verify(tag)
+        except ValueError:
+            out[:] = bytes(len(out))  # Never leave unverified plaintext behind
+            return False
+        return True
+
+
+class CryptographyBackend(AEADBackend):
+    """AES-GCM via the `cryptography` package (key schedule reused)."""
+
+    name = "cryptography"
+
+    def __init__(self, key: bytes):
+        super().__init__(key)
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        from cryptography.exceptions import InvalidTag
+        self._aead = AESGCM(key)
+        self._invalid_tag = InvalidTag
+        # ciphertext || tag staging area for decrypt_into (grown on demand)
+        self._scratch = memoryview(bytearray(256))
+        self._decrypt_into = getattr(self._aead, "decrypt_into", None)  # cryptography >= 45
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def encrypt(self, nonce, plaintext, associated_data=b""):
+        # cryptography returns ciphertext || tag
+        out = self._aead.encrypt(nonce, plaintext, associated_data or None)
+        return out[:-16], out[-16:]
+
+    def decrypt(self, nonce, ciphertext, tag, associated_data=b""):
+        try:
+            return self._aead.decrypt(
+                bytes(nonce),
+                bytes(ciphertext) + bytes(tag),
+                associated_data or None,
+            )
+        except self._invalid_tag:
+            return None
+
+    def decrypt_into(self, nonce, ciphertext, tag, out, associated_data=b""):
+        if self._decrypt_into is None:
+            return super().decrypt_into(nonce, ciphertext, tag, out, associated_data)
+        size = len(ciphertext)
+        if len(self._scratch) < size + 16:
+            self._scratch = memoryview(bytearray(size + 16))
+        staged = self._scratch[:size + 16]
+        staged[:size] = ciphertext
+        staged[size:] = tag
+        try:
+            self._decrypt_into(nonce, staged, associated_data or None, out)
+        except self._invalid_tag:
+            out[:] = bytes(len(out))
+            return False
+        return True
+
+
+BACKENDS: Dict[str, Type[AEADBackend]] = {
+    PycryptodomeBackend.name: PycryptodomeBackend,
+    CryptographyBackend.name: CryptographyBackend,
+}
+
+_selected: Optional[Type[AEADBackend]] = None
+
+
+def available_backends() -> List[str]:
+    """Names of backends importable in this environment."""
+    return [name for name, cls in BACKENDS.items() if cls.available()]
+
+
+def benchmark_backend(backend: Type[AEADBackend], rounds: int = 200, size: int = 64) -> float:
+    """Seconds for `rounds` encrypt+decrypt cycles of a small packet."""
+    impl = backend(bytes(16))
+    nonce = bytes(12)
+    plaintext = bytes(size)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ciphertext, tag = impl.encrypt(nonce, plaintext)
+        impl.decrypt(nonce, ciphertext, tag)
+    return time.perf_counter() - start
+
+
+def select_backend(name: Optional[str] = None) -> Type[AEADBackend]:
+    """
+    Pick the AES-GCM backend.
+
+    Args:
+        name: Backend to force; falls back to $LYCEUM_AEAD_BACKEND, then
+              to the fastest available backend (measured once per process)
+
+    Raises:
+        ValueError: If a forced backend is unknown or not installed
+    """
+    global _selected
+
+    name = name or os.environ.get(ENV_BACKEND)
+    if name:
+        backend = BACKENDS.get(name)
+        if backend is None:
+            raise ValueError(f"Unknown AEAD backend: {name}")
+        if not backend.available():
+            raise ValueError(f"AEAD backend not installed: {name}")
+        return backend
+
+    if _selected is None:
+        candidates = [BACKENDS[n] for n in available_backends()]
+        _selected = min(candidates, key=benchmark_backend)
+    return _selected
@@ -0,0 +1,50 @@
+"""
+Reusable receive buffers.
+
+The gateway receive path reads a frame, decrypts it and decodes it once
+per packet. Handing each stage a buffer from a small pool (instead of
+letting every slice and decrypt allocate) keeps allocation flat at
+sustained packet rates; see benchmarks/bench_alloc.py.
+"""
+from typing import List
+
+
+class BufferPool:
+    """
+    Fixed-size pool of equally sized bytearrays, handed out as memoryviews
+    so that slicing a buffer never copies it.
+
+    acquire() never fails: when the pool is empty it allocates a fresh
+    buffer and counts a miss, so a too-small pool shows up in `misses`
+    rather than as an error. Buffers released beyond `count` are dropped.
+    """
+
+    def __init__(self, size: int = 256, count: int = 8):
+        """
+        Args:
+            size: Bytes per buffer (at least the largest frame, 240 for E22)
+            count: Buffers kept for reuse
+        """
+        if size < 1 or count < 1:
+            raise ValueError("Buffer size and count must be positive")
+        self.size = size
+        self.count = count
+        self._free: List[memoryview] = [memoryview(bytearray(size)) for _ in range(count)]
+        self.misses = 0
+
+    def acquire(self) -> memoryview:
+        """Take a buffer from the pool."""
+        if self._free:
+            return self._free.pop()
+        self.misses += 1
+        return memoryview(bytearray(self.size))
+
+    def release(self, buf: memoryview):
+        """Return a buffer (as acquired, not a slice of it) to the pool."""
+        if len(buf) == self.size and len(self._free) < self.count:
+            self._free.append(buf)
+
+    @property
+    def available(self) -> int:
+        """Buffers currently free."""
+        return len(self._free)
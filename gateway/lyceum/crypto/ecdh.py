@@ -0,0 +1,242 @@
+"""
+X25519 Session Establishment for Lyceum Protocol
+
+Implements the ECDH handshake behind PNEUMA_PROTOCOL.md Section 4:
+SessionInit prompts and DebatePacket content are encrypted with session
+keys derived from the Moderator's and Guardian's X25519 keys via
+HKDF-SHA256.
+
+The X25519 exchange is the expensive step, so SessionKeyCache runs it once
+per Guardian relationship and derives each per-session key from the cached
+shared secret with a cheap HKDF call. Relationships rotate after a maximum
+age or number of sessions.
+
+A static Guardian key and a reused Moderator key give the same shared
+secret on every exchange, so the secret alone must not fix a session's key:
+the Moderator picks a random session nonce per derivation, sends it with
+SessionInit, and both sides mix it into the HKDF salt.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+import time
+
+from Crypto.PublicKey import ECC
+from Crypto.Random import get_random_bytes
+from Crypto.Protocol.DH import key_agreement, import_x25519_public_key
+
+from .aes_gcm import derive_session_key
+from .session import SessionCipher
+
+
+PUBLIC_KEY_SIZE = 32
+SESSION_NONCE_SIZE = 16
+
+
+class X25519KeyPair:
+    """An X25519 key pair with raw 32-byte public key encoding."""
+
+    def __init__(self, key: ECC.EccKey):
+        self._key = key
+        self.public_bytes = key.public_key().export_key(format="raw")
+
+    @classmethod
+    def generate(cls) -> "X25519KeyPair":
+        return cls(ECC.generate(curve="curve25519"))
+
+    def exchange(self, peer_public: bytes) -> bytes:
+        """
+        Compute the raw X25519 shared secret with a peer.
+
+        Raises:
+            ValueError: If the peer key is malformed or of low order
+        """
+        if len(peer_public) != PUBLIC_KEY_SIZE:
+            raise ValueError(f"Public key must be {PUBLIC_KEY_SIZE} bytes")
+        peer = import_x25519_public_key(bytes(peer_public))
+        shared = key_agreement(static_priv=self._key, static_pub=peer, kdf=lambda z: z)
+        if not any(shared):
+            raise ValueError("Low-order public key")
+        return shared
+
+
+@dataclass
+class SessionKeys:
+    """Key material for one Pneuma session with one peer."""
+    session_id: str
+    key: bytes  # AES-256 key
+    nonce_salt: bytes  # Salt for SessionCipher counter nonces
+    local_public: bytes  # Public key the peer needs to derive the same keys
+    session_nonce: bytes = b""  # HKDF salt; sent with SessionInit
+    _ciphers: Dict[int, SessionCipher] = field(default_factory=dict, repr=False, compare=False)
+
+    def cipher(self, sender: int) -> SessionCipher:
+        """
+        The on-air SessionCipher for this session and sender.
+
+        Built once and reused: a second cipher would restart the nonce
+        counter at 0 under the same key and salt.
+        """
+        cipher = self._ciphers.get(sender)
+        if cipher is None:
+            cipher = self._ciphers[sender] = SessionCipher(self.key, self.nonce_salt, sender=sender)
+        return cipher
+
+
+def derive_session_keys(
+    shared_secret: bytes,
+    session_id: str,
+    local_public: bytes = b"",
+    session_nonce: bytes = b"",
+) -> SessionKeys:
+    """Derive the AES key and nonce salt for one session via HKDF-SHA256."""
+    material = derive_session_key(
+        shared_secret,
+        salt=session_nonce,
+        info=b"lyceum-session-v1:" + session_id.encode("utf-8"),
+        length=32 + SessionCipher.SALT_SIZE,
+    )
+    return SessionKeys(
+        session_id=session_id,
+        key=material[:32],
+        nonce_salt=material[32:],
+        local_public=local_public,
+        session_nonce=session_nonce,
+    )
+
+
+@dataclass
+class PeerRelationship:
+    """Cached X25519 result for one peer."""
+    peer_public: bytes
+    local: X25519KeyPair
+    shared_secret: bytes
+    created: float
+    sessions: Dict[str, SessionKeys] = field(default_factory=dict)
+    uses: int = 0
+
+
+@dataclass
+class KeyCacheStats:
+    handshakes: int = 0
+    hits: int = 0
+    rotations: int = 0
+
+
+class SessionKeyCache:
+    """
+    Per-peer, per-session cache of derived session keys.
+
+    Moderators use ephemeral local keys (one fresh key pair per
+    relationship, sent to the Guardian with SessionInit) and pick a fresh
+    session nonce for every derivation. Guardians pass their static key
+    pair and look up the Moderator's ephemeral key and session nonce.
+
+    A Guardian can be handed the same public key and nonce again (after a
+    rotation, forget_session() or invalidate()), which derives the same key
+    and salt. The cache keeps the SessionCiphers of every key it derived
+    from a supplied nonce so their counters carry on instead of restarting
+    at 0 and reusing nonces.
+    """
+
+    def __init__(
+        self,
+        static_keypair: Optional[X25519KeyPair] = None,
+        max_age_s: float = 3600.0,
+        max_sessions: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            static_keypair: Long-term key pair; None for ephemeral keys
+            max_age_s: Rotate a relationship after this many seconds
+            max_sessions: Rotate after this many distinct sessions
+            clock: Monotonic time source (for tests)
+        """
+        self.static_keypair = static_keypair
+        self.max_age_s = max_age_s
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._peers: Dict[str, PeerRelationship] = {}
+        self._ciphers: Dict[bytes, Dict[int, SessionCipher]] = {}
+        self.stats = KeyCacheStats()
+
+    def _fresh(self, rel: PeerRelationship, peer_public: bytes) -> bool:
+        return (
+            rel.peer_public == peer_public
+            and self._clock() - rel.created < self.max_age_s
+            and rel.uses < self.max_sessions
+        )
+
+    def _handshake(self, peer_id: str, peer_public: bytes) -> PeerRelationship:
+        local = self.static_keypair or X25519KeyPair.generate()
+        rel = PeerRelationship(
+            peer_public=bytes(peer_public),
+            local=local,
+            shared_secret=local.exchange(peer_public),
+            created=self._clock(),
+        )
+        if peer_id in self._peers:
+            self.stats.rotations += 1
+        self._peers[peer_id] = rel
+        self.stats.handshakes += 1
+        return rel
+
+    def session_keys(
+        self,
+        peer_id: str,
+        peer_public: bytes,
+        session_id: str,
+        session_nonce: Optional[bytes] = None,
+    ) -> SessionKeys:
+        """
+        Get keys for a session, running the X25519 handshake only when the
+        peer is new, its key changed, or the relationship is due for rotation.
+
+        Args:
+            session_nonce: The nonce from the peer's SessionInit; None to
+                pick a fresh one (send keys.session_nonce to the peer)
+        """
+        rel = self._peers.get(peer_id)
+        if rel is not None:
+            keys = rel.sessions.get(session_id)
+            if (
+                keys is not None
+                and rel.peer_public == peer_public
+                and session_nonce in (None, keys.session_nonce)
+            ):
+                self.stats.hits += 1
+                return keys
+        if rel is None or not self._fresh(rel, peer_public):
+            rel = self._handshake(peer_id, peer_public)
+        else:
+            self.stats.hits += 1
+
+        if session_nonce is None:
+            keys = derive_session_keys(
+                rel.shared_secret, session_id, rel.local.public_bytes,
+                get_random_bytes(SESSION_NONCE_SIZE),
+            )
+        else:
+            keys = derive_session_keys(
+                rel.shared_secret, session_id, rel.local.public_bytes, bytes(session_nonce),
+            )
+            # The same inputs derive the same key: keep counting where we stopped
+            keys._ciphers = self._ciphers.setdefault(keys.key + keys.nonce_salt, keys._ciphers)
+        rel.sessions[session_id] = keys
+        rel.uses += 1
+        return keys
+
+    def forget_session(self, peer_id: str, session_id: str):
+        """Discard a session's keys (post-synthesis, per PNEUMA_ARCHITECTURE.md)."""
+        rel = self._peers.get(peer_id)
+        if rel is not None:
+            rel.sessions.pop(session_id, None)
+
+    def invalidate(self, peer_id: str):
+        """Drop a peer so the next session runs a fresh handshake."""
+        self._peers.pop(peer_id, None)
+
+    def local_public(self, peer_id: str) -> Optional[bytes]:
+        """Public key currently used with a peer (to send in SessionInit)."""
+        rel = self._peers.get(peer_id)
+        return rel.local.public_bytes if rel else None
@@ -0,0 +1,218 @@
+"""
+Session-scoped AES-GCM for on-air LoRa frames.
+
+A random 12-byte nonce per frame costs airtime and an RNG call on every
+transmit. Within a session the nonce is instead built from:
+
+    salt (6 bytes, fixed per session) + sender (2 bytes) + counter (4 bytes)
+
+Only the sender address and counter go on air, and both are authenticated
+because they are part of the nonce:
+
+Format: sender (2 bytes) + counter (4 bytes) + tag (16 bytes) + ciphertext
+
+That is 22 bytes of overhead instead of 28. Receivers keep a sliding-window
+replay bitmap per sender, so a captured frame cannot be replayed.
+"""
+from typing import Dict, Optional
+from Crypto.Random import get_random_bytes
+
+from .backends import select_backend
+
+
+class ReplayWindow:
+    """
+    Sliding-window anti-replay filter (as in IPsec, RFC 4303).
+
+    Accepts each counter at most once, tolerating reordering of up to
+    `size` frames behind the highest counter seen.
+    """
+
+    def __init__(self, size: int = 64):
+        if size < 1:
+            raise ValueError("Window size must be positive")
+        self.size = size
+        self.highest = -1
+        self._bitmap = 0  # Bit i set = (highest - i) already seen
+
+    def check(self, counter: int) -> bool:
+        """Return True if counter is new and inside the window."""
+        if counter > self.highest:
+            return True
+        offset = self.highest - counter
+        if offset >= self.size:
+            return False
+        return not (self._bitmap >> offset) & 1
+
+    def update(self, counter: int):
+        """Mark counter as seen. Call only after the frame authenticated."""
+        if counter > self.highest:
+            # A jump past the whole window clears it; don't build a huge int
+            shift = min(counter - self.highest, self.size)
+            self._bitmap = ((self._bitmap << shift) | 1) & ((1 << self.size) - 1)
+            self.highest = counter
+        else:
+            self._bitmap |= 1 << (self.highest - counter)
+
+
+class SessionCipher:
+    """
+    AES-GCM with counter-based nonces and per-sender replay protection.
+
+    Both ends must share the key and the session salt (sent in SessionInit
+    or derived with the session key). Each sender must use a distinct
+    address so no nonce is ever reused under the key.
+    """
+
+    SALT_SIZE = 6
+    SENDER_SIZE = 2
+    COUNTER_SIZE = 4
+    TAG_SIZE = 16
+    HEADER_SIZE = SENDER_SIZE + COUNTER_SIZE
+    MAX_COUNTER = (1 << (8 * COUNTER_SIZE)) - 1
+
+    def __init__(
+        self,
+        key: bytes,
+        salt: bytes,
+        sender: int,
+        window_size: int = 64,
+        backend: Optional[str] = None,
+    ):
+        """
+        Initialize a session cipher.
+
+        Args:
+            key: AES session key (16, 24, or 32 bytes)
+            salt: Per-session salt (6 bytes)
+            sender: This node's 16-bit address
+            window_size: Replay window per remote sender, in frames
+            backend: Force an AEAD backend (see lyceum.crypto.backends)
+        """
+        if len(key) not in (16, 24, 32):
+            raise ValueError("Key must be 16, 24, or 32 bytes")
+        if len(salt) != self.SALT_SIZE:
+            raise ValueError(f"Salt must be {self.SALT_SIZE} bytes")
+        self.key = key
+        self.salt = salt
+        self.sender = sender & 0xFFFF
+        self.window_size = window_size
+        self._counter = 0
+        self._windows: Dict[int, ReplayWindow] = {}
+        self._aead = select_backend(backend)(key)
+        self._rx_nonce = bytearray(salt + bytes(self.HEADER_SIZE))
+
+    @classmethod
+    def new_salt(cls) -> bytes:
+        """Generate a random salt for a new session."""
+        return get_random_bytes(cls.SALT_SIZE)
+
+    def _nonce(self, header: bytes) -> bytes:
+        return self.salt + header
+
+    def encrypt(self, plaintext: bytes, associated_data: bytes = b"") -> bytes:
+        """
+        Encrypt a frame with the next counter value.
+
+        Returns:
+            sender + counter + tag + ciphertext
+
+        Raises:
+            OverflowError: If the counter space is exhausted (rekey needed)
+        """
+        if self._counter > self.MAX_COUNTER:
+            raise OverflowError("Nonce counter exhausted; start a new session")
+        header = self.sender.to_bytes(2, "big") + self._counter.to_bytes(4, "big")
+        self._counter += 1
+
+        ciphertext, tag = self._aead.encrypt(self._nonce(header), plaintext, associated_data)
+        return header + tag + ciphertext
+
+    def decrypt(self, blob: bytes, associated_data: bytes = b"") -> Optional[bytes]:
+        """
+        Verify and decrypt a frame, rejecting replays.
+
+        Returns:
+            Plaintext, or None if the frame is malformed, fails
+            authentication, or was already received
+        """
+        if len(blob) < self.HEADER_SIZE + self.TAG_SIZE:
+            return None
+        header = bytes(blob[:self.HEADER_SIZE])
+        sender = int.from_bytes(header[:2], "big")
+        counter = int.from_bytes(header[2:], "big")
+
+        window = self._windows.get(sender)
+        if window is not None and not window.check(counter):
+            return None
+
+        plaintext = self._aead.decrypt(
+            self._nonce(header),
+            blob[self.HEADER_SIZE + self.TAG_SIZE:],
+            blob[self.HEADER_SIZE:self.HEADER_SIZE + self.TAG_SIZE],
+            associated_data,
+        )
+        if plaintext is None:
+            return None
+
+        # Only authenticated frames may advance the window
+        if window is None:
+            window = self._windows[sender] = ReplayWindow(self.window_size)
+        window.update(counter)
+        return plaintext
+
+    def decrypt_into(
+        self,
+        blob,
+        out,
+        associated_data: bytes = b"",
+    ) -> Optional[memoryview]:
+        """
+        Like decrypt(), but writes the plaintext into `out` and returns a
+        view of it instead of allocating a new bytes object.
+
+        Raises:
+            ValueError: If `out` is too small for the ciphertext
+        """
+        overhead = self.HEADER_SIZE + self.TAG_SIZE
+        if len(blob) < overhead:
+            return None
+        view = blob if isinstance(blob, memoryview) else memoryview(blob)
+        size = len(view) - overhead
+        if size > len(out):
+            raise ValueError(f"Output buffer too small: {len(out)} < {size}")
+        sender = int.from_bytes(view[:2], "big")
+        counter = int.from_bytes(view[2:self.HEADER_SIZE], "big")
+
+        window = self._windows.get(sender)
+        if window is not None and not window.check(counter):
+            return None
+
+        nonce = self._rx_nonce
+        nonce[self.SALT_SIZE:] = view[:self.HEADER_SIZE]
+        target = (out if isinstance(out, memoryview) else memoryview(out))[:size]
+        if not self._aead.decrypt_into(
+            nonce,
+            view[overhead:],
+            view[self.HEADER_SIZE:overhead],
+            target,
+            associated_data,
+        ):
+            return None
+
+        if window is None:
+            window = self._windows[sender] = ReplayWindow(self.window_size)
+        window.update(counter)
+        return target
+
+    @classmethod
+    def peek_sender(cls, blob: bytes) -> Optional[int]:
+        """Read the (unauthenticated) sender address from a frame header."""
+        if len(blob) < cls.HEADER_SIZE:
+            return None
+        return int.from_bytes(blob[:2], "big")
+
+    @property
+    def counter(self) -> int:
+        """Next counter value this node will send."""
+        return self._counter
@@ -0,0 +1,280 @@
+"""
+Store-and-forward custody queue for destinations that are out of range.
+
+A message sent to a node that is not currently reachable used to be
+lost after the link layer gave up. CustodyQueue takes custody of such
+messages in SQLite (WAL mode, so a crash or restart keeps them) and
+hands them back for another attempt:
+
+- as soon as the destination is heard again (heard()), the cheap and
+  likely-to-succeed moment on a mesh whose nodes come and go
+- otherwise on a slow backoff timer (due()), `retry_s` doubling per
+  attempt up to `max_retry_s`, in case the node is there but quiet
+
+Each message expires `ttl_s` after it was queued. Custody is refused
+(add() returns None) once a destination holds `max_per_destination`
+messages or the queue holds `max_total`. A message handed out for an
+attempt is "in flight" until delivered() or failed() is called.
+
+Times are wall-clock (time.time) so expiry and latency hold across
+restarts.
+
+Every held message is kept in memory as well (capacity is bounded by
+`max_total`), so heard(), due(), deadline and the counters never touch
+the database: heard() runs for every received packet on the event loop.
+Changes are queued as SQL writes; take_writes() collects them on the
+owner's thread and write() applies a batch in one WAL transaction
+(synchronous=NORMAL), in a worker thread. Batches must be written in
+the order they were taken. Only opening the queue reads the database.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+import sqlite3
+import time
+
+from .workers import LatencyStats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS custody (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    destination INTEGER NOT NULL,
+    channel INTEGER,
+    priority TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS custody_destination ON custody (destination, id);
+"""
+
+_COLUMNS = "id, destination, channel, priority, message, created, expires, attempts, next_attempt"
+
+
+@dataclass
+class CustodyEntry:
+    id: int
+    destination: int
+    channel: Optional[int]
+    priority: str
+    message: str
+    created: float
+    expires: float
+    attempts: int = 0
+    next_attempt: float = 0.0
+
+
+@dataclass
+class CustodyStats:
+    queued: int = 0
+    delivered: int = 0
+    expired: int = 0
+    refused: int = 0  # Over a capacity limit
+    attempts: int = 0
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class CustodyQueue:
+    """Messages held until their destination can be reached, in SQLite."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_s: float = 24 * 3600,
+        max_per_destination: int = 20,
+        max_total: int = 1000,
+        retry_s: float = 300.0,
+        max_retry_s: float = 3600.0,
+        clock=time.time,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_per_destination = max_per_destination
+        self.max_total = max_total
+        self.retry_s = retry_s
+        self.max_retry_s = max_retry_s
+        self._clock = clock
+        # Opened in a worker thread by Home Assistant; later writes come
+        # from worker threads too, one batch at a time
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._entries: Dict[int, CustodyEntry] = {}  # By id, oldest first
+        self._by_destination: Dict[int, List[CustodyEntry]] = {}
+        rows = self._db.execute(f"SELECT {_COLUMNS} FROM custody ORDER BY id")
+        for entry in (CustodyEntry(*row) for row in rows):
+            self._hold(entry)
+        row = self._db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'custody'").fetchone()
+        self._next_id = max([row[0] if row else 0] + list(self._entries)) + 1
+        self._writes: List[Tuple[str, tuple]] = []
+        self._inflight: Set[int] = set()
+        self.stats = CustodyStats()
+        self.latency = LatencyStats()  # Queued to delivered, seconds
+
+    def close(self):
+        """Write anything still queued and close the database (blocking)."""
+        self.flush()
+        self._db.close()
+
+    # --- Persistence --------------------------------------------------
+
+    def take_writes(self) -> List[Tuple[str, tuple]]:
+        """The SQL writes queued since the last call, for write()."""
+        writes, self._writes = self._writes, []
+        return writes
+
+    def write(self, writes: List[Tuple[str, tuple]]):
+        """Apply a batch from take_writes() in one transaction (blocking)."""
+        if not writes:
+            return
+        with self._db:
+            self._db.execute("BEGIN")
+            for sql, args in writes:
+                self._db.execute(sql, args)
+
+    def flush(self):
+        """Write everything queued now, on the calling thread (blocking)."""
+        self.write(self.take_writes())
+
+    @property
+    def unsaved(self) -> int:
+        return len(self._writes)
+
+    # --- In-memory index ------------------------------------------------
+
+    def _hold(self, entry: CustodyEntry):
+        self._entries[entry.id] = entry
+        self._by_destination.setdefault(entry.destination, []).append(entry)
+
+    def _release(self, entry: CustodyEntry):
+        del self._entries[entry.id]
+        held = self._by_destination[entry.destination]
+        held.remove(entry)
+        if not held:
+            del self._by_destination[entry.destination]
+        self._inflight.discard(entry.id)
+        self._writes.append(("DELETE FROM custody WHERE id = ?", (entry.id,)))
+
+    @property
+    def depth(self) -> int:
+        return len(self._entries)
+
+    def depth_by_destination(self) -> Dict[int, int]:
+        return {destination: len(held) for destination, held in self._by_destination.items()}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def add(
+        self,
+        destination: int,
+        message: str,
+        channel: Optional[int] = None,
+        priority: str = "relay",
+        ttl_s: Optional[float] = None,
+    ) -> Optional[CustodyEntry]:
+        """Take custody of a message; None if a capacity limit is reached."""
+        now = self._clock()
+        self.expire(now)
+        held = len(self._by_destination.get(destination, ()))
+        if held >= self.max_per_destination or self.depth >= self.max_total:
+            self.stats.refused += 1
+            return None
+        expires = now + (self.ttl_s if ttl_s is None else ttl_s)
+        entry = CustodyEntry(self._next_id, destination, channel, priority, message, now, expires, 0, now)
+        self._next_id += 1
+        self._hold(entry)
+        self._writes.append((
+            f"INSERT INTO custody ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (entry.id, destination, channel, priority, message, now, expires, 0, now),
+        ))
+        self.stats.queued += 1
+        return entry
+
+    def _claim(self, entries: List[CustodyEntry], now: float) -> List[CustodyEntry]:
+        """Mark entries in flight and push back their next timed attempt."""
+        out = []
+        for entry in entries:
+            if entry.id in self._inflight:
+                continue
+            entry.attempts += 1
+            entry.next_attempt = now + min(self.max_retry_s, self.retry_s * 2 ** (entry.attempts - 1))
+            self._writes.append((
+                "UPDATE custody SET attempts = ?, next_attempt = ? WHERE id = ?",
+                (entry.attempts, entry.next_attempt, entry.id),
+            ))
+            self._inflight.add(entry.id)
+            self.stats.attempts += 1
+            out.append(entry)
+        return out
+
+    def heard(self, node: int, now: Optional[float] = None) -> List[CustodyEntry]:
+        """`node` was heard: its held messages, claimed for an attempt now."""
+        held = self._by_destination.get(node)
+        if not held:
+            return []  # The common case: one dict lookup per packet
+        if now is None:
+            now = self._clock()
+        return self._claim([entry for entry in held if entry.expires > now], now)
+
+    def due(self, now: Optional[float] = None) -> List[CustodyEntry]:
+        """Expire old messages; those whose timed retry is due, claimed."""
+        if now is None:
+            now = self._clock()
+        self.expire(now)
+        return self._claim([e for e in self._entries.values() if e.next_attempt <= now], now)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """When due() next has work (a retry or an expiry)."""
+        times = [
+            # Messages in flight wait for their outcome, not the retry timer
+            entry.expires if entry.id in self._inflight else min(entry.next_attempt, entry.expires)
+            for entry in self._entries.values()
+        ]
+        return min(times) if times else None
+
+    def delivered(self, entry_id: int, now: Optional[float] = None) -> Optional[float]:
+        """The destination has the message; returns how long custody took."""
+        if now is None:
+            now = self._clock()
+        self._inflight.discard(entry_id)
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return None  # Expired meanwhile
+        self._release(entry)
+        latency = now - entry.created
+        self.latency.add(latency)
+        self.stats.delivered += 1
+        return latency
+
+    def failed(self, entry_id: int):
+        """The attempt did not get through; keep the message for the next one."""
+        self._inflight.discard(entry_id)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = self._clock()
+        expired = [entry for entry in self._entries.values() if entry.expires <= now]
+        for entry in expired:
+            self._release(entry)
+        self.stats.expired += len(expired)
+        return len(expired)
+
+    def to_dict(self) -> dict:
+        return dict(
+            self.stats.to_dict(),
+            depth=self.depth,
+            inflight=self.inflight,
+            latency_s={
+                "count": self.latency.count,
+                "p50": round(self.latency.percentile(50), 1),
+                "p95": round(self.latency.percentile(95), 1),
+                "max": round(self.latency.max, 1),
+            },
+        )
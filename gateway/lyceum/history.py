@@ -0,0 +1,124 @@
+"""
+Bounded in-memory history of recent gateway messages.
+
+Keeping recent traffic in Home Assistant's recorder means one database
+row per message event. MessageHistory instead keeps the last `capacity`
+messages in a ring of typed arrays - one slot per message, metadata
+packed into a few bytes and the text truncated to `max_text` bytes of
+UTF-8 - so memory use is fixed up front and never grows with traffic.
+
+- Received and sent messages are both recorded (direction flag)
+- query() returns the newest N entries, optionally filtered by sender
+  (received messages from that node) or channel
+"""
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import time
+
+RECEIVED = 0
+SENT = 1
+_NO_PEER = 0x10000  # Peer unknown (fits 'I', not an address)
+_NO_CHANNEL = 0xFF  # Channel chosen at send time (auto)
+
+# Fixed bytes per slot: time (d), peer (I), channel (B), flags (B),
+# rssi (h), snr (f), plus the text reference
+_SLOT_BYTES = 8 + 4 + 1 + 1 + 2 + 4 + 8
+
+
+class MessageHistory:
+    """Ring buffer of the last `capacity` messages, array-backed."""
+
+    def __init__(self, capacity: int = 500, max_text: int = 240, clock=time.time):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.max_text = max_text
+        self._clock = clock
+        self._time = array("d", bytes(8 * capacity))
+        self._peer = array("I", [_NO_PEER]) * capacity
+        self._channel = array("B", bytes(capacity))
+        self._flags = array("B", bytes(capacity))
+        self._rssi = array("h", bytes(2 * capacity))
+        self._snr = array("f", bytes(4 * capacity))
+        self._text: List[bytes] = [b""] * capacity
+        self._head = 0  # Next slot to write
+        self._count = 0
+        self.total = 0  # Messages ever recorded
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        """Upper bound on the memory held by the entries."""
+        return self.capacity * (_SLOT_BYTES + self.max_text)
+
+    def record(
+        self,
+        direction: int,
+        message: str,
+        peer: Optional[int] = None,
+        channel: Optional[int] = None,
+        rssi: int = 0,
+        snr: float = 0.0,
+        when: Optional[float] = None,
+    ):
+        """Store one message, overwriting the oldest once full."""
+        i = self._head
+        self._time[i] = self._clock() if when is None else when
+        self._peer[i] = _NO_PEER if peer is None else peer & 0xFFFF
+        self._channel[i] = _NO_CHANNEL if channel is None else channel
+        self._flags[i] = direction
+        self._rssi[i] = max(-32768, min(32767, int(rssi)))
+        self._snr[i] = snr
+        # Truncate on a character boundary so every entry decodes cleanly
+        self._text[i] = message.encode("utf-8")[: self.max_text].decode("utf-8", "ignore").encode("utf-8")
+        self._head = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.total += 1
+
+    def _entry(self, i: int) -> Dict[str, Any]:
+        peer = self._peer[i]
+        channel = self._channel[i]
+        received = self._flags[i] == RECEIVED
+        entry = {
+            "direction": "received" if received else "sent",
+            "sender" if received else "destination": None if peer == _NO_PEER else hex(peer),
+            "channel": None if channel == _NO_CHANNEL else channel,
+            "message": self._text[i].decode("utf-8"),
+            "timestamp": datetime.fromtimestamp(self._time[i]).isoformat(),
+        }
+        if received:
+            entry["rssi"] = self._rssi[i]
+            entry["snr"] = round(self._snr[i], 1)
+        return entry
+
+    def query(
+        self,
+        count: int = 20,
+        sender: Optional[int] = None,
+        channel: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The newest `count` matching entries, oldest first.
+
+        sender matches received messages from that node; channel matches
+        messages heard or sent on that channel.
+        """
+        matches = []
+        for back in range(1, self._count + 1):
+            if len(matches) >= count:
+                break
+            i = (self._head - back) % self.capacity
+            if sender is not None and (self._flags[i] != RECEIVED or self._peer[i] != sender):
+                continue
+            if channel is not None and self._channel[i] != channel:
+                continue
+            matches.append(i)
+        return [self._entry(i) for i in reversed(matches)]
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+        self._text = [b""] * self.capacity
@@ -0,0 +1,49 @@
+# Lyceum Link Layer (E22 UART framing and radio scheduling)
+from .framing import FrameReassembler, RingBuffer, MODE_LENGTH, MODE_GAP
+from .airtime import LoRaModulation, e22_modulation
+from .scheduler import Priority, SchedulerConfig, TxScheduler
+from .flags import (
+    FLAG_COMPRESSED,
+    FLAG_FRAGMENT,
+    FLAG_CONTROL,
+    FLAG_AGGREGATE,
+    FLAG_RELIABLE,
+    FLAG_ACK,
+    FLAG_FEC,
+)
+from .aggregate import Aggregator
+from .arq import ArqEndpoint
+from .fec import AdaptiveRedundancy, FecEndpoint, ReedSolomon
+from .adr import AdrController, DataRate, e22_ladder, sx126x_ladder
+from .multiradio import ChannelLoad, RadioBalancer, RxMerger
+
+__all__ = [
+    "FrameReassembler",
+    "RingBuffer",
+    "MODE_LENGTH",
+    "MODE_GAP",
+    "LoRaModulation",
+    "e22_modulation",
+    "Priority",
+    "SchedulerConfig",
+    "TxScheduler",
+    "FLAG_COMPRESSED",
+    "FLAG_FRAGMENT",
+    "FLAG_CONTROL",
+    "FLAG_AGGREGATE",
+    "FLAG_RELIABLE",
+    "FLAG_ACK",
+    "FLAG_FEC",
+    "Aggregator",
+    "ArqEndpoint",
+    "AdaptiveRedundancy",
+    "FecEndpoint",
+    "ReedSolomon",
+    "AdrController",
+    "DataRate",
+    "e22_ladder",
+    "sx126x_ladder",
+    "ChannelLoad",
+    "RadioBalancer",
+    "RxMerger",
+]
@@ -0,0 +1,408 @@
+"""
+Adaptive data rate (ADR) for LoRa links.
+
+An AdrController keeps per-neighbor link quality (EWMA of SNR and RSSI)
+and moves the radio along a ladder of data rates, slowest first:
+
+- E22 (e22_ladder): REG0 air rate codes 2.4k .. 62.5k. The module only
+  reports RSSI (the byte appended with REG3 bit 7), so SNR is estimated
+  as RSSI minus the receiver noise floor.
+- SX126x (sx126x_ladder): spreading factor 12 .. 5 at one bandwidth,
+  with SNR measured per packet (LoRaHAT.get_snr()).
+
+A rate is supported when the SNR clears its demodulation floor plus
+`margin_db`. The controller steps up one rate at a time, only after
+`min_samples` fresh samples and with a further `hysteresis_db`, and steps
+down as far as needed at once, or by one when the packet error rate over
+the last `per_window` outcomes exceeds `per_limit`. An E22 listens at a
+single air rate, so the radio's rate is the lowest any active neighbor
+supports.
+
+Both ends of a link must change together. Rate changes are agreed with
+every active neighbor with control frames (FLAG_CONTROL):
+
+    header(src, dst, seq=token, flags=FLAG_CONTROL) + kind(1) + rate(1) + snr(1)
+
+kind is PROPOSE, ACCEPT, REJECT (rate = the highest the peer supports)
+or COMMIT; snr is the sender's view of the link in 0.5 dB steps. The
+proposer commits once every neighbor has accepted, and each side
+switches `settle_s` after the commit. If a commit is lost, the two ends
+stop hearing each other; after `fallback_s` of silence both drop back to
+the slowest rate, which every node treats as the meeting point.
+
+Sans-IO like the other link layers: transmit(dst, frame) sends a control
+frame, apply(rate) retunes the radio; call observe() for every received
+frame, on_frame() with control frames, record_tx() with delivery
+outcomes (e.g. ARQ acks), and poll() at `deadline`.
+"""
+import math
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .airtime import E22_AIR_RATES, E22_NOMINAL_RATES, NOISE_FIGURE_DB, SNR_FLOOR_DB, LoRaModulation
+from .flags import FLAG_CONTROL
+
+
+_HEADER = struct.Struct(">HHBB")  # src, dst, seq, flags
+_CONTROL = struct.Struct(">BBb")  # kind, rate index, snr (0.5 dB)
+
+ADR_PROPOSE = 1
+ADR_ACCEPT = 2
+ADR_REJECT = 3
+ADR_COMMIT = 4
+SNR_UNKNOWN = -128
+
+
+@dataclass(frozen=True)
+class DataRate:
+    """One step of the ladder: what to tell the radio, and its airtime model."""
+    name: str
+    modulation: LoRaModulation
+    code: int  # E22 REG0 air rate code, or SX126x spreading factor
+
+    @property
+    def snr_floor(self) -> float:
+        return SNR_FLOOR_DB[self.modulation.spreading_factor]
+
+
+def e22_ladder() -> List[DataRate]:
+    """E22 air rates, slowest first (codes 0-1 duplicate 2)."""
+    return [
+        DataRate(f"{E22_NOMINAL_RATES[code] / 1000:g}k", E22_AIR_RATES[code], code)
+        for code in range(2, 8)
+    ]
+
+
+def sx126x_ladder(bandwidth: int = 125_000, coding_rate: int = 5) -> List[DataRate]:
+    """SX126x spreading factors 12 .. 5 at one bandwidth, slowest first."""
+    return [
+        DataRate(
+            f"SF{sf}",
+            LoRaModulation(spreading_factor=sf, bandwidth=bandwidth, coding_rate=coding_rate),
+            sf,
+        )
+        for sf in range(12, 4, -1)
+    ]
+
+
+def e22_rssi_dbm(raw: int) -> int:
+    """dBm from the RSSI byte an E22 appends to each packet (REG3 bit 7)."""
+    return -(256 - raw)
+
+
+def noise_floor_dbm(modulation: LoRaModulation) -> float:
+    """Thermal noise in the channel bandwidth plus the receiver noise figure."""
+    return -174 + 10 * math.log10(modulation.bandwidth) + NOISE_FIGURE_DB
+
+
+def is_control(frame) -> bool:
+    return len(frame) >= _HEADER.size + _CONTROL.size and bool(frame[5] & FLAG_CONTROL)
+
+
+def encode_control(src: int, dst: int, token: int, kind: int, rate: int, snr: Optional[float]) -> bytes:
+    q = SNR_UNKNOWN if snr is None else max(-127, min(127, round(snr * 2)))
+    return _HEADER.pack(src, dst, token & 0xFF, FLAG_CONTROL) + _CONTROL.pack(kind, rate, q)
+
+
+@dataclass
+class LinkQuality:
+    """What we know about one neighbor's link."""
+    snr: Optional[float] = None  # EWMA, dB, as we hear them
+    rssi: Optional[float] = None  # EWMA, dBm
+    remote_snr: Optional[float] = None  # How they hear us (from control frames)
+    samples: int = 0  # Since the last rate change
+    last_heard: float = 0.0
+
+
+@dataclass
+class RateStats:
+    """Traffic while the radio was at one data rate."""
+    name: str
+    seconds: float = 0.0
+    tx_packets: int = 0
+    tx_errors: int = 0
+    rx_packets: int = 0
+    bytes: int = 0  # Payload delivered (acked TX plus RX)
+
+    def to_dict(self, extra_seconds: float = 0.0) -> dict:
+        seconds = self.seconds + extra_seconds
+        return {
+            "seconds": round(seconds, 1),
+            "tx_packets": self.tx_packets,
+            "tx_errors": self.tx_errors,
+            "rx_packets": self.rx_packets,
+            "per": round(self.tx_errors / self.tx_packets, 4) if self.tx_packets else None,
+            "throughput_bps": round(8 * self.bytes / seconds, 1) if seconds > 0 else None,
+        }
+
+
+@dataclass
+class _Proposal:
+    rate: int
+    token: int
+    waiting: set
+    deadline: float
+    committed: bool = False
+
+
+class AdrController:
+    """Pick and negotiate the data rate for one radio."""
+
+    def __init__(
+        self,
+        address: int,
+        ladder: List[DataRate],
+        transmit: Callable[[int, bytes], None],
+        apply: Callable[[DataRate], None],
+        initial: int = 0,
+        margin_db: float = 5.0,
+        hysteresis_db: float = 3.0,
+        min_samples: int = 8,
+        alpha: float = 0.2,
+        per_limit: float = 0.3,
+        per_window: int = 20,
+        noise_dbm: Optional[float] = None,
+        settle_s: float = 1.0,
+        response_timeout: float = 5.0,
+        holdoff_s: float = 30.0,
+        fallback_s: float = 60.0,
+        neighbor_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not ladder:
+            raise ValueError("Empty data rate ladder")
+        self.address = address
+        self.ladder = ladder
+        self.transmit = transmit
+        self.apply = apply
+        self.margin_db = margin_db
+        self.hysteresis_db = hysteresis_db
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.per_limit = per_limit
+        self.per_window = per_window
+        # Noise floor for SNR estimates from RSSI (E22); None: per modulation
+        self.noise_dbm = noise_dbm
+        self.settle_s = settle_s
+        self.response_timeout = response_timeout
+        self.holdoff_s = holdoff_s
+        self.fallback_s = fallback_s
+        self.neighbor_timeout = neighbor_timeout
+        self._clock = clock
+        self.index = initial
+        self.peers: Dict[int, LinkQuality] = {}
+        self.stats = [RateStats(rate.name) for rate in ladder]
+        self.changes = 0
+        self.fallbacks = 0
+        now = clock()
+        self._since = now
+        self._last_heard = now
+        self._outcomes = deque(maxlen=per_window)
+        self._proposal: Optional[_Proposal] = None
+        self._accepted: Dict[int, tuple] = {}  # Proposer -> (token, rate, expiry)
+        self._switch: Optional[tuple] = None  # (at, rate)
+        self._holdoff_until = 0.0
+        self._token = 0
+
+    @property
+    def rate(self) -> DataRate:
+        return self.ladder[self.index]
+
+    # --- Measurements -----------------------------------------------------
+
+    def observe(self, peer: int, rssi: Optional[float] = None, snr: Optional[float] = None, size: int = 0):
+        """Record one frame received from `peer` (RSSI in dBm, SNR in dB)."""
+        now = self._clock()
+        if snr is None and rssi is not None:
+            noise = self.noise_dbm if self.noise_dbm is not None else noise_floor_dbm(self.rate.modulation)
+            snr = rssi - noise
+        q = self.peers.setdefault(peer, LinkQuality())
+        if snr is not None:
+            q.snr = snr if q.snr is None else q.snr + self.alpha * (snr - q.snr)
+        if rssi is not None:
+            q.rssi = rssi if q.rssi is None else q.rssi + self.alpha * (rssi - q.rssi)
+        q.samples += 1
+        q.last_heard = self._last_heard = now
+        stats = self.stats[self.index]
+        stats.rx_packets += 1
+        stats.bytes += size
+        self._evaluate(now)
+
+    def record_tx(self, size: int, ok: bool):
+        """Record a delivery outcome at the current rate (e.g. ARQ ack or loss)."""
+        stats = self.stats[self.index]
+        stats.tx_packets += 1
+        if ok:
+            stats.bytes += size
+        else:
+            stats.tx_errors += 1
+        self._outcomes.append(ok)
+        self._evaluate(self._clock())
+
+    def supported(self, snr: Optional[float], extra_db: float = 0.0) -> int:
+        """Highest ladder index whose SNR floor (+ margin) `snr` clears."""
+        best = 0
+        if snr is None:
+            return best
+        for i, rate in enumerate(self.ladder):
+            if snr >= rate.snr_floor + self.margin_db + extra_db:
+                best = i
+        return best
+
+    def _active(self, now: float) -> Dict[int, LinkQuality]:
+        return {
+            peer: q for peer, q in self.peers.items()
+            if now - q.last_heard <= self.neighbor_timeout
+        }
+
+    def _evaluate(self, now: float):
+        if self._proposal is not None or self._switch is not None or self._accepted:
+            return  # Negotiating
+        active = self._active(now)
+        if not active or any(q.samples < self.min_samples for q in active.values()):
+            return
+        snr = min(q.snr for q in active.values() if q.snr is not None) if any(
+            q.snr is not None for q in active.values()) else None
+        if snr is None:
+            return
+        target = self.supported(snr)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.per_window // 2 and failures / len(self._outcomes) > self.per_limit:
+            target = min(target, self.index - 1)
+        if target > self.index:
+            # One step, with hysteresis, and not straight after a refusal
+            if now < self._holdoff_until or self.supported(snr, self.hysteresis_db) <= self.index:
+                return
+            target = self.index + 1
+        if 0 <= target != self.index:
+            self._propose(target, list(active), now)
+
+    # --- Negotiation ------------------------------------------------------
+
+    def _propose(self, rate: int, peers: list, now: float):
+        self._token = (self._token + 1) & 0xFF
+        self._proposal = _Proposal(rate, self._token, set(peers), now + self.response_timeout)
+        for peer in peers:
+            self._send(peer, self._token, ADR_PROPOSE, rate)
+
+    def _send(self, peer: int, token: int, kind: int, rate: int):
+        q = self.peers.get(peer)
+        self.transmit(peer, encode_control(self.address, peer, token, kind, rate, q.snr if q else None))
+
+    def on_frame(self, frame) -> bool:
+        """Handle a received frame; False if it is not a control frame."""
+        if not is_control(frame):
+            return False
+        src, _dst, token, _flags = _HEADER.unpack_from(frame)
+        kind, rate, snr = _CONTROL.unpack_from(frame, _HEADER.size)
+        if rate >= len(self.ladder):
+            raise ValueError(f"ADR rate index {rate} beyond the ladder")
+        now = self._clock()
+        q = self.peers.setdefault(src, LinkQuality(last_heard=now))
+        if snr != SNR_UNKNOWN:
+            q.remote_snr = snr / 2
+        if kind == ADR_PROPOSE:
+            ours = self.supported(q.snr) if q.samples >= self.min_samples else 0
+            if self._proposal is not None and not self._proposal.committed:
+                if src > self.address:
+                    # Both proposed at once: the lower address goes first
+                    self._send(src, token, ADR_REJECT, ours)
+                    return True
+                self._proposal = None
+            if rate <= self.index or rate <= ours:
+                self._accepted[src] = (token, rate, now + self.response_timeout)
+                self._send(src, token, ADR_ACCEPT, rate)
+            else:
+                self._send(src, token, ADR_REJECT, ours)
+        elif kind == ADR_COMMIT:
+            accepted = self._accepted.pop(src, None)
+            if accepted is not None and accepted[:2] == (token, rate):
+                self._proposal = None  # Theirs wins over any of ours
+                self._switch = (now + self.settle_s, rate)
+        elif kind in (ADR_ACCEPT, ADR_REJECT):
+            proposal = self._proposal
+            if proposal is None or proposal.committed or token != proposal.token:
+                return True  # Stale
+            if kind == ADR_REJECT:
+                self._proposal = None
+                self._holdoff_until = now + self.holdoff_s
+            else:
+                proposal.waiting.discard(src)
+                if not proposal.waiting:
+                    proposal.committed = True
+                    for peer in self._active(now):
+                        self._send(peer, proposal.token, ADR_COMMIT, proposal.rate)
+                    self._proposal = None
+                    self._switch = (now + self.settle_s, proposal.rate)
+        else:
+            raise ValueError(f"Unknown ADR message kind {kind}")
+        return True
+
+    # --- Timers -----------------------------------------------------------
+
+    def poll(self, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        if self._switch is not None and now >= self._switch[0]:
+            rate = self._switch[1]
+            self._switch = None
+            self._change(rate, now)
+        if self._proposal is not None and now >= self._proposal.deadline:
+            self._proposal = None  # No answer from someone
+            self._holdoff_until = now + self.holdoff_s
+        for peer, (_, _, expiry) in list(self._accepted.items()):
+            if now >= expiry:
+                del self._accepted[peer]
+        if self.index != 0 and now - self._last_heard >= self.fallback_s:
+            self.fallbacks += 1
+            self._proposal = None
+            self._switch = None
+            self._change(0, now)
+        self._evaluate(now)
+
+    def _change(self, rate: int, now: float):
+        if rate == self.index:
+            return
+        self.stats[self.index].seconds += now - self._since
+        self._since = self._last_heard = now
+        self.index = rate
+        self.changes += 1
+        self._outcomes.clear()
+        for q in self.peers.values():
+            q.samples = 0  # Decide the next step on fresh measurements
+        self.apply(self.ladder[rate])
+
+    @property
+    def deadline(self) -> Optional[float]:
+        times = [expiry for _, _, expiry in self._accepted.values()]
+        if self._switch is not None:
+            times.append(self._switch[0])
+        if self._proposal is not None:
+            times.append(self._proposal.deadline)
+        if self.index != 0:
+            times.append(self._last_heard + self.fallback_s)
+        return min(times, default=None)
+
+    def report(self) -> dict:
+        """Per-rate throughput and packet error rate, plus the current state."""
+        now = self._clock()
+        return {
+            "rate": self.rate.name,
+            "changes": self.changes,
+            "fallbacks": self.fallbacks,
+            "neighbors": {
+                f"0x{peer:04X}": {
+                    "snr": None if q.snr is None else round(q.snr, 1),
+                    "rssi": None if q.rssi is None else round(q.rssi, 1),
+                    "remote_snr": q.remote_snr,
+                }
+                for peer, q in self._active(now).items()
+            },
+            "rates": {
+                stats.name: stats.to_dict(now - self._since if i == self.index else 0.0)
+                for i, stats in enumerate(self.stats)
+            },
+        }
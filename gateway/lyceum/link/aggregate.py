@@ -0,0 +1,185 @@
+"""
+Small-message aggregation.
+
+Every LoRa packet pays for its preamble and header on air, and every
+encrypted payload pays 28 bytes of AES-GCM nonce and tag (22 with
+SessionCipher). For telemetry, acknowledgements and short relay messages
+that overhead dominates. The Aggregator holds small LyceumFrames to the
+same destination for a short linger time and packs them into a single
+frame, which is then encrypted once:
+
+    src(2) dst(2) seq(1) flags(1)=FLAG_AGGREGATE
+    record*: len(1) seq(1) flags(1) payload(len - 2)
+
+Each record is an inner frame without its src/dst, which the outer frame
+already carries. A buffer is flushed when the next frame would not fit
+the MTU or its linger time expires; a buffer holding a single frame is
+sent as that frame, unchanged.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+import time
+
+from .flags import FLAG_AGGREGATE
+
+
+HEADER_SIZE = 6  # LyceumFrame src, dst, seq, flags
+RECORD_OVERHEAD = 1  # Length byte (seq/flags replace src/dst, so net -3)
+
+# Largest plaintext frame for one 240-byte E22 sub-packet: minus the
+# length-prefix byte and AES-GCM nonce + tag
+DEFAULT_MTU = 240 - 1 - 28
+
+
+def record_size(frame: bytes) -> int:
+    """Bytes a frame occupies inside an aggregate."""
+    return RECORD_OVERHEAD + len(frame) - 4
+
+
+def pack(frames: List[bytes]) -> bytes:
+    """Pack frames sharing src/dst into one aggregate frame."""
+    first = frames[0]
+    out = bytearray(first[:4])
+    out += bytes([first[4], FLAG_AGGREGATE])
+    for frame in frames:
+        body = memoryview(frame)[4:]
+        if len(body) > 255:
+            raise ValueError("Frame too large to aggregate")
+        out.append(len(body))
+        out += body
+    return bytes(out)
+
+
+def unpack(frame) -> Iterator[Tuple[int, int, memoryview]]:
+    """
+    Iterate (seq, flags, payload) records of an aggregate frame.
+
+    Payloads are views into `frame`. Raises ValueError on a truncated record.
+    """
+    view = memoryview(frame)
+    offset = HEADER_SIZE
+    while offset < len(view):
+        length = view[offset]
+        end = offset + 1 + length
+        if length < 2 or end > len(view):
+            raise ValueError("Truncated aggregate record")
+        yield view[offset + 1], view[offset + 2], view[offset + 3:end]
+        offset = end
+
+
+def is_aggregate(frame) -> bool:
+    return len(frame) >= HEADER_SIZE and bool(frame[5] & FLAG_AGGREGATE)
+
+
+@dataclass
+class _Pending:
+    frames: List[bytes]
+    size: int
+    started: float
+
+
+@dataclass
+class AggregatorStats:
+    messages: int = 0
+    frames_out: int = 0
+    aggregated: int = 0  # Output frames carrying more than one message
+    bypassed: int = 0  # Messages too large to aggregate
+
+    @property
+    def ratio(self) -> float:
+        """Messages per output frame."""
+        return self.messages / self.frames_out if self.frames_out else 0.0
+
+
+class Aggregator:
+    """
+    Coalesce small frames per key (e.g. destination, channel, priority).
+
+    emit(key, frame, count) receives each outgoing plaintext frame with
+    the number of messages it carries. Call poll() at `deadline` (e.g. via
+    loop.call_at) so lingering frames go out.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Hashable, bytes, int], None],
+        mtu: int = DEFAULT_MTU,
+        linger_s: float = 0.05,
+        max_message: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            emit: Receives (key, frame, message_count) for each output frame
+            mtu: Largest plaintext frame the link carries
+            linger_s: How long the first frame in a buffer may wait
+            max_message: Frames larger than this bypass aggregation
+                         (default: half the MTU)
+            clock: Monotonic time source
+        """
+        if mtu < HEADER_SIZE + 3:
+            raise ValueError("MTU too small")
+        self.emit = emit
+        self.mtu = mtu
+        self.linger_s = linger_s
+        self.max_message = max_message if max_message is not None else mtu // 2
+        self._clock = clock
+        self._pending: Dict[Hashable, _Pending] = {}
+        self.stats = AggregatorStats()
+
+    def add(self, key: Hashable, frame: bytes):
+        """Queue a LyceumFrame (as bytes) for the given key."""
+        self.stats.messages += 1
+        if len(frame) > self.max_message:
+            self.stats.bypassed += 1
+            self._send(key, [frame])
+            return
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            same_route = pending.frames[0][:4] == frame[:4]
+            if not same_route or pending.size + record_size(frame) > self.mtu:
+                self.flush(key)
+                pending = None
+        if pending is None:
+            self._pending[key] = _Pending([frame], HEADER_SIZE + record_size(frame), self._clock())
+        else:
+            pending.frames.append(frame)
+            pending.size += record_size(frame)
+            if pending.size + RECORD_OVERHEAD + 3 > self.mtu:
+                self.flush(key)  # Nothing else can fit
+
+    def _send(self, key: Hashable, frames: List[bytes]):
+        self.stats.frames_out += 1
+        if len(frames) == 1:
+            self.emit(key, frames[0], 1)
+        else:
+            self.stats.aggregated += 1
+            self.emit(key, pack(frames), len(frames))
+
+    def flush(self, key: Optional[Hashable] = None):
+        """Send the buffer for `key` now (all buffers when key is None)."""
+        keys = list(self._pending) if key is None else [key]
+        for k in keys:
+            pending = self._pending.pop(k, None)
+            if pending is not None:
+                self._send(k, pending.frames)
+
+    def poll(self, now: Optional[float] = None):
+        """Send buffers whose linger time has expired."""
+        if now is None:
+            now = self._clock()
+        for key in [k for k, p in self._pending.items() if now - p.started >= self.linger_s]:
+            self.flush(key)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Clock time at which the oldest buffer must be sent."""
+        if not self._pending:
+            return None
+        return min(p.started for p in self._pending.values()) + self.linger_s
+
+    @property
+    def pending(self) -> int:
+        """Messages currently held."""
+        return sum(len(p.frames) for p in self._pending.values())
@@ -0,0 +1,94 @@
+"""
+LoRa time-on-air.
+
+Implements the Semtech time-on-air formula (AN1200.13, SX1276/SX126x
+datasheets) for a packet of a given payload length:
+
+    Tsym      = 2^SF / BW
+    Tpreamble = (n_preamble + 4.25) * Tsym
+    n_payload = 8 + max(ceil((8*PL - 4*SF + 28 + 16*CRC - 20*IH)
+                             / (4*(SF - 2*DE))) * (CR + 4), 0)
+
+The E22 modules only expose a nominal "air data rate" (REG0 bits 2-0),
+so E22_AIR_RATES maps each setting to a spreading factor and bandwidth
+whose raw bitrate, SF * BW / 2^SF * 4/5, approximates the nominal rate
+(exact for 62.5k; conservative, i.e. slower, for the middle settings).
+"""
+from dataclasses import dataclass
+from typing import Dict
+import math
+
+
+# Demodulation SNR limit per spreading factor (SX126x datasheet), and a
+# typical receiver noise figure, for link budget estimates
+SNR_FLOOR_DB: Dict[int, float] = {
+    5: -2.5, 6: -5.0, 7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0,
+}
+NOISE_FIGURE_DB = 6.0
+
+
+@dataclass(frozen=True)
+class LoRaModulation:
+    """LoRa PHY parameters that determine airtime."""
+    spreading_factor: int = 7
+    bandwidth: int = 125_000  # Hz
+    coding_rate: int = 5  # 4/5 .. 4/8, given as the denominator
+    preamble: int = 8  # Symbols
+    explicit_header: bool = True
+    crc: bool = True
+
+    @property
+    def symbol_time(self) -> float:
+        return (1 << self.spreading_factor) / self.bandwidth
+
+    @property
+    def low_data_rate_optimize(self) -> bool:
+        # Mandated when a symbol lasts longer than 16 ms
+        return self.symbol_time > 0.016
+
+    @property
+    def bitrate(self) -> float:
+        """Raw PHY bitrate in bits/s (before preamble and header overhead)."""
+        return self.spreading_factor * self.bandwidth / (1 << self.spreading_factor) * 4 / self.coding_rate
+
+    @property
+    def sensitivity_dbm(self) -> float:
+        """Receiver sensitivity: thermal noise + noise figure + SNR floor."""
+        snr_floor = SNR_FLOOR_DB[self.spreading_factor]
+        return -174 + 10 * math.log10(self.bandwidth) + NOISE_FIGURE_DB + snr_floor
+
+    def time_on_air(self, payload_len: int) -> float:
+        """Seconds on air for a packet carrying `payload_len` bytes."""
+        sf = self.spreading_factor
+        de = 1 if self.low_data_rate_optimize else 0
+        ih = 0 if self.explicit_header else 1
+        numerator = 8 * payload_len - 4 * sf + 28 + 16 * int(self.crc) - 20 * ih
+        blocks = math.ceil(numerator / (4 * (sf - 2 * de)))
+        n_payload = 8 + max(blocks * self.coding_rate, 0)
+        return (self.preamble + 4.25 + n_payload) * self.symbol_time
+
+
+# E22-900T22 REG0 air data rate code -> modulation (codes 0-2 are all 2.4k)
+E22_AIR_RATES: Dict[int, LoRaModulation] = {
+    0: LoRaModulation(spreading_factor=11, bandwidth=500_000),
+    1: LoRaModulation(spreading_factor=11, bandwidth=500_000),
+    2: LoRaModulation(spreading_factor=11, bandwidth=500_000),  # 2.4k (default)
+    3: LoRaModulation(spreading_factor=10, bandwidth=500_000),  # 4.8k
+    4: LoRaModulation(spreading_factor=9, bandwidth=500_000),  # 9.6k
+    5: LoRaModulation(spreading_factor=8, bandwidth=500_000),  # 19.2k
+    6: LoRaModulation(spreading_factor=6, bandwidth=500_000),  # 38.4k
+    7: LoRaModulation(spreading_factor=5, bandwidth=500_000),  # 62.5k
+}
+
+# Nominal rate in bits/s for each code, as printed in the datasheet
+E22_NOMINAL_RATES: Dict[int, int] = {
+    0: 2400, 1: 2400, 2: 2400, 3: 4800, 4: 9600, 5: 19200, 6: 38400, 7: 62500,
+}
+
+
+def e22_modulation(air_rate_code: int) -> LoRaModulation:
+    """Modulation for an E22 REG0 air data rate code (0-7)."""
+    try:
+        return E22_AIR_RATES[air_rate_code]
+    except KeyError:
+        raise ValueError(f"Unknown E22 air rate code: {air_rate_code}") from None
@@ -0,0 +1,529 @@
+"""
+Selective-repeat ARQ over LyceumFrames.
+
+Reliable frames carry a 16-bit sequence number (the LyceumFrame seq byte
+alone wraps after 256 frames, far too soon to tell a retransmission from
+a new frame on a slow link) and are acknowledged with a cumulative ACK
+plus a selective-ACK bitmap:
+
+    data: header(flags=FLAG_RELIABLE) seq(2) lag(1) epoch(2) payload
+    ack:  header(flags=FLAG_ACK)      cum(2) bitmap(4) epoch(2)
+    sync: header(flags=FLAG_SYNC)     base(2) epoch(2)
+
+`lag` is the distance from the sender's window base, so a receiver can
+skip frames the sender gave up on instead of stalling; when no data
+frame is left to carry it, a sync frame announces the new base. `cum` is the next
+sequence number the receiver expects; bit i of `bitmap` acknowledges
+cum + 1 + i. The header seq byte holds the low byte of seq/cum.
+
+`epoch` is a random 16-bit session id drawn when the sender starts.
+A sender that restarts (a Home Assistant reboot, say) begins again at
+sequence 0; the new epoch tells the receiver to drop its old window
+and start from the new sender's base instead of taking every frame for
+a duplicate. ACKs echo the epoch they answer, so a new sender ignores
+ACKs left over from its previous life.
+
+Loss is detected from transmission order: LoRa links do not reorder,
+so once an ACK covers a frame, every unacknowledged frame transmitted
+before it is retransmitted. A single retransmission timer, restarted
+whenever an ACK makes progress, catches tail losses; its timeout comes
+from a smoothed RTT estimate (RFC 6298, with Karn's rule and
+exponential backoff). A frame is abandoned after max_retries.
+"""
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+from collections import deque
+import random
+import struct
+import time
+
+from .flags import FLAG_ACK, FLAG_FEC, FLAG_RELIABLE
+
+
+FLAG_SYNC = FLAG_RELIABLE | FLAG_ACK
+
+SEQ_BITS = 16
+SEQ_MOD = 1 << SEQ_BITS
+SACK_BITS = 32
+MAX_WINDOW = SACK_BITS + 1  # cum plus the bitmap
+
+_HEADER = struct.Struct(">HHBB")  # src, dst, seq, flags
+_DATA = struct.Struct(">HBH")  # seq, lag, epoch
+_ACK = struct.Struct(">HIH")  # cum, bitmap, epoch
+_SYNC = struct.Struct(">HH")  # base, epoch
+DATA_OVERHEAD = _HEADER.size + _DATA.size
+
+
+def new_epoch() -> int:
+    """A random session epoch for a sender that is starting up."""
+    return random.getrandbits(16)
+
+
+def encode_data(src: int, dst: int, seq: int, lag: int, payload: bytes, epoch: int) -> bytes:
+    return (
+        _HEADER.pack(src, dst, seq & 0xFF, FLAG_RELIABLE)
+        + _DATA.pack(seq % SEQ_MOD, lag, epoch)
+        + payload
+    )
+
+
+def encode_ack(src: int, dst: int, cum: int, bitmap: int, epoch: int) -> bytes:
+    return _HEADER.pack(src, dst, cum & 0xFF, FLAG_ACK) + _ACK.pack(cum % SEQ_MOD, bitmap, epoch)
+
+
+def encode_sync(src: int, dst: int, base: int, epoch: int) -> bytes:
+    return _HEADER.pack(src, dst, base & 0xFF, FLAG_SYNC) + _SYNC.pack(base % SEQ_MOD, epoch)
+
+
+def is_arq(frame) -> bool:
+    # FEC block acks also set FLAG_ACK (see lyceum.link.fec)
+    return (
+        len(frame) >= _HEADER.size
+        and bool(frame[5] & (FLAG_RELIABLE | FLAG_ACK))
+        and not frame[5] & FLAG_FEC
+    )
+
+
+def unwrap(wire: int, reference: int) -> int:
+    """Full sequence number nearest `reference` whose low 16 bits are `wire`."""
+    diff = (wire - reference) % SEQ_MOD
+    if diff >= SEQ_MOD // 2:
+        diff -= SEQ_MOD
+    return reference + diff
+
+
+class RttEstimator:
+    """Smoothed RTT and retransmission timeout (RFC 6298)."""
+
+    def __init__(self, initial_rto: float = 3.0, min_rto: float = 0.2, max_rto: float = 60.0):
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.rto = initial_rto
+        self.min_rto = min_rto
+        self.max_rto = max_rto
+
+    def sample(self, rtt: float):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.reset()
+
+    def backoff(self):
+        self.rto = min(self.rto * 2, self.max_rto)
+
+    def reset(self):
+        # Undo backoff once the peer is heard again; on a lossy link only
+        # retransmissions may be getting through, which yield no samples
+        if self.srtt is not None:
+            self.rto = min(max(self.srtt + 4 * self.rttvar, self.min_rto), self.max_rto)
+
+
+@dataclass
+class ArqStats:
+    sent: int = 0
+    retransmits: int = 0
+    fast_retransmits: int = 0
+    acked: int = 0
+    acked_bytes: int = 0  # Payload bytes acknowledged
+    failed: int = 0  # Given up after max_retries
+    delivered: int = 0
+    duplicates: int = 0
+    skipped: int = 0  # Abandoned by the sender, never received
+    stale: int = 0  # ACKs for another epoch (a previous session)
+    restarts: int = 0  # Peers seen starting a new epoch
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _Outstanding:
+    payload: bytes
+    sent_at: float
+    order: int = 0  # Transmission counter at the last send
+    retries: int = 0
+    acked: bool = False
+
+
+class ArqSender:
+    """
+    Sending half of a selective-repeat session to one peer.
+
+    transmit(frame) receives each data frame to put on the link. Call
+    on_ack() for ACK frames from the peer and poll() at `deadline`.
+    `epoch` identifies this session (random unless given).
+    """
+
+    def __init__(
+        self,
+        src: int,
+        dst: int,
+        transmit: Callable[[bytes], None],
+        window: int = 16,
+        max_retries: int = 8,
+        max_backlog: int = 256,
+        rtt: Optional[RttEstimator] = None,
+        on_fail: Optional[Callable[[bytes], None]] = None,
+        on_acked: Optional[Callable[[bytes], None]] = None,
+        stats: Optional[ArqStats] = None,
+        epoch: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"Window must be 1..{MAX_WINDOW}")
+        self.src = src
+        self.epoch = new_epoch() if epoch is None else epoch
+        self.dst = dst
+        self.transmit = transmit
+        self.window = window
+        self.max_retries = max_retries
+        self.max_backlog = max_backlog
+        self.rtt = rtt or RttEstimator()
+        self.on_fail = on_fail
+        self.on_acked = on_acked
+        self.stats = stats or ArqStats()
+        self._clock = clock
+        self._base = 0  # Oldest unacknowledged sequence number
+        self._next = 0
+        self._order = 0
+        self._timer: Optional[float] = None  # Start of the current RTO period
+        self._resync = False  # Abandoned frames not yet confirmed skipped
+        self._inflight: Dict[int, _Outstanding] = {}
+        self._backlog: Deque[bytes] = deque()
+
+    @property
+    def pending(self) -> int:
+        """Messages not yet acknowledged (in flight or waiting)."""
+        return len(self._backlog) + sum(not o.acked for o in self._inflight.values())
+
+    def send(self, payload: bytes) -> bool:
+        """Queue a payload for reliable delivery; False if the backlog is full."""
+        if len(self._backlog) >= self.max_backlog:
+            return False
+        self._backlog.append(payload)
+        self._fill(self._clock())
+        return True
+
+    def _fill(self, now: float):
+        while self._backlog and self._next < self._base + self.window:
+            seq = self._next
+            self._next += 1
+            entry = self._inflight[seq] = _Outstanding(self._backlog.popleft(), now)
+            self.stats.sent += 1
+            if self._timer is None:
+                self._timer = now
+            self._emit(seq, entry)
+
+    def _emit(self, seq: int, entry: _Outstanding):
+        self._order += 1
+        entry.order = self._order
+        self.transmit(encode_data(self.src, self.dst, seq, seq - self._base, entry.payload, self.epoch))
+
+    def _retry(self, seq: int, entry: _Outstanding, now: float) -> bool:
+        # Retransmit, or abandon once max_retries is used up
+        if entry.retries >= self.max_retries:
+            entry.acked = True  # The receiver skips it via `lag` or a sync
+            self._resync = True
+            self.stats.failed += 1
+            if self.on_fail:
+                self.on_fail(entry.payload)
+            return False
+        entry.retries += 1
+        entry.sent_at = now
+        self._emit(seq, entry)
+        return True
+
+    def _mark_acked(self, seq: int, now: float) -> int:
+        # Returns the acked frame's transmission order (0 if already acked)
+        entry = self._inflight.get(seq)
+        if entry is None or entry.acked:
+            return 0
+        entry.acked = True
+        self.stats.acked += 1
+        self.stats.acked_bytes += len(entry.payload)
+        if entry.retries == 0:
+            self.rtt.sample(now - entry.sent_at)  # Karn: skip ambiguous samples
+        if self.on_acked:
+            self.on_acked(entry.payload)
+        return entry.order
+
+    def on_ack(self, cum_wire: int, bitmap: int, epoch: int):
+        """Process a cumulative ACK and SACK bitmap from the peer."""
+        if epoch != self.epoch:
+            self.stats.stale += 1  # Answers a previous session of ours
+            return
+        now = self._clock()
+        cum = unwrap(cum_wire, self._base)
+        if cum < self._base or cum > self._next:
+            return  # Stale or bogus
+        if self._resync and cum >= self._base:
+            self._resync = False
+        latest = 0  # Newest transmission this ACK newly covers
+        for seq in range(self._base, cum):
+            latest = max(latest, self._mark_acked(seq, now))
+        for i in range(SACK_BITS):
+            if bitmap >> i & 1:
+                seq = cum + 1 + i
+                if seq >= self._next:
+                    break
+                latest = max(latest, self._mark_acked(seq, now))
+        if latest:
+            self.rtt.reset()
+            self._timer = now
+            # The link does not reorder: frames sent before one that has
+            # now been acknowledged were lost
+            for seq in range(cum, self._next):
+                entry = self._inflight[seq]
+                if not entry.acked and entry.order < latest:
+                    if self._retry(seq, entry, now):
+                        self.stats.fast_retransmits += 1
+        self._advance()
+        self._fill(now)
+        self._sync(now)
+
+    def _advance(self):
+        while self._base < self._next and self._inflight[self._base].acked:
+            del self._inflight[self._base]
+            self._base += 1
+        if self._base == self._next and not self._resync:
+            self._timer = None
+
+    def _sync(self, now: float):
+        # Announce the base after abandoning frames when no data frame will
+        if self._resync and self._base == self._next:
+            self._timer = now
+            self.transmit(encode_sync(self.src, self.dst, self._base, self.epoch))
+
+    def poll(self, now: Optional[float] = None):
+        """Retransmit the oldest frame if the RTO expired without progress."""
+        if now is None:
+            now = self._clock()
+        deadline = self.deadline
+        if deadline is None or now < deadline:
+            return
+        self._timer = now
+        for seq in range(self._base, self._next):
+            entry = self._inflight[seq]
+            if not entry.acked:
+                if self._retry(seq, entry, now):
+                    self.stats.retransmits += 1
+                    self.rtt.backoff()
+                break
+        else:
+            self.rtt.backoff()  # Only an unconfirmed sync is outstanding
+        self._advance()
+        self._fill(now)
+        self._sync(now)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Clock time at which the retransmission timer fires, if running."""
+        if self._timer is None:
+            return None
+        return self._timer + self.rtt.rto
+
+
+class ArqReceiver:
+    """
+    Receiving half of a selective-repeat session from one peer.
+
+    Frames are buffered within the window and deliver(payload) is called
+    in sequence order, exactly once per frame. A frame from a new epoch
+    (the sender restarted, or this receiver did) restarts the window at
+    the sender's base.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[bytes], None],
+        window: int = MAX_WINDOW,
+        stats: Optional[ArqStats] = None,
+    ):
+        if not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"Window must be 1..{MAX_WINDOW}")
+        self.deliver = deliver
+        self.window = window
+        self.stats = stats or ArqStats()
+        self.epoch: Optional[int] = None
+        self._expected = 0
+        self._buffer: Dict[int, bytes] = {}
+
+    def _restart(self, epoch: int, base: int):
+        # New sender session: hand over what the old one left, then follow
+        # the new sequence numbers from the sender's base
+        if self._buffer:
+            self._skip_to(max(self._buffer) + 1)
+        if self.epoch is not None:
+            self.stats.restarts += 1
+        self.epoch = epoch
+        self._expected = base
+
+    def on_data(self, seq_wire: int, lag: int, payload: bytes, epoch: int = 0) -> Tuple[int, int]:
+        """Accept a data frame; return the (cum, bitmap) ACK to send back."""
+        if epoch != self.epoch:
+            self._restart(epoch, seq_wire - lag)
+        seq = unwrap(seq_wire, self._expected)
+        self._skip_to(seq - lag)
+        if seq < self._expected or seq in self._buffer:
+            self.stats.duplicates += 1
+        elif seq < self._expected + self.window:
+            self._buffer[seq] = payload
+        self._drain()
+        return self.ack()
+
+    def on_sync(self, base_wire: int, epoch: int = 0) -> Tuple[int, int]:
+        """The sender's window starts at `base`; return the ACK to send back."""
+        if epoch != self.epoch:
+            self._restart(epoch, base_wire)
+        self._skip_to(unwrap(base_wire, self._expected))
+        self._drain()
+        return self.ack()
+
+    def _skip_to(self, base: int):
+        # The sender abandoned everything below its base
+        while self._expected < base:
+            data = self._buffer.pop(self._expected, None)
+            if data is None:
+                self.stats.skipped += 1
+            else:
+                self._deliver(data)
+            self._expected += 1
+
+    def _drain(self):
+        while self._expected in self._buffer:
+            self._deliver(self._buffer.pop(self._expected))
+            self._expected += 1
+
+    def _deliver(self, payload: bytes):
+        self.stats.delivered += 1
+        self.deliver(payload)
+
+    def ack(self) -> Tuple[int, int]:
+        bitmap = 0
+        for seq in self._buffer:
+            bit = seq - self._expected - 1
+            if 0 <= bit < SACK_BITS:
+                bitmap |= 1 << bit
+        return self._expected % SEQ_MOD, bitmap
+
+
+class ArqEndpoint:
+    """
+    Reliable sessions with any number of peers over one link.
+
+    transmit(dst, frame) puts a frame on the link; deliver(src, payload)
+    receives reliable payloads in order. Feed received frames to
+    on_frame() and call poll() at `deadline`. on_acked(dst, payload) and
+    on_fail(dst, payload), if given, report the fate of each payload sent.
+    Every session this endpoint sends on uses `epoch`, random by default,
+    so peers notice when the endpoint has been recreated.
+    """
+
+    def __init__(
+        self,
+        address: int,
+        transmit: Callable[[int, bytes], None],
+        deliver: Callable[[int, bytes], None],
+        window: int = 16,
+        max_retries: int = 8,
+        max_backlog: int = 256,
+        initial_rto: float = 3.0,
+        on_acked: Optional[Callable[[int, bytes], None]] = None,
+        on_fail: Optional[Callable[[int, bytes], None]] = None,
+        epoch: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.address = address
+        self.epoch = new_epoch() if epoch is None else epoch
+        self.transmit = transmit
+        self.deliver = deliver
+        self.window = window
+        self.max_retries = max_retries
+        self.max_backlog = max_backlog
+        self.initial_rto = initial_rto
+        self.on_acked = on_acked
+        self.on_fail = on_fail
+        self._clock = clock
+        self.stats = ArqStats()
+        self._senders: Dict[int, ArqSender] = {}
+        self._receivers: Dict[int, ArqReceiver] = {}
+
+    def _sender(self, dst: int) -> ArqSender:
+        sender = self._senders.get(dst)
+        if sender is None:
+            sender = self._senders[dst] = ArqSender(
+                self.address,
+                dst,
+                lambda frame: self.transmit(dst, frame),
+                window=self.window,
+                max_retries=self.max_retries,
+                max_backlog=self.max_backlog,
+                rtt=RttEstimator(initial_rto=self.initial_rto),
+                on_fail=(lambda payload: self.on_fail(dst, payload)) if self.on_fail else None,
+                on_acked=(lambda payload: self.on_acked(dst, payload)) if self.on_acked else None,
+                stats=self.stats,
+                epoch=self.epoch,
+                clock=self._clock,
+            )
+        return sender
+
+    def send(self, dst: int, payload: bytes) -> bool:
+        """Queue a payload for reliable delivery to `dst`."""
+        return self._sender(dst).send(payload)
+
+    def on_frame(self, frame) -> bool:
+        """Handle a received frame; False if it is not an ARQ frame."""
+        if not is_arq(frame):
+            return False
+        src, _dst, _seq, flags = _HEADER.unpack_from(frame)
+        if flags & FLAG_SYNC == FLAG_SYNC:
+            if len(frame) < _HEADER.size + _SYNC.size:
+                raise ValueError("Truncated sync")
+            base, epoch = _SYNC.unpack_from(frame, _HEADER.size)
+            cum, bitmap = self._receiver(src).on_sync(base, epoch)
+            self.transmit(src, encode_ack(self.address, src, cum, bitmap, epoch))
+            return True
+        if flags & FLAG_ACK:
+            if len(frame) < _HEADER.size + _ACK.size:
+                raise ValueError("Truncated ACK")
+            cum, bitmap, epoch = _ACK.unpack_from(frame, _HEADER.size)
+            sender = self._senders.get(src)
+            if sender is not None:
+                sender.on_ack(cum, bitmap, epoch)
+            return True
+        if len(frame) < DATA_OVERHEAD:
+            raise ValueError("Truncated data frame")
+        seq, lag, epoch = _DATA.unpack_from(frame, _HEADER.size)
+        cum, bitmap = self._receiver(src).on_data(seq, lag, bytes(frame[DATA_OVERHEAD:]), epoch)
+        self.transmit(src, encode_ack(self.address, src, cum, bitmap, epoch))
+        return True
+
+    def _receiver(self, src: int) -> ArqReceiver:
+        receiver = self._receivers.get(src)
+        if receiver is None:
+            receiver = self._receivers[src] = ArqReceiver(
+                lambda payload: self.deliver(src, payload), stats=self.stats
+            )
+        return receiver
+
+    def poll(self, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        for sender in self._senders.values():
+            sender.poll(now)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        deadlines = [d for d in (s.deadline for s in self._senders.values()) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    @property
+    def pending(self) -> int:
+        return sum(s.pending for s in self._senders.values())
+
+    def rto(self, dst: int) -> Optional[float]:
+        sender = self._senders.get(dst)
+        return sender.rtt.rto if sender else None
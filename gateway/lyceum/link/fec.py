@@ -0,0 +1,404 @@
+"""
+Forward error correction for multi-frame payloads.
+
+A payload too large for one frame (a long DebatePacket, a vault sync
+delta) is split into k data shards, and a systematic Reed-Solomon
+erasure code over GF(2^8) adds repair shards. Any k distinct shards
+rebuild the payload, so on a lossy link the receiver usually completes
+without waiting a round trip for retransmissions. Repair shards are rows
+of a Cauchy matrix, every square subset of which is invertible; more can
+be generated for the same block at any time (up to 256 - k), which lets
+the sender top a block up, fountain-style, until the receiver acks it.
+
+    shard: header(flags=FLAG_FEC)          epoch(2) block(2) index(1) k(1) length(2) data
+    ack:   header(flags=FLAG_FEC|FLAG_ACK) epoch(2) block(2) received(1) seen(1)
+
+`length` is the payload size (shards are padded to equal length). An ack
+reports how many shards the receiver held when it decoded the block out
+of how many it had seen numbered, from which the sender estimates loss
+and sizes the redundancy of the next block (AdaptiveRedundancy).
+
+Block ids restart at 0 with the sender, so, as in lyceum.link.arq, each
+sender draws a random `epoch` when it starts. A shard from a new epoch
+makes the receiver forget the blocks it decoded for that source, which
+would otherwise swallow the restarted sender's blocks as repeats. Acks
+echo the epoch, so a restarted sender ignores acks for its old blocks.
+
+Shard arithmetic uses per-coefficient 256-byte multiplication tables
+with bytes.translate and big-integer XOR, so the per-byte work runs in C.
+"""
+from dataclasses import dataclass
+from math import comb
+from typing import Callable, Dict, List, Optional
+import struct
+import time
+
+from .arq import new_epoch
+from .flags import FLAG_ACK, FLAG_FEC
+
+
+_HEADER = struct.Struct(">HHBB")  # src, dst, seq, flags
+_SHARD = struct.Struct(">HHBBH")  # epoch, block, index, k, length
+_ACK = struct.Struct(">HHBB")  # epoch, block, received, seen
+SHARD_OVERHEAD = _HEADER.size + _SHARD.size
+
+# Largest shard that keeps a frame within one encrypted sub-packet
+# (lyceum.link.aggregate.DEFAULT_MTU)
+MAX_SHARD = 240 - 1 - 28 - SHARD_OVERHEAD
+
+
+# --- GF(2^8) -------------------------------------------------------------
+
+_POLY = 0x11D
+_EXP = [0] * 512
+_LOG = [0] * 256
+_x = 1
+for _i in range(255):
+    _EXP[_i] = _x
+    _LOG[_x] = _i
+    _x <<= 1
+    if _x & 0x100:
+        _x ^= _POLY
+for _i in range(255, 512):
+    _EXP[_i] = _EXP[_i - 255]
+
+
+def gf_mul(a: int, b: int) -> int:
+    if a == 0 or b == 0:
+        return 0
+    return _EXP[_LOG[a] + _LOG[b]]
+
+
+def gf_inv(a: int) -> int:
+    if a == 0:
+        raise ZeroDivisionError("GF(256) inverse of 0")
+    return _EXP[255 - _LOG[a]]
+
+
+# _MUL[c] maps every byte b to c*b, for bytes.translate
+_MUL = [bytes(gf_mul(c, b) for b in range(256)) for c in range(256)]
+
+
+def _combine(coefficients: List[int], shards: List[bytes], size: int) -> bytes:
+    """sum(c_i * shard_i) over GF(256), for equal-length shards."""
+    acc = 0
+    for c, shard in zip(coefficients, shards):
+        if c:
+            acc ^= int.from_bytes(shard if c == 1 else shard.translate(_MUL[c]), "big")
+    return acc.to_bytes(size, "big")
+
+
+def _invert(matrix: List[List[int]]) -> List[List[int]]:
+    """Gauss-Jordan inverse of a square matrix over GF(256)."""
+    n = len(matrix)
+    rows = [row[:] + [int(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col]), None)
+        if pivot is None:
+            raise ValueError("Singular matrix")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        inv = gf_inv(rows[col][col])
+        rows[col] = [gf_mul(inv, v) for v in rows[col]]
+        for r in range(n):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [v ^ gf_mul(factor, p) for v, p in zip(rows[r], rows[col])]
+    return [row[n:] for row in rows]
+
+
+class ReedSolomon:
+    """
+    Systematic (k + m) erasure code: shard i < k is data shard i, shard
+    k + j is parity row j of a Cauchy matrix.
+    """
+
+    def __init__(self, k: int):
+        if not 1 <= k <= 255:
+            raise ValueError("k must be 1..255")
+        self.k = k
+
+    def row(self, index: int) -> List[int]:
+        """Encoding coefficients of shard `index` over the data shards."""
+        if index < self.k:
+            return [int(j == index) for j in range(self.k)]
+        x = index  # Distinct from every y = j < k
+        if x > 255:
+            raise ValueError("Shard index out of range")
+        return [gf_inv(x ^ j) for j in range(self.k)]
+
+    def encode(self, data: List[bytes], index: int) -> bytes:
+        """Shard `index` (data or repair) of equal-length data shards."""
+        if index < self.k:
+            return data[index]
+        return _combine(self.row(index), data, len(data[0]))
+
+    def decode(self, shards: Dict[int, bytes]) -> List[bytes]:
+        """Rebuild the k data shards from any k distinct shards."""
+        if len(shards) < self.k:
+            raise ValueError(f"Need {self.k} shards, have {len(shards)}")
+        if all(i in shards for i in range(self.k)):
+            return [shards[i] for i in range(self.k)]
+        # Prefer data shards: their rows are unit vectors
+        indices = sorted(shards)[:self.k]
+        size = len(shards[indices[0]])
+        inverse = _invert([self.row(i) for i in indices])
+        have = [shards[i] for i in indices]
+        return [
+            shards[j] if j in shards else _combine(inverse[j], have, size)
+            for j in range(self.k)
+        ]
+
+
+def split(payload: bytes, max_shard: int = MAX_SHARD) -> List[bytes]:
+    """Cut a payload into equal-length (zero-padded) data shards."""
+    k = max(1, -(-len(payload) // max_shard))
+    size = max(1, -(-len(payload) // k))
+    padded = payload.ljust(k * size, b"\0")
+    return [padded[i * size:(i + 1) * size] for i in range(k)]
+
+
+# --- Redundancy ----------------------------------------------------------
+
+class AdaptiveRedundancy:
+    """
+    Pick the number of repair shards from an EWMA of observed loss, so a
+    block of k data shards completes in one round with probability
+    `target` (independent losses assumed).
+    """
+
+    def __init__(
+        self,
+        target: float = 0.95,
+        initial_loss: float = 0.1,
+        alpha: float = 0.25,
+        max_ratio: float = 2.0,
+    ):
+        self.target = target
+        self.loss = initial_loss
+        self.alpha = alpha
+        self.max_ratio = max_ratio
+
+    def observe(self, received: int, sent: int):
+        """Fold in a block where `received` of `sent` shards arrived."""
+        if sent > 0:
+            sample = 1.0 - min(received, sent) / sent
+            self.loss += self.alpha * (sample - self.loss)
+
+    def completion_probability(self, k: int, n: int) -> float:
+        """P(at least k of n shards arrive)."""
+        p = 1.0 - self.loss
+        return sum(comb(n, i) * p ** i * (1 - p) ** (n - i) for i in range(k, n + 1))
+
+    def parity_for(self, k: int) -> int:
+        limit = min(int(k * self.max_ratio) + 1, 255 - k)
+        for m in range(limit + 1):
+            if self.completion_probability(k, k + m) >= self.target:
+                return m
+        return limit
+
+
+# --- Endpoint ------------------------------------------------------------
+
+def is_fec(frame) -> bool:
+    return len(frame) >= _HEADER.size and bool(frame[5] & FLAG_FEC)
+
+
+@dataclass
+class FecStats:
+    blocks_sent: int = 0
+    shards_sent: int = 0
+    repair_rounds: int = 0
+    blocks_acked: int = 0
+    blocks_failed: int = 0
+    blocks_decoded: int = 0
+    shards_received: int = 0
+    shards_unused: int = 0  # Arrived after the block was decoded
+    stale: int = 0  # Acks for another epoch (a previous session)
+    restarts: int = 0  # Sources seen starting a new epoch
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+@dataclass
+class _TxBlock:
+    dst: int
+    data: List[bytes]
+    length: int
+    next_index: int
+    deadline: float
+    rounds: int = 0
+
+
+@dataclass
+class _RxBlock:
+    k: int
+    length: int
+    shards: Dict[int, bytes]
+    seen: int = 0
+
+
+class FecEndpoint:
+    """
+    Send and receive FEC-coded payloads over one link.
+
+    transmit(dst, frame) puts a frame on the link; deliver(src, payload)
+    receives each rebuilt payload once. Feed received frames to
+    on_frame() and call poll() at `deadline` so unacknowledged blocks get
+    more repair shards. `epoch` identifies this sender's session (random
+    unless given).
+    """
+
+    def __init__(
+        self,
+        address: int,
+        transmit: Callable[[int, bytes], None],
+        deliver: Callable[[int, bytes], None],
+        redundancy: Optional[AdaptiveRedundancy] = None,
+        repair_timeout: float = 3.0,
+        max_rounds: int = 6,
+        max_shard: int = MAX_SHARD,
+        max_rx_blocks: int = 16,
+        epoch: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.address = address
+        self.transmit = transmit
+        self.deliver = deliver
+        self.redundancy = redundancy or AdaptiveRedundancy()
+        self.repair_timeout = repair_timeout
+        self.max_rounds = max_rounds
+        self.max_shard = max_shard
+        self.max_rx_blocks = max_rx_blocks
+        self.epoch = new_epoch() if epoch is None else epoch
+        self._clock = clock
+        self.stats = FecStats()
+        self._block = 0
+        self._tx: Dict[int, _TxBlock] = {}
+        self._rx: Dict[tuple, _RxBlock] = {}  # (src, block) -> shards so far
+        self._done: Dict[tuple, tuple] = {}  # (src, block) -> (received, seen)
+        self._epochs: Dict[int, int] = {}  # src -> epoch of its latest shard
+
+    def send(self, dst: int, payload: bytes) -> int:
+        """Encode and transmit a payload; returns its block id."""
+        data = split(payload, self.max_shard)
+        if len(data) > 255 - 1:
+            raise ValueError("Payload too large for one FEC block")
+        block = self._block
+        self._block = (self._block + 1) & 0xFFFF
+        m = min(self.redundancy.parity_for(len(data)), 255 - len(data))
+        entry = _TxBlock(dst, data, len(payload), 0, self._clock() + self.repair_timeout)
+        self._tx[block] = entry
+        self.stats.blocks_sent += 1
+        self._send_shards(block, entry, len(data) + m)
+        return block
+
+    def _send_shards(self, block: int, entry: _TxBlock, count: int):
+        rs = ReedSolomon(len(entry.data))
+        for _ in range(count):
+            index = entry.next_index
+            if index > 255:
+                break
+            entry.next_index += 1
+            shard = rs.encode(entry.data, index)
+            self.stats.shards_sent += 1
+            self.transmit(entry.dst, (
+                _HEADER.pack(self.address, entry.dst, index, FLAG_FEC)
+                + _SHARD.pack(self.epoch, block, index, len(entry.data), entry.length)
+                + shard
+            ))
+
+    def on_frame(self, frame) -> bool:
+        """Handle a received frame; False if it is not an FEC frame."""
+        if not is_fec(frame):
+            return False
+        src, _dst, _seq, flags = _HEADER.unpack_from(frame)
+        if flags & FLAG_ACK:
+            if len(frame) < _HEADER.size + _ACK.size:
+                raise ValueError("Truncated FEC ack")
+            epoch, block, received, seen = _ACK.unpack_from(frame, _HEADER.size)
+            if epoch != self.epoch:
+                self.stats.stale += 1
+                return True
+            entry = self._tx.pop(block, None)
+            if entry is not None and entry.dst == src:
+                self.stats.blocks_acked += 1
+                self.redundancy.observe(received, seen)
+            elif entry is not None:
+                self._tx[block] = entry  # Not from this block's peer
+            return True
+        if len(frame) < SHARD_OVERHEAD + 1:
+            raise ValueError("Truncated FEC shard")
+        epoch, block, index, k, length = _SHARD.unpack_from(frame, _HEADER.size)
+        if k == 0:
+            raise ValueError("FEC shard with k = 0")
+        self.stats.shards_received += 1
+        if self._epochs.get(src) != epoch:
+            self._restart(src, epoch)
+        key = (src, block)
+        if key in self._done:
+            self.stats.shards_unused += 1
+            self._ack(src, epoch, block, *self._done[key])  # Our ack may have been lost
+            return True
+        entry = self._rx.get(key)
+        if entry is None:
+            if len(self._rx) >= self.max_rx_blocks:
+                del self._rx[next(iter(self._rx))]  # Drop the oldest partial
+            entry = self._rx[key] = _RxBlock(k, length, {})
+        shard = bytes(frame[SHARD_OVERHEAD:])
+        if entry.k != k or (entry.shards and len(shard) != len(next(iter(entry.shards.values())))):
+            raise ValueError("FEC shard does not match its block")
+        entry.shards.setdefault(index, shard)
+        entry.seen = max(entry.seen, index + 1)
+        if len(entry.shards) >= entry.k:
+            del self._rx[key]
+            data = ReedSolomon(entry.k).decode(entry.shards)
+            result = (len(entry.shards), entry.seen)
+            self._done[key] = result
+            if len(self._done) > 4 * self.max_rx_blocks:
+                del self._done[next(iter(self._done))]
+            self.stats.blocks_decoded += 1
+            self._ack(src, epoch, block, *result)
+            self.deliver(src, b"".join(data)[:entry.length])
+        return True
+
+    def _restart(self, src: int, epoch: int):
+        # New sender session: its block ids start over, so forget the old ones
+        if src in self._epochs:
+            self.stats.restarts += 1
+        self._epochs[src] = epoch
+        for table in (self._rx, self._done):
+            for key in [key for key in table if key[0] == src]:
+                del table[key]
+
+    def _ack(self, dst: int, epoch: int, block: int, received: int, seen: int):
+        self.transmit(dst, (
+            _HEADER.pack(self.address, dst, block & 0xFF, FLAG_FEC | FLAG_ACK)
+            + _ACK.pack(epoch, block, min(received, 255), min(seen, 255))
+        ))
+
+    def poll(self, now: Optional[float] = None):
+        """Top up blocks whose ack is overdue; give up after max_rounds."""
+        if now is None:
+            now = self._clock()
+        for block, entry in list(self._tx.items()):
+            if entry.deadline > now:
+                continue
+            if entry.rounds >= self.max_rounds:
+                del self._tx[block]
+                self.stats.blocks_failed += 1
+                continue
+            entry.rounds += 1
+            self.stats.repair_rounds += 1
+            k = len(entry.data)
+            self._send_shards(block, entry, max(1, self.redundancy.parity_for(k)))
+            entry.deadline = now + self.repair_timeout
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return min((e.deadline for e in self._tx.values()), default=None)
+
+    @property
+    def pending(self) -> int:
+        """Blocks sent but not yet acknowledged."""
+        return len(self._tx)
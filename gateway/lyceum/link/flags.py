@@ -0,0 +1,34 @@
+"""
+LyceumFrame flags byte: which link-layer features a frame uses.
+
+    bit  7    6    5         4          3        2  1         0
+         FEC  ACK  RELIABLE  AGGREGATE  CONTROL  -  FRAGMENT  COMPRESSED
+
+Layers combine bits: an ARQ ack is FLAG_ACK, an FEC block ack is
+FLAG_FEC | FLAG_ACK, an ARQ sync is FLAG_RELIABLE | FLAG_ACK. Bit 2 is
+reserved and must be sent as zero.
+"""
+
+FLAG_COMPRESSED = 0x01  # Payload is DEFLATE-compressed (raw, no zlib header)
+FLAG_FRAGMENT = 0x02  # Payload is one fragment of a larger message
+FLAG_CONTROL = 0x08  # Link control message (lyceum.link.adr)
+FLAG_AGGREGATE = 0x10  # Payload is several records (lyceum.link.aggregate)
+FLAG_RELIABLE = 0x20  # Sequenced for selective-repeat ARQ (lyceum.link.arq)
+FLAG_ACK = 0x40  # Acknowledgement (ARQ, or FEC block with FLAG_FEC)
+FLAG_FEC = 0x80  # Erasure-coded shard of a larger payload (lyceum.link.fec)
+
+FLAG_RESERVED = 0x04
+FLAG_NAMES = {
+    FLAG_COMPRESSED: "compressed",
+    FLAG_FRAGMENT: "fragment",
+    FLAG_CONTROL: "control",
+    FLAG_AGGREGATE: "aggregate",
+    FLAG_RELIABLE: "reliable",
+    FLAG_ACK: "ack",
+    FLAG_FEC: "fec",
+}
+
+
+def describe(flags: int) -> list:
+    """Names of the bits set in a flags byte, low bit first (for logs)."""
+    return [name for bit, name in FLAG_NAMES.items() if flags & bit]
@@ -0,0 +1,231 @@
+"""
+Frame reassembly for the E22 UART byte stream.
+
+The E22 in transparent or fixed-point mode outputs received LoRa packets
+on the UART with no delimiter, and a read() returns whatever bytes have
+arrived: half a packet, or two packets back to back. This module turns
+that byte stream back into packets:
+
+- Length mode: each packet on air starts with a 1-byte length, added by
+  the sender (LyceumGateway does this). Robust at any packet rate; an
+  optional gap timeout discards a partial packet after a lost byte.
+- Gap mode: the module writes each received packet to the UART in one
+  burst, so an idle gap marks the end of a packet. Works with senders
+  that do not add a length byte, at the cost of one gap of latency.
+
+With "RSSI byte" enabled (REG3 bit 7) the module appends one RSSI byte
+after every packet; set trailer=1 to have it split off and reported.
+
+Bytes are kept in a fixed ring buffer and packets are handed to the
+callback as memoryviews into it (copied only if a packet wraps around the
+end of the ring), valid for the duration of the callback.
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional
+import time
+
+
+MODE_LENGTH = "length"
+MODE_GAP = "gap"
+
+
+class RingBuffer:
+    """Fixed-capacity byte ring with zero-copy reads of contiguous spans."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self._buf = memoryview(bytearray(capacity))
+        self._head = 0  # Index of the oldest byte
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self._size
+
+    def write(self, data) -> int:
+        """Append as much of `data` as fits; return the number of bytes taken."""
+        n = min(len(data), self.free)
+        if n == 0:
+            return 0
+        tail = (self._head + self._size) % self.capacity
+        first = min(n, self.capacity - tail)
+        self._buf[tail:tail + first] = data[:first]
+        if first < n:
+            self._buf[:n - first] = data[first:n]
+        self._size += n
+        return n
+
+    def peek(self, offset: int = 0) -> int:
+        """Byte at `offset` from the head (offset < len)."""
+        return self._buf[(self._head + offset) % self.capacity]
+
+    def view(self, offset: int, length: int, scratch: memoryview) -> memoryview:
+        """
+        Read `length` bytes starting `offset` bytes after the head.
+
+        Returns a view into the ring when the span is contiguous, otherwise
+        copies the two pieces into `scratch` and returns a view of that.
+        """
+        start = (self._head + offset) % self.capacity
+        end = start + length
+        if end <= self.capacity:
+            return self._buf[start:end]
+        first = self.capacity - start
+        scratch[:first] = self._buf[start:]
+        scratch[first:length] = self._buf[:length - first]
+        return scratch[:length]
+
+    def consume(self, n: int):
+        """Discard `n` bytes from the head."""
+        n = min(n, self._size)
+        self._head = (self._head + n) % self.capacity
+        self._size -= n
+        if self._size == 0:
+            self._head = 0  # Keep the next packet contiguous
+
+
+@dataclass
+class FramerStats:
+    frames: int = 0
+    bytes_in: int = 0
+    resyncs: int = 0  # Invalid length bytes skipped
+    stale_bytes: int = 0  # Partial packets dropped after a gap
+    overflow_bytes: int = 0  # Bytes dropped because the ring was full
+
+
+class FrameReassembler:
+    """
+    Incremental packet delimiter over a ring buffer.
+
+    Call feed() with each chunk read from the port; on_frame(packet, rssi)
+    is called for every complete packet, where rssi is the raw trailer
+    byte (or None without a trailer). In gap mode, also call flush() at
+    `deadline` (e.g. with loop.call_at) to emit the last packet of a burst.
+    """
+
+    def __init__(
+        self,
+        on_frame: Callable[[memoryview, Optional[int]], None],
+        mode: str = MODE_LENGTH,
+        max_frame: int = 240,
+        trailer: int = 0,
+        gap_s: Optional[float] = 0.02,
+        capacity: int = 2048,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            on_frame: Receives each packet (a view valid during the call)
+            mode: MODE_LENGTH or MODE_GAP
+            max_frame: Largest packet body in bytes (E22 sub-packet size)
+            trailer: Bytes the module appends per packet (1 with RSSI byte)
+            gap_s: Idle time that ends a packet (gap mode) or discards a
+                   partial one (length mode; None disables)
+            capacity: Ring size; must hold at least two maximal packets
+            clock: Monotonic time source (loop.time when using call_at)
+        """
+        if mode not in (MODE_LENGTH, MODE_GAP):
+            raise ValueError(f"Unknown framing mode: {mode}")
+        if mode == MODE_LENGTH and max_frame > 255:
+            raise ValueError("Length mode supports packets up to 255 bytes")
+        if mode == MODE_GAP and not gap_s:
+            raise ValueError("Gap mode needs gap_s")
+        if capacity < 2 * (max_frame + 1 + trailer):
+            raise ValueError("Ring capacity too small for max_frame")
+        self.on_frame = on_frame
+        self.mode = mode
+        self.max_frame = max_frame
+        self.trailer = trailer
+        self.gap_s = gap_s
+        self._clock = clock
+        self._ring = RingBuffer(capacity)
+        self._scratch = memoryview(bytearray(max_frame + trailer))
+        self._last_rx: Optional[float] = None
+        self.stats = FramerStats()
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered but not yet delivered."""
+        return len(self._ring)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Clock time at which buffered bytes should be flushed, if any."""
+        if not self._ring or not self.gap_s or self._last_rx is None:
+            return None
+        return self._last_rx + self.gap_s
+
+    def feed(self, data) -> int:
+        """Add bytes read from the port; return the number of packets emitted."""
+        now = self._clock()
+        emitted = self.flush(now)
+        self.stats.bytes_in += len(data)
+        self._last_rx = now
+
+        offset = 0
+        while offset < len(data):
+            taken = self._ring.write(data[offset:])
+            offset += taken
+            emitted += self._drain()
+            if taken == 0 and offset < len(data):
+                # Ring full of an undeliverable partial packet: drop it
+                self.stats.overflow_bytes += len(self._ring)
+                self._ring.consume(len(self._ring))
+        return emitted
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """
+        Handle an idle gap: in gap mode emit the buffered packet, in length
+        mode drop a stale partial packet. No-op before the deadline.
+        """
+        deadline = self.deadline
+        if deadline is None:
+            return 0
+        if now is None:
+            now = self._clock()
+        if now < deadline:
+            return 0
+        if self.mode == MODE_GAP:
+            return self._emit(len(self._ring) - self.trailer, 0)
+        self.stats.stale_bytes += len(self._ring)
+        self._ring.consume(len(self._ring))
+        return 0
+
+    def _drain(self) -> int:
+        if self.mode == MODE_GAP:
+            # A full sub-packet cannot grow any further
+            if len(self._ring) >= self.max_frame + self.trailer:
+                return self._emit(self.max_frame, 0)
+            return 0
+
+        ring = self._ring
+        emitted = 0
+        while ring:
+            length = ring.peek(0)
+            if length == 0 or length > self.max_frame:
+                ring.consume(1)
+                self.stats.resyncs += 1
+                continue
+            if len(ring) < 1 + length + self.trailer:
+                break
+            emitted += self._emit(length, 1)
+        return emitted
+
+    def _emit(self, length: int, header: int) -> int:
+        ring = self._ring
+        if length <= 0:
+            ring.consume(len(ring))
+            return 0
+        rssi = ring.peek(header + length) if self.trailer else None
+        packet = ring.view(header, length, self._scratch)
+        self.stats.frames += 1
+        try:
+            self.on_frame(packet, rssi)
+        finally:
+            ring.consume(header + length + self.trailer)
+        return 1
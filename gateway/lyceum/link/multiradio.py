@@ -0,0 +1,220 @@
+"""
+Several radios, one gateway: channel load balancing and RX merging.
+
+A gateway with several E22 modules, each listening on its own channel,
+gets one channel's worth of airtime per module. RadioBalancer decides
+which radio sends each frame:
+
+- a frame for a channel some radio listens on goes out on that radio
+  (the least loaded one, if several share the channel)
+- otherwise the peer's channel, as last heard by any radio, is used
+- otherwise (no channel preference) the radio whose channel is least
+  occupied wins
+
+Occupancy is the airtime, sent and heard, in a sliding window
+(ChannelLoad), plus the airtime already queued for the radio.
+
+RxMerger turns the packets from every radio into one stream ordered by
+when each packet started on air (arrival time minus its airtime), so a
+long packet that ended later on one channel still comes before a short
+one that started after it on another. Each packet is held for `hold_s`
+to let slower UARTs catch up, and a packet heard by two radios (e.g.
+on overlapping channels) is delivered once. A packet repeated on the
+radio that first heard it is a new transmission (a retransmission after
+a lost ACK, an unchanged reading) and is delivered again.
+"""
+import hashlib
+import heapq
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+
+class ChannelLoad:
+    """Airtime used on one channel over a sliding window."""
+
+    def __init__(self, window_s: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.window_s = window_s
+        self._clock = clock
+        self._events = deque()  # (time, airtime)
+        self._total = 0.0
+
+    def add(self, airtime: float, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        self._events.append((now, airtime))
+        self._total += airtime
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._events and self._events[0][0] <= now - self.window_s:
+            self._total -= self._events.popleft()[1]
+        if not self._events:
+            self._total = 0.0  # No float drift when idle
+
+    def occupancy(self, now: Optional[float] = None) -> float:
+        """Fraction of the window spent on air (sending or receiving)."""
+        if now is None:
+            now = self._clock()
+        self._trim(now)
+        return self._total / self.window_s
+
+
+@dataclass
+class RadioStats:
+    tx_frames: int = 0
+    tx_airtime: float = 0.0
+    rx_frames: int = 0
+    rx_airtime: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "tx_frames": self.tx_frames,
+            "tx_airtime_s": round(self.tx_airtime, 3),
+            "rx_frames": self.rx_frames,
+            "rx_airtime_s": round(self.rx_airtime, 3),
+        }
+
+
+class RadioBalancer:
+    """Pick the radio for each outbound frame by channel and occupancy."""
+
+    def __init__(
+        self,
+        channels: List[int],
+        window_s: float = 60.0,
+        max_peers: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not channels:
+            raise ValueError("No radios")
+        self.channels = list(channels)  # Listening channel of each radio
+        self.window_s = window_s
+        self.max_peers = max_peers
+        self._clock = clock
+        self.loads = [ChannelLoad(window_s, clock) for _ in channels]
+        self.stats = [RadioStats() for _ in channels]
+        self._queued = [0.0] * len(channels)  # Airtime waiting per radio
+        self._peers: "OrderedDict[int, int]" = OrderedDict()  # Peer -> radio last heard on
+
+    def record_tx(self, radio: int, airtime: float):
+        self.loads[radio].add(airtime)
+        stats = self.stats[radio]
+        stats.tx_frames += 1
+        stats.tx_airtime += airtime
+
+    def record_rx(self, radio: int, airtime: float, sender: Optional[int] = None):
+        self.loads[radio].add(airtime)
+        stats = self.stats[radio]
+        stats.rx_frames += 1
+        stats.rx_airtime += airtime
+        if sender is not None:
+            self.learn(sender, radio)
+
+    def learn(self, peer: int, radio: int):
+        """Remember which radio last heard `peer` (bounded, LRU)."""
+        self._peers[peer] = radio
+        self._peers.move_to_end(peer)
+        if len(self._peers) > self.max_peers:
+            self._peers.popitem(last=False)
+
+    def set_queued(self, radio: int, airtime: float):
+        """Airtime currently queued for `radio` (e.g. TxScheduler.queued_airtime)."""
+        self._queued[radio] = airtime
+
+    def load(self, radio: int) -> float:
+        return self.loads[radio].occupancy() + self._queued[radio] / self.window_s
+
+    def pick(self, channel: Optional[int] = None, peer: Optional[int] = None) -> int:
+        """Index of the radio to send on."""
+        if channel is None and peer is not None and peer in self._peers:
+            channel = self.channels[self._peers[peer]]
+        candidates = [i for i, c in enumerate(self.channels) if c == channel]
+        if not candidates:
+            candidates = range(len(self.channels))
+        return min(candidates, key=lambda i: (self.load(i), i))
+
+    def channel_for(self, peer: int) -> Optional[int]:
+        radio = self._peers.get(peer)
+        return None if radio is None else self.channels[radio]
+
+
+@dataclass
+class MergerStats:
+    delivered: int = 0
+    duplicates: int = 0
+    reordered: int = 0  # Released ahead of a packet that arrived earlier
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+class RxMerger:
+    """
+    One ordered stream from several radios.
+
+    push() each received packet with the radio it came from and its
+    airtime; deliver(radio, packet, rssi) is called in on-air start
+    order once the packet has been held `hold_s`. Call poll() at
+    `deadline`.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[int, bytes, Optional[int]], None],
+        hold_s: float = 0.05,
+        dedup_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.deliver = deliver
+        self.hold_s = hold_s
+        self.dedup_s = dedup_s
+        self._clock = clock
+        self._heap = []  # (start, order, arrived, radio, packet, rssi)
+        self._order = 0
+        # Digest -> (arrival, radio that heard it first)
+        self._seen: "OrderedDict[bytes, Tuple[float, int]]" = OrderedDict()
+        self._last_arrival = float("-inf")  # Of the last packet delivered
+        self.stats = MergerStats()
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        if not self._heap:
+            return None
+        return min(entry[2] for entry in self._heap) + self.hold_s
+
+    def push(self, radio: int, packet: bytes, rssi: Optional[int] = None, airtime: float = 0.0) -> bool:
+        """Queue a packet; False if another radio already heard it."""
+        now = self._clock()
+        while self._seen and next(iter(self._seen.values()))[0] <= now - self.dedup_s:
+            self._seen.popitem(last=False)
+        digest = hashlib.blake2b(packet, digest_size=8).digest()
+        seen = self._seen.get(digest)
+        if seen is not None and seen[1] != radio:
+            self.stats.duplicates += 1
+            return False
+        self._seen.pop(digest, None)  # Keep the dict in arrival order
+        self._seen[digest] = (now, radio)
+        self._order += 1
+        heapq.heappush(self._heap, (now - airtime, self._order, now, radio, packet, rssi))
+        if self.hold_s <= 0:
+            self.poll(now)
+        return True
+
+    def poll(self, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        # Release in start order, but only once the oldest arrival has been
+        # held long enough that nothing can still start before it
+        while self._heap and min(entry[2] for entry in self._heap) + self.hold_s <= now:
+            _start, _order, arrived, radio, packet, rssi = heapq.heappop(self._heap)
+            if arrived < self._last_arrival:
+                self.stats.reordered += 1
+            self._last_arrival = max(self._last_arrival, arrived)
+            self.stats.delivered += 1
+            self.deliver(radio, packet, rssi)
@@ -0,0 +1,318 @@
+"""
+Airtime-aware transmit scheduler.
+
+A single half-duplex radio is shared by everything the gateway sends, and
+regional rules cap each channel's duty cycle. Frames are queued by
+priority class and released only when:
+
+- the radio has finished transmitting the previous frame
+  (time-on-air from lyceum.link.airtime), and
+- the channel's token bucket holds enough airtime for the frame
+
+Classes are served in strict priority (discovery > debate > relay >
+telemetry), but a class blocked on an exhausted channel does not stop
+lower classes going out on other channels. Frames with a deadline are
+dropped, not sent late, once it passes. Queue wait is recorded per class.
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Deque, Dict, Optional
+import logging
+import time
+
+from ..workers import LatencyStats
+from .airtime import LoRaModulation
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Transmit classes, highest priority first."""
+    DISCOVERY = 0  # RoutingRequest / ExpertOffer hollers
+    DEBATE = 1  # DebatePacket / DebateChunk traffic
+    RELAY = 2  # Forwarded user messages
+    TELEMETRY = 3  # Status and sensor updates
+
+
+class TokenBucket:
+    """Airtime budget: fills at `rate` seconds per second, up to `burst`."""
+
+    # Refill arithmetic can leave a bucket a rounding error short of the
+    # cost it was waited for; without slack the wakeup time equals `now`
+    # and the transmit loop spins
+    EPSILON = 1e-9
+
+    def __init__(self, rate: float, burst: float, now: float):
+        if rate <= 0 or burst <= 0:
+            raise ValueError("Rate and burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated = now
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def available_at(self, cost: float, now: float) -> float:
+        """Earliest time `cost` seconds of airtime can be spent."""
+        self._refill(now)
+        # A frame longer than the burst goes out on a full bucket (into debt)
+        cost = min(cost, self.burst)
+        if self.tokens >= cost - self.EPSILON:
+            return now
+        return now + (cost - self.tokens) / self.rate
+
+    def consume(self, cost: float, now: float):
+        self._refill(now)
+        self.tokens -= cost
+
+
+@dataclass
+class SchedulerConfig:
+    """Radio and regulatory limits for the scheduler."""
+    modulation: LoRaModulation = field(default_factory=LoRaModulation)
+    # Fraction of time each channel may transmit (e.g. 0.01 for 1% bands)
+    duty_cycle: float = 0.1
+    # Airtime (seconds) a channel may spend in one burst after idling
+    burst_s: float = 4.0
+    # Bytes on the UART that do not go on air (fixed-point ADDH, ADDL, CH)
+    prefix_bytes: int = 3
+    # Queued frames kept per class before new ones are refused
+    max_queue: int = 64
+    # Default deadline (seconds after enqueue) per class; None = no deadline
+    deadlines: Dict[Priority, Optional[float]] = field(default_factory=lambda: {
+        Priority.DISCOVERY: 10.0,
+        Priority.DEBATE: 30.0,  # PNEUMA_ARCHITECTURE.md Stage C timeout
+        Priority.RELAY: None,
+        Priority.TELEMETRY: None,
+    })
+
+
+@dataclass
+class TxItem:
+    frame: bytes
+    channel: int
+    priority: Priority
+    airtime: float
+    enqueued: float
+    deadline: Optional[float] = None
+
+
+@dataclass
+class ClassStats:
+    queued: int = 0
+    sent: int = 0
+    refused: int = 0  # Queue full
+    expired: int = 0  # Deadline passed before airtime was available
+    failed: int = 0  # write() raised; counted in sent too
+    airtime_s: float = 0.0
+    wait: LatencyStats = field(default_factory=LatencyStats)
+
+    def to_dict(self) -> dict:
+        return {
+            "queued": self.queued,
+            "sent": self.sent,
+            "refused": self.refused,
+            "expired": self.expired,
+            "failed": self.failed,
+            "airtime_s": round(self.airtime_s, 3),
+            "wait": self.wait.to_dict(),
+        }
+
+
+class TxScheduler:
+    """
+    Priority, duty-cycle and airtime aware transmit queue.
+
+    Use enqueue() to submit frames and either run() (asyncio) or, for
+    tests and simulations, pop_ready()/next_wakeup() directly.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SchedulerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config or SchedulerConfig()
+        self._clock = clock
+        self._queues: Dict[Priority, Deque[TxItem]] = {p: deque() for p in Priority}
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._busy_until = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self.paused = False
+        self.stats: Dict[Priority, ClassStats] = {p: ClassStats() for p in Priority}
+
+    def airtime(self, frame: bytes) -> float:
+        """Time on air for a UART frame (prefix bytes are not transmitted)."""
+        on_air = max(len(frame) - self.config.prefix_bytes, 0)
+        return self.config.modulation.time_on_air(on_air)
+
+    def _bucket(self, channel: int, now: float) -> TokenBucket:
+        bucket = self._buckets.get(channel)
+        if bucket is None:
+            bucket = self._buckets[channel] = TokenBucket(
+                self.config.duty_cycle, self.config.burst_s, now
+            )
+        return bucket
+
+    def enqueue(
+        self,
+        frame: bytes,
+        channel: int,
+        priority: Priority = Priority.RELAY,
+        deadline: Optional[float] = None,
+    ) -> bool:
+        """
+        Queue a frame for transmission.
+
+        Args:
+            frame: Bytes to write to the module (with fixed-point prefix)
+            channel: E22 channel the frame goes out on
+            priority: Transmit class
+            deadline: Seconds from now after which the frame is dropped
+                      (defaults to the class deadline from the config)
+
+        Returns:
+            False if the class queue is full and the frame was refused
+        """
+        stats = self.stats[priority]
+        queue = self._queues[priority]
+        if len(queue) >= self.config.max_queue:
+            stats.refused += 1
+            return False
+        now = self._clock()
+        if deadline is None:
+            deadline = self.config.deadlines.get(priority)
+        queue.append(TxItem(
+            frame=frame,
+            channel=channel,
+            priority=priority,
+            airtime=self.airtime(frame),
+            enqueued=now,
+            deadline=now + deadline if deadline is not None else None,
+        ))
+        stats.queued += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _expire(self, now: float):
+        for priority, queue in self._queues.items():
+            if not queue:
+                continue
+            kept = deque(i for i in queue if i.deadline is None or i.deadline > now)
+            expired = len(queue) - len(kept)
+            if expired:
+                self.stats[priority].expired += expired
+                self._queues[priority] = kept
+
+    def pop_ready(self, now: Optional[float] = None) -> Optional[TxItem]:
+        """
+        Take the highest-priority frame that may be transmitted now and
+        charge its airtime, or return None if nothing may go yet.
+        """
+        if now is None:
+            now = self._clock()
+        self._expire(now)
+        if self.paused or now < self._busy_until:
+            return None
+        blocked = set()  # Channels whose head-of-line frame must wait
+        for priority in Priority:
+            for item in self._queues[priority]:
+                if item.channel in blocked:
+                    continue
+                bucket = self._bucket(item.channel, now)
+                if bucket.available_at(item.airtime, now) > now:
+                    blocked.add(item.channel)
+                    continue
+                self._queues[priority].remove(item)
+                bucket.consume(item.airtime, now)
+                self._busy_until = now + item.airtime
+                stats = self.stats[priority]
+                stats.sent += 1
+                stats.airtime_s += item.airtime
+                stats.wait.add(now - item.enqueued)
+                return item
+        return None
+
+    def next_wakeup(self, now: Optional[float] = None) -> Optional[float]:
+        """Earliest time a queued frame could become ready (None if idle)."""
+        if now is None:
+            now = self._clock()
+        if self.paused:
+            return None  # resume() wakes the loop
+        times = []
+        heads = set()  # Only the first frame per channel can go (see pop_ready)
+        for priority in Priority:
+            for item in self._queues[priority]:
+                if item.deadline is not None:
+                    times.append(item.deadline)
+                if item.channel in heads:
+                    continue
+                heads.add(item.channel)
+                times.append(self._bucket(item.channel, now).available_at(item.airtime, now))
+        if not times:
+            return None
+        return max(min(times), self._busy_until)
+
+    def pause(self):
+        """Hold every frame (queueing still works) until resume()."""
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @property
+    def busy_until(self) -> float:
+        """When the last frame released will have finished on air."""
+        return self._busy_until
+
+    @property
+    def depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @property
+    def queued_airtime(self) -> float:
+        """Seconds on air needed to send everything queued."""
+        return sum(item.airtime for q in self._queues.values() for item in q)
+
+    def depths(self) -> Dict[str, int]:
+        return {p.name.lower(): len(q) for p, q in self._queues.items()}
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Per-class counters and queue-wait summaries."""
+        return {p.name.lower(): s.to_dict() for p, s in self.stats.items()}
+
+    async def run(self, write: Callable[[bytes], None]):
+        """
+        Transmit loop: hand each frame to `write` when it may go on air.
+
+        The clock must be the event loop's (loop.time) or time.monotonic.
+        A write that raises is logged and counted; the loop carries on.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            item = self.pop_ready()
+            if item is not None:
+                try:
+                    write(item.frame)
+                except Exception:
+                    self.stats[item.priority].failed += 1
+                    _LOGGER.exception(
+                        "Writing a %d-byte frame on channel %s failed", len(item.frame), item.channel
+                    )
+                continue
+            self._wakeup.clear()
+            wakeup = self.next_wakeup()
+            timeout = None if wakeup is None else max(wakeup - self._clock(), 0.0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
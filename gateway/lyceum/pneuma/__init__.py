@@ -1,12 +1,18 @@
 # Pneuma Protocol Implementation
-from .messages import RoutingRequest, ExpertOffer, DebatePacket
+from .messages import RoutingRequest, ExpertOffer, DebatePacket, DebateChunk
 from .router import IntentClassifier
 from .discovery import ExpertDiscovery
+from .debate import DebateStreamer, DebateStream
+from .synthesis import SynthesisEngine
 
 __all__ = [
     "RoutingRequest",
     "ExpertOffer", 
     "DebatePacket",
+    "DebateChunk",
     "IntentClassifier",
     "ExpertDiscovery",
+    "DebateStreamer",
+    "DebateStream",
+    "SynthesisEngine",
 ]
@@ -0,0 +1,473 @@
+"""
+Pneuma Debate Streaming (Stage C - EXECUTION)
+
+Implements streamed debate rounds for PNEUMA_PROTOCOL.md State 4:
+- Proposer emits its generation as ordered DebateChunks while producing it
+- Critic and Moderator reassemble chunks and consume in-order text at once
+- The final chunk of a round closes it and yields the complete DebatePacket
+
+Streaming cuts time-to-first-word on Layer 2 debates: the critic can start
+reading, and the Moderator can display partial output, before the proposer
+has finished generating.
+
+DebateSession drives the Proposal → Critique → Revision loop for the
+Moderator, and RoundSkipPolicy ends it after round 1 when the critic is
+confident the proposal already holds.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from enum import Enum
+import time
+
+from .messages import DebateChunk, DebateMetadata, DebatePacket
+
+
+@dataclass
+class StreamConfig:
+    """Configuration for chunking a generation into DebateChunks."""
+    # Emit the first chunk as soon as this much text is available
+    first_chunk_chars: int = 16
+    # Target size of later chunks (fewer, larger packets)
+    chunk_chars: int = 160
+    # Out-of-order chunks held per round before the stream is dropped
+    max_pending_chunks: int = 64
+
+
+class DebateStreamer:
+    """
+    Proposer/critic side: splits a token stream into DebateChunks.
+
+    Tokens are buffered and cut on whitespace so chunks never split a word;
+    a word longer than the chunk size goes out whole in a longer chunk.
+    The first chunk is deliberately small to minimise time-to-first-word.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        round: int,
+        role: str = "proposer",
+        config: Optional[StreamConfig] = None,
+    ):
+        self.session_id = session_id
+        self.round = round
+        self.role = role
+        self.config = config or StreamConfig()
+        self._buffer = ""
+        self._seq = 0
+        self._finished = False
+
+    def feed(self, text: str) -> List[DebateChunk]:
+        """
+        Add newly generated text.
+
+        Returns:
+            Chunks ready for transmission (possibly empty)
+        """
+        if self._finished:
+            raise RuntimeError("Round already finished")
+
+        self._buffer += text
+        chunks = []
+        while True:
+            limit = (
+                self.config.first_chunk_chars if self._seq == 0
+                else self.config.chunk_chars
+            )
+            if len(self._buffer) < limit:
+                break
+            # Cut after the last whitespace inside the limit; failing that,
+            # run on to the end of the word (a longer chunk, not a split)
+            cut = max(self._buffer.rfind(" ", 0, limit), self._buffer.rfind("\n", 0, limit))
+            if cut <= 0:
+                cut = self._next_break(max(limit, 1))
+                if cut < 0:
+                    break  # Word still being generated
+            cut += 1
+            chunks.append(self._emit(self._buffer[:cut]))
+            self._buffer = self._buffer[cut:]
+        return chunks
+
+    def _next_break(self, start: int) -> int:
+        breaks = [i for i in (self._buffer.find(" ", start), self._buffer.find("\n", start)) if i >= 0]
+        return min(breaks) if breaks else -1
+
+    def finish(self, metadata: Optional[DebateMetadata] = None) -> List[DebateChunk]:
+        """Flush remaining text and emit the end-of-round marker."""
+        if self._finished:
+            return []
+        self._finished = True
+        final = self._emit(self._buffer, final=True, metadata=metadata or DebateMetadata())
+        self._buffer = ""
+        return [final]
+
+    def _emit(
+        self,
+        content: str,
+        final: bool = False,
+        metadata: Optional[DebateMetadata] = None,
+    ) -> DebateChunk:
+        chunk = DebateChunk(
+            session_id=self.session_id,
+            round=self.round,
+            role=self.role,
+            seq=self._seq,
+            content=content,
+            final=final,
+            metadata=metadata,
+        )
+        self._seq += 1
+        return chunk
+
+
+class ChunkReassembler:
+    """
+    Receiver side: reorders the chunks of one (session, round, role).
+
+    Chunks may arrive duplicated or out of order. Text is released only
+    once every earlier chunk has been seen, so consumers always observe a
+    prefix of the final content.
+    """
+
+    def __init__(self, session_id: str, round: int, role: str, max_pending: int = 64):
+        self.session_id = session_id
+        self.round = round
+        self.role = role
+        self.max_pending = max_pending
+        self._parts: List[str] = []
+        self._pending: Dict[int, DebateChunk] = {}
+        self._next_seq = 0
+        self._final_seq: Optional[int] = None
+        self._metadata = DebateMetadata()
+
+    def add(self, chunk: DebateChunk) -> str:
+        """
+        Add a chunk.
+
+        Returns:
+            Text newly available in order (empty if still waiting on a gap)
+
+        Raises:
+            ValueError: If too many out-of-order chunks are pending
+        """
+        if chunk.seq < self._next_seq or chunk.seq in self._pending:
+            return ""  # Duplicate
+        if self._final_seq is not None and chunk.seq > self._final_seq:
+            return ""  # Past the end-of-round marker
+        if chunk.final:
+            self._final_seq = chunk.seq
+
+        self._pending[chunk.seq] = chunk
+        released = []
+        while self._next_seq in self._pending:
+            ready = self._pending.pop(self._next_seq)
+            released.append(ready.content)
+            if ready.final and ready.metadata is not None:
+                self._metadata = ready.metadata
+            self._next_seq += 1
+
+        if len(self._pending) > self.max_pending:
+            raise ValueError("Too many out-of-order chunks")
+
+        delta = "".join(released)
+        if delta:
+            self._parts.append(delta)
+        return delta
+
+    @property
+    def text(self) -> str:
+        """In-order text received so far."""
+        return "".join(self._parts)
+
+    @property
+    def complete(self) -> bool:
+        """True once the end-of-round marker and every earlier chunk arrived."""
+        return self._final_seq is not None and self._next_seq > self._final_seq
+
+    def missing(self) -> List[int]:
+        """Sequence numbers known to be missing (gaps before the highest seen)."""
+        if not self._pending:
+            return []
+        highest = max(self._pending)
+        return [s for s in range(self._next_seq, highest) if s not in self._pending]
+
+    def to_packet(self) -> Optional[DebatePacket]:
+        """Build the full DebatePacket once the round is complete."""
+        if not self.complete:
+            return None
+        return DebatePacket(
+            session_id=self.session_id,
+            round=self.round,
+            role=self.role,
+            content=self.text,
+            metadata=self._metadata,
+        )
+
+
+@dataclass
+class StreamUpdate:
+    """Result of feeding one chunk into a DebateStream."""
+    round: int
+    role: str
+    delta: str  # Newly available in-order text
+    packet: Optional[DebatePacket] = None  # Set when the round just completed
+
+    @property
+    def complete(self) -> bool:
+        return self.packet is not None
+
+
+class DebateStream:
+    """
+    Moderator side: tracks every streamed round of one debate session.
+
+    Feed it DebateChunks as they arrive; each call reports the text that
+    can be displayed (or forwarded to the critic) right away.
+    """
+
+    def __init__(self, session_id: str, config: Optional[StreamConfig] = None):
+        self.session_id = session_id
+        self.config = config or StreamConfig()
+        self._rounds: Dict[Tuple[int, str], ChunkReassembler] = {}
+        self._completed: set = set()
+        self._dropped: set = set()
+
+    def add(self, chunk: DebateChunk) -> Optional[StreamUpdate]:
+        """
+        Add a chunk from the air.
+
+        Returns:
+            StreamUpdate, or None if the chunk is for another session,
+            outside the round limit, or for a round already completed or
+            dropped (too many out-of-order chunks pending)
+        """
+        if chunk.session_id != self.session_id:
+            return None
+        if not 1 <= chunk.round <= DebatePacket.MAX_ROUNDS:
+            return None
+        key = (chunk.round, chunk.role)
+        if key in self._completed or key in self._dropped:
+            return None
+
+        reassembler = self._rounds.get(key)
+        if reassembler is None:
+            reassembler = ChunkReassembler(
+                self.session_id,
+                chunk.round,
+                chunk.role,
+                max_pending=self.config.max_pending_chunks,
+            )
+            self._rounds[key] = reassembler
+
+        try:
+            delta = reassembler.add(chunk)
+        except ValueError:
+            # Gaps this wide mean the stream is lost; ignore the rest of it
+            del self._rounds[key]
+            self._dropped.add(key)
+            return None
+        packet = reassembler.to_packet()
+        if packet is not None:
+            self._completed.add(key)
+        return StreamUpdate(round=chunk.round, role=chunk.role, delta=delta, packet=packet)
+
+    def partial_text(self, round: int, role: str) -> str:
+        """Best in-order text so far for a round (for partial display)."""
+        reassembler = self._rounds.get((round, role))
+        return reassembler.text if reassembler else ""
+
+    def is_complete(self, round: int, role: str) -> bool:
+        return (round, role) in self._completed
+
+    def is_dropped(self, round: int, role: str) -> bool:
+        return (round, role) in self._dropped
+
+
+@dataclass
+class RoundSkipConfig:
+    """Thresholds for ending a debate before the round cap."""
+    enabled: bool = True
+    # Critic must be at least this confident in its own critique...
+    critic_confidence: float = 0.85
+    # ...and agree with the proposal at least this much
+    critic_agreement: float = 0.9
+    # Proposer's own confidence must also clear this bar
+    proposer_confidence: float = 0.8
+    # Backbone air rate used to convert skipped bytes to airtime (2.4 kbps)
+    air_bytes_per_second: float = 300.0
+
+
+@dataclass
+class RoundSkipStats:
+    """Running totals for RoundSkipPolicy decisions."""
+    debates: int = 0
+    rounds_run: int = 0
+    rounds_skipped: int = 0
+    latency_saved_s: float = 0.0
+    bytes_saved: int = 0
+    airtime_saved_s: float = 0.0
+
+    @property
+    def skip_rate(self) -> float:
+        """Fraction of possible rounds that were skipped."""
+        possible = self.rounds_run + self.rounds_skipped
+        return self.rounds_skipped / possible if possible else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "debates": self.debates,
+            "rounds_run": self.rounds_run,
+            "rounds_skipped": self.rounds_skipped,
+            "skip_rate": self.skip_rate,
+            "latency_saved_s": self.latency_saved_s,
+            "bytes_saved": self.bytes_saved,
+            "airtime_saved_s": self.airtime_saved_s,
+        }
+
+
+class RoundSkipPolicy:
+    """
+    Decides whether a debate may stop after a critique.
+
+    Shared across sessions so its stats describe the Moderator as a whole.
+    """
+
+    def __init__(self, config: Optional[RoundSkipConfig] = None):
+        self.config = config or RoundSkipConfig()
+        self.stats = RoundSkipStats()
+
+    def should_stop(self, proposal: DebatePacket, critique: DebatePacket) -> bool:
+        """True if the critique agrees strongly enough to skip revision."""
+        if not self.config.enabled:
+            return False
+        agreement = critique.metadata.agreement
+        if agreement is None:
+            return False  # Critic did not vote; assume it wants a revision
+        return (
+            critique.metadata.confidence >= self.config.critic_confidence
+            and agreement >= self.config.critic_agreement
+            and proposal.metadata.confidence >= self.config.proposer_confidence
+        )
+
+    def record(
+        self,
+        rounds_run: int,
+        rounds_skipped: int,
+        round_seconds: float,
+        round_bytes: int,
+    ):
+        """
+        Record a finished debate.
+
+        Args:
+            rounds_run: Rounds actually completed
+            rounds_skipped: Rounds avoided by the policy
+            round_seconds: Mean observed duration of a completed round
+            round_bytes: Mean observed content bytes of a completed round
+        """
+        self.stats.debates += 1
+        self.stats.rounds_run += rounds_run
+        self.stats.rounds_skipped += rounds_skipped
+        if rounds_skipped:
+            saved_bytes = round_bytes * rounds_skipped
+            self.stats.latency_saved_s += round_seconds * rounds_skipped
+            self.stats.bytes_saved += saved_bytes
+            self.stats.airtime_saved_s += saved_bytes / self.config.air_bytes_per_second
+
+
+class DebateAction(Enum):
+    """What the Moderator should do after a DebatePacket arrives."""
+    FORWARD_TO_CRITIC = "forward_to_critic"
+    REQUEST_REVISION = "request_revision"
+    FINISH = "finish"
+    IGNORE = "ignore"
+
+
+class DebateSession:
+    """
+    Moderator-side Stage C state machine for one session.
+
+    Proposal → Critique → Revision → Critique, capped at
+    DebatePacket.MAX_ROUNDS and cut short by the RoundSkipPolicy.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        has_critic: bool = True,
+        policy: Optional[RoundSkipPolicy] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_id = session_id
+        self.has_critic = has_critic
+        self.policy = policy or RoundSkipPolicy()
+        self._clock = clock
+        self.round = 1
+        self.done = False
+        self.skipped_rounds = 0
+        self.packets: List[DebatePacket] = []
+        self._round_started = clock()
+        self._round_seconds: List[float] = []
+        self._round_bytes: List[int] = []
+        self._current_bytes = 0
+
+    def _expected_role(self) -> str:
+        last = self.packets[-1] if self.packets else None
+        if last is None or last.is_critic():
+            return "proposer"
+        return "critic"
+
+    def add_packet(self, packet: DebatePacket) -> DebateAction:
+        """Advance the session with a completed DebatePacket."""
+        if (
+            self.done
+            or packet.session_id != self.session_id
+            or packet.round != self.round
+            or packet.role != self._expected_role()
+        ):
+            return DebateAction.IGNORE
+
+        self.packets.append(packet)
+        self._current_bytes += len(packet.content.encode("utf-8"))
+
+        if packet.is_proposer():
+            if not self.has_critic:
+                self._close_round()
+                return self._finish()
+            return DebateAction.FORWARD_TO_CRITIC
+
+        self._close_round()
+        if self.round >= DebatePacket.MAX_ROUNDS:
+            return self._finish()
+        if self.policy.should_stop(self.packets[-2], packet):
+            self.skipped_rounds = DebatePacket.MAX_ROUNDS - self.round
+            return self._finish()
+
+        self.round += 1
+        return DebateAction.REQUEST_REVISION
+
+    def _close_round(self):
+        now = self._clock()
+        self._round_seconds.append(now - self._round_started)
+        self._round_bytes.append(self._current_bytes)
+        self._round_started = now
+        self._current_bytes = 0
+
+    def _finish(self) -> DebateAction:
+        self.done = True
+        completed = len(self._round_seconds)
+        self.policy.record(
+            rounds_run=completed,
+            rounds_skipped=self.skipped_rounds,
+            round_seconds=sum(self._round_seconds) / completed,
+            round_bytes=sum(self._round_bytes) // completed,
+        )
+        return DebateAction.FINISH
+
+    @property
+    def final_proposal(self) -> Optional[DebatePacket]:
+        """Latest proposer packet (the answer to synthesise)."""
+        for packet in reversed(self.packets):
+            if packet.is_proposer():
+                return packet
+        return None
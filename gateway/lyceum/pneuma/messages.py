@@ -5,6 +5,7 @@ Implements the JSON schemas defined in PNEUMA_PROTOCOL.md:
 - RoutingRequest (Stage A → B): Moderator broadcasts to find Experts
 - ExpertOffer (Stage B Response): Guardian offers its services
 - DebatePacket (Stage C Execution): Core exchange of thought
+- DebateChunk (Stage C Streaming): Ordered slice of a DebatePacket in flight
 
 All messages serialize to JSON for Layer 2 (TCP/IP) or CBOR for Layer 3 (LoRa).
 """
@@ -187,18 +188,23 @@ class DebateMetadata:
     """Metadata attached to debate content."""
     confidence: float = 0.9
     citations: List[str] = field(default_factory=list)
+    agreement: Optional[float] = None  # Critic only: agreement with the proposal [0, 1]
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        d = {
             "confidence": self.confidence,
             "citations": self.citations,
         }
+        if self.agreement is not None:
+            d["agreement"] = self.agreement
+        return d
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "DebateMetadata":
         return cls(
             confidence=d.get("confidence", 0.9),
             citations=d.get("citations", []),
+            agreement=d.get("agreement"),
         )
 
 
@@ -260,6 +266,61 @@ class DebatePacket:
         return self.role == "critic"
 
 
+@dataclass
+class DebateChunk:
+    """
+    Stage C Streaming: An ordered slice of a proposal or critique.
+
+    Lets the critic and the Moderator start reading a generation before
+    the expert finishes it. Chunks are ordered by `seq` within a round;
+    the chunk with `final` set closes the round and carries its metadata.
+    """
+    session_id: str
+    round: int
+    role: str  # "proposer" or "critic"
+    seq: int  # 0-based position within the round
+    content: str  # Text produced since the previous chunk
+    final: bool = False  # End-of-round marker
+    metadata: Optional[DebateMetadata] = None  # Only sent on the final chunk
+
+    MSG_TYPE = "debate_chunk"
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "type": self.MSG_TYPE,
+            "session_id": self.session_id,
+            "round": self.round,
+            "role": self.role,
+            "seq": self.seq,
+            "content": self.content,
+            "final": self.final,
+        }
+        # Omitted on intermediate chunks to keep them small on Layer 3
+        if self.metadata is not None:
+            d["metadata"] = self.metadata.to_dict()
+        return d
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DebateChunk":
+        metadata = d.get("metadata")
+        return cls(
+            session_id=d["session_id"],
+            round=d["round"],
+            role=d["role"],
+            seq=d["seq"],
+            content=d["content"],
+            final=d.get("final", False),
+            metadata=DebateMetadata.from_dict(metadata) if metadata is not None else None,
+        )
+
+    @classmethod
+    def from_json(cls, s: str) -> "DebateChunk":
+        return cls.from_dict(json.loads(s))
+
+
 def parse_message(data: str) -> Optional[Any]:
     """
     Parse a JSON message and return the appropriate message type.
@@ -274,6 +335,8 @@ def parse_message(data: str) -> Optional[Any]:
             return ExpertOffer.from_dict(d)
         elif msg_type == DebatePacket.MSG_TYPE:
             return DebatePacket.from_dict(d)
+        elif msg_type == DebateChunk.MSG_TYPE:
+            return DebateChunk.from_dict(d)
         return None
     except (json.JSONDecodeError, KeyError, TypeError):
         return None
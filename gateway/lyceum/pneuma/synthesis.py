@@ -0,0 +1,235 @@
+"""
+Pneuma Synthesis (Stage D - FUSION)
+
+Implements the Moderator-side fusion step from PNEUMA_ARCHITECTURE.md:
+- Weighted Voting: answers weighted by Guardian reputation and confidence
+- Evidence-Based: answers with citations win ties against bare claims
+- Streaming with Backfill: the best answer is available at any moment and
+  a "Revised Answer" is flagged when a late packet clearly beats it
+
+Fusion is incremental: it starts from the proposer's first (even partial)
+output and is updated as critiques and revisions arrive, so the Moderator
+always has something to return when the 30-second timeout fires.
+"""
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+import time
+
+from .messages import DebatePacket
+
+
+@dataclass
+class SynthesisConfig:
+    """Weights for fusing debate output."""
+    # Bonus for answers that carry verifiable citations
+    citation_bonus: float = 0.1
+    # Revisions address a critique, so they outrank the draft they replace
+    revision_bonus: float = 0.05
+    # Partial (still streaming) answers are discounted until complete
+    partial_penalty: float = 0.5
+    # Another expert's answer must beat the shown one by this much before
+    # it replaces it (and triggers a "Revised Answer" notification)
+    revision_margin: float = 0.1
+    # Hard limit from PNEUMA_ARCHITECTURE.md Stage C
+    timeout_seconds: float = DebatePacket.TIMEOUT_SECONDS
+
+
+@dataclass
+class Candidate:
+    """One expert's latest answer and the critiques it received."""
+    source: str  # Guardian ID (or role when unknown)
+    content: str
+    confidence: float
+    reputation: int
+    round: int
+    citations: List[str] = field(default_factory=list)
+    partial: bool = False
+    agreements: List[float] = field(default_factory=list)
+
+
+@dataclass
+class SynthesisResult:
+    """The Moderator's current best answer."""
+    content: str
+    source: Optional[str]
+    score: float
+    partial: bool = False  # Built from a proposal still streaming in
+    revised: bool = False  # Replaced a previously shown answer
+    timed_out: bool = False
+    critiques: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.content
+
+
+class SynthesisEngine:
+    """
+    Incremental Stage D fusion for one debate session.
+
+    Feed it proposer and critic packets (or partial proposer text) as they
+    arrive and read `current` whenever an answer is needed.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        config: Optional[SynthesisConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session_id = session_id
+        self.config = config or SynthesisConfig()
+        self._clock = clock
+        self._started = clock()
+        self._candidates: Dict[str, Candidate] = {}
+        self._critiques: List[str] = []
+        self._shown: Optional[SynthesisResult] = None
+        self.revisions = 0
+
+    def score(self, candidate: Candidate) -> float:
+        """
+        Score a candidate answer (higher is better).
+
+        Base is confidence weighted by normalised reputation; critics'
+        agreement scales it, and citations/revisions add small bonuses.
+        """
+        rep = min(max(candidate.reputation, 0) / 100.0, 1.0)
+        score = candidate.confidence * (0.5 + 0.5 * rep)
+        if candidate.agreements:
+            mean = sum(candidate.agreements) / len(candidate.agreements)
+            score *= 0.5 + 0.5 * mean
+        if candidate.citations:
+            score += self.config.citation_bonus
+        if candidate.round > 1:
+            score += self.config.revision_bonus
+        if candidate.partial:
+            score *= self.config.partial_penalty
+        return score
+
+    def add_partial(self, text: str, source: str = "proposer", reputation: int = 50,
+                    round: int = 1) -> SynthesisResult:
+        """
+        Record in-order streamed text for a proposal still being generated.
+
+        Ignored once a complete packet for that source and round is known.
+        """
+        existing = self._candidates.get(source)
+        if existing is not None and (
+            existing.round > round or (existing.round == round and not existing.partial)
+        ):
+            return self._update()
+        self._candidates[source] = Candidate(
+            source=source,
+            content=text,
+            confidence=existing.confidence if existing else 0.5,
+            reputation=reputation,
+            round=round,
+            partial=True,
+            agreements=[] if existing is None or existing.round != round
+            else existing.agreements,
+        )
+        return self._update()
+
+    def add_packet(
+        self,
+        packet: DebatePacket,
+        source: Optional[str] = None,
+        reputation: int = 50,
+        target: Optional[str] = None,
+    ) -> SynthesisResult:
+        """
+        Fuse a complete DebatePacket into the current answer.
+
+        Args:
+            packet: Proposal, revision or critique
+            source: Guardian ID of the sender (defaults to its role)
+            reputation: Sender's reputation from the Pneuma Vault
+            target: For critiques, the source being critiqued
+                    (defaults to the current best proposal)
+        """
+        if packet.session_id != self.session_id:
+            return self.current
+
+        if packet.is_proposer():
+            source = source or packet.role
+            existing = self._candidates.get(source)
+            if existing is not None and not existing.partial and existing.round > packet.round:
+                return self.current  # Late copy of an older draft
+            self._candidates[source] = Candidate(
+                source=source,
+                content=packet.content,
+                confidence=packet.metadata.confidence,
+                reputation=reputation,
+                round=packet.round,
+                citations=list(packet.metadata.citations),
+                # Critiques of the draft do not carry over to its revision
+                agreements=[] if existing is None or existing.round != packet.round
+                else existing.agreements,
+            )
+        elif packet.is_critic():
+            self._critiques.append(packet.content)
+            agreement = packet.metadata.agreement
+            if agreement is not None:
+                best = self._candidates.get(target) if target else self._best()
+                if best is not None:
+                    best.agreements.append(agreement)
+        return self._update()
+
+    def _best(self) -> Optional[Candidate]:
+        if not self._candidates:
+            return None
+        return max(self._candidates.values(), key=self.score)
+
+    def _update(self) -> SynthesisResult:
+        best = self._best()
+        shown = self._shown
+        held = self._candidates.get(shown.source) if shown and shown.source else None
+        if (
+            best is not None
+            and held is not None
+            and not held.partial
+            and best is not held
+            and self.score(best) < self.score(held) + self.config.revision_margin
+        ):
+            best = held  # Not clearly better: keep showing the same answer
+
+        if best is None:
+            result = SynthesisResult(content="", source=None, score=0.0)
+        else:
+            result = SynthesisResult(
+                content=best.content,
+                source=best.source,
+                score=self.score(best),
+                partial=best.partial,
+                critiques=list(self._critiques),
+            )
+            if (
+                shown is not None
+                and not shown.partial
+                and not result.partial
+                and result.content != shown.content
+            ):
+                result.revised = True
+                self.revisions += 1
+        self._shown = result
+        return result
+
+    @property
+    def current(self) -> SynthesisResult:
+        """Best answer right now (may be partial or empty)."""
+        return self._shown or self._update()
+
+    @property
+    def expired(self) -> bool:
+        """True once the Stage C timeout has elapsed."""
+        return self._clock() - self._started >= self.config.timeout_seconds
+
+    def finalize(self) -> SynthesisResult:
+        """
+        Return the answer to deliver to the user.
+
+        On timeout this is whatever has been fused so far, flagged
+        `timed_out`, rather than nothing.
+        """
+        # A copy: callers may still hold the result `current` returned
+        return replace(self.current, timed_out=self.expired)
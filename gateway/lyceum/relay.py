@@ -0,0 +1,415 @@
+"""
+Batched internet relay with an on-disk spool for when the uplink is down.
+
+Relaying one message per HTTP request (and one connection per message)
+costs a TLS handshake and a round trip per LoRa packet, and a failed
+POST used to lose the message. RelayClient instead:
+
+- reuses one connection pool (the `post` callable: HttpPoster here,
+  Home Assistant's shared aiohttp session in the integration)
+- sends queued messages in batches (up to `batch_size` / `batch_bytes`,
+  waiting `linger_s` for a batch to fill) as one gzip-compressed JSON
+  array per POST
+- applies backpressure: submit() waits while `max_queue` messages are
+  already waiting for a slow relay
+- on failure (connection error, 408/429/5xx) goes offline: the batch and
+  everything queued after it is appended to a Spool and replayed, in
+  order, once a retry (exponential backoff) gets through
+
+Delivery is at-least-once: a crash between a successful POST and the
+spool commit replays that batch.
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import gzip
+import json
+import os
+import threading
+import time
+
+HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+# Responses worth retrying; any other non-2xx means the relay will never
+# take the batch, so it is dropped rather than blocking the queue forever
+RETRY_STATUS = {408, 429}
+
+
+class Spool:
+    """
+    Durable FIFO of undelivered records: an append-only file plus offset.
+
+    Records are single-line byte strings (compact JSON), one per line.
+    Delivered records are not rewritten: the read offset moves forward
+    in a small side file, and both are truncated once everything has
+    been delivered. A torn last line (crash mid-append) is discarded on
+    open. Blocking file I/O: call from a worker thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, fsync: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.fsync = fsync
+        self._offset_path = path + ".offset"
+        self.offset = 0
+        self.depth = 0  # Records not yet delivered
+        self.size = 0  # File size (bytes)
+        self.dropped = 0  # Records refused because the spool was full
+        self._open()
+
+    def _open(self):
+        try:
+            with open(self._offset_path, "rb") as f:
+                self.offset = int(f.read() or 0)
+        except (FileNotFoundError, ValueError):
+            self.offset = 0
+        if not os.path.exists(self.path):
+            open(self.path, "ab").close()
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)  # Torn write
+            self.size = end
+        self.offset = min(self.offset, self.size)
+        self.depth = data.count(b"\n", self.offset, self.size)
+
+    @property
+    def pending_bytes(self) -> int:
+        return self.size - self.offset
+
+    def append(self, records: List[bytes]) -> int:
+        """Append records in order; returns how many fit under max_bytes."""
+        out = []
+        size = self.size
+        for record in records:
+            if size + len(record) + 1 > self.max_bytes:
+                break
+            out.append(record)
+            size += len(record) + 1
+        self.dropped += len(records) - len(out)
+        if out:
+            with open(self.path, "ab") as f:
+                f.write(b"\n".join(out) + b"\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self.size = size
+            self.depth += len(out)
+        return len(out)
+
+    def peek(self, max_records: int, max_bytes: int) -> Tuple[List[bytes], int]:
+        """The oldest records (at least one) and the offset just past them."""
+        records = []
+        end = self.offset
+        total = 0
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                if records and (len(records) >= max_records or total + len(line) > max_bytes):
+                    break
+                records.append(line[:-1])
+                total += len(line)
+                end += len(line)
+        return records, end
+
+    def commit(self, end: int, count: int):
+        """Mark records up to `end` (from peek) delivered."""
+        self.depth -= count
+        if end >= self.size:
+            # Everything delivered: start over with an empty file
+            with open(self.path, "wb"):
+                pass
+            self.size = self.offset = self.depth = 0
+        else:
+            self.offset = end
+        tmp = self._offset_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(str(self.offset).encode())
+        os.replace(tmp, self._offset_path)
+
+
+class HttpPoster:
+    """
+    POST bodies to one URL over a kept-alive http.client connection.
+
+    Await it like the aiohttp-based poster; the blocking request runs in
+    the default executor. One request at a time, so the connection is
+    reused for every batch.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parts = urlsplit(url)
+        self._cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path or "/"
+        if parts.query:
+            self._path += "?" + parts.query
+        self.timeout = timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _request(self, body: bytes, headers: Dict[str, str]) -> int:
+        if self._conn is None:
+            self._conn = self._cls(self._host, self._port, timeout=self.timeout)
+        try:
+            self._conn.request("POST", self._path, body, headers)
+            response = self._conn.getresponse()
+            response.read()  # Drain it so the connection can be reused
+            return response.status
+        except (OSError, HTTPException):
+            self.close()
+            raise
+
+    def post_sync(self, body: bytes, headers: Dict[str, str]) -> int:
+        with self._lock:
+            if self._conn is None:
+                return self._request(body, headers)
+            try:
+                return self._request(body, headers)
+            except (OSError, HTTPException):
+                # A kept-alive connection the server has since closed
+                # fails on first use; retry once on a fresh one
+                return self._request(body, headers)
+
+    async def __call__(self, body: bytes, headers: Dict[str, str]) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.post_sync, body, headers)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@dataclass
+class RelayStats:
+    submitted: int = 0
+    sent: int = 0  # Messages the relay accepted
+    batches: int = 0
+    failures: int = 0  # POSTs that failed or asked for a retry
+    rejected: int = 0  # Messages in batches refused for good (4xx)
+    dropped: int = 0  # Queue or spool full
+    spooled: int = 0  # Messages written to the spool
+    replayed: int = 0  # Messages delivered from the spool
+    raw_bytes: int = 0
+    body_bytes: int = 0  # After compression
+
+    def to_dict(self) -> dict:
+        d = dict(self.__dict__)
+        d["compression"] = round(self.raw_bytes / self.body_bytes, 2) if self.body_bytes else None
+        return d
+
+
+class RelayClient:
+    """
+    Queue messages for the internet relay and send them in batches.
+
+    post(body, headers) -> HTTP status must reuse connections across
+    calls. Without a spool, a failed batch is retried in memory and the
+    queue (then submit()) blocks until the relay is back.
+    """
+
+    def __init__(
+        self,
+        post: Callable[[bytes, Dict[str, str]], Awaitable[int]],
+        spool: Optional[Spool] = None,
+        batch_size: int = 64,
+        batch_bytes: int = 32 * 1024,
+        linger_s: float = 0.1,
+        max_queue: int = 256,
+        compress_level: int = 6,
+        retry_min_s: float = 1.0,
+        retry_max_s: float = 60.0,
+        rate_window_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.post = post
+        self.spool = spool
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.linger_s = linger_s
+        self.compress_level = compress_level
+        self.retry_min_s = retry_min_s
+        self.retry_max_s = retry_max_s
+        self.rate_window_s = rate_window_s
+        self._clock = clock
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue)
+        self._inflight: List[bytes] = []  # Batch taken from the queue, not yet sent or spooled
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+        self._sent_log: deque = deque()  # (time, messages) within the rate window
+        self._task: Optional[asyncio.Task] = None
+        self.online = True
+        self.stats = RelayStats()
+
+    # Producer side
+
+    @staticmethod
+    def encode(record: Any) -> bytes:
+        return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+    async def submit(self, record: Any):
+        """Queue one JSON-serializable record; waits while the queue is full."""
+        await self._queue.put(self.encode(record))
+        self.stats.submitted += 1
+
+    def submit_nowait(self, record: Any) -> bool:
+        """Queue a record without waiting; False (and dropped) if full."""
+        try:
+            self._queue.put_nowait(self.encode(record))
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            return False
+        self.stats.submitted += 1
+        return True
+
+    # Sender side
+
+    def start(self):
+        self._task = asyncio.ensure_future(self.run())
+
+    async def close(self):
+        """Stop sending; anything not yet delivered goes to the spool."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.spool:
+            records = self._inflight + self._drain_queue()
+            self._inflight = []
+            if records:
+                await self._spool(records)
+
+    async def _io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def _drain_queue(self) -> List[bytes]:
+        records = []
+        while not self._queue.empty():
+            records.append(self._queue.get_nowait())
+        return records
+
+    async def _spool(self, records: List[bytes]):
+        written = await self._io(self.spool.append, records)
+        self.stats.spooled += written
+        self.stats.dropped += len(records) - written
+
+    async def run(self):
+        """Send loop: spooled messages first (oldest), then the queue."""
+        while True:
+            if self.spool and self.spool.depth:
+                await self._drain_spool()
+                continue
+            await self._collect()
+            while not await self._send(self._inflight):
+                if self.spool:
+                    await self._spool(self._inflight)
+                    break
+                await asyncio.sleep(max(0.0, self._retry_at - self._clock()))
+            self._inflight = []
+
+    async def _get(self, timeout: float) -> Optional[bytes]:
+        """Next queued record, or None after `timeout` seconds."""
+        # Not wait_for: it can swallow close()'s cancellation when the
+        # record arrives at the same moment
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._queue.get()
+        except TimeoutError:
+            return None
+
+    async def _collect(self):
+        """Wait for one message, then up to linger_s for a batch to fill."""
+        # Taken messages live in _inflight so close() can spool them
+        batch = self._inflight
+        batch.append(await self._queue.get())
+        size = len(batch[0])
+        deadline = self._clock() + self.linger_s
+        while len(batch) < self.batch_size and size < self.batch_bytes:
+            if self._queue.empty():
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    break
+                record = await self._get(remaining)
+                if record is None:
+                    break
+            else:
+                record = self._queue.get_nowait()
+            batch.append(record)
+            size += len(record)
+
+    async def _drain_spool(self):
+        wait = self._retry_at - self._clock()
+        if wait > 0:
+            # Offline: keep the queue moving onto disk until the next retry
+            first = await self._get(wait)
+            if first is None:
+                return
+            await self._spool([first] + self._drain_queue())
+            return
+        records, end = await self._io(self.spool.peek, self.batch_size, self.batch_bytes)
+        if await self._send(records):
+            await self._io(self.spool.commit, end, len(records))
+            self.stats.replayed += len(records)
+
+    async def _send(self, records: List[bytes]) -> bool:
+        """POST one batch; False if it should be retried later."""
+        raw = b"[" + b",".join(records) + b"]"
+        body = gzip.compress(raw, self.compress_level)
+        try:
+            status = await self.post(body, HEADERS)
+        except Exception:
+            status = None
+        if status is None or status in RETRY_STATUS or status >= 500:
+            self.stats.failures += 1
+            self.online = False
+            self._retry_delay = min(self.retry_max_s, max(self.retry_min_s, 2 * self._retry_delay))
+            self._retry_at = self._clock() + self._retry_delay
+            return False
+        self.online = True
+        self._retry_delay = 0.0
+        self.stats.batches += 1
+        self.stats.raw_bytes += len(raw)
+        self.stats.body_bytes += len(body)
+        if 200 <= status < 300:
+            self.stats.sent += len(records)
+            self._sent_log.append((self._clock(), len(records)))
+        else:
+            self.stats.rejected += len(records)
+        return True
+
+    # Reporting
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting in memory."""
+        return self._queue.qsize() + len(self._inflight)
+
+    @property
+    def spool_depth(self) -> int:
+        return self.spool.depth if self.spool else 0
+
+    def rate(self) -> float:
+        """Messages delivered per second over the rate window."""
+        now = self._clock()
+        while self._sent_log and self._sent_log[0][0] <= now - self.rate_window_s:
+            self._sent_log.popleft()
+        return sum(n for _, n in self._sent_log) / self.rate_window_s
+
+    def to_dict(self) -> dict:
+        return dict(
+            self.stats.to_dict(),
+            online=self.online,
+            depth=self.depth,
+            spool_depth=self.spool_depth,
+            spool_bytes=self.spool.pending_bytes if self.spool else 0,
+            messages_per_s=round(self.rate(), 3),
+        )
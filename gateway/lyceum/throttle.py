@@ -0,0 +1,187 @@
+"""
+Coalescing for gateway state updates and message events.
+
+At relay traffic rates every received packet used to trigger one bus
+event and one state write per sensor, and the recorder stores every one
+of them. These helpers keep the counters exact while bounding how often
+the outside world hears about them:
+
+- UpdateThrottle: a burst of change notifications becomes at most one
+  notification per `min_interval` - the first one immediately, the rest
+  folded into one trailing notification at the end of the interval, so
+  the final state is never lost
+- EventSummarizer: message events collected over `window_s` become one
+  summary (count, per-sender and per-channel counts, signal range, last
+  message)
+
+Both are sans-IO: call poll() at `deadline` from whatever timer the
+caller has (HA uses loop.call_at).
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import time
+
+
+@dataclass
+class ThrottleStats:
+    requested: int = 0  # Notifications asked for
+    notified: int = 0  # Notifications delivered
+
+    @property
+    def coalesced(self) -> int:
+        return self.requested - self.notified
+
+    def to_dict(self) -> dict:
+        return {
+            "requested": self.requested,
+            "notified": self.notified,
+            "coalesced": self.coalesced,
+        }
+
+
+class UpdateThrottle:
+    """
+    Deliver notify() at most once per `min_interval` seconds.
+
+    request() notifies immediately if the last notification is at least
+    `min_interval` old; otherwise it marks the state dirty and the next
+    poll() at `deadline` notifies once for everything since. With
+    min_interval=0 every request notifies.
+    """
+
+    def __init__(
+        self,
+        notify: Callable[[], None],
+        min_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.notify = notify
+        self.min_interval = min_interval
+        self._clock = clock
+        self._last = float("-inf")
+        self._dirty = False
+        self.stats = ThrottleStats()
+
+    @property
+    def pending(self) -> bool:
+        return self._dirty
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._last + self.min_interval if self._dirty else None
+
+    def request(self, now: Optional[float] = None) -> bool:
+        """Ask for a notification; True if it was delivered right away."""
+        if now is None:
+            now = self._clock()
+        self.stats.requested += 1
+        if not self._dirty and now >= self._last + self.min_interval:
+            self._fire(now)
+            return True
+        self._dirty = True
+        return False
+
+    def poll(self, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        if self._dirty and now >= self._last + self.min_interval:
+            self._fire(now)
+
+    def flush(self):
+        """Deliver a pending notification now (e.g. on shutdown)."""
+        if self._dirty:
+            self._fire(self._clock())
+
+    def _fire(self, now: float):
+        self._dirty = False
+        self._last = now
+        self.stats.notified += 1
+        self.notify()
+
+
+class EventSummarizer:
+    """
+    Fold message events into one summary per `window_s`.
+
+    add() each event; emit(summary) is called from poll() once the window
+    that opened with the first event has elapsed. At most `max_keys`
+    senders and channels are counted individually; the rest are counted
+    under "other" so a flood of senders can't grow the summary.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], None],
+        window_s: float = 10.0,
+        max_keys: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.emit = emit
+        self.window_s = window_s
+        self.max_keys = max_keys
+        self._clock = clock
+        self._opened: Optional[float] = None
+        self._reset()
+        self.summaries = 0
+
+    def _reset(self):
+        self._count = 0
+        self._senders: Dict[str, int] = {}
+        self._channels: Dict[Any, int] = {}
+        self._rssi_min: Optional[int] = None
+        self._rssi_max: Optional[int] = None
+        self._first: Optional[Dict[str, Any]] = None
+        self._last: Optional[Dict[str, Any]] = None
+
+    @property
+    def pending(self) -> int:
+        return self._count
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return None if self._opened is None else self._opened + self.window_s
+
+    def _tally(self, counts: Dict, key):
+        if key not in counts and len(counts) >= self.max_keys:
+            key = "other"
+        counts[key] = counts.get(key, 0) + 1
+
+    def add(self, event: Dict[str, Any], now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        if self._opened is None:
+            self._opened = now
+            self._first = event
+        self._count += 1
+        self._last = event
+        self._tally(self._senders, event.get("sender"))
+        self._tally(self._channels, event.get("channel"))
+        rssi = event.get("rssi")
+        if rssi:
+            self._rssi_min = rssi if self._rssi_min is None else min(self._rssi_min, rssi)
+            self._rssi_max = rssi if self._rssi_max is None else max(self._rssi_max, rssi)
+
+    def poll(self, now: Optional[float] = None):
+        if now is None:
+            now = self._clock()
+        if self._opened is not None and now >= self._opened + self.window_s:
+            self.flush()
+
+    def flush(self):
+        """Emit the current window's summary, if it has any events."""
+        if self._opened is None:
+            return
+        summary = {
+            "count": self._count,
+            "senders": self._senders,
+            "channels": self._channels,
+            "rssi_min": self._rssi_min,
+            "rssi_max": self._rssi_max,
+            "first_timestamp": self._first.get("timestamp"),
+            "last_timestamp": self._last.get("timestamp"),
+            "last_message": self._last.get("message"),
+        }
+        self._opened = None
+        self._reset()
+        self.summaries += 1
+        self.emit(summary)
@@ -0,0 +1,199 @@
+"""
+Sharded worker pool for the gateway receive path.
+
+Decrypting and parsing relayed frames on the Home Assistant event loop
+makes every other integration wait behind the crypto and JSON work. This
+pool moves that work to threads and hands only finished results back.
+
+- Frames are sharded by sender: each shard is a single worker thread, so
+  frames from one sender are processed and delivered in arrival order
+- Frames without a known sender all go to shard 0 (fully ordered)
+- Queue depth and per-stage latency (queue wait, processing, delivery to
+  the consumer) are tracked so loop responsiveness can be monitored
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import time
+
+
+class LatencyStats:
+    """Rolling latency summary over the most recent samples."""
+
+    def __init__(self, window: int = 512):
+        self._samples: deque = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Latency at `pct` (0-100) over the window, in seconds."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100.0))
+        return ordered[index]
+
+    @property
+    def mean(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(self._samples) / len(self._samples)
+
+    def to_dict(self) -> Dict[str, float]:
+        """Summary in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+@dataclass
+class WorkItem:
+    """One frame moving through the pool, with stage timestamps."""
+    key: Optional[int]
+    data: bytes
+    shard: int
+    enqueued: float
+    started: float = 0.0
+    finished: float = 0.0
+    result: Any = None
+    error: Optional[BaseException] = None
+    tag: Any = None  # Caller's context for the frame, handed back unchanged
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ShardedWorkerPool:
+    """
+    Process frames on worker threads, preserving per-sender order.
+
+    `process(data)` runs on a worker thread and must be thread-safe
+    across shards. `deliver(item)` is called on the same worker thread
+    once processing finishes; event-loop consumers should wrap it with
+    loop.call_soon_threadsafe and call record_delivery() when it runs.
+    """
+
+    STAGES = ("queue", "process", "deliver")
+
+    def __init__(
+        self,
+        process: Callable[[bytes], Any],
+        deliver: Callable[[WorkItem], None],
+        workers: int = 2,
+        clock: Callable[[], float] = time.perf_counter,
+        window: int = 512,
+    ):
+        """
+        Args:
+            process: Decrypt/parse function for one frame
+            deliver: Receives each finished WorkItem
+            workers: Number of shards (one thread each)
+            clock: Monotonic time source shared by all stages
+            window: Samples kept per latency summary
+        """
+        if workers < 1:
+            raise ValueError("Need at least one worker")
+        self.workers = workers
+        self._process = process
+        self._deliver = deliver
+        self._clock = clock
+        self._shards = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"lyceum-rx{i}")
+            for i in range(workers)
+        ]
+        self._depths = [0] * workers
+        self._lock = threading.Lock()
+        self.latency = {stage: LatencyStats(window) for stage in self.STAGES}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_depth = 0
+
+    def shard_for(self, key: Optional[int]) -> int:
+        """Shard index for a sender key."""
+        if key is None:
+            return 0
+        return key % self.workers
+
+    def submit(self, key: Optional[int], data: bytes, tag: Any = None) -> WorkItem:
+        """
+        Queue a frame for processing.
+
+        Args:
+            key: Sender address (None if unknown before decryption)
+            data: Frame bytes; must not be a view of a reused buffer
+            tag: Returned with the finished item (e.g. the receiving radio)
+        """
+        shard = self.shard_for(key)
+        item = WorkItem(key=key, data=data, shard=shard, enqueued=self._clock(), tag=tag)
+        with self._lock:
+            self._depths[shard] += 1
+            self.submitted += 1
+            depth = sum(self._depths)
+            if depth > self.peak_depth:
+                self.peak_depth = depth
+        self._shards[shard].submit(self._run, item)
+        return item
+
+    def _run(self, item: WorkItem):
+        item.started = self._clock()
+        try:
+            item.result = self._process(item.data)
+        except Exception as e:  # Reported to the consumer, never lost
+            item.error = e
+        item.finished = self._clock()
+        with self._lock:
+            self._depths[item.shard] -= 1
+            self.completed += 1
+            if item.error is not None:
+                self.failed += 1
+            self.latency["queue"].add(item.started - item.enqueued)
+            self.latency["process"].add(item.finished - item.started)
+        self._deliver(item)
+
+    def record_delivery(self, item: WorkItem):
+        """Record when the consumer actually handled a finished item."""
+        with self._lock:
+            self.latency["deliver"].add(self._clock() - item.finished)
+
+    @property
+    def depth(self) -> int:
+        """Frames queued or in progress across all shards."""
+        with self._lock:
+            return sum(self._depths)
+
+    def depths(self) -> List[int]:
+        """Frames queued or in progress per shard."""
+        with self._lock:
+            return list(self._depths)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, queue depth and per-stage latency summaries."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "depth": sum(self._depths),
+                "peak_depth": self.peak_depth,
+                "latency": {name: s.to_dict() for name, s in self.latency.items()},
+            }
+
+    def close(self, wait: bool = True):
+        """Stop the workers (finishing queued frames when wait is True)."""
+        for shard in self._shards:
+            shard.shutdown(wait=wait)
@@ -1,5 +1,27 @@
+"""
+LyceumFrame: the plaintext frame carried inside every LoRa packet.
+
+Full header (6 bytes):    src(2) dst(2) seq(1) flags(1) + payload
+Compact header (4 bytes): src(2) seq(1) flags(1) + payload
+
+In fixed-point mode the E22 prefix (ADDH, ADDL, CH) already tells the
+radio where the packet goes, and only the addressed module (or every
+module, for 0xFFFF) receives it, so the compact header leaves dst out.
+Both ends must agree on the header format, as they do on framing; the
+receiver restores dst as its own address. Flag bits are defined in
+lyceum.link.flags.
+"""
+import struct
 from dataclasses import dataclass
-from typing import Tuple
+
+from lyceum.link.flags import FLAG_FEC
+
+
+HEADER = struct.Struct(">HHBB")  # src, dst, seq, flags
+COMPACT_HEADER = struct.Struct(">HBB")  # src, seq, flags
+HEADER_SIZE = HEADER.size
+# Bytes saved per frame by the compact header
+COMPACT_SAVING = HEADER.size - COMPACT_HEADER.size
 
 
 @dataclass
@@ -10,25 +32,111 @@ class LyceumFrame:
     flags: int
     payload: bytes
 
-    def to_bytes(self) -> bytes:
-        return (
-            self.src.to_bytes(2, "big")
-            + self.dst.to_bytes(2, "big")
-            + (self.seq & 0xFF).to_bytes(1, "big")
-            + (self.flags & 0xFF).to_bytes(1, "big")
-            + self.payload
-        )
+    def to_bytes(self, compact: bool = False) -> bytes:
+        if compact:
+            header = COMPACT_HEADER.pack(self.src, self.seq & 0xFF, self.flags & 0xFF)
+        else:
+            header = HEADER.pack(self.src, self.dst, self.seq & 0xFF, self.flags & 0xFF)
+        return header + self.payload
+
+    def pack_into(self, buf, offset: int = 0, compact: bool = False) -> int:
+        """Encode into a preallocated buffer; returns the bytes written."""
+        if compact:
+            COMPACT_HEADER.pack_into(buf, offset, self.src, self.seq & 0xFF, self.flags & 0xFF)
+            start = offset + COMPACT_HEADER.size
+        else:
+            HEADER.pack_into(buf, offset, self.src, self.dst, self.seq & 0xFF, self.flags & 0xFF)
+            start = offset + HEADER.size
+        end = start + len(self.payload)
+        buf[start:end] = self.payload
+        return end - offset
 
     @classmethod
     def from_bytes(cls, b: bytes) -> "LyceumFrame":
-        if len(b) < 6:
+        if len(b) < HEADER.size:
+            raise ValueError("Frame too short")
+        src, dst, seq, flags = HEADER.unpack_from(b)
+        return cls(src=src, dst=dst, seq=seq, flags=flags, payload=b[HEADER.size:])
+
+    @classmethod
+    def from_compact(cls, b: bytes, dst: int) -> "LyceumFrame":
+        """Decode a compact-header frame received at address `dst`."""
+        if len(b) < COMPACT_HEADER.size:
+            raise ValueError("Frame too short")
+        src, seq, flags = COMPACT_HEADER.unpack_from(b)
+        return cls(src=src, dst=dst, seq=seq, flags=flags, payload=b[COMPACT_HEADER.size:])
+
+    @property
+    def is_fec(self) -> bool:
+        # Payload is one erasure-coded shard (lyceum.link.fec)
+        return bool(self.flags & FLAG_FEC)
+
+
+def compact_header(frame) -> bytes:
+    """Full-header frame bytes -> compact-header frame bytes."""
+    if len(frame) < HEADER.size:
+        raise ValueError("Frame too short")
+    return bytes(frame[:2]) + bytes(frame[4:])
+
+
+def expand_header_into(buf, size: int, dst: int) -> memoryview:
+    """
+    Rewrite a compact-header frame in place as a full-header one.
+
+    The compact frame must start COMPACT_SAVING bytes into `buf` and be
+    `size` bytes long; src moves to the front and dst fills the gap, so
+    no payload bytes are copied. Returns a view of the full frame.
+    """
+    if size < COMPACT_HEADER.size:
+        raise ValueError("Frame too short")
+    view = buf if isinstance(buf, memoryview) else memoryview(buf)
+    src, seq, flags = COMPACT_HEADER.unpack_from(view, COMPACT_SAVING)
+    HEADER.pack_into(view, 0, src, dst, seq, flags)
+    return view[:size + COMPACT_SAVING]
+
+
+class LyceumFrameView:
+    """Zero-copy read-only view of a frame held in a (pooled) buffer."""
+
+    __slots__ = ("buf",)
+    HEADER_SIZE = HEADER_SIZE
+
+    def __init__(self, buf: memoryview):
+        if len(buf) < self.HEADER_SIZE:
             raise ValueError("Frame too short")
-        src = int.from_bytes(b[0:2], "big")
-        dst = int.from_bytes(b[2:4], "big")
-        seq = b[4]
-        flags = b[5]
-        payload = b[6:]
-        return cls(src=src, dst=dst, seq=seq, flags=flags, payload=payload)
+        self.buf = buf
+
+    @property
+    def src(self) -> int:
+        return (self.buf[0] << 8) | self.buf[1]
+
+    @property
+    def dst(self) -> int:
+        return (self.buf[2] << 8) | self.buf[3]
+
+    @property
+    def seq(self) -> int:
+        return self.buf[4]
+
+    @property
+    def flags(self) -> int:
+        return self.buf[5]
+
+    @property
+    def payload(self) -> memoryview:
+        return self.buf[self.HEADER_SIZE:]
+
+    @property
+    def is_fec(self) -> bool:
+        return bool(self.buf[5] & FLAG_FEC)
+
+    def header(self) -> tuple:
+        # (src, dst, seq, flags) in one unpack
+        return HEADER.unpack_from(self.buf)
+
+    def to_frame(self) -> LyceumFrame:
+        # Copy out, for keeping a frame beyond the life of its buffer
+        return LyceumFrame.from_bytes(bytes(self.buf))
 
 
 def make_test_frame(src: int, dst: int, seq: int, payload: bytes) -> LyceumFrame:
@@ -0,0 +1,232 @@
+"""
+Radio throughput and latency benchmark.
+
+Sends numbered, timestamped LyceumFrames from one LyceumGateway to
+another through the real transmit and receive paths (E22Transport,
+FrameReassembler, AES-GCM) and reports, for each message size:
+
+- throughput: messages/s and payload bit/s received
+- latency: send-to-receive percentiles (p50/p90/p99/max, ms)
+- loss, decrypt failures and malformed frames
+- serial queue depth: bytes waiting in the TX transport after each write
+
+Both ends run in this process, so latency needs no clock sync. Give two
+real ports (--port for TX, --rx-port for RX, modules in fixed-point mode
+with the RX module at --dst), or --emulate to use a pair of virtual E22
+modules (e22_emulator). Results are printed and, with --json, written
+to a file.
+
+Usage (from gateway/):
+    python run_bench.py --emulate [--time-scale 0.1] [--loss 0.05]
+    python run_bench.py --port /dev/ttyUSB0 --rx-port /dev/ttyUSB1 --dst 0x0002
+    common: [--sizes 16 64 180] [--count 50] [--rate 2] [--key HEX]
+            [--air-rate 2] [--json results.json]
+"""
+import asyncio
+import json
+import struct
+import time
+
+from e22_driver import LyceumGateway
+from e22_transport import E22Transport
+from lyceum.crypto import SessionCipher
+from lyceum.link import FrameReassembler
+from lyceum_proto import LyceumFrame
+
+
+STAMP = struct.Struct(">Id")  # Message number, send time (perf_counter)
+DEFAULT_KEY = "000102030405060708090a0b0c0d0e0f"
+
+
+def percentile(values: list, q: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_size(tx: LyceumGateway, rx: LyceumGateway, args, size: int) -> dict:
+    loop = asyncio.get_running_loop()
+    sent = {}
+    latencies = []
+    counts = {"received": 0, "duplicates": 0, "decrypt_failures": 0, "malformed": 0}
+    seen = set()
+    done = asyncio.Event()
+    last_rx = None
+
+    def on_frame(packet, rssi):
+        nonlocal last_rx
+        plain = rx.decrypt_payload(bytes(packet))
+        if plain is None:
+            counts["decrypt_failures"] += 1
+            return
+        try:
+            number, _stamp = STAMP.unpack_from(LyceumFrame.from_bytes(plain).payload)
+        except (ValueError, struct.error):
+            counts["malformed"] += 1
+            return
+        if number not in sent:
+            counts["malformed"] += 1
+            return
+        if number in seen:
+            counts["duplicates"] += 1
+            return
+        seen.add(number)
+        counts["received"] += 1
+        last_rx = time.perf_counter()
+        latencies.append(last_rx - sent[number])
+        if counts["received"] == args.count:
+            done.set()
+
+    framer = FrameReassembler(
+        on_frame,
+        mode=args.framing,
+        trailer=1 if args.rssi_byte else 0,
+        clock=loop.time,
+    )
+    flush_handle = None
+
+    def on_data(data):
+        nonlocal flush_handle
+        framer.feed(data)
+        if flush_handle:
+            flush_handle.cancel()
+            flush_handle = None
+        if framer.deadline is not None:
+            flush_handle = loop.call_at(framer.deadline, framer.flush)
+
+    rx_transport = E22Transport.from_serial(rx.e22, on_data, loop=loop)
+    tx_transport = E22Transport.from_serial(tx.e22, lambda data: None, loop=loop)
+    rx_transport.start()
+    tx_transport.start()
+    depths = []
+    start = time.perf_counter()
+    try:
+        for number in range(args.count):
+            now = time.perf_counter()
+            payload = STAMP.pack(number, now) + bytes(size - STAMP.size)
+            frame = LyceumFrame(src=tx.address, dst=args.dst, seq=number, flags=0, payload=payload)
+            sent[number] = now
+            tx_transport.write(tx.build_lyceum_frame(args.dst, args.channel, frame.to_bytes()))
+            depths.append(tx_transport.pending)
+            # Pace from the start time so slow writes do not stretch the run
+            await asyncio.sleep(max(0.0, start + (number + 1) / args.rate - time.perf_counter()))
+        await tx_transport.drain()
+        try:
+            await asyncio.wait_for(done.wait(), args.settle)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        if flush_handle:
+            flush_handle.cancel()
+        tx_transport.stop()
+        rx_transport.stop()
+    # Up to the last delivery, not the end of the settle wait
+    elapsed = (last_rx or time.perf_counter()) - start
+
+    ms = [l * 1000 for l in latencies]
+    return {
+        "size": size,
+        "sent": args.count,
+        **counts,
+        "loss": 1 - counts["received"] / args.count,
+        "seconds": round(elapsed, 3),
+        "msgs_per_s": counts["received"] / elapsed if elapsed > 0 else 0.0,
+        "payload_bps": 8 * size * counts["received"] / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(ms, 0.50),
+            "p90": percentile(ms, 0.90),
+            "p99": percentile(ms, 0.99),
+            "max": max(ms) if ms else None,
+        },
+        "serial_queue_bytes": {
+            "max": max(depths),
+            "mean": sum(depths) / len(depths),
+        },
+        "framer": dict(framer.stats.__dict__),
+    }
+
+
+def main():
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument("--port", help="TX module serial port")
+    p.add_argument("--rx-port", help="RX module serial port")
+    p.add_argument("--emulate", action="store_true", help="Use two virtual E22 modules")
+    p.add_argument("--src", type=lambda x: int(x, 0), default=0x0001)
+    p.add_argument("--dst", type=lambda x: int(x, 0), default=0x0002)
+    p.add_argument("--channel", type=int, default=4)
+    p.add_argument("--key", default=DEFAULT_KEY, help="AES key hex (16/24/32 bytes)")
+    p.add_argument("--counter-nonces", action="store_true",
+                   help="Use SessionCipher counter nonces (fresh salt per run)")
+    p.add_argument("--framing", choices=["length", "gap"], default="length")
+    p.add_argument("--rssi-byte", action="store_true", help="RX module appends an RSSI byte")
+    p.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 180], help="Payload bytes")
+    p.add_argument("--count", type=int, default=50, help="Messages per size")
+    p.add_argument("--rate", type=float, default=2.0, help="Messages offered per second")
+    p.add_argument("--settle", type=float, default=5.0, help="Seconds to wait for stragglers")
+    p.add_argument("--air-rate", type=int, default=2, help="Emulated E22 air rate code")
+    p.add_argument("--loss", type=float, default=0.0, help="Emulated frame loss")
+    p.add_argument("--time-scale", type=float, default=1.0, help="Emulated airtime scale")
+    p.add_argument("--json", help="Write results to this file")
+    args = p.parse_args()
+    if not args.emulate and not (args.port and args.rx_port):
+        p.error("give --port and --rx-port, or --emulate")
+    if min(args.sizes) < STAMP.size:
+        p.error(f"sizes must be at least {STAMP.size} bytes")
+
+    ether = None
+    tx_port, rx_port = args.port, args.rx_port
+    if args.emulate:
+        from e22_emulator import Ether
+
+        ether = Ether(loss=args.loss, time_scale=args.time_scale)
+        ether.start()
+        settings = dict(channel=args.channel, air_rate=args.air_rate, fixed_point=True)
+        tx_port = ether.module(address=args.src, **settings).port
+        rx_port = ether.module(address=args.dst, rssi_byte=args.rssi_byte, **settings).port
+
+    aes_key = bytes.fromhex(args.key) if args.key else None
+    # Counters restart at 0 in every run, so the salt must not repeat
+    salt = SessionCipher.new_salt() if args.counter_nonces else None
+    common = dict(aes_key=aes_key, session_salt=salt, framing=args.framing)
+    tx = LyceumGateway(tx_port, address=args.src, **common)
+    rx = LyceumGateway(rx_port, address=args.dst, **common)
+    results = []
+    try:
+        for size in args.sizes:
+            results.append(asyncio.run(run_size(tx, rx, args, size)))
+    finally:
+        tx.close()
+        rx.close()
+        if ether:
+            ether.stop()
+
+    print(f"{'size':>5} {'sent':>5} {'recv':>5} {'loss':>6} {'msg/s':>7} {'bit/s':>8} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'decrypt':>7} {'queue':>6}")
+    for r in results:
+        lat = r["latency_ms"]
+        fmt = lambda v: f"{v:>8.1f}" if v is not None else f"{'-':>8}"
+        print(
+            f"{r['size']:>5} {r['sent']:>5} {r['received']:>5} {r['loss']:>6.1%} "
+            f"{r['msgs_per_s']:>7.2f} {r['payload_bps']:>8,.0f} {fmt(lat['p50'])} {fmt(lat['p99'])} "
+            f"{r['decrypt_failures']:>7} {r['serial_queue_bytes']['max']:>6}"
+        )
+
+    report = {
+        "config": {
+            k: v for k, v in vars(args).items() if k not in ("key", "json")
+        },
+        "results": results,
+    }
+    if ether:
+        report["emulator"] = ether.stats.to_dict()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
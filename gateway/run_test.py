@@ -12,14 +12,17 @@ def main():
     p.add_argument("--key", default=None, help="AES key hex (16/24/32 bytes)")
     p.add_argument("--set-fixed", action="store_true", help="Set module to fixed-point mode (requires config mode)")
     p.add_argument("--set-crypt", type=lambda x: int(x, 0), default=None, help="Set module 16-bit crypt key (requires config mode)")
+    p.add_argument("--read-config", action="store_true", help="Print the module's register block (requires config mode)")
     p.add_argument("message", nargs="?", default="hello lyceum")
     args = p.parse_args()
 
     aes_key = bytes.fromhex(args.key) if args.key else None
     gw = LyceumGateway(args.port, baud=115200, aes_key=aes_key)
     try:
+        if args.read_config:
+            print(gw.read_config() or "No response. Ensure device is in config mode (9600,8N1).")
         if args.set_fixed:
-            print("Writing fixed-point mode (0x07 = 0x01). Ensure device is in config mode (9600,8N1).")
+            print("Writing fixed-point mode (REG3 0x06 bit 6). Ensure device is in config mode (9600,8N1).")
             ok = gw.set_fixed_point_mode()
             print("OK" if ok else "Failed")
         if args.set_crypt is not None:
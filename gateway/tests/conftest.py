@@ -0,0 +1,17 @@
+"""Shared fixtures for the gateway tests."""
+import pytest
+
+
+class FakeClock:
+    """Monotonic clock stand-in: tests move `now` by hand."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
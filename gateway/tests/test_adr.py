@@ -0,0 +1,223 @@
+"""Tests for adaptive data rate selection and negotiation."""
+import pytest
+
+from lyceum.link.adr import (
+    ADR_ACCEPT,
+    ADR_COMMIT,
+    ADR_PROPOSE,
+    ADR_REJECT,
+    AdrController,
+    e22_ladder,
+    e22_rssi_dbm,
+    encode_control,
+    is_control,
+    sx126x_ladder,
+)
+from lyceum.link.arq import is_arq
+from lyceum.link.fec import is_fec
+
+
+A, B, C = 0x0001, 0x0002, 0x0003
+
+
+class Net:
+    """Controllers wired back to back; frames are delivered on pump().
+
+    Like radios, two nodes only hear each other at the same data rate.
+    """
+
+    def __init__(self, clock, addresses, **kwargs):
+        self.clock = clock
+        self.queue = []
+        self.drop = lambda frame: False
+        self.applied = {a: [] for a in addresses}
+        self.nodes = {
+            a: AdrController(
+                a, e22_ladder(), self._transmitter(a),
+                lambda rate, a=a: self.applied[a].append(rate.code),
+                min_samples=3, clock=clock, **kwargs,
+            )
+            for a in addresses
+        }
+
+    def _transmitter(self, src):
+        def transmit(dst, frame):
+            self.queue.append((dst, frame))
+        return transmit
+
+    def pump(self):
+        while self.queue:
+            dst, frame = self.queue.pop(0)
+            src = int.from_bytes(frame[0:2], "big")
+            if self.nodes[src].index == self.nodes[dst].index and not self.drop(frame):
+                assert self.nodes[dst].on_frame(frame)
+
+    def hear(self, rssi, times=3):
+        for receiver in self.nodes:
+            for sender in self.nodes:
+                if sender != receiver:
+                    for _ in range(times):
+                        self.nodes[receiver].observe(sender, rssi=rssi, size=10)
+
+    def settle(self, seconds=1.0):
+        self.clock.now += seconds
+        for node in self.nodes.values():
+            node.poll()
+        self.pump()
+
+
+class TestLadders:
+    def test_e22_ladder_is_slowest_first(self):
+        ladder = e22_ladder()
+        assert [r.code for r in ladder] == [2, 3, 4, 5, 6, 7]
+        floors = [r.snr_floor for r in ladder]
+        assert floors == sorted(floors)
+
+    def test_sx126x_ladder(self):
+        ladder = sx126x_ladder()
+        assert [r.code for r in ladder] == list(range(12, 4, -1))
+        assert ladder[0].modulation.time_on_air(20) > ladder[-1].modulation.time_on_air(20)
+
+    def test_rssi_byte(self):
+        assert e22_rssi_dbm(256 - 97) == -97
+
+    def test_control_frames_are_distinct(self):
+        frame = encode_control(A, B, 1, ADR_PROPOSE, 3, -4.5)
+        assert is_control(frame)
+        assert not is_arq(frame) and not is_fec(frame)
+        assert frame[-1] == 0xF7  # -9 half-dB
+
+
+class TestSelection:
+    def test_steps_up_one_rate_at_a_time(self, clock):
+        net = Net(clock, [A, B])
+        net.hear(-70)  # Plenty of SNR for the fastest rate
+        net.pump()
+        net.settle()
+        assert net.nodes[A].index == net.nodes[B].index == 1
+        assert net.applied[A] == net.applied[B] == [3]
+
+    def test_needs_fresh_samples_after_a_change(self, clock):
+        net = Net(clock, [A, B])
+        net.hear(-70)
+        net.pump()
+        net.settle()
+        net.settle()
+        assert net.nodes[A].index == 1  # No new samples yet
+        net.hear(-70)
+        net.pump()
+        net.settle()
+        assert net.nodes[A].index == 2
+
+    def test_hysteresis_holds_near_a_threshold(self, clock):
+        ladder = e22_ladder()
+        net = Net(clock, [A, B], noise_dbm=-110.0)
+        # Clears rate 1 with the margin but not margin + hysteresis
+        snr = ladder[1].snr_floor + 5.0 + 1.0
+        net.hear(-110.0 + snr)
+        net.pump()
+        net.settle()
+        assert net.nodes[A].index == 0
+
+    def test_steps_down_at_once(self, clock):
+        net = Net(clock, [A, B], initial=5, noise_dbm=-110.0)
+        net.hear(-110.0 + e22_ladder()[1].snr_floor + 5.5)
+        net.pump()
+        net.settle()
+        assert net.nodes[A].index == net.nodes[B].index == 1
+
+    def test_packet_errors_step_down(self, clock):
+        sent = []
+        node = AdrController(A, e22_ladder(), lambda d, f: sent.append(f), lambda r: None,
+                             initial=3, min_samples=1, per_window=10, per_limit=0.5, noise_dbm=-110.0,
+                             clock=clock)
+        node.observe(B, rssi=-110.0 + e22_ladder()[3].snr_floor + 6.0)  # Holds rate 3
+        for ok in [True, False] * 3:
+            node.record_tx(20, ok)
+        assert not sent
+        node.record_tx(20, False)  # 4 of 7 lost
+        assert sent[-1][6:8] == bytes([ADR_PROPOSE, 2])
+
+    def test_slowest_neighbor_sets_the_rate(self, clock):
+        node = AdrController(A, e22_ladder(), lambda d, f: None, lambda r: None,
+                             min_samples=1, noise_dbm=-110.0, clock=clock)
+        node.observe(C, rssi=-110.0 + e22_ladder()[0].snr_floor + 5.0)
+        node.observe(B, rssi=-60)
+        assert node._proposal is None and node.index == 0
+
+
+class TestNegotiation:
+    def test_reject_holds_off(self, clock):
+        net = Net(clock, [A, B], holdoff_s=30.0)
+        for _ in range(3):
+            net.nodes[A].observe(B, rssi=-70)
+        net.nodes[B].observe(A, rssi=-125)  # B hears A badly
+        kinds = []
+        net.drop = lambda f: kinds.append(f[6])
+        net.pump()
+        assert kinds == [ADR_PROPOSE, ADR_REJECT]
+        net.settle()
+        assert net.nodes[A].index == 0 and net.nodes[A].deadline is None
+        net.nodes[A].observe(B, rssi=-70)
+        assert not net.queue  # Held off
+        clock.now += 30.0
+        net.nodes[A].observe(B, rssi=-70)
+        assert net.queue
+
+    def test_no_answer_times_out(self, clock):
+        net = Net(clock, [A, B], response_timeout=5.0)
+        net.hear(-70)
+        net.queue.clear()
+        assert net.nodes[A].deadline == 5.0
+        net.settle(5.0)
+        assert net.nodes[A].index == 0 and net.nodes[A]._proposal is None
+
+    def test_switch_waits_for_commit(self, clock):
+        net = Net(clock, [A, B])
+        kinds = []
+        net.drop = lambda f: kinds.append(f[6]) or f[6] == ADR_COMMIT
+        net.hear(-70)
+        net.pump()
+        net.settle()
+        # Both propose; one proposal is accepted before its commit is sent
+        assert kinds.index(ADR_PROPOSE) < kinds.index(ADR_ACCEPT) < kinds.index(ADR_COMMIT)
+        assert net.nodes[A].index == 1
+        assert net.nodes[B].index == 0  # Never told to switch
+
+    def test_lost_commit_falls_back(self, clock):
+        net = Net(clock, [A, B], fallback_s=60.0)
+        net.drop = lambda f: f[6] == ADR_COMMIT
+        net.hear(-70)
+        net.pump()
+        net.settle()
+        assert net.nodes[A].deadline == pytest.approx(clock.now + 60.0)
+        net.settle(60.0)
+        assert net.nodes[A].index == 0 and net.nodes[A].fallbacks == 1
+        assert net.applied[A] == [3, 2]
+
+    def test_all_neighbors_must_accept(self, clock):
+        net = Net(clock, [A, B, C])
+        net.drop = lambda f: C.to_bytes(2, "big") in (f[0:2], f[2:4])  # C is deaf and mute
+        net.hear(-70, times=1)  # Everyone known before anyone decides
+        net.hear(-70, times=2)
+        net.pump()
+        net.settle()
+        assert net.nodes[A].index == 0 and net.nodes[B].index == 0
+
+    def test_rejects_unknown_rate(self):
+        node = AdrController(A, e22_ladder(), lambda d, f: None, lambda r: None)
+        with pytest.raises(ValueError):
+            node.on_frame(encode_control(B, A, 1, ADR_PROPOSE, 9, None))
+        assert node.on_frame(b"\x00\x02\x00\x01\x00\x00hi!") is False
+
+
+class TestReport:
+    def test_per_and_throughput_per_rate(self, clock):
+        node = AdrController(A, e22_ladder(), lambda d, f: None, lambda r: None, clock=clock)
+        node.record_tx(100, True)
+        node.record_tx(100, False)
+        clock.now = 10.0
+        rates = node.report()["rates"]
+        assert rates["2.4k"]["per"] == 0.5
+        assert rates["2.4k"]["throughput_bps"] == 80.0
+        assert rates["62.5k"]["per"] is None
@@ -0,0 +1,103 @@
+"""Tests for small-message aggregation."""
+import pytest
+
+from lyceum.link.aggregate import (
+    DEFAULT_MTU,
+    FLAG_AGGREGATE,
+    Aggregator,
+    is_aggregate,
+    pack,
+    unpack,
+)
+from lyceum_proto import LyceumFrame, LyceumFrameView
+
+
+def text(seq: int, payload: bytes, dst: int = 2) -> bytes:
+    return LyceumFrame(src=1, dst=dst, seq=seq, flags=0, payload=payload).to_bytes()
+
+
+def collector():
+    out = []
+    return out, lambda key, frame, count: out.append((key, frame, count))
+
+
+class TestPacking:
+    def test_round_trip(self):
+        frames = [text(i, f"msg {i}".encode()) for i in range(3)]
+        packed = pack(frames)
+        view = LyceumFrameView(memoryview(packed))
+        assert (view.src, view.dst, view.seq) == (1, 2, 0)
+        assert view.flags == FLAG_AGGREGATE and is_aggregate(packed)
+        records = [(seq, flags, bytes(p)) for seq, flags, p in unpack(packed)]
+        assert records == [(i, 0, f"msg {i}".encode()) for i in range(3)]
+
+    def test_truncated_record(self):
+        packed = pack([text(0, b"abc"), text(1, b"defgh")])
+        with pytest.raises(ValueError):
+            list(unpack(packed[:-2]))
+
+    def test_plain_frame_is_not_aggregate(self):
+        assert not is_aggregate(text(0, b"hello"))
+
+
+class TestAggregator:
+    def test_linger_flushes(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, linger_s=0.05, clock=clock)
+        agg.add("k", text(0, b"a"))
+        agg.add("k", text(1, b"b"))
+        assert out == [] and agg.deadline == pytest.approx(0.05)
+        clock.now = 0.04
+        agg.poll()
+        assert out == []
+        clock.now = 0.05
+        agg.poll()
+        assert len(out) == 1 and out[0][2] == 2
+        assert [bytes(p) for _, _, p in unpack(out[0][1])] == [b"a", b"b"]
+        assert agg.deadline is None
+
+    def test_single_message_sent_unchanged(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, clock=clock)
+        frame = text(0, b"alone")
+        agg.add("k", frame)
+        agg.flush()
+        assert out == [("k", frame, 1)]
+
+    def test_mtu_respected(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, clock=clock)
+        for i in range(40):
+            agg.add("k", text(i, bytes(20)))
+        agg.flush()
+        assert sum(count for _, _, count in out) == 40
+        assert all(len(frame) <= DEFAULT_MTU for _, frame, _ in out)
+        seqs = [seq for _, frame, _ in out for seq, _, _ in unpack(frame)]
+        assert seqs == list(range(40))
+
+    def test_keys_and_routes_kept_apart(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, clock=clock)
+        agg.add("a", text(0, b"x", dst=2))
+        agg.add("b", text(1, b"y", dst=2))
+        agg.add("a", text(2, b"z", dst=3))  # Same key, new destination
+        agg.flush()
+        assert sorted((k, c) for k, _, c in out) == [("a", 1), ("a", 1), ("b", 1)]
+
+    def test_large_message_bypasses(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, clock=clock)
+        big = text(0, bytes(150))
+        agg.add("k", big)
+        assert out == [("k", big, 1)]
+        assert agg.stats.bypassed == 1 and agg.pending == 0
+
+    def test_stats(self, clock):
+        out, emit = collector()
+        agg = Aggregator(emit, clock=clock)
+        for i in range(6):
+            agg.add("k", text(i, b"hi"))
+        agg.flush()
+        assert agg.stats.messages == 6
+        assert agg.stats.frames_out == 1 and agg.stats.aggregated == 1
+        assert agg.stats.ratio == 6.0
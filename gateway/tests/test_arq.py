@@ -0,0 +1,231 @@
+"""Tests for selective-repeat ARQ."""
+import heapq
+import random
+
+import pytest
+
+from lyceum.link.arq import (
+    FLAG_ACK,
+    FLAG_RELIABLE,
+    SEQ_MOD,
+    ArqEndpoint,
+    ArqReceiver,
+    RttEstimator,
+    encode_ack,
+    encode_data,
+    is_arq,
+    unwrap,
+)
+
+
+class Loopback:
+    """Two endpoints joined by a link with fixed latency and random loss."""
+
+    def __init__(self, loss: float = 0.0, latency: float = 0.1, seed: int = 7, **kwargs):
+        self.now = 0.0
+        self.loss = loss
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.events = []
+        self.order = 0
+        self.drop = None  # Optional predicate(frame) -> bool
+        self.received = []
+        self.a = ArqEndpoint(1, self._transmit, lambda s, p: None, clock=self.clock, **kwargs)
+        self.b = ArqEndpoint(2, self._transmit, lambda s, p: self.received.append(p),
+                             clock=self.clock, **kwargs)
+        self.nodes = {1: self.a, 2: self.b}
+
+    def clock(self):
+        return self.now
+
+    def _transmit(self, dst, frame):
+        if self.rng.random() < self.loss or (self.drop and self.drop(frame)):
+            return
+        self.order += 1
+        heapq.heappush(self.events, (self.now + self.latency, self.order, dst, frame))
+
+    def run(self, limit: float = 10_000.0):
+        while self.now < limit:
+            times = [t for t in (self.a.deadline, self.b.deadline) if t is not None]
+            if self.events:
+                times.append(self.events[0][0])
+            if not times:
+                break
+            self.now = max(self.now, min(times))
+            while self.events and self.events[0][0] <= self.now:
+                _, _, dst, frame = heapq.heappop(self.events)
+                self.nodes[dst].on_frame(frame)
+            self.a.poll(self.now)
+            self.b.poll(self.now)
+
+
+def messages(n):
+    return [i.to_bytes(4, "big") for i in range(n)]
+
+
+class TestWire:
+    def test_unwrap(self):
+        assert unwrap(5, SEQ_MOD - 3) == SEQ_MOD + 5
+        assert unwrap(SEQ_MOD - 2, 3) == -2
+        assert unwrap(10, 0) == 10
+
+    def test_frames(self):
+        data = encode_data(1, 2, 0x1234, 3, b"hi", 0xBEEF)
+        ack = encode_ack(2, 1, 0x1235, 0b101, 0xBEEF)
+        assert data[4] == 0x34 and data[5] == FLAG_RELIABLE
+        assert ack[5] == FLAG_ACK
+        assert is_arq(data) and is_arq(ack)
+        assert not is_arq(bytes([0, 1, 0, 2, 0, 0]) + b"plain")
+
+    def test_rtt_estimator(self):
+        rtt = RttEstimator(initial_rto=3.0, min_rto=0.2)
+        rtt.sample(1.0)
+        assert (rtt.srtt, rtt.rttvar, rtt.rto) == (1.0, 0.5, 3.0)
+        rtt.sample(1.0)
+        assert rtt.rto == pytest.approx(1.0 + 4 * 0.375)
+        rtt.backoff()
+        assert rtt.rto == pytest.approx(5.0)
+        rtt.reset()
+        assert rtt.rto == pytest.approx(2.5)
+
+
+class TestReceiver:
+    def test_reorder_and_sack(self):
+        got = []
+        rx = ArqReceiver(got.append)
+        assert rx.on_data(1, 1, b"b") == (0, 0b1)
+        assert rx.on_data(3, 3, b"d") == (0, 0b101)
+        assert rx.on_data(0, 0, b"a") == (2, 0b1)
+        assert rx.on_data(0, 0, b"a") == (2, 0b1)  # Duplicate re-acked
+        assert rx.on_data(2, 1, b"c") == (4, 0)
+        assert got == [b"a", b"b", b"c", b"d"]
+        assert rx.stats.duplicates == 1
+
+    def test_skips_abandoned(self):
+        got = []
+        rx = ArqReceiver(got.append)
+        rx.on_data(1, 1, b"b")
+        # Sender's base moved to 2: frame 0 was given up on
+        assert rx.on_data(2, 0, b"c") == (3, 0)
+        assert got == [b"b", b"c"]
+        assert rx.stats.skipped == 1
+
+    def test_new_epoch_restarts_window(self):
+        got = []
+        rx = ArqReceiver(got.append)
+        for seq in range(100):
+            rx.on_data(seq, 0, b"old", epoch=7)
+        rx.on_data(101, 1, b"held", epoch=7)  # 100 never arrives
+        # The sender restarted and counts from 0 again
+        assert rx.on_data(0, 0, b"new", epoch=8) == (1, 0)
+        assert got[-2:] == [b"held", b"new"]
+        assert rx.stats.restarts == 1 and rx.stats.duplicates == 0
+
+
+class TestEndpoint:
+    def test_lossless_in_order(self):
+        link = Loopback()
+        for m in messages(50):
+            assert link.a.send(2, m)
+        link.run()
+        assert link.received == messages(50)
+        assert link.a.stats.retransmits == 0
+        assert link.a.rto(2) < 3.0  # Adapted to the 0.2 s round trip
+
+    @pytest.mark.parametrize("loss", [0.01, 0.1, 0.3])
+    def test_lossy_exactly_once(self, loss):
+        link = Loopback(loss=loss)
+        for m in messages(200):
+            link.a.send(2, m)
+        link.run()
+        assert link.received == messages(200)
+        assert link.a.stats.failed == 0
+
+    def test_sequence_wraps(self):
+        link = Loopback(loss=0.1)
+        sender = link.a._sender(2)
+        sender._base = sender._next = SEQ_MOD - 5
+        link.b.on_frame(encode_data(1, 2, SEQ_MOD - 5, 0, b"x", sender.epoch))  # Create receiver
+        link.received.clear()
+        link.events.clear()
+        link.b._receivers[1]._expected = SEQ_MOD - 5
+        for m in messages(20):
+            link.a.send(2, m)
+        link.run()
+        assert link.received == messages(20)
+
+    def test_gives_up_and_moves_on(self):
+        link = Loopback(max_retries=2)
+        link.drop = lambda f: f[5] == FLAG_RELIABLE and f[-4:] == (1).to_bytes(4, "big")
+        for m in messages(5):
+            link.a.send(2, m)
+        link.run()
+        assert link.a.stats.failed == 1
+        assert link.received == [m for m in messages(5) if m != (1).to_bytes(4, "big")]
+        assert link.b.stats.skipped == 1
+
+    def test_reports_fate_of_each_payload(self):
+        acked, failed = [], []
+        link = Loopback(max_retries=2, on_acked=lambda d, p: acked.append((d, p)),
+                        on_fail=lambda d, p: failed.append((d, p)))
+        lost = (3).to_bytes(4, "big")
+        link.drop = lambda f: f[5] == FLAG_RELIABLE and f[-4:] == lost
+        for m in messages(5):
+            link.a.send(2, m)
+        link.run()
+        assert failed == [(2, lost)]
+        assert sorted(p for _, p in acked) == [m for m in messages(5) if m != lost]
+
+    def test_lost_sync_is_retried(self):
+        link = Loopback(max_retries=1)
+        syncs = []
+
+        def drop(frame):
+            if frame[5] == FLAG_RELIABLE | FLAG_ACK:
+                syncs.append(frame)
+                return len(syncs) == 1
+            return frame[5] == FLAG_RELIABLE and frame[-4:] == (2).to_bytes(4, "big")
+
+        link.drop = drop
+        for m in messages(4):
+            link.a.send(2, m)
+        link.run()
+        assert len(syncs) == 2
+        assert link.received == [m for m in messages(4) if m != (2).to_bytes(4, "big")]
+
+    def test_sender_restart(self):
+        link = Loopback()
+        for m in messages(100):
+            link.a.send(2, m)
+        link.run()
+        # Node 1 reboots: a new endpoint, sequence numbers from 0 again
+        stale_ack = encode_ack(2, 1, 100, 0, link.a.epoch)
+        link.a = link.nodes[1] = ArqEndpoint(1, link._transmit, lambda s, p: None,
+                                             epoch=link.a.epoch ^ 1, clock=link.clock)
+        link.received.clear()
+        for m in messages(5):
+            link.a.send(2, m)
+        link.a.on_frame(stale_ack)  # Left over from before the reboot
+        link.run()
+        assert link.received == messages(5)
+        assert link.b.stats.duplicates == 0 and link.b.stats.restarts == 1
+        assert link.a.stats.acked == 5 and link.a.stats.stale == 1
+        assert link.a.pending == 0
+
+    def test_receiver_restart(self):
+        link = Loopback()
+        for m in messages(40):
+            link.a.send(2, m)
+        link.run()
+        link.b = link.nodes[2] = ArqEndpoint(2, link._transmit, lambda s, p: link.received.append(p),
+                                             clock=link.clock)
+        link.received.clear()
+        for m in messages(5):
+            link.a.send(2, m)
+        link.run()
+        assert link.received == messages(5)
+        assert link.b.stats.skipped == 0
+
+    def test_non_arq_frame_ignored(self):
+        link = Loopback()
+        assert not link.b.on_frame(bytes([0, 1, 0, 2, 0, 0]) + b"plain")
@@ -0,0 +1,89 @@
+"""Tests for pluggable AES-GCM backends."""
+import pytest
+from lyceum.crypto import backends
+from lyceum.crypto.aes_gcm import AESGCMCipher
+from lyceum.crypto.backends import (
+    BACKENDS,
+    ENV_BACKEND,
+    PycryptodomeBackend,
+    available_backends,
+    select_backend,
+)
+from lyceum.crypto.session import SessionCipher
+
+
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+NONCE = bytes(range(12))
+
+
+@pytest.fixture
+def both():
+    pytest.importorskip("cryptography")
+    return [BACKENDS[name](KEY) for name in ("pycryptodome", "cryptography")]
+
+
+class TestBackends:
+    def test_pycryptodome_always_available(self):
+        assert "pycryptodome" in available_backends()
+
+    def test_identical_output(self, both):
+        a, b = both
+        for aad in (b"", b"hdr"):
+            assert a.encrypt(NONCE, b"same bytes", aad) == b.encrypt(NONCE, b"same bytes", aad)
+
+    def test_cross_decrypt(self, both):
+        a, b = both
+        ct, tag = a.encrypt(NONCE, b"payload", b"aad")
+        assert b.decrypt(NONCE, ct, tag, b"aad") == b"payload"
+        ct, tag = b.encrypt(NONCE, b"payload")
+        assert a.decrypt(NONCE, ct, tag) == b"payload"
+
+    def test_bad_tag_returns_none(self, both):
+        for impl in both:
+            ct, tag = impl.encrypt(NONCE, b"payload")
+            assert impl.decrypt(NONCE, ct, bytes(16)) is None
+
+    def test_accepts_memoryview(self, both):
+        for impl in both:
+            ct, tag = impl.encrypt(NONCE, b"payload")
+            assert impl.decrypt(memoryview(NONCE), memoryview(ct), memoryview(tag)) == b"payload"
+
+
+class TestSelectBackend:
+    def test_explicit_name(self):
+        assert select_backend("pycryptodome") is PycryptodomeBackend
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv(ENV_BACKEND, "pycryptodome")
+        assert select_backend() is PycryptodomeBackend
+
+    def test_unknown_raises(self):
+        with pytest.raises(ValueError):
+            select_backend("openssl-hw")
+
+    def test_auto_selection_cached(self, monkeypatch):
+        monkeypatch.delenv(ENV_BACKEND, raising=False)
+        monkeypatch.setattr(backends, "_selected", None)
+        chosen = select_backend()
+        assert chosen.name in available_backends()
+        assert select_backend() is chosen
+
+
+class TestCipherInterop:
+    def test_payload_cipher_across_backends(self):
+        pytest.importorskip("cryptography")
+        a = AESGCMCipher(KEY, backend="pycryptodome")
+        b = AESGCMCipher(KEY, backend="cryptography")
+        assert a.backend == "pycryptodome" and b.backend == "cryptography"
+        assert b.decrypt(a.encrypt(b"hello", b"x"), b"x") == b"hello"
+        assert a.decrypt_many(b.encrypt_many([b"one", b"two"])) == [b"one", b"two"]
+
+    def test_session_cipher_byte_identical(self):
+        pytest.importorskip("cryptography")
+        salt = bytes(6)
+        a = SessionCipher(KEY, salt, sender=1, backend="pycryptodome")
+        b = SessionCipher(KEY, salt, sender=1, backend="cryptography")
+        frame = a.encrypt(b"frame")
+        assert frame == b.encrypt(b"frame")
+        receiver = SessionCipher(KEY, salt, sender=2, backend="cryptography")
+        assert receiver.decrypt(frame) == b"frame"
@@ -1,6 +1,7 @@
 """Tests for AES-GCM crypto module."""
 import pytest
 from lyceum.crypto.aes_gcm import AESGCMCipher, derive_session_key
+from lyceum.crypto.buffers import BufferPool
 
 
 class TestAESGCMCipher:
@@ -74,6 +75,50 @@ class TestAESGCMCipher:
         with pytest.raises(ValueError, match="Key must be 16, 24, or 32 bytes"):
             AESGCMCipher(b"short")
 
+    def test_encrypt_many_roundtrip(self, cipher):
+        plaintexts = [b"a" * 32, b"b" * 230, b""]
+        blobs = cipher.encrypt_many(plaintexts)
+        assert len(blobs) == 3
+        assert len({blob[:12] for blob in blobs}) == 3  # Distinct nonces
+        assert cipher.decrypt_many(blobs) == plaintexts
+
+    def test_batch_interoperates_with_single(self, cipher):
+        blob = cipher.encrypt_many([b"relay"], associated_data=b"hdr")[0]
+        assert cipher.decrypt(blob, associated_data=b"hdr") == b"relay"
+        single = cipher.encrypt(b"relay")
+        assert cipher.decrypt_many([single]) == [b"relay"]
+
+    def test_decrypt_many_isolates_failures(self, cipher):
+        good = cipher.encrypt(b"good")
+        bad = good[:-1] + bytes([good[-1] ^ 0xFF])
+        assert cipher.decrypt_many([good, bad, b"short", good]) == [
+            b"good", None, None, b"good",
+        ]
+
+    @pytest.mark.parametrize("backend", ["pycryptodome", "cryptography"])
+    def test_decrypt_into_pooled_buffer(self, backend):
+        if backend == "cryptography":
+            pytest.importorskip("cryptography")
+        cipher = AESGCMCipher(bytes(16), backend=backend)
+        pool = BufferPool(size=64, count=1)
+        out = pool.acquire()
+        blob = bytearray(cipher.encrypt(b"zero copy", b"hdr"))
+        view = cipher.decrypt_into(memoryview(blob), out, b"hdr")
+        assert bytes(view) == b"zero copy"
+        assert view.obj is out.obj  # Written into the pooled buffer
+
+    def test_decrypt_into_failure_clears_buffer(self, cipher):
+        out = bytearray(b"\xAA" * 32)
+        blob = cipher.encrypt(b"secret")
+        bad = blob[:-1] + bytes([blob[-1] ^ 0xFF])
+        assert cipher.decrypt_into(bad, out) is None
+        assert out[:6] == bytes(6)
+        assert cipher.decrypt_into(b"short", out) is None
+
+    def test_decrypt_into_buffer_too_small(self, cipher):
+        with pytest.raises(ValueError):
+            cipher.decrypt_into(cipher.encrypt(b"x" * 40), bytearray(16))
+
     def test_256_bit_key(self, cipher_256):
         plaintext = b"Testing with 256-bit key"
         blob = cipher_256.encrypt(plaintext)
@@ -93,3 +138,36 @@ class TestDeriveSessionKey:
         key1 = derive_session_key(b"secret_a")
         key2 = derive_session_key(b"secret_b")
         assert key1 != key2
+
+    def test_derive_matches_hkdf_sha256(self):
+        # RFC 5869 Appendix A.1 test vector
+        ikm = bytes.fromhex("0b" * 22)
+        salt = bytes.fromhex("000102030405060708090a0b0c")
+        info = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9")
+        okm = derive_session_key(ikm, salt=salt, info=info, length=42)
+        assert okm.hex() == (
+            "3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf"
+            "34007208d5b887185865"
+        )
+
+
+class TestBufferPool:
+    def test_reuses_released_buffers(self):
+        pool = BufferPool(size=32, count=2)
+        a = pool.acquire()
+        pool.release(a)
+        assert pool.acquire() is a
+        assert pool.misses == 0
+
+    def test_empty_pool_allocates_and_counts_miss(self):
+        pool = BufferPool(size=32, count=1)
+        pool.acquire()
+        extra = pool.acquire()
+        assert len(extra) == 32
+        assert pool.misses == 1
+
+    def test_release_ignores_foreign_and_surplus(self):
+        pool = BufferPool(size=32, count=1)
+        pool.release(memoryview(bytearray(16)))
+        pool.release(memoryview(bytearray(32)))
+        assert pool.available == 1
@@ -0,0 +1,104 @@
+"""Tests for the store-and-forward custody queue."""
+import pytest
+
+from lyceum.custody import CustodyQueue
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = 1_700_000_000.0  # Wall-clock timestamps
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "custody.db")
+
+
+class TestCustodyQueue:
+    def test_delivered_when_destination_heard(self, path, clock):
+        queue = CustodyQueue(path, clock=clock)
+        entry = queue.add(0x42, "hello", channel=5)
+        assert [e.id for e in queue.due()] == [entry.id]  # First attempt right away
+        queue.failed(entry.id)
+        assert queue.due() == []  # Backing off
+        clock.now += 60
+        assert queue.heard(0x99) == []
+        attempt = queue.heard(0x42)
+        assert [(e.message, e.channel, e.attempts) for e in attempt] == [("hello", 5, 2)]
+        assert queue.heard(0x42) == []  # Already in flight
+        assert queue.delivered(entry.id) == pytest.approx(60)
+        assert queue.depth == 0
+        assert queue.to_dict()["latency_s"]["p50"] == pytest.approx(60)
+
+    def test_survives_restart(self, path, clock):
+        queue = CustodyQueue(path, clock=clock)
+        queue.add(0x42, "one")
+        queue.add(0x43, "two")
+        queue.due()  # Both in flight when the process dies
+        queue.close()
+        reopened = CustodyQueue(path, clock=clock)
+        assert reopened.depth == 2
+        assert [e.message for e in reopened.heard(0x43)] == ["two"]
+
+    def test_writes_are_batched_and_reads_stay_in_memory(self, path, clock):
+        queue = CustodyQueue(path, clock=clock)
+        entry = queue.add(0x42, "hello")
+        queue.due()
+        writes = queue.take_writes()
+        assert len(writes) == 2 and queue.unsaved == 0  # Insert, then the claim
+        assert CustodyQueue(path, clock=clock).depth == 0  # Not written yet
+        queue.write(writes)
+        assert CustodyQueue(path, clock=clock).heard(0x42)[0].attempts == 2  # Claim saved
+        queue._db.close()  # Nothing below may need the database
+        queue.failed(entry.id)
+        assert queue.heard(0x99) == [] and queue.unsaved == 0
+        assert queue.deadline == entry.next_attempt
+        assert [e.id for e in queue.heard(0x42)] == [entry.id]
+        assert queue.delivered(entry.id) == 0
+        assert queue.depth == 0 and queue.unsaved == 2
+
+    def test_backoff_schedule(self, path, clock):
+        queue = CustodyQueue(path, retry_s=10, max_retry_s=25, clock=clock)
+        entry = queue.add(1, "m")
+        start = clock.now
+        for expected in (10, 20, 25, 25):
+            (claimed,) = queue.due()
+            queue.failed(claimed.id)
+            assert claimed.next_attempt - clock.now == expected
+            assert queue.deadline == claimed.next_attempt
+            clock.now = claimed.next_attempt
+        assert clock.now - start == 80
+        assert entry.id == claimed.id
+
+    def test_in_flight_does_not_hold_the_deadline(self, path, clock):
+        queue = CustodyQueue(path, ttl_s=1000, retry_s=10, clock=clock)
+        entry = queue.add(1, "m")
+        queue.due()
+        clock.now += 50  # Retry time passed while the attempt is still running
+        assert queue.deadline == entry.created + 1000  # Only the expiry
+        queue.failed(entry.id)
+        assert queue.deadline == entry.created + 10
+
+    def test_expiry(self, path, clock):
+        queue = CustodyQueue(path, ttl_s=100, clock=clock)
+        queue.add(1, "old")
+        queue.add(1, "short", ttl_s=10)
+        assert queue.deadline == clock.now  # First attempts due
+        queue.due()
+        clock.now += 10
+        assert queue.due() == []
+        assert queue.depth == 1 and queue.stats.expired == 1
+        clock.now += 90
+        assert queue.heard(1) == []
+        queue.expire()
+        assert queue.depth == 0 and queue.deadline is None
+
+    def test_capacity_limits(self, path, clock):
+        queue = CustodyQueue(path, max_per_destination=2, max_total=3, clock=clock)
+        assert queue.add(1, "a") and queue.add(1, "b")
+        assert queue.add(1, "c") is None  # Destination full
+        assert queue.add(2, "d")
+        assert queue.add(3, "e") is None  # Queue full
+        assert queue.stats.refused == 2
+        assert queue.depth_by_destination() == {1: 2, 2: 1}
@@ -0,0 +1,253 @@
+"""Tests for streamed debate rounds."""
+import pytest
+from lyceum.pneuma.debate import (
+    DebateStreamer,
+    ChunkReassembler,
+    DebateStream,
+    StreamConfig,
+    DebateSession,
+    DebateAction,
+    RoundSkipPolicy,
+    RoundSkipConfig,
+)
+from lyceum.pneuma.messages import DebateChunk, DebateMetadata, DebatePacket
+
+
+def _tokens(text):
+    """Split text into word-sized tokens the way an LLM would emit them."""
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + [words[-1]]
+
+
+class TestDebateStreamer:
+    @pytest.fixture
+    def streamer(self):
+        return DebateStreamer("sess_001", round=1, config=StreamConfig(
+            first_chunk_chars=8,
+            chunk_chars=32,
+        ))
+
+    def test_first_chunk_is_small(self, streamer):
+        chunks = streamer.feed("def scan_bt(): pass")
+        assert len(chunks) >= 1
+        assert chunks[0].seq == 0
+        assert len(chunks[0].content) <= 8
+
+    def test_chunks_do_not_split_words(self, streamer):
+        text = "the quick brown fox jumps over the lazy dog " * 4
+        chunks = []
+        for token in _tokens(text):
+            chunks.extend(streamer.feed(token))
+        for chunk in chunks:
+            assert chunk.content.endswith(" ")
+
+    def test_finish_emits_end_marker(self, streamer):
+        streamer.feed("hello")
+        chunks = streamer.finish(DebateMetadata(confidence=0.8))
+        assert len(chunks) == 1
+        assert chunks[0].final is True
+        assert chunks[0].content == "hello"
+        assert chunks[0].metadata.confidence == 0.8
+
+    def test_feed_after_finish_raises(self, streamer):
+        streamer.finish()
+        with pytest.raises(RuntimeError):
+            streamer.feed("late")
+
+    def test_long_word_is_not_split(self, streamer):
+        chunks = streamer.feed("Antidisestablishment")
+        assert chunks == []  # Waits for the word to end
+        chunks = streamer.feed("arianism rules ok")
+        assert [c.content for c in chunks] == ["Antidisestablishmentarianism "]
+
+    def test_sequence_is_contiguous(self, streamer):
+        chunks = streamer.feed("word " * 40) + streamer.finish()
+        assert [c.seq for c in chunks] == list(range(len(chunks)))
+
+
+class TestChunkReassembler:
+    def _chunks(self, text="alpha beta gamma delta epsilon zeta eta theta"):
+        streamer = DebateStreamer("s", round=1, config=StreamConfig(
+            first_chunk_chars=6,
+            chunk_chars=12,
+        ))
+        return streamer.feed(text) + streamer.finish(DebateMetadata(confidence=0.7))
+
+    def test_in_order(self):
+        chunks = self._chunks()
+        r = ChunkReassembler("s", 1, "proposer")
+        for chunk in chunks:
+            r.add(chunk)
+        assert r.complete is True
+        packet = r.to_packet()
+        assert packet.content == "alpha beta gamma delta epsilon zeta eta theta"
+        assert packet.metadata.confidence == 0.7
+
+    def test_out_of_order_holds_gap(self):
+        chunks = self._chunks()
+        r = ChunkReassembler("s", 1, "proposer")
+        assert r.add(chunks[1]) == ""
+        assert r.missing() == [0]
+        delta = r.add(chunks[0])
+        assert delta == chunks[0].content + chunks[1].content
+
+    def test_reversed_delivery(self):
+        chunks = self._chunks()
+        r = ChunkReassembler("s", 1, "proposer")
+        for chunk in reversed(chunks):
+            r.add(chunk)
+        assert r.complete is True
+        assert r.text == "".join(c.content for c in chunks)
+
+    def test_duplicates_ignored(self):
+        chunks = self._chunks()
+        r = ChunkReassembler("s", 1, "proposer")
+        r.add(chunks[0])
+        assert r.add(chunks[0]) == ""
+        assert r.text == chunks[0].content
+
+    def test_incomplete_has_no_packet(self):
+        chunks = self._chunks()
+        r = ChunkReassembler("s", 1, "proposer")
+        r.add(chunks[0])
+        assert r.complete is False
+        assert r.to_packet() is None
+
+    def test_pending_limit(self):
+        r = ChunkReassembler("s", 1, "proposer", max_pending=2)
+        r.add(DebateChunk("s", 1, "proposer", seq=1, content="a"))
+        r.add(DebateChunk("s", 1, "proposer", seq=2, content="b"))
+        with pytest.raises(ValueError):
+            r.add(DebateChunk("s", 1, "proposer", seq=3, content="c"))
+
+
+class TestDebateStream:
+    def test_partial_then_complete(self):
+        stream = DebateStream("sess_001")
+        first = DebateChunk("sess_001", 1, "proposer", seq=0, content="def scan")
+        last = DebateChunk("sess_001", 1, "proposer", seq=1, content="_bt(): ...", final=True)
+
+        update = stream.add(first)
+        assert update.delta == "def scan"
+        assert update.complete is False
+        assert stream.partial_text(1, "proposer") == "def scan"
+
+        update = stream.add(last)
+        assert update.complete is True
+        assert update.packet.content == "def scan_bt(): ..."
+        assert stream.is_complete(1, "proposer")
+
+    def test_rounds_and_roles_are_independent(self):
+        stream = DebateStream("s")
+        stream.add(DebateChunk("s", 1, "proposer", seq=0, content="p"))
+        stream.add(DebateChunk("s", 1, "critic", seq=0, content="c"))
+        assert stream.partial_text(1, "proposer") == "p"
+        assert stream.partial_text(1, "critic") == "c"
+
+    def test_rejects_other_session_and_bad_round(self):
+        stream = DebateStream("s")
+        assert stream.add(DebateChunk("other", 1, "proposer", seq=0, content="x")) is None
+        assert stream.add(DebateChunk("s", 3, "proposer", seq=0, content="x")) is None
+
+    def test_too_many_pending_drops_the_round(self):
+        stream = DebateStream("s", StreamConfig(max_pending_chunks=2))
+        for seq in (1, 2):
+            assert stream.add(DebateChunk("s", 1, "proposer", seq=seq, content="x")).delta == ""
+        assert stream.add(DebateChunk("s", 1, "proposer", seq=3, content="x")) is None
+        assert stream.is_dropped(1, "proposer")
+        assert stream.add(DebateChunk("s", 1, "proposer", seq=0, content="x")) is None
+        assert stream.partial_text(1, "proposer") == ""
+        assert stream.add(DebateChunk("s", 1, "critic", seq=0, content="c")).delta == "c"
+
+    def test_completed_round_ignores_late_chunks(self):
+        stream = DebateStream("s")
+        stream.add(DebateChunk("s", 1, "proposer", seq=0, content="done", final=True))
+        assert stream.add(DebateChunk("s", 1, "proposer", seq=0, content="done", final=True)) is None
+
+
+def _packet(role, round, confidence=0.9, agreement=None, content="x" * 100):
+    return DebatePacket(
+        session_id="s",
+        round=round,
+        role=role,
+        content=content,
+        metadata=DebateMetadata(confidence=confidence, agreement=agreement),
+    )
+
+
+class TestRoundSkipPolicy:
+    def test_stops_on_confident_agreement(self):
+        policy = RoundSkipPolicy()
+        assert policy.should_stop(
+            _packet("proposer", 1, confidence=0.95),
+            _packet("critic", 1, confidence=0.9, agreement=0.95),
+        ) is True
+
+    def test_continues_without_agreement_vote(self):
+        policy = RoundSkipPolicy()
+        assert policy.should_stop(
+            _packet("proposer", 1, confidence=0.95),
+            _packet("critic", 1, confidence=0.99),
+        ) is False
+
+    def test_continues_on_low_proposer_confidence(self):
+        policy = RoundSkipPolicy()
+        assert policy.should_stop(
+            _packet("proposer", 1, confidence=0.5),
+            _packet("critic", 1, confidence=0.9, agreement=0.95),
+        ) is False
+
+    def test_disabled(self):
+        policy = RoundSkipPolicy(RoundSkipConfig(enabled=False))
+        assert policy.should_stop(
+            _packet("proposer", 1, confidence=0.95),
+            _packet("critic", 1, confidence=0.9, agreement=0.95),
+        ) is False
+
+
+class TestDebateSession:
+    def test_full_two_rounds(self):
+        session = DebateSession("s")
+        assert session.add_packet(_packet("proposer", 1)) == DebateAction.FORWARD_TO_CRITIC
+        assert session.add_packet(_packet("critic", 1, agreement=0.2)) == DebateAction.REQUEST_REVISION
+        assert session.add_packet(_packet("proposer", 2)) == DebateAction.FORWARD_TO_CRITIC
+        assert session.add_packet(_packet("critic", 2)) == DebateAction.FINISH
+        assert session.done is True
+        assert session.skipped_rounds == 0
+        assert session.policy.stats.rounds_run == 2
+
+    def test_early_stop_records_savings(self, clock):
+        policy = RoundSkipPolicy(RoundSkipConfig(air_bytes_per_second=100.0))
+        session = DebateSession("s", policy=policy, clock=clock)
+
+        session.add_packet(_packet("proposer", 1, confidence=0.95))
+        clock.now = 4.0
+        action = session.add_packet(_packet("critic", 1, confidence=0.9, agreement=0.95))
+
+        assert action == DebateAction.FINISH
+        assert session.skipped_rounds == 1
+        stats = policy.stats
+        assert stats.rounds_skipped == 1
+        assert stats.skip_rate == 0.5
+        assert stats.latency_saved_s == pytest.approx(4.0)
+        assert stats.bytes_saved == 200
+        assert stats.airtime_saved_s == pytest.approx(2.0)
+
+    def test_out_of_turn_packets_ignored(self):
+        session = DebateSession("s")
+        assert session.add_packet(_packet("critic", 1)) == DebateAction.IGNORE
+        assert session.add_packet(_packet("proposer", 2)) == DebateAction.IGNORE
+        session.add_packet(_packet("proposer", 1))
+        assert session.add_packet(_packet("proposer", 1)) == DebateAction.IGNORE
+
+    def test_no_critic_finishes_after_proposal(self):
+        session = DebateSession("s", has_critic=False)
+        assert session.add_packet(_packet("proposer", 1)) == DebateAction.FINISH
+        assert session.final_proposal.round == 1
+
+    def test_final_proposal_is_revision(self):
+        session = DebateSession("s")
+        session.add_packet(_packet("proposer", 1, content="draft"))
+        session.add_packet(_packet("critic", 1))
+        session.add_packet(_packet("proposer", 2, content="revised"))
+        assert session.final_proposal.content == "revised"
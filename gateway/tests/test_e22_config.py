@@ -0,0 +1,124 @@
+"""Tests for the E22 register model and driver configuration (on the emulator)."""
+import pytest
+
+from e22_config import E22Config, FACTORY_REGISTERS, fastest_air_rate
+from e22_driver import LyceumGateway
+from e22_emulator import Ether, MODE_CONFIGURATION, MODE_TRANSMISSION
+
+
+@pytest.fixture
+def ether():
+    with Ether(time_scale=0.01) as e:
+        yield e
+
+
+@pytest.fixture
+def gateway(ether):
+    module = ether.module(mode=MODE_CONFIGURATION)
+    gw = LyceumGateway(module.port, baud=9600)
+    gw.e22.s.timeout = 0.5
+    writes = []
+    config_write = gw.e22.config_write
+
+    def counting(start, data, temporary=False):
+        writes.append((start, bytes(data)))
+        return config_write(start, data, temporary)
+
+    gw.e22.config_write = counting
+    yield gw, module, writes
+    gw.close()
+
+
+class TestE22Config:
+    def test_factory_round_trip(self):
+        config = E22Config.from_bytes(FACTORY_REGISTERS)
+        assert config == E22Config()
+        assert (config.uart_baud, config.air_rate_bps, config.channel) == (9600, 2400, 0x12)
+        assert config.to_bytes() == FACTORY_REGISTERS
+
+    def test_write_covers_only_changed_range(self):
+        current = E22Config()
+        want = E22Config(channel=4, fixed_point=True)
+        assert want.write_for(current) == (0x05, bytes([0x04, 0x43]))
+        assert current.write_for(current) is None
+
+    def test_crypt_key_always_written_when_set(self):
+        current = E22Config()
+        assert E22Config(crypt_key=0x1234).write_for(current) == (0x07, b"\x12\x34")
+        known = E22Config(crypt_key=0x1234)
+        assert E22Config(crypt_key=0x1234).write_for(known) is None
+
+    def test_reserved_bits_preserved(self):
+        regs = bytearray(FACTORY_REGISTERS)
+        regs[0x04] |= 0x18
+        regs[0x06] = 0x0B
+        config = E22Config.from_bytes(bytes(regs))
+        assert config.to_bytes() == bytes(regs)
+
+    def test_rejects_unknown_values(self):
+        with pytest.raises(ValueError):
+            E22Config(uart_baud=14400).to_bytes()
+        with pytest.raises(ValueError):
+            E22Config(channel=81).to_bytes()
+
+    def test_fastest_air_rate(self):
+        assert fastest_air_rate(-60.0)[0] == 7
+        assert fastest_air_rate(-125.0)[0] == 2
+        code, margin = fastest_air_rate(-110.0, margin_db=10.0)
+        assert code == 5 and margin >= 10.0
+
+
+class TestDriverConfiguration:
+    def test_fixed_point_sets_reg3_bit6(self, gateway):
+        gw, module, writes = gateway
+        assert gw.set_fixed_point_mode()
+        assert module.fixed_point
+        assert module.registers[0x06] == 0x43  # Low bits kept
+        assert module.registers[0x07:0x09] == b"\x00\x00"
+        assert writes == [(0x06, b"\x43")]
+
+    def test_crypt_key_at_0x07(self, gateway):
+        gw, module, writes = gateway
+        assert gw.set_crypt_key(0xBEEF)
+        assert module.registers[0x07:0x09] == b"\xbe\xef"
+        assert writes == [(0x07, b"\xbe\xef")]
+
+    def test_configure_is_one_read_and_one_write(self, gateway):
+        gw, module, writes = gateway
+        applied = gw.configure(address=0x0002, channel=4, fixed_point=True, crypt_key=0x0101)
+        assert applied.channel == 4 and applied.crypt_key == 0x0101
+        assert len(writes) == 1 and writes[0][0] == 0x01  # ADDH unchanged
+        assert (module.address, module.channel, module.fixed_point) == (2, 4, True)
+        # Known state: no further reads or writes needed
+        assert gw.configure(channel=4) == applied
+        assert len(writes) == 1
+        assert gw.read_config().fixed_point
+
+    def test_select_rates(self, gateway):
+        gw, module, writes = gateway
+        selection = gw.select_rates(rssi_dbm=-100.0, max_baud=115200)
+        assert selection.uart_baud == 115200
+        assert selection.air_rate == module.air_rate
+        assert selection.margin_db >= 10.0
+        assert gw.rates == selection
+        assert E22Config.from_bytes(bytes(module.registers)).uart_baud == 115200
+        # Without an RSSI the air rate stays as it is
+        assert gw.select_rates(max_baud=57600).air_rate == selection.air_rate
+
+    def test_read_rssi(self, gateway):
+        gw, module, writes = gateway
+        assert gw.configure(rssi_noise=True)
+        module.set_mode(MODE_TRANSMISSION)
+        noise, last = gw.e22.read_rssi()
+        assert noise == pytest.approx(-110.0)
+        assert last == pytest.approx(-110.0)  # Nothing received yet
+
+    def test_software_mode_switch_round_trip(self, gateway):
+        gw, module, writes = gateway
+        assert gw.configure(software_mode_switch=True)
+        module.set_mode(MODE_TRANSMISSION)
+        assert gw.e22.switch_mode(configuration=True)
+        assert module.mode == MODE_CONFIGURATION
+        assert gw.configure(refresh=True, air_rate=5).air_rate == 5
+        assert gw.e22.switch_mode(configuration=False)
+        assert (module.mode, module.air_rate) == (MODE_TRANSMISSION, 5)
@@ -0,0 +1,141 @@
+"""Tests for X25519 session establishment and the session key cache."""
+import pytest
+from lyceum.crypto.ecdh import (
+    X25519KeyPair,
+    SessionKeyCache,
+    derive_session_keys,
+)
+
+
+class TestX25519KeyPair:
+    def test_shared_secret_agrees(self):
+        a = X25519KeyPair.generate()
+        b = X25519KeyPair.generate()
+        assert a.exchange(b.public_bytes) == b.exchange(a.public_bytes)
+        assert len(a.public_bytes) == 32
+
+    def test_rejects_bad_length(self):
+        with pytest.raises(ValueError):
+            X25519KeyPair.generate().exchange(b"short")
+
+    def test_rejects_low_order_point(self):
+        with pytest.raises(ValueError):
+            X25519KeyPair.generate().exchange(bytes(32))
+
+
+class TestDeriveSessionKeys:
+    def test_sessions_get_independent_keys(self):
+        secret = bytes(range(32))
+        k1 = derive_session_keys(secret, "sess_1")
+        k2 = derive_session_keys(secret, "sess_2")
+        assert k1.key != k2.key
+        assert k1.nonce_salt != k2.nonce_salt
+        assert len(k1.key) == 32
+        assert len(k1.nonce_salt) == 6
+
+    def test_session_cipher_interoperates(self):
+        keys = derive_session_keys(bytes(range(32)), "sess_1")
+        blob = keys.cipher(sender=1).encrypt(b"prompt")
+        assert keys.cipher(sender=2).decrypt(blob) == b"prompt"
+
+    def test_cipher_is_reused(self):
+        keys = derive_session_keys(bytes(range(32)), "sess_1")
+        first = keys.cipher(sender=1).encrypt(b"a")
+        second = keys.cipher(sender=1).encrypt(b"b")
+        assert keys.cipher(sender=1) is keys.cipher(sender=1)
+        assert first[:6] != second[:6]  # Counter kept running: no nonce reuse
+
+
+class TestSessionKeyCache:
+    @pytest.fixture
+    def guardian_keys(self):
+        return X25519KeyPair.generate()
+
+    def test_both_sides_derive_same_keys(self, guardian_keys):
+        moderator = SessionKeyCache()
+        guardian = SessionKeyCache(static_keypair=guardian_keys)
+
+        m_keys = moderator.session_keys("!guardian", guardian_keys.public_bytes, "sess_1")
+        g_keys = guardian.session_keys(
+            "!moderator", m_keys.local_public, "sess_1", m_keys.session_nonce
+        )
+
+        assert m_keys.key == g_keys.key
+        assert m_keys.nonce_salt == g_keys.nonce_salt
+
+    def test_static_rotation_never_repeats_a_nonce(self, guardian_keys, clock):
+        moderator = SessionKeyCache()
+        guardian = SessionKeyCache(static_keypair=guardian_keys, max_age_s=60, clock=clock)
+        m_keys = moderator.session_keys("!guardian", guardian_keys.public_bytes, "sess_1")
+        args = ("!moderator", m_keys.local_public, "sess_1", m_keys.session_nonce)
+
+        nonces = set()
+
+        def send(keys):
+            header = keys.cipher(sender=2).encrypt(b"reply")[:6]
+            nonces.add(keys.key + keys.nonce_salt + header)
+
+        send(guardian.session_keys(*args))
+        clock.now = 61  # Rotation re-runs the exchange against the same key
+        send(guardian.session_keys(*args))
+        guardian.forget_session("!moderator", "sess_1")
+        send(guardian.session_keys(*args))
+        guardian.invalidate("!moderator")
+        send(guardian.session_keys(*args))
+
+        assert guardian.stats.rotations == 1
+        assert len(nonces) == 4
+        reply = guardian.session_keys(*args).cipher(sender=2).encrypt(b"x")
+        assert m_keys.cipher(sender=1).decrypt(reply) == b"x"
+
+    def test_new_session_nonce_gives_new_keys(self, guardian_keys):
+        guardian = SessionKeyCache(static_keypair=guardian_keys)
+        peer = X25519KeyPair.generate().public_bytes
+        k1 = guardian.session_keys("!m", peer, "sess_1", bytes(16))
+        k2 = guardian.session_keys("!m", peer, "sess_1", bytes([1]) * 16)
+        assert k1.key != k2.key
+        assert k1.nonce_salt != k2.nonce_salt
+
+    def test_handshake_runs_once_per_relationship(self, guardian_keys):
+        cache = SessionKeyCache()
+        for i in range(5):
+            cache.session_keys("!guardian", guardian_keys.public_bytes, f"sess_{i}")
+        assert cache.stats.handshakes == 1
+        assert cache.stats.hits == 4
+
+    def test_same_session_returns_cached_keys(self, guardian_keys):
+        cache = SessionKeyCache()
+        k1 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_1")
+        k2 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_1")
+        assert k1 is k2
+
+    def test_rotates_after_max_age(self, guardian_keys, clock):
+        cache = SessionKeyCache(max_age_s=60, clock=clock)
+        k1 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_1")
+        clock.now = 61
+        k2 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_2")
+        assert cache.stats.rotations == 1
+        assert k1.local_public != k2.local_public  # Fresh ephemeral key
+
+    def test_rotates_after_max_sessions(self, guardian_keys):
+        cache = SessionKeyCache(max_sessions=2)
+        for i in range(3):
+            cache.session_keys("!g", guardian_keys.public_bytes, f"sess_{i}")
+        assert cache.stats.handshakes == 2
+
+    def test_peer_key_change_forces_handshake(self):
+        cache = SessionKeyCache()
+        cache.session_keys("!g", X25519KeyPair.generate().public_bytes, "sess_1")
+        cache.session_keys("!g", X25519KeyPair.generate().public_bytes, "sess_1")
+        assert cache.stats.handshakes == 2
+
+    def test_forget_and_invalidate(self, guardian_keys):
+        cache = SessionKeyCache()
+        k1 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_1")
+        cache.forget_session("!g", "sess_1")
+        k2 = cache.session_keys("!g", guardian_keys.public_bytes, "sess_1")
+        assert k1 is not k2
+        assert k1.key != k2.key  # Fresh session nonce, fresh key
+
+        cache.invalidate("!g")
+        assert cache.local_public("!g") is None
@@ -0,0 +1,191 @@
+"""Tests for the pty-based E22 emulator."""
+import asyncio
+import time
+
+import pytest
+
+from e22_driver import E22Serial, LyceumGateway
+from e22_emulator import (
+    Ether,
+    FACTORY_REGISTERS,
+    FORMAT_ERROR,
+    MODE_CONFIGURATION,
+    MODE_TRANSMISSION,
+)
+from e22_transport import E22Transport
+from lyceum.link import FrameReassembler, e22_modulation
+
+
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+SCALE = 0.01  # 100x faster than real air
+
+
+@pytest.fixture
+def ether():
+    with Ether(time_scale=SCALE, seed=3) as e:
+        yield e
+
+
+@pytest.fixture
+def ports():
+    opened = []
+
+    def open_port(module, timeout=0.3):
+        port = E22Serial(module.port, timeout=timeout)
+        opened.append(port)
+        return port
+
+    yield open_port
+    for port in opened:
+        port.close()
+
+
+def read_all(port, size=512) -> bytes:
+    return port.read(size)
+
+
+class TestConfiguration:
+    def test_write_and_read_registers(self, ether, ports):
+        module = ether.module(mode=MODE_CONFIGURATION)
+        port = ports(module)
+        assert port.config_write(0x05, bytes([0x09])) == bytes([0xC1, 0x05, 0x01, 0x09])
+        assert module.channel == 0x09
+        port.send_plain(bytes([0xC1, 0x00, 0x09]))
+        expected = bytearray(FACTORY_REGISTERS)
+        expected[0x05] = 0x09
+        assert port.read(12) == bytes([0xC1, 0x00, 0x09]) + expected
+
+    def test_crypt_is_write_only(self, ether, ports):
+        module = ether.module(mode=MODE_CONFIGURATION)
+        port = ports(module)
+        assert port.config_write(0x07, bytes([0x12, 0x34])) is not None
+        assert module.registers[0x07:0x09] == b"\x12\x34"
+        port.send_plain(bytes([0xC1, 0x06, 0x03]))
+        assert port.read(6) == bytes([0xC1, 0x06, 0x03, FACTORY_REGISTERS[6], 0, 0])
+
+    def test_format_error(self, ether, ports):
+        port = ports(ether.module(mode=MODE_CONFIGURATION))
+        port.send_plain(bytes([0xC0, 0x08, 0x02, 0x00, 0x00]))  # Past the block
+        assert port.read(3) == FORMAT_ERROR
+
+    def test_software_mode_switch(self, ether, ports):
+        module = ether.module()
+        module.registers[0x04] |= 0x04
+        port = ports(module)
+        port.send_plain(bytes([0xC0, 0xC1, 0xC2, 0xC3, 0x02, 0x01]))
+        assert port.read(5) == bytes([0xC1, 0xC2, 0xC3, 0x02, 0x01])
+        assert module.mode == MODE_CONFIGURATION
+
+
+class TestRadio:
+    def test_fixed_point_addressing(self, ether, ports):
+        a = ether.module(address=1, channel=4, fixed_point=True)
+        b = ether.module(address=2, channel=4, fixed_point=True)
+        c = ether.module(address=3, channel=4, fixed_point=True)
+        pa, pb, pc = ports(a), ports(b), ports(c)
+        pa.send_plain(b"\x00\x02\x04unicast")
+        assert read_all(pb) == b"unicast"
+        assert read_all(pc) == b""
+        pa.send_plain(b"\xff\xff\x04everyone")
+        assert read_all(pb) == b"everyone"
+        assert read_all(pc) == b"everyone"
+
+    def test_channel_and_air_rate_must_match(self, ether, ports):
+        a = ether.module(address=1, channel=4, fixed_point=True)
+        b = ether.module(address=2, channel=5, fixed_point=True)
+        c = ether.module(address=2, channel=4, air_rate=5, fixed_point=True)
+        pa, pb, pc = ports(a), ports(b), ports(c)
+        pa.send_plain(b"\x00\x02\x04hello")
+        assert read_all(pb) == b""
+        assert read_all(pc) == b""
+
+    def test_transparent_mode(self, ether, ports):
+        a = ether.module(address=7, channel=4)
+        b = ether.module(address=7, channel=4)
+        pa, pb = ports(a), ports(b)
+        pa.send_plain(b"\x00\x02\x04 is payload here")
+        assert read_all(pb) == b"\x00\x02\x04 is payload here"
+
+    def test_airtime(self, ether, ports):
+        a = ether.module(address=1, channel=4, fixed_point=True)
+        b = ether.module(address=2, channel=4, fixed_point=True)
+        pa, pb = ports(a), ports(b, timeout=2.0)
+        payload = bytes(200)
+        start = time.monotonic()
+        pa.send_plain(b"\x00\x02\x04" + payload)
+        assert pb.read(len(payload)) == payload
+        elapsed = time.monotonic() - start
+        assert elapsed >= e22_modulation(2).time_on_air(len(payload)) * SCALE
+        assert ether.stats.airtime == pytest.approx(e22_modulation(2).time_on_air(200))
+
+    def test_collision_loses_both(self, ports):
+        # Real-time airtime (~0.5 s) so the two sends surely overlap
+        with Ether() as ether:
+            a = ether.module(address=1, channel=4, fixed_point=True)
+            b = ether.module(address=2, channel=4, fixed_point=True)
+            c = ether.module(address=3, channel=4, fixed_point=True)
+            pa, pb, pc = ports(a), ports(b), ports(c, timeout=1.0)
+            pa.send_plain(b"\x00\x03\x04" + bytes(100))
+            pb.send_plain(b"\x00\x03\x04" + bytes(100))
+            assert read_all(pc) == b""
+            assert ether.stats.collisions == 2
+
+    def test_loss_and_rssi(self, ether, ports):
+        a = ether.module(address=1, channel=4, fixed_point=True)
+        b = ether.module(address=2, channel=4, fixed_point=True, rssi_byte=True)
+        c = ether.module(address=2, channel=4, fixed_point=True)
+        ether.set_link(a, b, rssi=-97)
+        ether.set_link(a, c, loss=1.0)
+        pa, pb, pc = ports(a), ports(b), ports(c)
+        pa.send_plain(b"\x00\x02\x04hi")
+        data = read_all(pb)
+        assert data[:-1] == b"hi"
+        assert -(256 - data[-1]) == -97
+        assert read_all(pc) == b""
+        assert ether.stats.lost == 1
+
+
+class TestGatewayStack:
+    def test_lyceum_gateway_round_trip(self, ether):
+        """The HA receive path (E22Transport + FrameReassembler) unchanged."""
+        a = ether.module(address=1, channel=4, fixed_point=True)
+        b = ether.module(address=2, channel=4, fixed_point=True, rssi_byte=True)
+        tx = LyceumGateway(a.port, aes_key=KEY, address=1)
+        rx = LyceumGateway(b.port, aes_key=KEY, address=2)
+
+        async def scenario():
+            got = asyncio.Queue()
+
+            def on_frame(packet, rssi):
+                got.put_nowait((rx.decrypt_payload(bytes(packet)), rssi))
+
+            framer = FrameReassembler(on_frame, trailer=1)
+            transport = E22Transport.from_serial(rx.e22, framer.feed)
+            transport.start()
+            try:
+                for text in ("one", "two", "three"):
+                    tx.send_text(0x0002, 4, text)
+                    # Writes closer together than the UART gap would merge
+                    # into one packet, as on a real module
+                    await asyncio.sleep(4 * ether.gap_s)
+                return [await asyncio.wait_for(got.get(), 2.0) for _ in range(3)]
+            finally:
+                transport.stop()
+
+        try:
+            received = asyncio.run(scenario())
+        finally:
+            tx.close()
+            rx.close()
+        assert [plain[6:] for plain, _ in received] == [b"one", b"two", b"three"]
+        assert all(rssi == 256 - 60 for _, rssi in received)
+
+    def test_modes_are_exclusive(self, ether, ports):
+        module = ether.module(address=1, channel=4, fixed_point=True)
+        port = ports(module)
+        module.set_mode(MODE_CONFIGURATION)
+        assert port.config_write(0x05, bytes([0x06])) is not None
+        module.set_mode(MODE_TRANSMISSION)
+        port.send_plain(b"\x00\x02\x06data")
+        assert port.read(8) == b""  # Sent on air, nothing echoed back
+        assert ether.stats.packets == 1
@@ -0,0 +1,154 @@
+"""Tests for Reed-Solomon FEC and the FEC endpoint."""
+import itertools
+import random
+
+import pytest
+
+from lyceum.link.fec import (
+    AdaptiveRedundancy,
+    FecEndpoint,
+    MAX_SHARD,
+    ReedSolomon,
+    gf_inv,
+    gf_mul,
+    is_fec,
+    split,
+)
+from lyceum.link.flags import FLAG_ACK, FLAG_FEC
+from lyceum.link.arq import is_arq
+from lyceum_proto import LyceumFrame
+
+
+class TestGaloisField:
+    def test_inverse(self):
+        for a in range(1, 256):
+            assert gf_mul(a, gf_inv(a)) == 1
+
+    def test_distributive(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            a, b, c = (rng.randrange(256) for _ in range(3))
+            assert gf_mul(a, b ^ c) == gf_mul(a, b) ^ gf_mul(a, c)
+
+
+class TestReedSolomon:
+    def test_any_k_of_n(self):
+        data = split(bytes(range(200)) * 3, max_shard=150)
+        k = len(data)
+        rs = ReedSolomon(k)
+        shards = {i: rs.encode(data, i) for i in range(k + 3)}
+        for subset in itertools.combinations(range(k + 3), k):
+            assert rs.decode({i: shards[i] for i in subset}) == data
+
+    def test_late_repair_indices(self):
+        data = split(b"lyceum" * 100, max_shard=40)
+        rs = ReedSolomon(len(data))
+        repair = {i: rs.encode(data, i) for i in range(200, 200 + len(data))}
+        assert rs.decode(repair) == data
+
+    def test_too_few_shards(self):
+        rs = ReedSolomon(3)
+        with pytest.raises(ValueError):
+            rs.decode({0: b"a", 4: b"b"})
+
+    def test_split_pads_evenly(self):
+        shards = split(bytes(401), max_shard=MAX_SHARD)
+        assert len(shards) == 3 and {len(s) for s in shards} == {134}
+
+
+class TestAdaptiveRedundancy:
+    def test_parity_grows_with_loss(self):
+        low, high = AdaptiveRedundancy(initial_loss=0.01), AdaptiveRedundancy(initial_loss=0.3)
+        assert low.parity_for(10) < high.parity_for(10)
+        assert high.completion_probability(10, 10 + high.parity_for(10)) >= 0.95
+
+    def test_observe_tracks_loss(self):
+        r = AdaptiveRedundancy(initial_loss=0.0, alpha=0.5)
+        r.observe(received=7, sent=10)
+        assert r.loss == pytest.approx(0.15)
+
+
+def link(clock, loss=0.0, seed=3, **kwargs):
+    """Two FEC endpoints over a zero-latency lossy loopback."""
+    rng = random.Random(seed)
+    got = []
+    queue = []
+    a = FecEndpoint(1, lambda d, f: rng.random() >= loss and queue.append((d, f)),
+                    lambda s, p: None, clock=clock, **kwargs)
+    b = FecEndpoint(2, lambda d, f: rng.random() >= loss and queue.append((d, f)),
+                    lambda s, p: got.append(p), clock=clock)
+    nodes = {1: a, 2: b}
+
+    def run():
+        while True:
+            while queue:
+                dst, frame = queue.pop(0)
+                nodes[dst].on_frame(frame)
+            if a.deadline is None:
+                return
+            clock.now = a.deadline
+            a.poll()
+    return a, b, got, run
+
+
+class TestFecEndpoint:
+    def test_lossless(self, clock):
+        a, b, got, run = link(clock)
+        payload = bytes(range(256)) * 4
+        a.send(2, payload)
+        run()
+        assert got == [payload]
+        assert a.pending == 0 and a.stats.blocks_acked == 1
+
+    @pytest.mark.parametrize("loss", [0.1, 0.3])
+    def test_lossy_completes_once(self, clock, loss):
+        a, b, got, run = link(clock, loss=loss)
+        payloads = [bytes([i]) * 900 for i in range(20)]
+        for payload in payloads:
+            a.send(2, payload)
+            run()
+        assert got == payloads
+        assert b.stats.blocks_decoded == 20
+
+    def test_frames_marked(self):
+        shards, acks, got = [], [], []
+        a = FecEndpoint(1, lambda d, f: shards.append(f), lambda s, p: None)
+        b = FecEndpoint(2, lambda d, f: acks.append(f), lambda s, p: got.append(p))
+        a.send(2, b"x" * 500)
+        assert all(is_fec(f) and not is_arq(f) for f in shards)
+        assert LyceumFrame.from_bytes(shards[0]).is_fec
+        for frame in shards[1:]:  # First data shard lost
+            b.on_frame(frame)
+        assert got == [b"x" * 500]
+        assert acks[0][5] == FLAG_FEC | FLAG_ACK and not is_arq(acks[0])
+        # One ack on decode, then one for each shard that arrived late
+        assert len(acks) == len(shards) - 3
+        a.on_frame(acks[0])
+        assert a.pending == 0
+
+    def test_gives_up(self, clock):
+        a, b, got, run = link(clock, loss=1.0, max_rounds=2)
+        a.send(2, b"y" * 300)
+        run()
+        assert a.stats.blocks_failed == 1 and a.stats.repair_rounds == 2
+
+    def test_sender_restart(self):
+        shards, acks, got = [], [], []
+        b = FecEndpoint(2, lambda d, f: acks.append(f), lambda s, p: got.append(p))
+        a = FecEndpoint(1, lambda d, f: shards.append(f), lambda s, p: None, epoch=1)
+        assert a.send(2, b"before" * 50) == 0
+        for frame in shards:
+            b.on_frame(frame)
+        old_ack = acks[0]
+
+        # Restarted sender: block ids begin at 0 again
+        shards.clear()
+        a = FecEndpoint(1, lambda d, f: shards.append(f), lambda s, p: None, epoch=2)
+        assert a.send(2, b"after" * 50) == 0
+        for frame in shards:
+            b.on_frame(frame)
+        assert got == [b"before" * 50, b"after" * 50]
+        assert b.stats.restarts == 1
+
+        a.on_frame(old_ack)  # Ack for the old session's block 0
+        assert a.pending == 1 and a.stats.stale == 1
@@ -0,0 +1,168 @@
+"""Tests for E22 UART frame reassembly."""
+import random
+
+import pytest
+
+from lyceum.crypto import AESGCMCipher
+from lyceum.link.framing import FrameReassembler, RingBuffer, MODE_GAP, MODE_LENGTH
+from lyceum_proto import LyceumFrame, LyceumFrameView
+
+
+class Sink:
+    def __init__(self):
+        self.frames = []
+        self.rssi = []
+        self.views = []
+
+    def __call__(self, view, rssi):
+        self.views.append(view.obj)
+        self.frames.append(bytes(view))
+        self.rssi.append(rssi)
+
+
+def framed(*packets):
+    return b"".join(bytes([len(p)]) + p for p in packets)
+
+
+@pytest.fixture
+def sink():
+    return Sink()
+
+
+class TestRingBuffer:
+    def test_wraparound_view(self):
+        ring = RingBuffer(8)
+        scratch = memoryview(bytearray(8))
+        ring.write(b"abcdef")
+        ring.consume(5)
+        assert ring.write(b"ghijkl") == 6  # Wraps past the end
+        assert bytes(ring.view(0, 7, scratch)) == b"fghijkl"
+        assert ring.free == 1
+
+    def test_write_limited_to_free_space(self):
+        ring = RingBuffer(4)
+        assert ring.write(b"abcdef") == 4
+        assert ring.write(b"x") == 0
+
+
+class TestLengthMode:
+    def test_split_across_reads(self, sink, clock):
+        framer = FrameReassembler(sink, clock=clock)
+        stream = framed(b"hello", b"world!")
+        framer.feed(stream[:3])
+        assert sink.frames == []
+        framer.feed(stream[3:9])
+        framer.feed(stream[9:])
+        assert sink.frames == [b"hello", b"world!"]
+
+    def test_back_to_back_in_one_read(self, sink, clock):
+        framer = FrameReassembler(sink, clock=clock)
+        assert framer.feed(framed(b"a", b"bb", b"ccc")) == 3
+        assert sink.frames == [b"a", b"bb", b"ccc"]
+        assert framer.pending == 0
+
+    def test_zero_copy_delivery(self, sink, clock):
+        framer = FrameReassembler(sink, clock=clock)
+        framer.feed(framed(b"payload"))
+        assert sink.views[0] is framer._ring._buf.obj
+
+    def test_invalid_length_resyncs(self, sink, clock):
+        framer = FrameReassembler(sink, max_frame=16, clock=clock)
+        framer.feed(b"\x00\xff" + framed(b"ok"))
+        assert sink.frames == [b"ok"]
+        assert framer.stats.resyncs == 2
+
+    def test_stale_partial_dropped_after_gap(self, sink, clock):
+        framer = FrameReassembler(sink, gap_s=0.05, clock=clock)
+        framer.feed(b"\x10abc")  # Claims 16 bytes, rest lost on air
+        clock.now = 1.0
+        framer.feed(framed(b"next"))
+        assert sink.frames == [b"next"]
+        assert framer.stats.stale_bytes == 4
+
+    def test_rssi_trailer(self, sink, clock):
+        framer = FrameReassembler(sink, trailer=1, clock=clock)
+        framer.feed(b"\x02hi\xa0\x03abc\xb0")
+        assert sink.frames == [b"hi", b"abc"]
+        assert sink.rssi == [0xA0, 0xB0]
+
+    def test_sustained_stream_wraps_ring(self, sink, clock):
+        framer = FrameReassembler(sink, max_frame=32, capacity=80, clock=clock)
+        packets = [bytes([i]) * (1 + i % 30) for i in range(200)]
+        stream = framed(*packets)
+        for i in range(0, len(stream), 7):
+            framer.feed(stream[i:i + 7])
+        assert sink.frames == packets
+
+    def test_no_decrypt_failures_from_read_boundaries(self, clock):
+        cipher = AESGCMCipher(bytes(16))
+        blobs = cipher.encrypt_many([b"msg %d" % i * 5 for i in range(300)])
+        stream = framed(*blobs)
+        failures = []
+        framer = FrameReassembler(
+            lambda view, rssi: failures.append(cipher.decrypt(view) is None),
+            clock=clock,
+        )
+        rng = random.Random(7)
+        i = 0
+        while i < len(stream):
+            n = rng.choice((1, 17, 64, 256))  # Arbitrary UART read sizes
+            framer.feed(stream[i:i + n])
+            i += n
+        assert len(failures) == 300 and not any(failures)
+
+
+class TestGapMode:
+    def test_gap_ends_packet(self, sink, clock):
+        framer = FrameReassembler(sink, mode=MODE_GAP, gap_s=0.02, clock=clock)
+        framer.feed(b"first ")
+        clock.now = 0.005
+        framer.feed(b"packet")
+        assert framer.deadline == pytest.approx(0.025)
+        assert framer.flush() == 0  # Not idle long enough yet
+        clock.now = 0.03
+        assert framer.flush() == 1
+        assert sink.frames == [b"first packet"]
+
+    def test_new_burst_flushes_previous(self, sink, clock):
+        framer = FrameReassembler(sink, mode=MODE_GAP, gap_s=0.02, clock=clock)
+        framer.feed(b"one")
+        clock.now = 0.1
+        framer.feed(b"two")
+        assert sink.frames == [b"one"]
+
+    def test_full_subpacket_emitted_immediately(self, sink, clock):
+        framer = FrameReassembler(sink, mode=MODE_GAP, max_frame=8, clock=clock)
+        framer.feed(b"12345678rest")
+        assert sink.frames == [b"12345678"]
+
+    def test_gap_mode_with_rssi(self, sink, clock):
+        framer = FrameReassembler(sink, mode=MODE_GAP, trailer=1, clock=clock)
+        framer.feed(b"data\x90")
+        clock.now = 1.0
+        framer.flush()
+        assert sink.frames == [b"data"] and sink.rssi == [0x90]
+
+
+class TestFramerConfig:
+    def test_rejects_bad_settings(self, sink):
+        with pytest.raises(ValueError):
+            FrameReassembler(sink, mode="slip")
+        with pytest.raises(ValueError):
+            FrameReassembler(sink, mode=MODE_LENGTH, max_frame=300)
+        with pytest.raises(ValueError):
+            FrameReassembler(sink, mode=MODE_GAP, gap_s=None)
+
+
+class TestLyceumFrameView:
+    def test_fields_without_copy(self):
+        frame = LyceumFrame(src=0x1234, dst=0xFFFF, seq=7, flags=1, payload=b"hi")
+        buf = memoryview(bytearray(frame.to_bytes()))
+        view = LyceumFrameView(buf)
+        assert (view.src, view.dst, view.seq, view.flags) == (0x1234, 0xFFFF, 7, 1)
+        assert view.payload.obj is buf.obj
+        assert view.to_frame() == frame
+
+    def test_too_short(self):
+        with pytest.raises(ValueError):
+            LyceumFrameView(memoryview(b"abc"))
@@ -0,0 +1,282 @@
+"""
+Tests for the Home Assistant gateway device against emulated E22 modules.
+
+The integration only needs a few names from homeassistant and aiohttp;
+when those packages are not installed they are stubbed here, and the
+integration's modules are loaded without its __init__ (which needs the
+rest of Home Assistant).
+"""
+import asyncio
+import importlib
+import os
+import sys
+import types
+
+import pytest
+
+from e22_driver import LyceumGateway
+from e22_config import REG_REG1
+from e22_emulator import Ether
+from lyceum.custody import CustodyQueue
+
+
+INTEGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "homeassistant", "custom_components", "lyceum_gateway",
+)
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+SCALE = 0.01  # 100x faster than real air
+GATEWAY, PEER = 0x0001, 0x0002
+
+
+def _install_stubs():
+    try:
+        import homeassistant.core  # noqa: F401
+    except ImportError:
+        sys.modules["homeassistant"] = types.ModuleType("homeassistant")
+        core = sys.modules["homeassistant.core"] = types.ModuleType("homeassistant.core")
+        core.HomeAssistant = object
+        core.callback = lambda fn: fn
+        helpers = sys.modules["homeassistant.helpers"] = types.ModuleType("homeassistant.helpers")
+        client = sys.modules["homeassistant.helpers.aiohttp_client"] = types.ModuleType(
+            "homeassistant.helpers.aiohttp_client"
+        )
+        client.async_get_clientsession = lambda hass: hass.http_session
+        helpers.aiohttp_client = client
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        aiohttp = sys.modules["aiohttp"] = types.ModuleType("aiohttp")
+        aiohttp.ClientTimeout = lambda total=None: total
+    # The integration package without its __init__
+    package = types.ModuleType("lyceum_gateway")
+    package.__path__ = [INTEGRATION]
+    sys.modules.setdefault("lyceum_gateway", package)
+
+
+_install_stubs()
+const = importlib.import_module("lyceum_gateway.const")
+LyceumGatewayDevice = importlib.import_module("lyceum_gateway.gateway").LyceumGatewayDevice
+
+
+class FakeResponse:
+    status = 200
+
+    async def read(self):
+        return b""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, data, headers, timeout):
+        self.posts.append((url, data))
+        return FakeResponse()
+
+
+class FakeBus:
+    def __init__(self):
+        self.events = []
+
+    def async_fire(self, event_type, data):
+        self.events.append((event_type, data))
+
+    def of(self, event_type):
+        return [data for kind, data in self.events if kind == event_type]
+
+
+class FakeHass:
+    """The parts of HomeAssistant the gateway uses."""
+
+    def __init__(self, config_dir):
+        self.loop = asyncio.get_running_loop()
+        self.bus = FakeBus()
+        self.config = types.SimpleNamespace(path=lambda *parts: os.path.join(config_dir, *parts))
+        self.http_session = FakeSession()
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    def async_add_executor_job(self, fn, *args):
+        return self.loop.run_in_executor(None, fn, *args)
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def ether():
+    with Ether(time_scale=SCALE, seed=3) as e:
+        yield e
+
+
+@pytest.fixture
+def peer(ether):
+    """A node on channel 4 driven with the blocking driver."""
+    module = ether.module(address=PEER, channel=4, fixed_point=True)
+    node = LyceumGateway(module.port, aes_key=KEY, address=PEER)
+    yield node
+    node.close()
+
+
+@pytest.fixture
+def start(ether, tmp_path):
+    """Run scenario(device, hass) against a device on an emulated module."""
+
+    def run(scenario, module=None, **options):
+        if module is None:
+            module = ether.module(address=GATEWAY, channel=4, fixed_point=True)
+        options.setdefault("aes_key", KEY)
+        options.setdefault("custody_ttl", 0.0)
+
+        async def main():
+            hass = FakeHass(str(tmp_path))
+            device = LyceumGatewayDevice(hass, module.port, channel=4, node_id="!0001", **options)
+            await device.async_start()
+            try:
+                return await scenario(device, hass)
+            finally:
+                await device.async_stop()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def send_from(peer, text, channel=4):
+    """Blocking send from the peer to the gateway (run in the executor)."""
+    return asyncio.get_running_loop().run_in_executor(
+        None, peer.send_text, GATEWAY, channel, text, PEER
+    )
+
+
+class TestLyceumGatewayDevice:
+    def test_received_message_fires_event(self, start, peer):
+        async def scenario(device, hass):
+            await send_from(peer, "hello")
+            await wait_until(lambda: hass.bus.of(const.EVENT_MESSAGE_RECEIVED))
+            return hass.bus.of(const.EVENT_MESSAGE_RECEIVED)
+
+        [event] = start(scenario)
+        assert event["message"] == "hello"
+        assert event[const.ATTR_SENDER] == hex(PEER)
+        assert event[const.ATTR_CHANNEL] == 4
+
+    @pytest.mark.parametrize("rx_workers", [0, 1])
+    def test_compact_header_without_key(self, start, ether, rx_workers):
+        module = ether.module(address=PEER, channel=4, fixed_point=True)
+        node = LyceumGateway(module.port, address=PEER, compact_header=True)
+
+        async def scenario(device, hass):
+            await send_from(node, "compact")
+            await wait_until(lambda: hass.bus.of(const.EVENT_MESSAGE_RECEIVED))
+            return hass.bus.of(const.EVENT_MESSAGE_RECEIVED)
+
+        try:
+            [event] = start(scenario, aes_key=None, compact_header=True, rx_workers=rx_workers)
+        finally:
+            node.close()
+        assert event["message"] == "compact"
+        assert event[const.ATTR_SENDER] == hex(PEER)
+
+    @pytest.mark.parametrize("rx_workers", [0, 1])
+    def test_radios_are_merged(self, start, ether, peer, rx_workers):
+        far = ether.module(address=0x0003, channel=5, fixed_point=True)
+        far_node = LyceumGateway(far.port, aes_key=KEY, address=0x0003)
+        extra = ether.module(address=GATEWAY, channel=5, fixed_point=True)
+
+        async def scenario(device, hass):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, far_node.send_text, GATEWAY, 5, "far", 0x0003)
+            await send_from(peer, "near")
+            await wait_until(lambda: len(hass.bus.of(const.EVENT_MESSAGE_RECEIVED)) == 2)
+            # Replies go out on the channel each peer was heard on
+            assert device.balancer.channel_for(0x0003) == 5
+            assert device.balancer.channel_for(PEER) == 4
+            return hass.bus.of(const.EVENT_MESSAGE_RECEIVED), device.tx_stats
+
+        try:
+            events, stats = start(scenario, extra_radios=[(extra.port, 5)], rx_workers=rx_workers)
+        finally:
+            far_node.close()
+        channels = {event["message"]: event[const.ATTR_CHANNEL] for event in events}
+        assert channels == {"far": 5, "near": 4}
+        assert stats["merger"]["delivered"] == 2
+        assert [radio["rx_frames"] for radio in stats["radios"]] == [1, 1]
+
+    def test_sent_message_reaches_peer(self, start, peer):
+        async def scenario(device, hass):
+            await device.async_send_message(PEER, 4, "to peer")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, peer.e22.read, 64)
+
+        packet = start(scenario)
+        plain = peer.decrypt_payload(packet[1:])  # After the length byte
+        assert plain[6:] == b"to peer"
+
+    def test_state_updates_are_throttled(self, start, peer):
+        async def scenario(device, hass):
+            updates = []
+            device.register_callback(lambda: updates.append(device.message_count))
+            for i in range(3):
+                await send_from(peer, f"m{i}")
+                await asyncio.sleep(0.02)
+            await wait_until(lambda: device.message_count == 3)
+            await wait_until(lambda: updates[-1] == 3)  # Trailing update
+            return updates
+
+        updates = start(scenario, state_interval=0.3)
+        assert len(updates) < 3
+        assert updates[0] == 1  # Leading update right away
+
+    def test_configuration_mode_holds_transmission(self, start, ether):
+        module = ether.module(address=GATEWAY, channel=4, fixed_point=True)
+        module.registers[REG_REG1] |= 0x04  # Software mode switch
+
+        async def scenario(device, hass):
+            # Frames to 0xC0xx start C0 00: a register write in configuration mode
+            for i in range(3):
+                await device.async_send_message(0xC004, 4, f"frame {i}")
+            await wait_until(lambda: module.rssi_byte and device.scheduler.depth == 0)
+            await wait_until(lambda: ether.stats.packets == 3)
+
+        # ADR turns on the RSSI byte at startup, with the frames queued
+        start(scenario, module=module, adaptive_rate=True, aggregate_linger=0.0)
+        assert module.address == GATEWAY and module.channel == 4
+        assert module.mode == "transmission"
+
+    def test_custody_is_saved_off_the_loop(self, start, tmp_path):
+        async def scenario(device, hass):
+            await device.async_send_message(0x0009, None, "held", store_and_forward=True)
+            assert device.custody.depth == 1
+            await wait_until(lambda: not device.custody.unsaved)
+
+        start(scenario, custody_ttl=3600.0)
+        path = os.path.join(str(tmp_path), const.DOMAIN, "custody.db")
+        queue = CustodyQueue(path)
+        try:
+            assert queue.depth == 1
+        finally:
+            queue.close()
+
+    def test_relay_client_starts_with_backbone_mode(self, start):
+        async def scenario(device, hass):
+            assert device.relay is not None
+            await device.async_relay_to_internet("to the backbone")
+            await wait_until(lambda: device.relay.stats.sent)
+            return hass.http_session.posts, device.relay_stats
+
+        posts, stats = start(scenario, backbone_mode=True, relay_url="http://relay.test/")
+        assert posts[0][0] == "http://relay.test/relay/batch"
+        assert stats["sent"] == 1
@@ -0,0 +1,52 @@
+"""Tests for the bounded message history."""
+import pytest
+
+from lyceum.history import RECEIVED, SENT, MessageHistory
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = 1_700_000_000.0  # Wall-clock timestamps
+    return clock
+
+
+class TestMessageHistory:
+    def test_ring_keeps_newest(self, clock):
+        history = MessageHistory(capacity=3, clock=clock)
+        for i in range(5):
+            history.record(RECEIVED, f"m{i}", peer=0x10, channel=4)
+        assert len(history) == 3 and history.total == 5
+        assert [e["message"] for e in history.query(10)] == ["m2", "m3", "m4"]
+        assert [e["message"] for e in history.query(2)] == ["m3", "m4"]
+
+    def test_entry_fields(self, clock):
+        history = MessageHistory(clock=clock)
+        history.record(RECEIVED, "hello", peer=0x1234, channel=5, rssi=-87, snr=6.5)
+        history.record(SENT, "reply", peer=0x1234)
+        rx, tx = history.query()
+        assert rx["direction"] == "received" and rx["sender"] == "0x1234"
+        assert rx["channel"] == 5 and rx["rssi"] == -87 and rx["snr"] == pytest.approx(6.5)
+        assert tx == {
+            "direction": "sent",
+            "destination": "0x1234",
+            "channel": None,  # Auto-selected at send time
+            "message": "reply",
+            "timestamp": tx["timestamp"],
+        }
+
+    def test_filters(self, clock):
+        history = MessageHistory(clock=clock)
+        history.record(RECEIVED, "a", peer=1, channel=4)
+        history.record(RECEIVED, "b", peer=2, channel=5)
+        history.record(SENT, "c", peer=1, channel=4)
+        history.record(RECEIVED, "d", peer=1, channel=5)
+        assert [e["message"] for e in history.query(sender=1)] == ["a", "d"]
+        assert [e["message"] for e in history.query(channel=4)] == ["a", "c"]
+        assert [e["message"] for e in history.query(sender=1, channel=5)] == ["d"]
+        assert [e["message"] for e in history.query(1, sender=1)] == ["d"]
+
+    def test_text_truncated_on_character_boundary(self, clock):
+        history = MessageHistory(max_text=5, clock=clock)
+        history.record(RECEIVED, "abéé")  # 6 bytes of UTF-8
+        assert history.query()[0]["message"] == "abé"
+        assert history.memory_bytes == 500 * (28 + 5)
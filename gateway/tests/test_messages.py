@@ -5,6 +5,7 @@ from lyceum.pneuma.messages import (
     RoutingRequest,
     ExpertOffer,
     DebatePacket,
+    DebateChunk,
     Intent,
     IntentConstraints,
     Bid,
@@ -117,6 +118,19 @@ class TestDebatePacket:
         assert parsed.metadata.confidence == 0.92
         assert parsed.metadata.citations == ["RFC 1234"]
 
+    def test_agreement_only_serialized_when_set(self):
+        proposal = DebatePacket(session_id="s", round=1, role="proposer", content="")
+        critique = DebatePacket(
+            session_id="s",
+            round=1,
+            role="critic",
+            content="",
+            metadata=DebateMetadata(confidence=0.9, agreement=0.95),
+        )
+
+        assert "agreement" not in proposal.to_dict()["metadata"]
+        assert DebatePacket.from_json(critique.to_json()).metadata.agreement == 0.95
+
     def test_valid_round(self):
         p1 = DebatePacket(session_id="s1", round=1, role="proposer", content="")
         p2 = DebatePacket(session_id="s1", round=2, role="critic", content="")
@@ -141,6 +155,33 @@ class TestDebatePacket:
         assert d["type"] == "debate"
 
 
+class TestDebateChunk:
+    def test_roundtrip_json(self):
+        chunk = DebateChunk(
+            session_id="sess_001",
+            round=1,
+            role="proposer",
+            seq=3,
+            content="def scan",
+            final=True,
+            metadata=DebateMetadata(confidence=0.8),
+        )
+
+        parsed = DebateChunk.from_json(chunk.to_json())
+
+        assert parsed.seq == 3
+        assert parsed.content == "def scan"
+        assert parsed.final is True
+        assert parsed.metadata.confidence == 0.8
+
+    def test_intermediate_chunk_omits_metadata(self):
+        chunk = DebateChunk(session_id="s", round=1, role="proposer", seq=0, content="x")
+        d = chunk.to_dict()
+        assert d["type"] == "debate_chunk"
+        assert "metadata" not in d
+        assert DebateChunk.from_dict(d).metadata is None
+
+
 class TestParseMessage:
     def test_parse_routing_request(self):
         data = json.dumps({
@@ -179,6 +220,19 @@ class TestParseMessage:
         assert isinstance(msg, DebatePacket)
         assert msg.content == "test content"
 
+    def test_parse_debate_chunk(self):
+        data = json.dumps({
+            "type": "debate_chunk",
+            "session_id": "sess_001",
+            "round": 1,
+            "role": "proposer",
+            "seq": 0,
+            "content": "partial",
+        })
+        msg = parse_message(data)
+        assert isinstance(msg, DebateChunk)
+        assert msg.final is False
+
     def test_parse_unknown_type(self):
         data = json.dumps({"type": "unknown", "data": "test"})
         msg = parse_message(data)
@@ -0,0 +1,112 @@
+"""Tests for multi-radio load balancing and receive merging."""
+import pytest
+
+from lyceum.link.multiradio import ChannelLoad, RadioBalancer, RxMerger
+from lyceum.link.scheduler import Priority, SchedulerConfig, TxScheduler
+
+
+class TestChannelLoad:
+    def test_sliding_window(self, clock):
+        load = ChannelLoad(window_s=10.0, clock=clock)
+        load.add(1.0)
+        clock.now = 5.0
+        load.add(2.0)
+        assert load.occupancy() == pytest.approx(0.3)
+        clock.now = 10.0
+        assert load.occupancy() == pytest.approx(0.2)  # First one aged out
+        clock.now = 20.0
+        assert load.occupancy() == 0.0
+
+
+class TestRadioBalancer:
+    def test_channel_owner_sends(self, clock):
+        balancer = RadioBalancer([4, 5, 6], clock=clock)
+        balancer.record_tx(1, 30.0)  # Busy, but the only radio on 5
+        assert balancer.pick(channel=5) == 1
+
+    def test_least_occupied_without_preference(self, clock):
+        balancer = RadioBalancer([4, 5, 6], clock=clock)
+        balancer.record_tx(0, 2.0)
+        balancer.record_rx(2, 1.0)
+        assert balancer.pick() == 1
+        balancer.set_queued(1, 5.0)
+        assert balancer.pick() == 2
+
+    def test_same_channel_radios_share(self, clock):
+        balancer = RadioBalancer([4, 4, 6], clock=clock)
+        picks = []
+        for _ in range(4):
+            radio = balancer.pick(channel=4)
+            picks.append(radio)
+            balancer.record_tx(radio, 1.0)
+        assert picks == [0, 1, 0, 1]
+
+    def test_peer_affinity(self, clock):
+        balancer = RadioBalancer([4, 5], max_peers=2, clock=clock)
+        balancer.record_rx(1, 0.1, sender=0x0042)
+        balancer.record_tx(1, 10.0)
+        assert balancer.pick(peer=0x0042) == 1
+        assert balancer.channel_for(0x0042) == 5
+        assert balancer.pick(channel=4, peer=0x0042) == 0  # Explicit channel wins
+        balancer.learn(0x0043, 0)
+        balancer.learn(0x0044, 0)
+        assert balancer.channel_for(0x0042) is None  # Evicted
+
+    def test_unknown_channel_goes_to_least_loaded(self, clock):
+        balancer = RadioBalancer([4, 5], clock=clock)
+        balancer.record_tx(0, 1.0)
+        assert balancer.pick(channel=9) == 1
+
+    def test_scheduler_queued_airtime(self, clock):
+        sched = TxScheduler(SchedulerConfig(), clock=clock)
+        sched.enqueue(bytes(50), 4, Priority.RELAY)
+        sched.enqueue(bytes(50), 4, Priority.TELEMETRY)
+        assert sched.queued_airtime == pytest.approx(2 * sched.airtime(bytes(50)))
+
+
+class TestRxMerger:
+    def _merger(self, clock, hold_s=0.05):
+        out = []
+        merger = RxMerger(lambda radio, packet, rssi: out.append((radio, packet)),
+                          hold_s=hold_s, clock=clock)
+        return merger, out
+
+    def test_orders_by_air_start(self, clock):
+        merger, out = self._merger(clock)
+        clock.now = 1.00
+        merger.push(0, b"short", airtime=0.05)  # Started at 0.95
+        clock.now = 1.02
+        merger.push(1, b"long", airtime=0.50)  # Started at 0.52
+        assert merger.deadline == pytest.approx(1.05)
+        clock.now = 1.05
+        merger.poll()
+        assert out == [(1, b"long"), (0, b"short")]
+        assert merger.stats.reordered == 1
+
+    def test_holds_until_deadline(self, clock):
+        merger, out = self._merger(clock)
+        merger.push(0, b"a")
+        merger.poll()
+        assert out == [] and merger.pending == 1
+        clock.now = 0.05
+        merger.poll()
+        assert out == [(0, b"a")]
+        assert merger.deadline is None
+
+    def test_duplicates_across_radios(self, clock):
+        merger, out = self._merger(clock, hold_s=0.0)
+        assert merger.push(0, b"same")
+        assert not merger.push(1, b"same")
+        assert out == [(0, b"same")]
+        clock.now = 5.0
+        assert merger.push(1, b"same")  # Outside the dedup window
+        assert merger.stats.duplicates == 1
+
+    def test_repeat_on_same_radio_delivered(self, clock):
+        merger, out = self._merger(clock, hold_s=0.0)
+        assert merger.push(0, b"temp=20")
+        clock.now = 1.0
+        assert merger.push(0, b"temp=20")  # Sent again, e.g. an ARQ retransmission
+        assert not merger.push(1, b"temp=20")
+        assert out == [(0, b"temp=20"), (0, b"temp=20")]
+        assert merger.stats.duplicates == 1
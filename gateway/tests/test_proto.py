@@ -0,0 +1,116 @@
+"""Tests for the LyceumFrame codec and compact header."""
+import os
+import pty
+
+import pytest
+
+from e22_driver import LyceumGateway
+from lyceum.link.flags import FLAG_ACK, FLAG_FEC, FLAG_RESERVED, FLAG_NAMES, describe
+from lyceum_proto import (
+    COMPACT_SAVING,
+    HEADER_SIZE,
+    LyceumFrame,
+    LyceumFrameView,
+    compact_header,
+    expand_header_into,
+)
+
+
+KEY = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+
+
+@pytest.fixture
+def gateways():
+    master, slave = pty.openpty()
+    made = []
+
+    def make(**kwargs):
+        kwargs.setdefault("aes_key", KEY)
+        gw = LyceumGateway(os.ttyname(slave), **kwargs)
+        made.append(gw)
+        return gw
+
+    yield make
+    for gw in made:
+        gw.close()
+    os.close(slave)
+    os.close(master)
+
+
+class TestCodec:
+    def test_round_trip(self):
+        frame = LyceumFrame(src=0xA1B2, dst=0x0102, seq=300, flags=FLAG_ACK, payload=b"hello")
+        wire = frame.to_bytes()
+        assert wire == bytes.fromhex("a1b20102") + bytes([44, FLAG_ACK]) + b"hello"
+        decoded = LyceumFrame.from_bytes(wire)
+        assert decoded == LyceumFrame(src=0xA1B2, dst=0x0102, seq=44, flags=FLAG_ACK, payload=b"hello")
+
+    def test_pack_into_preallocated(self):
+        frame = LyceumFrame(src=1, dst=2, seq=3, flags=0, payload=b"xyz")
+        buf = bytearray(32)
+        n = frame.pack_into(buf, 5)
+        assert n == HEADER_SIZE + 3
+        assert bytes(buf[5:5 + n]) == frame.to_bytes()
+        assert buf[:5] == bytes(5)
+
+    def test_too_short(self):
+        with pytest.raises(ValueError):
+            LyceumFrame.from_bytes(b"\x00\x01\x02")
+        with pytest.raises(ValueError):
+            LyceumFrame.from_compact(b"\x00", dst=1)
+
+    def test_view_header_matches(self):
+        frame = LyceumFrame(src=9, dst=8, seq=7, flags=FLAG_FEC, payload=b"p")
+        view = LyceumFrameView(memoryview(frame.to_bytes()))
+        assert view.header() == (9, 8, 7, FLAG_FEC)
+        assert view.is_fec
+
+
+class TestCompactHeader:
+    def test_drops_destination(self):
+        frame = LyceumFrame(src=0x0005, dst=0x0002, seq=1, flags=0, payload=b"data")
+        compact = frame.to_bytes(compact=True)
+        assert len(compact) == len(frame.to_bytes()) - COMPACT_SAVING
+        assert compact == compact_header(frame.to_bytes())
+        assert LyceumFrame.from_compact(compact, dst=0x0002) == frame
+
+    def test_expand_in_place(self):
+        frame = LyceumFrame(src=0x0005, dst=0x0002, seq=1, flags=FLAG_ACK, payload=b"data")
+        buf = bytearray(64)
+        n = frame.pack_into(buf, COMPACT_SAVING, compact=True)
+        full = expand_header_into(buf, n, 0x0002)
+        assert full.obj is buf
+        assert bytes(full) == frame.to_bytes()
+
+    def test_gateway_round_trip(self, gateways):
+        tx = gateways(address=0x0005, compact_header=True)
+        rx = gateways(address=0x0002, compact_header=True)
+        plain = tx.text_frame(0x0002, "hi", src=0x0005)
+        packet = tx.build_lyceum_frame(0x0002, 4, plain)
+        full = gateways(address=0x0005).build_lyceum_frame(0x0002, 4, plain)
+        assert len(full) - len(packet) == COMPACT_SAVING
+        blob = packet[4:]  # Strip ADDH, ADDL, CH and the length byte
+        assert rx.decrypt_payload(blob) == plain
+        out = bytearray(256)
+        assert bytes(rx.decrypt_payload_into(blob, out)) == plain
+
+    def test_peek_sender(self, gateways):
+        for compact in (False, True):
+            tx = gateways(aes_key=None, compact_header=compact)
+            packet = tx.build_lyceum_frame(0x0002, 4, tx.text_frame(0x0002, "hi", src=0x0005))
+            assert tx.peek_sender(packet[4:]) == 0x0005
+        keyed = gateways()
+        packet = keyed.build_lyceum_frame(0x0002, 4, keyed.text_frame(0x0002, "hi", src=0x0005))
+        assert keyed.peek_sender(packet[4:]) is None  # Hidden by random-nonce AES-GCM
+
+
+class TestFlags:
+    def test_bits_distinct(self):
+        bits = list(FLAG_NAMES)
+        assert all(bit & (bit - 1) == 0 for bit in bits)
+        assert len(set(bits)) == len(bits)
+        assert not any(bit & FLAG_RESERVED for bit in bits)
+
+    def test_describe(self):
+        assert describe(FLAG_FEC | FLAG_ACK) == ["ack", "fec"]
+        assert describe(0) == []
@@ -0,0 +1,194 @@
+"""Tests for the batched internet relay and its spool, against a local HTTP server."""
+import asyncio
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lyceum.relay import HttpPoster, RelayClient, Spool
+
+
+class RelayServer:
+    """Stand-in relay: records batches and the client ports they came from."""
+
+    def __init__(self):
+        self.batches = []
+        self.peers = set()
+        self.status = 200
+        self.delay = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if server.delay:
+                    threading.Event().wait(server.delay)
+                status = server.status
+                if status == 200:
+                    assert self.headers["Content-Encoding"] == "gzip"
+                    server.batches.append(json.loads(gzip.decompress(body)))
+                    server.peers.add(self.client_address)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/relay/batch"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def messages(self):
+        return [m["n"] for batch in self.batches for m in batch]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = RelayServer()
+    yield server
+    server.close()
+
+
+async def wait_for(condition, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not condition():
+        assert loop.time() < end, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class TestSpool:
+    def test_append_peek_commit(self, tmp_path):
+        path = str(tmp_path / "relay.spool")
+        spool = Spool(path, fsync=False)
+        spool.append([b'{"n":1}', b'{"n":2}', b'{"n":3}'])
+        records, end = spool.peek(2, 1024)
+        assert records == [b'{"n":1}', b'{"n":2}']
+        spool.commit(end, 2)
+        reopened = Spool(path, fsync=False)
+        assert reopened.depth == 1
+        records, end = reopened.peek(10, 1024)
+        assert records == [b'{"n":3}']
+        reopened.commit(end, 1)
+        assert reopened.depth == 0 and reopened.size == 0  # Compacted
+
+    def test_torn_tail_and_capacity(self, tmp_path):
+        path = str(tmp_path / "relay.spool")
+        with open(path, "wb") as f:
+            f.write(b'{"n":1}\n{"n":')
+        spool = Spool(path, max_bytes=20, fsync=False)
+        assert spool.depth == 1 and spool.size == 8
+        assert spool.append([b'{"n":2}', b'{"n":3}']) == 1
+        assert spool.dropped == 1
+
+
+class TestRelayClient:
+    def test_batches_over_one_connection(self, server):
+        async def scenario():
+            poster = HttpPoster(server.url)
+            client = RelayClient(poster, batch_size=10, linger_s=0.05)
+            client.start()
+            for n in range(25):
+                await client.submit({"n": n, "message": "x" * 100})
+            await wait_for(lambda: client.stats.sent == 25)
+            await client.close()
+            poster.close()
+            return client
+
+        client = asyncio.run(scenario())
+        assert server.messages == list(range(25))
+        assert len(server.batches) < 25
+        assert len(server.peers) == 1  # Connection reused
+        stats = client.to_dict()
+        assert stats["compression"] > 2
+        assert stats["messages_per_s"] > 0
+
+    def test_spools_offline_and_replays_in_order(self, server, tmp_path):
+        async def scenario():
+            server.status = 503
+            spool = Spool(str(tmp_path / "relay.spool"), fsync=False)
+            client = RelayClient(HttpPoster(server.url), spool=spool, linger_s=0.01,
+                                 retry_min_s=0.05, retry_max_s=0.1)
+            client.start()
+            for n in range(5):
+                await client.submit({"n": n})
+            await wait_for(lambda: client.spool_depth == 5)
+            assert not client.online
+            for n in range(5, 8):
+                await client.submit({"n": n})
+            await wait_for(lambda: client.spool_depth == 8)
+            server.status = 200
+            for n in range(8, 10):
+                await client.submit({"n": n})
+            await wait_for(lambda: client.stats.replayed == 10)  # All behind the spool
+            await client.close()
+            return client
+
+        client = asyncio.run(scenario())
+        assert server.messages == list(range(10))
+        assert client.spool_depth == 0 and client.online
+
+    def test_spool_survives_restart(self, server, tmp_path):
+        path = str(tmp_path / "relay.spool")
+
+        async def offline():
+            client = RelayClient(HttpPoster("http://127.0.0.1:9/"), spool=Spool(path, fsync=False),
+                                 linger_s=0.01, retry_min_s=10)
+            client.start()
+            for n in range(3):
+                await client.submit({"n": n})
+            await wait_for(lambda: client.spool_depth == 3)
+            await client.submit({"n": 3})
+            await client.close()  # Queued message goes to the spool too
+
+        async def online():
+            client = RelayClient(HttpPoster(server.url), spool=Spool(path, fsync=False))
+            assert client.spool_depth == 4
+            client.start()
+            await wait_for(lambda: client.spool_depth == 0)
+            await client.close()
+
+        asyncio.run(offline())
+        asyncio.run(online())
+        assert server.messages == [0, 1, 2, 3]
+
+    def test_backpressure_without_spool(self, server):
+        async def scenario():
+            server.delay = 0.1
+            client = RelayClient(HttpPoster(server.url), batch_size=1, max_queue=2, linger_s=0)
+            client.start()
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for n in range(5):
+                await client.submit({"n": n})
+            blocked = loop.time() - start
+            assert not client.submit_nowait({"n": 5})
+            await wait_for(lambda: client.stats.sent == 5)
+            await client.close()
+            return blocked, client
+
+        blocked, client = asyncio.run(scenario())
+        assert blocked >= 0.1  # submit() waited for the slow relay
+        assert client.stats.dropped == 1
+
+    def test_permanent_rejection_is_dropped(self, server):
+        async def scenario():
+            server.status = 400
+            client = RelayClient(HttpPoster(server.url), linger_s=0)
+            client.start()
+            await client.submit({"n": 0})
+            await wait_for(lambda: client.stats.rejected == 1)
+            await client.close()
+            return client
+
+        assert asyncio.run(scenario()).online
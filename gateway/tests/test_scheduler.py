@@ -0,0 +1,184 @@
+"""Tests for LoRa airtime and the transmit scheduler."""
+import asyncio
+
+import pytest
+
+from lyceum.link.airtime import LoRaModulation, e22_modulation, E22_AIR_RATES
+from lyceum.link.scheduler import Priority, SchedulerConfig, TokenBucket, TxScheduler
+
+
+def frame(size: int, tag: int = 0) -> bytes:
+    return bytes([0, 1, 4]) + bytes([tag]) * size
+
+
+class TestAirtime:
+    def test_semtech_reference(self):
+        # SF7 / 125 kHz / 4:5, 8-symbol preamble, CRC, explicit header
+        assert LoRaModulation().time_on_air(10) == pytest.approx(0.041216, rel=1e-4)
+
+    def test_low_data_rate_optimize(self):
+        slow = LoRaModulation(spreading_factor=12, bandwidth=125_000)
+        assert slow.low_data_rate_optimize
+        assert slow.time_on_air(10) == pytest.approx(0.991232, rel=1e-4)
+
+    def test_e22_rates_get_faster(self):
+        times = [E22_AIR_RATES[code].time_on_air(64) for code in range(2, 8)]
+        assert times == sorted(times, reverse=True)
+        assert e22_modulation(7).bitrate == pytest.approx(62500)
+
+    def test_unknown_code(self):
+        with pytest.raises(ValueError):
+            e22_modulation(9)
+
+
+class TestTokenBucket:
+    def test_refill(self):
+        bucket = TokenBucket(rate=0.1, burst=1.0, now=0.0)
+        bucket.consume(1.0, 0.0)
+        assert bucket.available_at(0.5, 0.0) == pytest.approx(5.0)
+        assert bucket.available_at(0.5, 5.0) == 5.0
+
+    def test_oversized_cost_waits_for_full_bucket(self):
+        bucket = TokenBucket(rate=1.0, burst=1.0, now=0.0)
+        bucket.consume(0.5, 0.0)
+        assert bucket.available_at(3.0, 0.0) == pytest.approx(0.5)
+
+
+class TestTxScheduler:
+    def test_priority_order(self, clock):
+        sched = TxScheduler(clock=clock)
+        sched.enqueue(frame(10, 3), 4, Priority.TELEMETRY)
+        sched.enqueue(frame(10, 2), 4, Priority.RELAY)
+        sched.enqueue(frame(10, 0), 4, Priority.DISCOVERY)
+        order = []
+        while sched.depth:
+            item = sched.pop_ready()
+            if item is None:
+                clock.now = sched.next_wakeup()
+                continue
+            order.append(item.priority)
+        assert order == [Priority.DISCOVERY, Priority.RELAY, Priority.TELEMETRY]
+
+    def test_radio_busy_for_airtime(self, clock):
+        sched = TxScheduler(clock=clock)
+        sched.enqueue(frame(50), 4)
+        sched.enqueue(frame(50), 4)
+        first = sched.pop_ready()
+        assert sched.pop_ready() is None  # Still on air
+        assert sched.next_wakeup() == pytest.approx(first.airtime)
+
+    def test_pause_holds_frames(self, clock):
+        sched = TxScheduler(clock=clock)
+        sched.pause()
+        assert sched.enqueue(frame(50), 4)
+        assert sched.pop_ready() is None
+        assert sched.next_wakeup() is None
+        sched.resume()
+        item = sched.pop_ready()
+        assert item is not None
+        assert sched.busy_until == pytest.approx(item.airtime)
+
+    def test_duty_cycle_budget(self, clock):
+        config = SchedulerConfig(duty_cycle=0.01, burst_s=0.2)
+        sched = TxScheduler(config, clock=clock)
+        airtime = sched.airtime(frame(40))
+        sent = 0
+        for _ in range(20):
+            sched.enqueue(frame(40), 4, Priority.RELAY)
+        while clock.now < 100.0:
+            if sched.pop_ready():
+                sent += 1
+            clock.now = sched.next_wakeup() or 100.0
+        # Burst plus 1% of 100 s, in frames
+        assert sent * airtime <= 0.2 + 1.0 + airtime
+
+    def test_blocked_channel_does_not_stall_others(self, clock):
+        config = SchedulerConfig(duty_cycle=0.01, burst_s=0.05)
+        sched = TxScheduler(config, clock=clock)
+        sched.enqueue(frame(40), 4, Priority.DISCOVERY)
+        assert sched.pop_ready() is not None  # Exhausts channel 4
+        clock.now = 1.0
+        sched.enqueue(frame(40), 4, Priority.DISCOVERY)
+        sched.enqueue(frame(40), 7, Priority.TELEMETRY)
+        item = sched.pop_ready()
+        assert item.channel == 7
+
+    def test_wakeup_waits_for_head_of_line(self, clock):
+        # A small frame behind a large one on the same channel must not make
+        # next_wakeup() report a time at which pop_ready() sends nothing
+        config = SchedulerConfig(duty_cycle=0.1, burst_s=0.5)
+        sched = TxScheduler(config, clock=clock)
+        sched.enqueue(frame(200), 4)
+        sched.enqueue(frame(200), 4)
+        sched.enqueue(frame(5), 4)
+        sent = 0
+        for _ in range(10):
+            if sched.pop_ready():
+                sent += 1
+                continue
+            wakeup = sched.next_wakeup()
+            if wakeup is None:
+                break
+            assert wakeup > clock.now
+            clock.now = wakeup
+        assert sent == 3
+
+    def test_deadline_expiry(self, clock):
+        config = SchedulerConfig(duty_cycle=0.001, burst_s=0.05)
+        sched = TxScheduler(config, clock=clock)
+        sched.enqueue(frame(40), 4, Priority.RELAY)
+        sched.pop_ready()
+        sched.enqueue(frame(40), 4, Priority.DISCOVERY, deadline=2.0)
+        clock.now = 3.0
+        assert sched.pop_ready() is None
+        assert sched.stats[Priority.DISCOVERY].expired == 1
+        assert sched.depth == 0
+
+    def test_queue_limit_and_wait_stats(self, clock):
+        sched = TxScheduler(SchedulerConfig(max_queue=2), clock=clock)
+        assert sched.enqueue(frame(10), 4, Priority.TELEMETRY)
+        assert sched.enqueue(frame(10), 4, Priority.TELEMETRY)
+        assert not sched.enqueue(frame(10), 4, Priority.TELEMETRY)
+        clock.now = 0.5
+        sched.pop_ready()
+        stats = sched.to_dict()["telemetry"]
+        assert stats["refused"] == 1
+        assert stats["wait"]["max_ms"] == pytest.approx(500)
+
+    def test_run_loop_writes_frames(self):
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            config = SchedulerConfig(modulation=e22_modulation(7))
+            sched = TxScheduler(config, clock=loop.time)
+            written = []
+            task = asyncio.ensure_future(sched.run(written.append))
+            sched.enqueue(frame(20, 1), 4, Priority.RELAY)
+            sched.enqueue(frame(20, 2), 4, Priority.DISCOVERY)
+            await asyncio.sleep(0.1)
+            task.cancel()
+            return written
+
+        written = asyncio.run(scenario())
+        assert [f[3] for f in written] == [2, 1]  # Discovery first
+
+    def test_run_loop_survives_failed_write(self, caplog):
+        def write(data):
+            if data[3] == 1:
+                raise OSError("port gone")
+            written.append(data)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            sched = TxScheduler(SchedulerConfig(modulation=e22_modulation(7)), clock=loop.time)
+            task = asyncio.ensure_future(sched.run(write))
+            sched.enqueue(frame(20, 1), 4, Priority.RELAY)
+            sched.enqueue(frame(20, 2), 4, Priority.RELAY)
+            await asyncio.sleep(0.1)
+            task.cancel()
+            return sched
+
+        written = []
+        sched = asyncio.run(scenario())
+        assert [f[3] for f in written] == [2]
+        assert sched.to_dict()["relay"]["failed"] == 1
+        assert "port gone" in caplog.text
@@ -0,0 +1,130 @@
+"""Tests for counter-nonce session cipher and replay window."""
+import pytest
+from lyceum.crypto.session import SessionCipher, ReplayWindow
+
+
+KEY = bytes.fromhex("deadbeefcafebabe0011223344556677")
+SALT = bytes.fromhex("a1b2c3d4e5f6")
+
+
+class TestReplayWindow:
+    def test_accepts_increasing(self):
+        w = ReplayWindow(size=8)
+        for counter in range(20):
+            assert w.check(counter) is True
+            w.update(counter)
+
+    def test_rejects_duplicate(self):
+        w = ReplayWindow(size=8)
+        w.update(5)
+        assert w.check(5) is False
+
+    def test_accepts_reordered_inside_window(self):
+        w = ReplayWindow(size=8)
+        w.update(10)
+        assert w.check(7) is True
+        w.update(7)
+        assert w.check(7) is False
+        assert w.check(8) is True
+
+    def test_rejects_older_than_window(self):
+        w = ReplayWindow(size=8)
+        w.update(100)
+        assert w.check(92) is False
+        assert w.check(93) is True
+
+    def test_large_jump_clears_bitmap(self):
+        w = ReplayWindow(size=8)
+        w.update(1)
+        w.update(1000)
+        assert w.check(999) is True
+        w.update(SessionCipher.MAX_COUNTER)
+        assert w._bitmap == 1  # Shift capped at the window, not 2**32 bits
+        assert w.check(1000) is False
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ReplayWindow(size=0)
+
+
+class TestSessionCipher:
+    @pytest.fixture
+    def alice(self):
+        return SessionCipher(KEY, SALT, sender=0x0001)
+
+    @pytest.fixture
+    def bob(self):
+        return SessionCipher(KEY, SALT, sender=0x0002)
+
+    def test_roundtrip(self, alice, bob):
+        blob = alice.encrypt(b"Hello, Lyceum!")
+        assert bob.decrypt(blob) == b"Hello, Lyceum!"
+
+    def test_overhead_is_22_bytes(self, alice):
+        blob = alice.encrypt(b"x" * 100)
+        assert len(blob) == 100 + 22
+
+    def test_counter_increments(self, alice):
+        first = alice.encrypt(b"a")
+        second = alice.encrypt(b"a")
+        assert first[2:6] == (0).to_bytes(4, "big")
+        assert second[2:6] == (1).to_bytes(4, "big")
+        assert first != second
+
+    def test_replay_rejected(self, alice, bob):
+        blob = alice.encrypt(b"once")
+        assert bob.decrypt(blob) == b"once"
+        assert bob.decrypt(blob) is None
+
+    def test_out_of_order_accepted_once(self, alice, bob):
+        blobs = [alice.encrypt(bytes([i])) for i in range(4)]
+        assert bob.decrypt(blobs[3]) == b"\x03"
+        assert bob.decrypt(blobs[1]) == b"\x01"
+        assert bob.decrypt(blobs[1]) is None
+
+    def test_windows_are_per_sender(self, alice, bob):
+        carol = SessionCipher(KEY, SALT, sender=0x0003)
+        assert bob.decrypt(alice.encrypt(b"a")) == b"a"
+        assert bob.decrypt(carol.encrypt(b"c")) == b"c"
+
+    def test_forged_counter_does_not_advance_window(self, alice, bob):
+        blob = alice.encrypt(b"real")
+        forged = blob[:2] + (1000).to_bytes(4, "big") + blob[6:]
+        assert bob.decrypt(forged) is None
+        assert bob.decrypt(blob) == b"real"
+
+    def test_tampered_sender_fails(self, alice, bob):
+        blob = alice.encrypt(b"data")
+        tampered = (0x0009).to_bytes(2, "big") + blob[2:]
+        assert bob.decrypt(tampered) is None
+
+    def test_wrong_salt_fails(self, alice):
+        other = SessionCipher(KEY, bytes(6), sender=0x0002)
+        assert other.decrypt(alice.encrypt(b"data")) is None
+
+    def test_aad(self, alice, bob):
+        blob = alice.encrypt(b"data", associated_data=b"hdr")
+        assert bob.decrypt(blob, associated_data=b"other") is None
+
+    def test_too_short(self, bob):
+        assert bob.decrypt(b"short") is None
+
+    def test_decrypt_into(self, alice, bob):
+        out = bytearray(64)
+        blob = alice.encrypt(b"pooled")
+        view = bob.decrypt_into(memoryview(blob), out)
+        assert bytes(view) == b"pooled"
+        assert bob.decrypt_into(blob, out) is None  # Replay
+        assert bob.decrypt(alice.encrypt(b"next")) == b"next"  # Shares the window
+
+    def test_peek_sender(self, alice):
+        assert SessionCipher.peek_sender(alice.encrypt(b"x")) == 0x0001
+
+    def test_counter_exhaustion(self, alice):
+        alice._counter = SessionCipher.MAX_COUNTER + 1
+        with pytest.raises(OverflowError):
+            alice.encrypt(b"x")
+
+    def test_invalid_salt(self):
+        with pytest.raises(ValueError):
+            SessionCipher(KEY, b"short", sender=1)
@@ -0,0 +1,105 @@
+"""Tests for incremental Stage D synthesis."""
+import pytest
+from lyceum.pneuma.synthesis import SynthesisEngine, SynthesisConfig
+from lyceum.pneuma.messages import DebatePacket, DebateMetadata
+
+
+def _packet(role, round=1, content="answer", confidence=0.9, agreement=None, citations=None):
+    return DebatePacket(
+        session_id="sess_001",
+        round=round,
+        role=role,
+        content=content,
+        metadata=DebateMetadata(
+            confidence=confidence,
+            citations=citations or [],
+            agreement=agreement,
+        ),
+    )
+
+
+class TestSynthesisEngine:
+    @pytest.fixture
+    def engine(self, clock):
+        return SynthesisEngine("sess_001", clock=clock)
+
+    def test_empty_before_any_packet(self, engine):
+        assert engine.current.empty is True
+
+    def test_partial_answer_available_while_streaming(self, engine):
+        result = engine.add_partial("def scan")
+        assert result.content == "def scan"
+        assert result.partial is True
+
+    def test_complete_packet_replaces_partial(self, engine):
+        engine.add_partial("def scan")
+        result = engine.add_packet(_packet("proposer", content="def scan_bt(): ..."))
+        assert result.content == "def scan_bt(): ..."
+        assert result.partial is False
+        assert result.revised is False
+
+    def test_partial_ignored_after_complete(self, engine):
+        engine.add_packet(_packet("proposer", content="full"))
+        result = engine.add_partial("fu")
+        assert result.content == "full"
+
+    def test_partial_of_later_round_accepted(self, engine):
+        engine.add_packet(_packet("proposer", content="draft"))
+        result = engine.add_partial("revis", round=2)
+        assert result.content == "revis"
+        assert engine.add_partial("revised", round=2).content == "revised"
+        assert engine.add_partial("dra", round=1).content == "revised"
+
+    def test_revision_flags_revised_answer(self, engine):
+        engine.add_packet(_packet("proposer", content="draft"))
+        engine.add_packet(_packet("critic", content="unsafe", agreement=0.3))
+        result = engine.add_packet(_packet("proposer", round=2, content="fixed"))
+        assert result.content == "fixed"
+        assert result.revised is True
+        assert result.critiques == ["unsafe"]
+        assert engine.revisions == 1
+
+    def test_critic_disagreement_lowers_score(self, engine):
+        before = engine.add_packet(_packet("proposer")).score
+        after = engine.add_packet(_packet("critic", agreement=0.0)).score
+        assert after < before
+
+    def test_reputation_weighting(self, engine):
+        engine.add_packet(_packet("proposer", content="low"), source="!a", reputation=10)
+        result = engine.add_packet(_packet("proposer", content="high"), source="!b", reputation=100)
+        assert result.content == "high"
+        assert result.revised is True
+
+    def test_small_improvement_does_not_flip_answer(self, engine):
+        engine.add_packet(_packet("proposer", content="first", confidence=0.9), source="!a")
+        result = engine.add_packet(
+            _packet("proposer", content="second", confidence=0.92), source="!b"
+        )
+        assert result.content == "first"
+        assert result.revised is False
+
+    def test_citations_preferred(self, engine):
+        engine.add_packet(_packet("proposer", content="bare"), source="!a")
+        result = engine.add_packet(
+            _packet("proposer", content="cited", citations=["RFC 1234"]), source="!b"
+        )
+        assert result.content == "cited"
+
+    def test_old_draft_does_not_override_revision(self, engine):
+        engine.add_packet(_packet("proposer", round=2, content="revised"))
+        result = engine.add_packet(_packet("proposer", round=1, content="draft"))
+        assert result.content == "revised"
+
+    def test_other_session_ignored(self, engine):
+        packet = _packet("proposer")
+        packet.session_id = "other"
+        assert engine.add_packet(packet).empty is True
+
+    def test_finalize_on_timeout_returns_best_so_far(self, engine, clock):
+        shown = engine.add_partial("partial answer")
+        clock.now = SynthesisConfig().timeout_seconds
+        assert engine.expired is True
+        result = engine.finalize()
+        assert result.timed_out is True
+        assert result.content == "partial answer"
+        assert shown.timed_out is False  # Earlier results are left alone
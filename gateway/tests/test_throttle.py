@@ -0,0 +1,82 @@
+"""Tests for state update throttling and event summaries."""
+from lyceum.throttle import EventSummarizer, UpdateThrottle
+
+
+class TestUpdateThrottle:
+    def test_burst_coalesces_to_leading_and_trailing(self, clock):
+        calls = []
+        throttle = UpdateThrottle(lambda: calls.append(clock.now), min_interval=1.0, clock=clock)
+        assert throttle.request()
+        for i in range(1, 100):
+            clock.now = i / 200
+            assert not throttle.request()
+        assert calls == [0.0]
+        assert throttle.deadline == 1.0
+        throttle.poll()  # Too early
+        clock.now = 1.0
+        throttle.poll()
+        assert calls == [0.0, 1.0]
+        assert throttle.deadline is None
+        assert throttle.stats.to_dict() == {"requested": 100, "notified": 2, "coalesced": 98}
+
+    def test_quiet_requests_notify_immediately(self, clock):
+        calls = []
+        throttle = UpdateThrottle(lambda: calls.append(clock.now), min_interval=1.0, clock=clock)
+        for t in (0.0, 1.5, 3.0):
+            clock.now = t
+            assert throttle.request()
+        assert calls == [0.0, 1.5, 3.0]
+
+    def test_zero_interval_passes_through(self, clock):
+        calls = []
+        throttle = UpdateThrottle(lambda: calls.append(1), min_interval=0.0, clock=clock)
+        for _ in range(5):
+            throttle.request()
+        assert len(calls) == 5 and throttle.deadline is None
+
+    def test_flush(self, clock):
+        calls = []
+        throttle = UpdateThrottle(lambda: calls.append(1), clock=clock)
+        throttle.request()
+        throttle.request()
+        throttle.flush()
+        throttle.flush()
+        assert len(calls) == 2
+
+
+class TestEventSummarizer:
+    def test_window_summary(self, clock):
+        out = []
+        summarizer = EventSummarizer(out.append, window_s=10.0, clock=clock)
+        assert summarizer.deadline is None
+        for i, (sender, rssi) in enumerate([("0x1", -80), ("0x2", -95), ("0x1", -70)]):
+            clock.now = i
+            summarizer.add({"sender": sender, "channel": 4, "rssi": rssi,
+                            "message": f"m{i}", "timestamp": f"t{i}"})
+        assert summarizer.deadline == 10.0
+        summarizer.poll()
+        assert out == []
+        clock.now = 10.0
+        summarizer.poll()
+        assert out == [{
+            "count": 3,
+            "senders": {"0x1": 2, "0x2": 1},
+            "channels": {4: 3},
+            "rssi_min": -95,
+            "rssi_max": -70,
+            "first_timestamp": "t0",
+            "last_timestamp": "t2",
+            "last_message": "m2",
+        }]
+        assert summarizer.pending == 0 and summarizer.deadline is None
+        summarizer.flush()
+        assert len(out) == 1  # Nothing to summarize
+
+    def test_sender_cap(self, clock):
+        out = []
+        summarizer = EventSummarizer(out.append, max_keys=2, clock=clock)
+        for sender in ("a", "b", "c", "d", "a"):
+            summarizer.add({"sender": sender})
+        summarizer.flush()
+        assert out[0]["senders"] == {"a": 2, "b": 1, "other": 2}
+        assert out[0]["count"] == 5
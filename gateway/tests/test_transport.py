@@ -0,0 +1,157 @@
+"""Tests for the event-driven E22 serial transport (over a pty)."""
+import asyncio
+import errno
+import os
+import pty
+import time
+import tty
+
+import pytest
+
+import e22_transport
+from e22_transport import E22Transport
+
+
+@pytest.fixture
+def pty_pair():
+    master, slave = pty.openpty()
+    # Raw mode so bytes pass through the line discipline unmodified
+    tty.setraw(slave)
+    tty.setraw(master)
+    yield master, slave
+    os.close(master)
+    os.close(slave)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestE22Transport:
+    def test_receive_is_event_driven(self, pty_pair):
+        master, slave = pty_pair
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            got = asyncio.Queue()
+            transport = E22Transport(slave, lambda d: got.put_nowait(bytes(d)), loop=loop)
+            transport.start()
+            start = time.perf_counter()
+            os.write(master, b"\x01\x02frame")
+            data = await asyncio.wait_for(got.get(), 1.0)
+            latency = time.perf_counter() - start
+            transport.stop()
+            return data, latency
+
+        data, latency = run(scenario())
+        assert data == b"\x01\x02frame"
+        assert latency < 0.1  # No pyserial timeout or polling sleep
+
+    def test_write_and_drain(self, pty_pair):
+        master, slave = pty_pair
+
+        async def scenario():
+            transport = E22Transport(slave, lambda d: None, loop=asyncio.get_running_loop())
+            transport.start()
+            transport.write(b"hello ")
+            transport.write(b"mesh")
+            await asyncio.wait_for(transport.drain(), 1.0)
+            transport.stop()
+            return transport
+
+        transport = run(scenario())
+        assert transport.pending == 0
+        assert transport.bytes_out == 10
+        received = b""
+        while len(received) < 10:  # The pty may hand the writes over separately
+            received += os.read(master, 64)
+        assert received == b"hello mesh"
+
+    def test_request_collects_reply_and_passes_rest(self, pty_pair):
+        master, slave = pty_pair
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            frames = []
+            transport = E22Transport(slave, lambda d: frames.append(bytes(d)), loop=loop)
+            transport.start()
+
+            async def module():
+                cmd = await loop.run_in_executor(None, os.read, master, 3)
+                assert cmd == b"\xc1\x00\x02"
+                # Reply split across writes, followed by a radio frame
+                os.write(master, b"\xc1\x00")
+                await asyncio.sleep(0.01)
+                os.write(master, b"\x02\x12\x34" + b"radio")
+
+            responder = asyncio.ensure_future(module())
+            reply = await transport.request(b"\xc1\x00\x02", reply_len=5)
+            await responder
+            await asyncio.sleep(0.05)
+            transport.stop()
+            return reply, b"".join(frames)
+
+        reply, rest = run(scenario())
+        assert reply == b"\xc1\x00\x02\x12\x34"
+        assert rest == b"radio"
+
+    def test_request_timeout(self, pty_pair):
+        master, slave = pty_pair
+
+        async def scenario():
+            transport = E22Transport(slave, lambda d: None, loop=asyncio.get_running_loop())
+            transport.start()
+            reply = await transport.request(b"\xc1\x00\x09", reply_len=12, timeout=0.05)
+            transport.stop()
+            return reply
+
+        assert run(scenario()) is None
+
+    def test_unplugged_port_stops_transport(self, pty_pair, monkeypatch):
+        master, slave = pty_pair
+
+        def unplugged(fd, buffers):
+            raise OSError(errno.EIO, "Input/output error")
+
+        async def scenario():
+            lost = asyncio.get_running_loop().create_future()
+            transport = E22Transport(slave, lambda d: None, loop=asyncio.get_running_loop(),
+                                     on_close=lost.set_result)
+            transport.start()
+            monkeypatch.setattr(e22_transport.os, "readv", unplugged)
+            os.write(master, b"x")
+            exc = await asyncio.wait_for(lost, 1.0)
+            reply = await transport.request(b"\xc1\x00\x09", reply_len=12)
+            return transport, exc, reply
+
+        transport, exc, reply = run(scenario())
+        assert exc.errno == errno.EIO and transport.error is exc
+        assert not transport.running and reply is None
+        with pytest.raises(ConnectionError):
+            transport.write(b"x")
+
+    def test_eof_stops_and_fails_drain(self):
+        read_fd, write_fd = os.pipe()
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            lost = loop.create_future()
+            reader = E22Transport(read_fd, lambda d: None, loop=loop, on_close=lost.set_result)
+            reader.start()
+            # Nobody reads the pipe, so most of this stays queued
+            writer = E22Transport(write_fd, lambda d: None, loop=loop)
+            writer.start()
+            writer.write(bytes(1 << 20))
+            draining = asyncio.ensure_future(writer.drain())
+            await asyncio.sleep(0.01)
+            writer.stop()
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(draining, 1.0)
+            os.close(write_fd)
+            return reader, await asyncio.wait_for(lost, 1.0)
+
+        try:
+            reader, exc = run(scenario())
+        finally:
+            os.close(read_fd)
+        assert exc is None and not reader.running
@@ -0,0 +1,108 @@
+"""Tests for the sharded receive worker pool."""
+import threading
+
+import pytest
+from lyceum.workers import LatencyStats, ShardedWorkerPool
+
+
+class Collector:
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def __call__(self, item):
+        with self.lock:
+            self.items.append(item)
+
+
+@pytest.fixture
+def collector():
+    return Collector()
+
+
+class TestLatencyStats:
+    def test_summary(self):
+        stats = LatencyStats(window=10)
+        for ms in range(1, 11):
+            stats.add(ms / 1000)
+        d = stats.to_dict()
+        assert d["count"] == 10
+        assert d["max_ms"] == 10
+        assert d["p50_ms"] == 6
+        assert d["mean_ms"] == pytest.approx(5.5)
+
+    def test_empty(self):
+        assert LatencyStats().to_dict()["p95_ms"] == 0
+
+
+class TestShardedWorkerPool:
+    def test_per_sender_order_preserved(self, collector):
+        pool = ShardedWorkerPool(lambda d: d.decode(), collector, workers=3)
+        for i in range(200):
+            sender = i % 5
+            pool.submit(sender, f"{sender}:{i}".encode())
+        pool.close()
+        assert len(collector.items) == 200
+        for sender in range(5):
+            seen = [int(item.result.split(":")[1]) for item in collector.items
+                    if item.key == sender]
+            assert seen == sorted(seen)
+
+    def test_unknown_sender_uses_shard_zero(self, collector):
+        pool = ShardedWorkerPool(lambda d: d, collector, workers=4)
+        assert pool.submit(None, b"x").shard == 0
+        assert pool.shard_for(6) == 2
+        pool.close()
+
+    def test_tag_returned_with_result(self, collector):
+        pool = ShardedWorkerPool(lambda d: d.upper(), collector, workers=2)
+        pool.submit(1, b"x", tag=3)
+        pool.close()
+        assert [(item.result, item.tag) for item in collector.items] == [(b"X", 3)]
+
+    def test_queue_depth(self, collector):
+        gate = threading.Event()
+
+        def slow(data):
+            gate.wait(5)
+            return data
+
+        pool = ShardedWorkerPool(slow, collector, workers=2)
+        for _ in range(3):
+            pool.submit(1, b"x")
+        assert pool.depth == 3
+        assert pool.depths() == [0, 3]
+        gate.set()
+        pool.close()
+        assert pool.depth == 0
+        assert pool.stats()["peak_depth"] == 3
+
+    def test_errors_are_delivered(self, collector):
+        def process(data):
+            if data == b"bad":
+                raise ValueError("corrupt")
+            return data
+
+        pool = ShardedWorkerPool(process, collector, workers=1)
+        pool.submit(1, b"good")
+        pool.submit(1, b"bad")
+        pool.close()
+        assert [item.ok for item in collector.items] == [True, False]
+        assert isinstance(collector.items[1].error, ValueError)
+        assert pool.stats()["failed"] == 1
+
+    def test_stage_latency_recorded(self, collector):
+        pool = ShardedWorkerPool(lambda d: d, collector, workers=2)
+        for i in range(10):
+            pool.submit(i, b"x")
+        pool.close()
+        for item in collector.items:
+            pool.record_delivery(item)
+        stats = pool.stats()
+        assert stats["completed"] == 10
+        for stage in ShardedWorkerPool.STAGES:
+            assert stats["latency"][stage]["count"] == 10
+
+    def test_needs_a_worker(self, collector):
+        with pytest.raises(ValueError):
+            ShardedWorkerPool(lambda d: d, collector, workers=0)
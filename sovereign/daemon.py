@@ -70,6 +70,7 @@ class AIWTDaemon:
         self._router: Optional[QwenRouter] = None
         self._lora: Optional[LoRaHAT] = None
         self._display: Optional[OLEDDisplay] = None
+        self._cipher = None  # Built on first encrypted packet, then reused
         
         # Callbacks
         self._on_message_received: Optional[Callable[[str], None]] = None
@@ -213,10 +214,11 @@ class AIWTDaemon:
         if not self.config.aes_key:
             return packet  # No encryption configured
         
-        # Use lyceum crypto module
-        from lyceum.crypto import AESGCMCipher
-        cipher = AESGCMCipher(self.config.aes_key)
-        return cipher.decrypt(packet)
+        if self._cipher is None:
+            # Use lyceum crypto module
+            from lyceum.crypto import AESGCMCipher
+            self._cipher = AESGCMCipher(self.config.aes_key)
+        return self._cipher.decrypt(packet)
 
     # Placeholder methods for hardware interaction
     async def _wait_for_button(self, pin: int) -> ButtonEvent:
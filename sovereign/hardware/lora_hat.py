@@ -131,6 +131,25 @@ class LoRaHAT:
         
         return None
 
+    async def set_data_rate(self, spreading_factor: int, bandwidth: Optional[int] = None):
+        """
+        Retune the modulation, e.g. to a rate agreed by lyceum.link.adr.
+
+        Takes effect for the next packet in either direction.
+        """
+        if not 5 <= spreading_factor <= 12:
+            raise ValueError(f"Spreading factor out of range (5-12): {spreading_factor}")
+        self.config.spreading_factor = spreading_factor
+        if bandwidth is not None:
+            self.config.bandwidth = bandwidth
+        
+        # Production would:
+        # 1. Enter standby
+        # 2. SetModulationParams (SF, BW, CR, low data rate optimize)
+        # 3. Return to RX continuous mode
+        
+        logger.info(f"LoRa data rate set to SF{spreading_factor} @ {self.config.bandwidth // 1000} kHz")
+
     def set_rx_callback(self, callback: Callable[[bytes], None]):
         """Set callback for received packets."""
         self._rx_callback = callback